@@ -0,0 +1,300 @@
+# app/cache/autocomplete.py
+import logging
+import os
+import sqlite3
+import sys
+import threading
+import time
+import unicodedata
+from bisect import bisect_left
+from typing import Callable, Dict, List, Optional, Tuple
+
+from app.db.maintenance import PeriodicTask
+
+logger = logging.getLogger(__name__)
+
+# Presupuesto de memoria del índice y segundos entre reconstrucciones completas
+# (recogen los cambios hechos por otros procesos, p. ej. la carga masiva; 0 = nunca)
+AUTOCOMPLETE_MAX_BYTES = int(os.environ.get("AUTOCOMPLETE_MAX_BYTES", str(128 * 1024 * 1024)))
+AUTOCOMPLETE_REFRESH = float(os.environ.get("AUTOCOMPLETE_REFRESH", "300"))
+
+# Texto indexado de cada entidad: tabla y columna
+AUTOCOMPLETE_SOURCES = {
+    "usuarios": ("usuarios", "nickname"),
+    "equipos": ("equipos", "nombre"),
+}
+
+# Separador entre la clave normalizada, el texto original y el ID de cada entrada.
+# Es menor que cualquier otro carácter, así que las entradas se ordenan por clave.
+_SEP = "\x00"
+
+# Bytes de cada posición de la lista (un puntero)
+_SLOT = 8
+
+
+def normalize(text: str) -> str:
+    """
+    Normaliza un texto para comparar prefijos: sin mayúsculas ni diacríticos.
+    """
+    if text.isascii():
+        return text.lower().replace(_SEP, "")
+    decomposed = unicodedata.normalize("NFKD", text)
+    return "".join(c for c in decomposed if not unicodedata.combining(c)).casefold().replace(_SEP, "")
+
+
+def _entry(item_id: int, text: str) -> str:
+    return f"{normalize(text)}{_SEP}{text}{_SEP}{item_id}"
+
+
+class PrefixIndex:
+    """
+    Lista ordenada de entradas `clave\\0texto\\0id` para buscar por prefijo con bisect.
+
+    Cada entrada es una sola cadena, así que el índice ocupa una lista y una cadena
+    por elemento (unos 90 bytes para un nickname típico), sin diccionarios ni nodos
+    de un trie. Buscar cuesta O(log n); insertar o borrar, un desplazamiento de la
+    lista (memmove), del orden de un milisegundo con un millón de entradas.
+    """
+
+    def __init__(self, entries: List[str]):
+        self._entries = entries
+        self.bytes = sys.getsizeof(entries) + sum(sys.getsizeof(entry) for entry in entries)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def add(self, entry: str) -> None:
+        position = bisect_left(self._entries, entry)
+        if position < len(self._entries) and self._entries[position] == entry:
+            return
+        self._entries.insert(position, entry)
+        self.bytes += sys.getsizeof(entry) + _SLOT
+
+    def remove(self, entry: str) -> None:
+        position = bisect_left(self._entries, entry)
+        if position < len(self._entries) and self._entries[position] == entry:
+            del self._entries[position]
+            self.bytes -= sys.getsizeof(entry) + _SLOT
+
+    def lookup(self, prefix: str, limit: int) -> List[Tuple[str, int, str]]:
+        """
+        Devuelve hasta `limit` tuplas `(clave, id, texto)` cuya clave empieza por `prefix`
+        (ya normalizado), en orden alfabético.
+        """
+        results = []
+        position = bisect_left(self._entries, prefix)
+        while len(results) < limit and position < len(self._entries):
+            entry = self._entries[position]
+            if not entry.startswith(prefix):
+                break
+            key, rest = entry.split(_SEP, 1)
+            text, item_id = rest.rsplit(_SEP, 1)
+            results.append((key, int(item_id), text))
+            position += 1
+        return results
+
+
+class AutocompleteIndex:
+    """
+    Índice en memoria de nicknames y nombres de equipo para autocompletar.
+
+    Se construye al arrancar leyendo las tablas y lo mantienen al día las funciones
+    de escritura del CRUD (`add`, `remove`) después de cada commit. Una tarea de
+    fondo lo reconstruye cada `refresh` segundos para recoger los cambios hechos
+    por otros procesos; los cambios que llegan durante una reconstrucción se
+    guardan y se aplican al índice nuevo antes de sustituir al anterior.
+
+    Si una entidad no cabe en `max_bytes`, se descarta su índice y `lookup`
+    devuelve None para que la consulta vaya a la base de datos.
+
+    Args:
+        max_bytes: Presupuesto de memoria aproximado de todo el índice, en bytes.
+        refresh: Segundos entre reconstrucciones completas (0 = nunca).
+    """
+
+    def __init__(self, max_bytes: int = AUTOCOMPLETE_MAX_BYTES, refresh: float = AUTOCOMPLETE_REFRESH):
+        self.max_bytes = max_bytes
+        self.refresh = refresh
+        self._indexes: Dict[str, Optional[PrefixIndex]] = {kind: None for kind in AUTOCOMPLETE_SOURCES}
+        self._pending: Optional[Dict[str, List[Tuple[bool, str]]]] = None
+        self._lock = threading.Lock()
+        self._build_lock = threading.Lock()
+        self._task: Optional[PeriodicTask] = None
+        self._connect: Optional[Callable[[], sqlite3.Connection]] = None
+        self._stats: Dict[str, object] = {
+            "builds": 0,
+            "last_build_ms": 0.0,
+            "lookups": 0,
+            "fallbacks": 0,
+            "over_budget": 0,
+        }
+
+    def start(self, connect: Callable[[], sqlite3.Connection]) -> None:
+        """
+        Construye el índice y arranca la tarea que lo reconstruye periódicamente.
+
+        Args:
+            connect: Función que abre una conexión a la base de datos.
+        """
+        self._connect = connect
+        self.rebuild()
+        if self.refresh > 0 and self._task is None:
+            self._task = PeriodicTask("autocomplete-refresh", self.refresh, self.rebuild)
+            self._task.start()
+
+    def stop(self) -> None:
+        """
+        Detiene la reconstrucción periódica, si está en marcha.
+        """
+        if self._task is not None:
+            self._task.stop()
+            self._task = None
+
+    def rebuild(self) -> None:
+        """
+        Vuelve a leer todas las entidades de la base de datos y sustituye el índice.
+        """
+        if self._connect is None:
+            return
+        with self._build_lock:
+            start = time.perf_counter()
+            with self._lock:
+                self._pending = {kind: [] for kind in AUTOCOMPLETE_SOURCES}
+            try:
+                conn = self._connect()
+                try:
+                    built = {kind: self._load(conn, kind) for kind in AUTOCOMPLETE_SOURCES}
+                finally:
+                    conn.close()
+            except Exception:
+                with self._lock:
+                    self._pending = None
+                raise
+            with self._lock:
+                for kind, index in built.items():
+                    if index is not None:
+                        for added, entry in self._pending[kind]:
+                            if added:
+                                index.add(entry)
+                            else:
+                                index.remove(entry)
+                    self._indexes[kind] = index
+                self._pending = None
+                self._stats["builds"] += 1
+                self._stats["last_build_ms"] = (time.perf_counter() - start) * 1000
+
+    def _load(self, conn: sqlite3.Connection, kind: str) -> Optional[PrefixIndex]:
+        table, column = AUTOCOMPLETE_SOURCES[kind]
+        # Lo que ya ocupan las demás entidades cuenta para el presupuesto
+        with self._lock:
+            budget = self.max_bytes - sum(
+                index.bytes for other, index in self._indexes.items() if other != kind and index is not None
+            )
+        entries = []
+        size = 0
+        for item_id, text in conn.execute(f"SELECT id, {column} FROM {table}"):
+            entry = _entry(item_id, text)
+            size += sys.getsizeof(entry) + _SLOT
+            if size > budget:
+                logger.warning("El índice de autocompletado de %s supera %d bytes; se consultará la base de datos", kind, budget)
+                with self._lock:
+                    self._stats["over_budget"] += 1
+                return None
+            entries.append(entry)
+        entries.sort()
+        return PrefixIndex(entries)
+
+    def _apply(self, kind: str, added: bool, item_id: int, text: str) -> None:
+        entry = _entry(item_id, text)
+        with self._lock:
+            if self._pending is not None:
+                self._pending[kind].append((added, entry))
+            index = self._indexes[kind]
+            if index is None:
+                return
+            if added:
+                index.add(entry)
+                if sum(other.bytes for other in self._indexes.values() if other is not None) > self.max_bytes:
+                    logger.warning("El índice de autocompletado de %s supera el presupuesto; se consultará la base de datos", kind)
+                    self._indexes[kind] = None
+                    self._stats["over_budget"] += 1
+            else:
+                index.remove(entry)
+
+    def add(self, kind: str, item_id: int, text: str) -> None:
+        """
+        Añade un elemento recién creado o renombrado.
+
+        Args:
+            kind: 'usuarios' o 'equipos'.
+            item_id: ID del elemento.
+            text: Nickname o nombre indexado.
+        """
+        self._apply(kind, True, item_id, text)
+
+    def remove(self, kind: str, item_id: int, text: str) -> None:
+        """
+        Quita un elemento eliminado o el texto anterior de uno renombrado.
+
+        Args:
+            kind: 'usuarios' o 'equipos'.
+            item_id: ID del elemento.
+            text: Nickname o nombre que tenía indexado.
+        """
+        self._apply(kind, False, item_id, text)
+
+    def lookup(self, kind: str, prefix: str, limit: int) -> Optional[List[Tuple[str, int, str]]]:
+        """
+        Busca los elementos de una entidad cuyo texto empieza por `prefix`, sin
+        distinguir mayúsculas ni diacríticos.
+
+        Args:
+            kind: 'usuarios' o 'equipos'.
+            prefix: Texto tecleado.
+            limit: Número máximo de resultados.
+
+        Returns:
+            Hasta `limit` tuplas `(clave normalizada, id, texto)` en orden alfabético,
+            o None si la entidad no está indexada y hay que consultar la base de datos.
+        """
+        with self._lock:
+            index = self._indexes[kind]
+            if index is None:
+                return None
+            self._stats["lookups"] += 1
+            return index.lookup(normalize(prefix), limit)
+
+    def count_fallback(self) -> None:
+        """
+        Cuenta una consulta servida desde la base de datos por no estar indexada.
+        """
+        with self._lock:
+            self._stats["fallbacks"] += 1
+
+    def stats(self) -> Dict[str, object]:
+        """
+        Devuelve las métricas del índice: entradas y memoria por entidad, reconstrucciones
+        y consultas servidas desde memoria o desde la base de datos.
+
+        Returns:
+            Diccionario con las métricas.
+        """
+        with self._lock:
+            kinds = {
+                kind: {
+                    "indexed": index is not None,
+                    "entries": len(index) if index is not None else 0,
+                    "bytes": index.bytes if index is not None else 0,
+                }
+                for kind, index in self._indexes.items()
+            }
+            return {
+                **self._stats,
+                "bytes": sum(kind["bytes"] for kind in kinds.values()),
+                "max_bytes": self.max_bytes,
+                "refresh": self.refresh,
+                "kinds": kinds,
+            }
+
+
+autocomplete_index = AutocompleteIndex()
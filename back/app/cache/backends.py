@@ -0,0 +1,204 @@
+# app/cache/backends.py
+import logging
+import socket
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional
+from urllib.parse import urlparse
+
+logger = logging.getLogger(__name__)
+
+
+class MemoryBackend:
+    """
+    Caché en memoria del proceso con desalojo LRU, caducidad (TTL) y presupuesto de memoria.
+
+    Guarda los objetos tal cual (sin serializar). El tamaño de cada entrada lo
+    estima quien la guarda; cuando la suma supera `max_bytes` o hay más de
+    `max_entries` entradas, se descartan las menos usadas.
+
+    Args:
+        max_entries: Número máximo de entradas.
+        max_bytes: Presupuesto de memoria aproximado, en bytes.
+    """
+
+    stores_objects = True
+
+    def __init__(self, max_entries: int, max_bytes: int):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.evictions = 0
+
+    def get(self, key: str) -> Optional[object]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, expires_at, size = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                self._bytes -= size
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def get_or_set(self, key: str, value: object, ttl: float, size: int) -> object:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[1] > time.monotonic():
+                self._entries.move_to_end(key)
+                return entry[0]
+        self.set(key, value, ttl, size)
+        return value
+
+    def set(self, key: str, value: object, ttl: float, size: int) -> None:
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= old[2]
+            self._entries[key] = (value, time.monotonic() + ttl, size)
+            self._bytes += size
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                _, (_, _, old_size) = self._entries.popitem(last=False)
+                self._bytes -= old_size
+                self.evictions += 1
+
+    def delete(self, keys: List[str]) -> None:
+        with self._lock:
+            for key in keys:
+                entry = self._entries.pop(key, None)
+                if entry is not None:
+                    self._bytes -= entry[2]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> Dict[str, object]:
+        with self._lock:
+            return {
+                "backend": "memory",
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+                "evictions": self.evictions,
+            }
+
+
+class RedisError(Exception):
+    """
+    Error devuelto por el servidor Redis o de comunicación con él.
+    """
+
+
+class RedisBackend:
+    """
+    Caché compartida entre workers sobre cualquier servidor que hable el protocolo
+    de Redis (RESP2): Redis, Valkey, KeyDB o un servidor de pruebas local.
+
+    Implementa sólo los comandos necesarios (GET, SET ... PX [NX], DEL) sobre un
+    socket por hilo, sin dependencias externas. Los valores se guardan serializados
+    en JSON y caducan en el servidor; el presupuesto de memoria y la política LRU se
+    configuran en el propio servidor (`maxmemory`, `maxmemory-policy allkeys-lru`).
+
+    Args:
+        url: URL del servidor, por ejemplo `redis://localhost:6379/0`.
+        prefix: Prefijo de todas las claves.
+        timeout: Timeout de conexión y lectura, en segundos.
+    """
+
+    stores_objects = False
+
+    def __init__(self, url: str, prefix: str = "matchpoint:", timeout: float = 0.5):
+        parsed = urlparse(url)
+        self.host = parsed.hostname or "localhost"
+        self.port = parsed.port or 6379
+        self.db = int(parsed.path.lstrip("/") or 0)
+        self.password = parsed.password
+        self.prefix = prefix
+        self.timeout = timeout
+        self._local = threading.local()
+
+    def _connect(self) -> socket.socket:
+        sock = socket.create_connection((self.host, self.port), timeout=self.timeout)
+        self._local.sock = sock
+        self._local.reader = sock.makefile("rb")
+        if self.password:
+            self._command("AUTH", self.password)
+        if self.db:
+            self._command("SELECT", str(self.db))
+        return sock
+
+    def _read_reply(self):
+        line = self._local.reader.readline()
+        if not line:
+            raise RedisError("Conexión cerrada por el servidor")
+        kind, payload = line[:1], line[1:-2]
+        if kind == b"+":
+            return payload.decode()
+        if kind == b"-":
+            raise RedisError(payload.decode())
+        if kind == b":":
+            return int(payload)
+        if kind == b"$":
+            length = int(payload)
+            if length == -1:
+                return None
+            data = self._local.reader.read(length + 2)
+            return data[:-2]
+        if kind == b"*":
+            count = int(payload)
+            if count == -1:
+                return None
+            return [self._read_reply() for _ in range(count)]
+        raise RedisError(f"Respuesta desconocida: {line!r}")
+
+    def _command(self, *args):
+        if getattr(self._local, "sock", None) is None:
+            self._connect()
+        parts = [f"*{len(args)}\r\n".encode()]
+        for arg in args:
+            data = arg if isinstance(arg, bytes) else str(arg).encode()
+            parts.append(b"$%d\r\n%s\r\n" % (len(data), data))
+        try:
+            self._local.sock.sendall(b"".join(parts))
+            return self._read_reply()
+        except (OSError, RedisError):
+            self._close()
+            raise
+
+    def _close(self) -> None:
+        sock = getattr(self._local, "sock", None)
+        if sock is not None:
+            try:
+                sock.close()
+            except OSError:
+                pass
+        self._local.sock = None
+
+    def get(self, key: str) -> Optional[bytes]:
+        return self._command("GET", self.prefix + key)
+
+    def get_or_set(self, key: str, value: bytes, ttl: float, size: int) -> bytes:
+        if self._command("SET", self.prefix + key, value, "PX", str(int(ttl * 1000)), "NX") is not None:
+            return value
+        current = self.get(key)
+        return value if current is None else current
+
+    def set(self, key: str, value: bytes, ttl: float, size: int) -> None:
+        self._command("SET", self.prefix + key, value, "PX", str(int(ttl * 1000)))
+
+    def delete(self, keys: List[str]) -> None:
+        if keys:
+            self._command("DEL", *[self.prefix + key for key in keys])
+
+    def stats(self) -> Dict[str, object]:
+        return {"backend": "redis", "host": self.host, "port": self.port, "db": self.db}
@@ -0,0 +1,180 @@
+# app/cache/cache.py
+import functools
+import logging
+import os
+import secrets
+import threading
+from typing import Any, Callable, Dict
+
+from pydantic import TypeAdapter
+
+from app.cache.backends import MemoryBackend, RedisBackend, RedisError
+
+logger = logging.getLogger(__name__)
+
+# Configuración de la caché de lecturas
+CACHE_ENABLED = os.environ.get("CACHE_ENABLED", "1") == "1"
+CACHE_BACKEND = os.environ.get("CACHE_BACKEND", "memory")  # memory | redis
+CACHE_REDIS_URL = os.environ.get("CACHE_REDIS_URL", "redis://localhost:6379/0")
+CACHE_TTL = float(os.environ.get("CACHE_TTL", "60"))
+CACHE_MAX_ENTRIES = int(os.environ.get("CACHE_MAX_ENTRIES", "10000"))
+CACHE_MAX_BYTES = int(os.environ.get("CACHE_MAX_BYTES", str(32 * 1024 * 1024)))
+
+
+class ResponseCache:
+    """
+    Caché de lectura (read-through) delante de los getters del CRUD.
+
+    Cada getter cacheado pertenece a un espacio de nombres (la ruta que lo sirve,
+    p. ej. `/tournaments/{id}`), del que se llevan aciertos y fallos para calcular
+    la tasa de aciertos por ruta. Las funciones de escritura del CRUD invalidan
+    las claves afectadas mediante `invalidate`.
+
+    Cada clave tiene una versión guardada en el backend (un token aleatorio) que
+    forma parte de la clave del valor. La lectura toma la versión antes de ir a la
+    base de datos e `invalidate` borra la versión, así que si una escritura se
+    confirma mientras otra petición está cargando el valor anterior, ese valor se
+    guarda bajo una versión que ya nadie consulta en lugar de quedarse servido
+    hasta que caduque. Como la versión vive en el backend, vale también entre
+    workers con Redis.
+
+    Args:
+        backend: Backend de almacenamiento (`MemoryBackend` o `RedisBackend`).
+        ttl: Segundos de vida de cada entrada.
+        enabled: Si es False, todas las lecturas van directamente a la base de datos.
+    """
+
+    def __init__(self, backend, ttl: float = CACHE_TTL, enabled: bool = True):
+        self.backend = backend
+        self.ttl = ttl
+        self.enabled = enabled
+        self._stats: Dict[str, Dict[str, int]] = {}
+        self._lock = threading.Lock()
+
+    def _count(self, namespace: str, field: str) -> None:
+        with self._lock:
+            counters = self._stats.setdefault(namespace, {"hits": 0, "misses": 0, "invalidations": 0})
+            counters[field] += 1
+
+    def get_or_load(self, namespace: str, key: Any, loader: Callable[[], Any], adapter: TypeAdapter) -> Any:
+        """
+        Devuelve el valor cacheado o lo carga con `loader` y lo guarda.
+
+        Los valores None (registro inexistente) no se cachean. Si el backend falla,
+        se registra el error y se lee directamente de la base de datos.
+
+        Args:
+            namespace: Espacio de nombres (ruta) de la entrada.
+            key: Clave dentro del espacio de nombres.
+            loader: Función que lee el valor de la base de datos.
+            adapter: TypeAdapter del tipo del valor, para serializarlo y estimar su tamaño.
+
+        Returns:
+            El valor cacheado o recién cargado.
+        """
+        if not self.enabled:
+            return loader()
+
+        try:
+            version = self._version(f"{namespace}:{key}")
+            full_key = f"{namespace}:{key}@{version}"
+            cached = self.backend.get(full_key)
+        except (OSError, RedisError):
+            logger.exception("Error leyendo la caché")
+            self._count(namespace, "misses")
+            return loader()
+        if cached is not None:
+            self._count(namespace, "hits")
+            if self.backend.stores_objects:
+                return cached
+            return adapter.validate_json(cached)
+
+        self._count(namespace, "misses")
+        value = loader()
+        if value is None:
+            return value
+        payload = adapter.dump_json(value)
+        try:
+            if self.backend.stores_objects:
+                self.backend.set(full_key, value, self.ttl, len(payload))
+            else:
+                self.backend.set(full_key, payload, self.ttl, len(payload))
+        except (OSError, RedisError):
+            logger.exception("Error escribiendo en la caché")
+        return value
+
+    def _version(self, key: str) -> str:
+        # La versión dura más que los valores para no dejar huérfanos los guardados tarde
+        version = self.backend.get_or_set(f"{key}#v", secrets.token_hex(8).encode(), self.ttl * 2, 16)
+        return version.decode()
+
+    def invalidate(self, namespace: str, *keys: Any) -> None:
+        """
+        Elimina las entradas indicadas de un espacio de nombres.
+
+        Args:
+            namespace: Espacio de nombres (ruta) de las entradas.
+            keys: Claves a invalidar.
+        """
+        if not self.enabled or not keys:
+            return
+        try:
+            self.backend.delete([f"{namespace}:{key}#v" for key in keys])
+        except (OSError, RedisError):
+            logger.exception("Error invalidando la caché")
+        with self._lock:
+            counters = self._stats.setdefault(namespace, {"hits": 0, "misses": 0, "invalidations": 0})
+            counters["invalidations"] += len(keys)
+
+    def cached(self, namespace: str, value_type: Any) -> Callable:
+        """
+        Decorador para getters del CRUD con la firma `(db, clave)`.
+
+        Args:
+            namespace: Espacio de nombres (ruta) de las entradas.
+            value_type: Tipo devuelto por el getter (modelo pydantic o List[modelo]).
+
+        Returns:
+            El decorador.
+        """
+        adapter = TypeAdapter(value_type)
+
+        def decorator(func: Callable) -> Callable:
+            @functools.wraps(func)
+            def wrapper(db, *args, **kwargs):
+                key = args[0] if args else next(iter(kwargs.values()))
+                return self.get_or_load(namespace, key, lambda: func(db, *args, **kwargs), adapter)
+            return wrapper
+        return decorator
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Devuelve las métricas de la caché: aciertos, fallos y tasa de aciertos por ruta,
+        más las del backend.
+
+        Returns:
+            Diccionario con las métricas.
+        """
+        with self._lock:
+            routes = {
+                namespace: {
+                    **counters,
+                    "hit_ratio": counters["hits"] / (counters["hits"] + counters["misses"])
+                    if counters["hits"] + counters["misses"] else 0.0,
+                }
+                for namespace, counters in self._stats.items()
+            }
+        try:
+            backend = self.backend.stats()
+        except (OSError, RedisError):
+            backend = {}
+        return {"enabled": self.enabled, "ttl": self.ttl, "backend": backend, "routes": routes}
+
+
+def _create_backend():
+    if CACHE_BACKEND == "redis":
+        return RedisBackend(CACHE_REDIS_URL)
+    return MemoryBackend(max_entries=CACHE_MAX_ENTRIES, max_bytes=CACHE_MAX_BYTES)
+
+
+response_cache = ResponseCache(_create_backend(), ttl=CACHE_TTL, enabled=CACHE_ENABLED)
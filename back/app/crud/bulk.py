@@ -0,0 +1,115 @@
+# app/crud/bulk.py
+import sqlite3
+from typing import Callable, List, Optional, Sequence, Tuple
+
+from app.crud.errors import integrity_message
+from app.schemas.bulk import ResultadoItem, ResultadoLote
+
+
+def bulk_insert(
+    db: sqlite3.Connection,
+    table: str,
+    columns: Sequence[str],
+    rows: Sequence[Sequence[object]],
+    atomic: bool = True,
+    on_insert: Optional[Callable[[sqlite3.Connection, List[Tuple[int, int]]], None]] = None,
+    check: Optional[Callable[[sqlite3.Connection, Sequence[object]], Optional[str]]] = None,
+) -> ResultadoLote:
+    """
+    Inserta muchas filas en una sola transacción (un único commit/fsync).
+
+    Primero intenta un `executemany` de todo el lote. Si alguna fila viola una
+    restricción, revierte y repite fila a fila dentro de una única transacción para
+    identificar los elementos que fallan: en modo atómico se revierte todo; en modo
+    parcial se confirman las filas válidas.
+
+    Si se indica `check`, se omite el `executemany` y cada fila se valida justo
+    antes de insertarla, dentro de una transacción `BEGIN IMMEDIATE`, de modo que
+    la validación ve también las filas anteriores del lote.
+
+    Args:
+        db: Conexión a la base de datos.
+        table: Tabla destino (con clave primaria AUTOINCREMENT).
+        columns: Columnas a insertar.
+        rows: Valores de cada fila, en el orden de `columns`.
+        atomic: True para todo o nada, False para guardar las filas válidas.
+        on_insert: Función opcional que recibe `(índice, id)` de las filas insertadas y
+            se ejecuta antes del commit, en la misma transacción (por ejemplo, para
+            mantener tablas derivadas).
+        check: Función opcional que recibe cada fila antes de insertarla y devuelve
+            el motivo por el que no puede guardarse, o None si es válida.
+
+    Returns:
+        ResultadoLote: Resultado por elemento, con el ID asignado o el error.
+    """
+    sql = f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join('?' for _ in columns)})"
+
+    if check is not None:
+        db.execute("BEGIN IMMEDIATE")
+        try:
+            return _insert_rows(db, sql, rows, atomic, on_insert, check)
+        except Exception:
+            db.rollback()
+            raise
+
+    try:
+        db.executemany(sql, rows)
+        # Dentro de la transacción de escritura los IDs AUTOINCREMENT son consecutivos
+        last_id = db.execute("SELECT seq FROM sqlite_sequence WHERE name = ?", (table,)).fetchone()[0]
+        if on_insert is not None:
+            first_id = last_id - len(rows) + 1
+            on_insert(db, [(i, first_id + i) for i in range(len(rows))])
+        db.commit()
+    except sqlite3.IntegrityError:
+        db.rollback()
+    else:
+        first_id = last_id - len(rows) + 1
+        return ResultadoLote(
+            creados=len(rows),
+            fallidos=0,
+            resultados=[ResultadoItem(indice=i, ok=True, id=first_id + i) for i in range(len(rows))],
+        )
+
+    return _insert_rows(db, sql, rows, atomic, on_insert, check)
+
+
+def _insert_rows(
+    db: sqlite3.Connection,
+    sql: str,
+    rows: Sequence[Sequence[object]],
+    atomic: bool,
+    on_insert: Optional[Callable[[sqlite3.Connection, List[Tuple[int, int]]], None]],
+    check: Optional[Callable[[sqlite3.Connection, Sequence[object]], Optional[str]]],
+) -> ResultadoLote:
+    """
+    Inserta las filas una a una en la transacción en curso, anotando el resultado de cada una.
+    """
+    results: List[ResultadoItem] = []
+    failed = 0
+    for index, row in enumerate(rows):
+        error = check(db, row) if check is not None else None
+        if error is not None:
+            results.append(ResultadoItem(indice=index, ok=False, error=error))
+            failed += 1
+            continue
+        try:
+            cursor = db.execute(sql, row)
+            results.append(ResultadoItem(indice=index, ok=True, id=cursor.lastrowid))
+        except sqlite3.IntegrityError as exc:
+            # SQLite sólo revierte la sentencia fallida; la transacción sigue abierta
+            results.append(ResultadoItem(indice=index, ok=False, error=integrity_message(exc)))
+            failed += 1
+
+    if atomic and failed:
+        db.rollback()
+        for item in results:
+            if item.ok:
+                item.ok = False
+                item.id = None
+                item.error = "No se guardó porque otro elemento del lote falló"
+        return ResultadoLote(creados=0, fallidos=len(rows), resultados=results)
+
+    if on_insert is not None:
+        on_insert(db, [(item.indice, item.id) for item in results if item.ok])
+    db.commit()
+    return ResultadoLote(creados=len(rows) - failed, fallidos=failed, resultados=results)
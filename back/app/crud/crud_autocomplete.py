@@ -0,0 +1,61 @@
+# app/crud/crud_autocomplete.py
+import heapq
+import sqlite3
+from typing import List, Optional, Tuple
+
+from app.cache.autocomplete import AUTOCOMPLETE_SOURCES, autocomplete_index, normalize
+from app.schemas.autocomplete import Sugerencia
+
+AUTOCOMPLETE_TYPES = tuple(AUTOCOMPLETE_SOURCES)
+
+
+def _from_db(db: sqlite3.Connection, kind: str, prefix: str, limit: int) -> List[Tuple[str, int, str]]:
+    """
+    Busca por prefijo en la tabla cuando la entidad no está en el índice en memoria.
+
+    `LIKE` no distingue mayúsculas ASCII pero sí diacríticos, y recorre la tabla
+    entera: es sólo el camino de reserva.
+    """
+    autocomplete_index.count_fallback()
+    table, column = AUTOCOMPLETE_SOURCES[kind]
+    pattern = prefix.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+    rows = db.execute(
+        f"SELECT id, {column} FROM {table} WHERE {column} LIKE ? ESCAPE '\\' ORDER BY {column} COLLATE NOCASE LIMIT ?",
+        (pattern, limit),
+    ).fetchall()
+    return sorted((normalize(text), item_id, text) for item_id, text in rows)
+
+
+def autocomplete(
+    prefix: str, tipo: Optional[str] = None, limit: int = 10, db: Optional[sqlite3.Connection] = None
+) -> Optional[List[Sugerencia]]:
+    """
+    Sugiere usuarios (por nickname) y equipos (por nombre) que empiezan por `prefix`.
+
+    Se sirve desde `autocomplete_index`, sin tocar la base de datos. Si alguna
+    entidad no está indexada (no cabe en el presupuesto de memoria), se consulta
+    su tabla con `db`.
+
+    Args:
+        prefix: Texto tecleado (sin distinguir mayúsculas ni diacríticos).
+        tipo: Limita las sugerencias a 'usuarios' o 'equipos'.
+        limit: Número máximo de sugerencias.
+        db: Conexión para las entidades no indexadas.
+
+    Returns:
+        Las sugerencias en orden alfabético, o None si hace falta la base de datos y
+        no se ha indicado `db`.
+    """
+    tipos = (tipo,) if tipo else AUTOCOMPLETE_TYPES
+    found = []
+    for kind in tipos:
+        matches = autocomplete_index.lookup(kind, prefix, limit)
+        if matches is None:
+            if db is None:
+                return None
+            matches = _from_db(db, kind, prefix, limit)
+        found.append([(key, kind, item_id, text) for key, item_id, text in matches])
+    return [
+        Sugerencia(tipo=kind, id=item_id, texto=text)
+        for _, kind, item_id, text in heapq.merge(*found)
+    ][:limit]
@@ -0,0 +1,115 @@
+# app/crud/crud_changes.py
+import sqlite3
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from fastapi import HTTPException
+
+from app.crud.crud_export import EXPORT_COLUMNS
+from app.crud.loader import fetch_by_ids
+from app.schemas.changes import Cambio, PaginaCambios
+
+# Tablas cuyo registro de cambios se sirve (todas las que tienen triggers en `cambios`)
+CHANGE_ENTITIES = tuple(EXPORT_COLUMNS)
+
+
+def get_head(db: sqlite3.Connection) -> int:
+    """
+    Devuelve el último `seq` del registro de cambios (0 si está vacío).
+    """
+    return db.execute("SELECT COALESCE(MAX(seq), 0) FROM cambios").fetchone()[0]
+
+
+def _current_rows(db: sqlite3.Connection, entity: str, ids: List[int]) -> Dict[int, dict]:
+    rows = fetch_by_ids(db, entity, ids, columns=", ".join(EXPORT_COLUMNS[entity]))
+    return {row_id: dict(row) for row_id, row in rows.items()}
+
+
+def list_changes(
+    db: sqlite3.Connection, since: int, limit: int, entidades: Optional[Sequence[str]] = None
+) -> PaginaCambios:
+    """
+    Devuelve los cambios posteriores al cursor `since`, resumidos por fila.
+
+    De cada fila se devuelve sólo su último cambio en la página, con su estado
+    actual; una fila creada y borrada dentro de la página no aparece, y una entrada
+    'reload' sustituye a los cambios anteriores de su tabla. Como el registro se
+    compacta en segundo plano, un 'update' puede llegar sin su 'insert': los
+    clientes deben aplicar 'insert' y 'update' como altas o reemplazos.
+
+    Args:
+        db: Conexión a la base de datos.
+        since: Último `seq` ya aplicado por el cliente (0 para empezar).
+        limit: Número máximo de entradas del registro que se leen.
+        entidades: Si se indica, sólo los cambios de esas tablas.
+
+    Raises:
+        HTTPException: 410 si el cursor es anterior a las entradas conservadas
+            (el cliente debe volver a leer los datos completos). Lleva el último
+            `seq` en la cabecera `X-Changes-Head` (el cursor desde el que seguir
+            tras la relectura) y el `seq` más antiguo conservado en `X-Changes-Oldest`.
+
+    Returns:
+        La página de cambios y el cursor para continuar.
+    """
+    purged = db.execute("SELECT purgado_hasta FROM cambios_retencion").fetchone()[0]
+    if since < purged:
+        head = get_head(db)
+        # Sin entradas conservadas, la más antigua será la siguiente que se registre
+        oldest = db.execute("SELECT MIN(seq) FROM cambios").fetchone()[0] or head + 1
+        raise HTTPException(
+            status_code=410,
+            detail=(
+                f"El cursor {since} es anterior a los cambios conservados (el más antiguo es {oldest}); "
+                f"vuelva a leer los datos completos y continúe desde {head}"
+            ),
+            headers={"X-Changes-Head": str(head), "X-Changes-Oldest": str(oldest)},
+        )
+    # Se fija el final antes de leer, para que `siguiente` no salte cambios confirmados entretanto
+    head = get_head(db)
+    sql = "SELECT seq, entidad, id_entidad, op FROM cambios WHERE seq > ? AND seq <= ?"
+    params: list = [since, head]
+    if entidades:
+        sql += f" AND entidad IN ({', '.join('?' * len(entidades))})"
+        params.extend(entidades)
+    sql += " ORDER BY seq LIMIT ?"
+    params.append(limit + 1)
+    rows = db.execute(sql, params).fetchall()
+    hay_mas = len(rows) > limit
+    rows = rows[:limit]
+    siguiente = rows[-1]["seq"] if hay_mas else max(since, head)
+
+    # Último cambio de cada fila, en orden de su último `seq`, recordando la primera operación
+    latest: Dict[Tuple[str, Optional[int]], Tuple[int, str, str]] = {}
+    for seq, entity, row_id, op in rows:
+        previous = latest.pop((entity, row_id), None)
+        latest[(entity, row_id)] = (seq, previous[1] if previous else op, op)
+    reloads = {entity: seq for (entity, _), (seq, _, op) in latest.items() if op == "reload"}
+
+    changes: List[Tuple[int, str, Optional[int], str]] = []
+    pending: Dict[str, List[int]] = {}
+    for (entity, row_id), (seq, first_op, op) in latest.items():
+        if op != "reload" and seq < reloads.get(entity, 0):
+            continue
+        if first_op == "insert":
+            if op == "delete":
+                continue
+            op = "insert"
+        changes.append((seq, entity, row_id, op))
+        if op in ("insert", "update"):
+            pending.setdefault(entity, []).append(row_id)
+
+    current = {entity: _current_rows(db, entity, ids) for entity, ids in pending.items()}
+    return PaginaCambios(
+        cambios=[
+            Cambio(
+                seq=seq,
+                entidad=entity,
+                id=row_id,
+                op=op,
+                datos=current[entity].get(row_id) if entity in current else None,
+            )
+            for seq, entity, row_id, op in changes
+        ],
+        siguiente=siguiente,
+        hay_mas=hay_mas,
+    )
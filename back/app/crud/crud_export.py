@@ -0,0 +1,115 @@
+# app/crud/crud_export.py
+import csv
+import io
+import json
+import os
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+from app.db.database import connection
+
+# Filas leídas de la base de datos en cada `fetchmany`
+EXPORT_BATCH_SIZE = int(os.environ.get("EXPORT_BATCH_SIZE", "1000"))
+
+# Columnas exportables de cada tabla (nunca se exportan los hashes de contraseña
+# ni las columnas internas).
+EXPORT_COLUMNS: Dict[str, Tuple[str, ...]] = {
+    "usuarios": ("id", "nombre", "nickname", "email", "fecha_reg", "actualizado_en"),
+    "equipos": ("id", "nombre", "id_capitan", "actualizado_en"),
+    "miembros_equipo": ("id", "id_equipo", "id_usuario", "rol", "actualizado_en"),
+    "torneos": (
+        "id", "nombre", "descripcion", "fecha_inicio", "fecha_fin", "max_equipos", "inscritos",
+        "estado", "formato", "stream_url", "id_organizador", "actualizado_en",
+    ),
+    "inscripciones": ("id", "id_equipo", "id_torneo", "fecha_inscripcion", "semilla", "actualizado_en"),
+    "lista_espera": ("id", "id_equipo", "id_torneo", "fecha_alta", "actualizado_en"),
+    "pagos": ("id", "id_equipo", "id_torneo", "monto_cent", "estado", "fecha_pago", "actualizado_en"),
+    "partidos": (
+        "id", "id_torneo", "equipo_local", "equipo_visitante", "fecha", "sede",
+        "resultado_local", "resultado_visitante", "llave", "ronda", "posicion", "actualizado_en",
+    ),
+}
+
+
+def export_batches(entity: str, columns: Sequence[str], updated_since: Optional[str] = None) -> Iterator[List[tuple]]:
+    """
+    Recorre una tabla en lotes de `EXPORT_BATCH_SIZE` filas paginando por clave.
+
+    Cada lote es una consulta corta con `LIMIT` que toma una conexión del pool y la
+    devuelve antes de entregar las filas: un cliente lento no retiene conexiones ni
+    una transacción de lectura abierta (que impediría completar los checkpoints del
+    WAL). El lote siguiente continúa tras la última clave leída, así que la memoria
+    usada no depende del tamaño de la tabla. Sin filtro se recorre la tabla por
+    `id`; con `updated_since`, por `(actualizado_en, id)` sobre el índice de
+    `actualizado_en`, sin ordenar en memoria en ningún caso.
+
+    El resultado no es una instantánea: una fila modificada durante la descarga
+    puede salir con su valor nuevo o, con `updated_since`, dos veces (la siguiente
+    exportación incremental la recoge igualmente).
+
+    Args:
+        entity: Tabla a exportar (clave de `EXPORT_COLUMNS`).
+        columns: Columnas a exportar, ya validadas contra `EXPORT_COLUMNS`.
+        updated_since: Si se indica, sólo las filas modificadas desde esa fecha
+            (formato de `actualizado_en`).
+
+    Yields:
+        Listas de hasta `EXPORT_BATCH_SIZE` filas.
+    """
+    select = f"SELECT {', '.join(('actualizado_en', 'id') + tuple(columns))} FROM {entity}"
+    if updated_since is None:
+        first = (f"{select} WHERE 1 ORDER BY id LIMIT ?", ())
+    else:
+        first = (f"{select} WHERE actualizado_en >= ? ORDER BY actualizado_en, id LIMIT ?", (updated_since,))
+    # Tras la primera página se sigue desde la última clave. Con updated_since se
+    # agotan primero las filas con el mismo actualizado_en (búsqueda por
+    # `actualizado_en = ? AND id > ?` en el índice) y después las posteriores: una
+    # comparación de fila `(actualizado_en, id) > (?, ?)` sólo usaría el índice para
+    # la fecha y recorrería de nuevo todos los empates en cada página.
+    last: Optional[tuple] = None
+    while True:
+        with connection() as db:
+            cursor = db.cursor()
+            cursor.row_factory = None
+            if last is None:
+                sql, params = first
+                rows = cursor.execute(sql, params + (EXPORT_BATCH_SIZE,)).fetchall()
+            elif updated_since is None:
+                rows = cursor.execute(f"{select} WHERE id > ? ORDER BY id LIMIT ?", (last[1], EXPORT_BATCH_SIZE)).fetchall()
+            else:
+                rows = cursor.execute(
+                    f"{select} WHERE actualizado_en = ? AND id > ? ORDER BY id LIMIT ?", last + (EXPORT_BATCH_SIZE,)
+                ).fetchall()
+                if len(rows) < EXPORT_BATCH_SIZE:
+                    rows += cursor.execute(
+                        f"{select} WHERE actualizado_en > ? ORDER BY actualizado_en, id LIMIT ?",
+                        (last[0], EXPORT_BATCH_SIZE - len(rows)),
+                    ).fetchall()
+        if not rows:
+            break
+        yield [row[2:] for row in rows]
+        if len(rows) < EXPORT_BATCH_SIZE:
+            break
+        last = rows[-1][:2]
+
+
+def stream_ndjson(columns: Sequence[str], batches: Iterator[List[tuple]]) -> Iterator[str]:
+    """
+    Serializa los lotes como NDJSON: un objeto JSON por línea.
+    """
+    for rows in batches:
+        yield "".join(json.dumps(dict(zip(columns, row)), ensure_ascii=False) + "\n" for row in rows)
+
+
+def stream_csv(columns: Sequence[str], batches: Iterator[List[tuple]]) -> Iterator[str]:
+    """
+    Serializa los lotes como CSV, con una fila de cabecera.
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+    yield buffer.getvalue()
+    for rows in batches:
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerows(rows)
+        yield buffer.getvalue()
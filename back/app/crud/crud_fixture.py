@@ -0,0 +1,153 @@
+# app/crud/crud_fixture.py
+import sqlite3
+from typing import Optional
+
+from fastapi import HTTPException
+
+from app.crud import crud_tournament
+from app.crud.errors import integrity_error
+from app.schemas.fixture import ResultadoFixture
+from app.schemas.tournament import MAX_EQUIPOS
+from app.services import fixtures
+from app.services.ratings import RATING_INICIAL
+
+
+def _check_size(teams: int, formato: str) -> None:
+    if teams > MAX_EQUIPOS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"El formato '{formato}' admite como máximo {MAX_EQUIPOS} equipos ({teams} inscritos); use el formato suizo",
+        )
+
+
+def assign_seeds(db: sqlite3.Connection, tournament_id: int) -> None:
+    """
+    Fija las semillas de los equipos inscritos en un torneo: por rating Elo
+    descendente y, a igualdad (o sin rating), por orden de inscripción. No hace commit.
+
+    Args:
+        db: Conexión a la base de datos.
+        tournament_id: ID del torneo.
+    """
+    db.execute(
+        """
+        UPDATE inscripciones SET semilla = orden.semilla
+        FROM (
+            SELECT i.id, ROW_NUMBER() OVER (
+                ORDER BY COALESCE(r.rating, ?) DESC, i.fecha_inscripcion, i.id
+            ) AS semilla
+            FROM inscripciones i LEFT JOIN ratings r ON r.id_equipo = i.id_equipo
+            WHERE i.id_torneo = ?
+        ) AS orden
+        WHERE inscripciones.id = orden.id
+        """,
+        (RATING_INICIAL, tournament_id),
+    )
+
+
+def generate_fixtures(db: sqlite3.Connection, tournament_id: int, formato: str, ida_y_vuelta: bool = False) -> Optional[ResultadoFixture]:
+    """
+    Genera los partidos de un torneo a partir de sus inscripciones.
+
+    Todo se hace en una única transacción de escritura (`BEGIN IMMEDIATE`): la
+    lectura del estado del cuadro, la inserción de los partidos con `executemany`
+    y el registro del formato, de modo que dos llamadas simultáneas no pueden
+    generar los mismos cruces. Las jornadas se reparten entre `fecha_inicio` y
+    `fecha_fin` del torneo.
+
+    En liga se generan todas las jornadas de una vez. En eliminación, la primera
+    llamada fija las semillas (ver `assign_seeds`) y cada llamada crea los
+    cruces cuyos dos equipos ya se conocen.
+
+    Args:
+        db: Conexión a la base de datos.
+        tournament_id: ID del torneo.
+        formato: 'liga', 'eliminacion' o 'doble_eliminacion'.
+        ida_y_vuelta: En liga, añade la segunda vuelta.
+
+    Raises:
+        HTTPException: 400 si hay menos de dos equipos inscritos o más de
+            `MAX_EQUIPOS`, o las fechas del torneo no son válidas; 409 si el torneo ya tiene otro formato o su liga
+            ya fue generada.
+
+    Returns:
+        El resultado de la generación, o None si el torneo no existe.
+    """
+    db.execute("BEGIN IMMEDIATE")
+    try:
+        tournament = db.execute(
+            "SELECT fecha_inicio, fecha_fin, formato FROM torneos WHERE id = ?", (tournament_id,)
+        ).fetchone()
+        if tournament is None:
+            db.rollback()
+            return None
+        if tournament["formato"] is not None and tournament["formato"] != formato:
+            raise HTTPException(status_code=409, detail=f"El torneo ya tiene un calendario de formato '{tournament['formato']}'")
+
+        campeon = None
+        if formato == "liga":
+            if tournament["formato"] is not None:
+                raise HTTPException(status_code=409, detail="El calendario de liga ya fue generado")
+            teams = [
+                row[0] for row in db.execute(
+                    "SELECT id_equipo FROM inscripciones WHERE id_torneo = ? ORDER BY fecha_inscripcion, id",
+                    (tournament_id,),
+                )
+            ]
+            if len(teams) < 2:
+                raise HTTPException(status_code=400, detail="El torneo necesita al menos dos equipos inscritos")
+            _check_size(len(teams), formato)
+            nuevos = fixtures.round_robin(teams, ida_y_vuelta=ida_y_vuelta)
+            jornadas = fixtures.round_robin_jornadas(len(teams), ida_y_vuelta=ida_y_vuelta)
+        else:
+            if tournament["formato"] is None:
+                # Las semillas se fijan una sola vez
+                assign_seeds(db, tournament_id)
+            seeds = {
+                row["semilla"]: row["id_equipo"] for row in db.execute(
+                    "SELECT semilla, id_equipo FROM inscripciones WHERE id_torneo = ? AND semilla IS NOT NULL",
+                    (tournament_id,),
+                )
+            }
+            if len(seeds) < 2:
+                raise HTTPException(status_code=400, detail="El torneo necesita al menos dos equipos inscritos")
+            _check_size(len(seeds), formato)
+            existing = {
+                (row["llave"], row["ronda"], row["posicion"]): (
+                    row["equipo_local"], row["equipo_visitante"], row["resultado_local"], row["resultado_visitante"]
+                )
+                for row in db.execute(
+                    "SELECT llave, ronda, posicion, equipo_local, equipo_visitante, resultado_local, resultado_visitante "
+                    "FROM partidos WHERE id_torneo = ? AND llave IS NOT NULL",
+                    (tournament_id,),
+                )
+            }
+            doble = formato == "doble_eliminacion"
+            nuevos, campeon = fixtures.elimination(seeds, existing, doble=doble)
+            jornadas = fixtures.elimination_jornadas(fixtures.bracket_size(max(seeds)), doble)
+
+        try:
+            fechas = fixtures.spread_dates(tournament["fecha_inicio"], tournament["fecha_fin"], jornadas)
+        except ValueError as exc:
+            raise HTTPException(status_code=400, detail=f"Fechas del torneo inválidas: {exc}")
+
+        db.executemany(
+            "INSERT INTO partidos (id_torneo, equipo_local, equipo_visitante, fecha, llave, ronda, posicion) VALUES (?, ?, ?, ?, ?, ?, ?)",
+            [
+                (tournament_id, m.local, m.visitante, fechas[m.jornada], m.llave, m.ronda, m.posicion)
+                for m in nuevos
+            ],
+        )
+        if tournament["formato"] is None:
+            db.execute("UPDATE torneos SET formato = ? WHERE id = ?", (formato, tournament_id))
+        db.commit()
+    except sqlite3.IntegrityError as exc:
+        db.rollback()
+        raise integrity_error(exc)
+    except Exception:
+        db.rollback()
+        raise
+
+    if tournament["formato"] is None:
+        crud_tournament.invalidate_cache(tournament_id)
+    return ResultadoFixture(formato=formato, creados=len(nuevos), jornadas=jornadas, campeon=campeon)
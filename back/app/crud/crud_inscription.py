@@ -1,31 +1,107 @@
 # app/crud/crud_inscription.py
 import sqlite3
-from typing import List, Optional
+from typing import List, Optional, Union
 
-from app.schemas.inscription import Inscripcion, InscripcionCreate
+from fastapi import HTTPException
 
+from app.crud import crud_tournament
+from app.crud.bulk import bulk_insert
+from app.crud.errors import UNIQUE_MESSAGES, integrity_error
+from app.schemas.bulk import ResultadoLote
+from app.schemas.inscription import EntradaEspera, Inscripcion, InscripcionCreate
 
-def create_inscription(db: sqlite3.Connection, inscription: InscripcionCreate) -> Optional[Inscripcion]:
+
+def create_inscription(db: sqlite3.Connection, inscription: InscripcionCreate) -> Union[Inscripcion, EntradaEspera]:
     """
-    Crea una nueva inscripción para un equipo en un torneo.
+    Inscribe un equipo en un torneo o, si el torneo está completo, lo añade a su lista de espera.
+
+    El cupo lo controla la base de datos: el contador `torneos.inscritos` lo mantienen
+    los triggers de `inscripciones` en la misma transacción, y la inserción se aborta
+    si el torneo ya está lleno, sin necesidad de contar las inscripciones. La
+    transacción se abre con `BEGIN IMMEDIATE`, así que las peticiones simultáneas se
+    serializan y nunca se supera `max_equipos`.
 
     Args:
         db: Conexión a la base de datos.
         inscription: Datos de la inscripción a crear.
 
+    Raises:
+        HTTPException: 400 si el equipo ya está inscrito o en la lista de espera, o las referencias no existen.
+
     Returns:
-        La inscripción creada o None si ya existe.
+        La inscripción creada o, si el torneo está completo, la entrada en la lista de espera.
     """
+    db.execute("BEGIN IMMEDIATE")
     try:
-        cursor = db.execute(
-            "INSERT INTO inscripciones (id_equipo, id_torneo) VALUES (?, ?)",
-            (inscription.id_equipo, inscription.id_torneo),
-        )
+        try:
+            row = db.execute(
+                "INSERT INTO inscripciones (id_equipo, id_torneo) VALUES (?, ?) RETURNING *",
+                (inscription.id_equipo, inscription.id_torneo),
+            ).fetchone()
+        except sqlite3.IntegrityError as exc:
+            if str(exc) != "torneo_completo":
+                raise
+            if db.execute(
+                "SELECT 1 FROM inscripciones WHERE id_equipo = ? AND id_torneo = ?",
+                (inscription.id_equipo, inscription.id_torneo),
+            ).fetchone():
+                raise HTTPException(status_code=400, detail=UNIQUE_MESSAGES["inscripciones.id_equipo, inscripciones.id_torneo"])
+            entry = db.execute(
+                "INSERT INTO lista_espera (id_equipo, id_torneo) VALUES (?, ?) RETURNING *",
+                (inscription.id_equipo, inscription.id_torneo),
+            ).fetchone()
+            posicion = _waitlist_position(db, entry["id_torneo"], entry["id"])
+            db.commit()
+            return EntradaEspera(**entry, posicion=posicion)
         db.commit()
-        inscription_id = cursor.lastrowid
-        return get_inscription(db, inscription_id)
-    except sqlite3.IntegrityError:
-        return None
+    except sqlite3.IntegrityError as exc:
+        db.rollback()
+        raise integrity_error(exc)
+    except Exception:
+        db.rollback()
+        raise
+    crud_tournament.invalidate_cache(inscription.id_torneo)
+    return Inscripcion(**row)
+
+def _waitlist_position(db: sqlite3.Connection, tournament_id: int, entry_id: int) -> int:
+    """
+    Posición de una entrada en la lista de espera de su torneo (1 = la primera).
+    """
+    return db.execute(
+        "SELECT COUNT(*) FROM lista_espera WHERE id_torneo = ? AND id <= ?", (tournament_id, entry_id)
+    ).fetchone()[0]
+
+def get_waitlist(db: sqlite3.Connection, tournament_id: int) -> List[EntradaEspera]:
+    """
+    Obtiene la lista de espera de un torneo, por orden de llegada.
+
+    Args:
+        db: Conexión a la base de datos.
+        tournament_id: ID del torneo.
+
+    Returns:
+        Las entradas de la lista de espera con su posición.
+    """
+    rows = db.execute(
+        "SELECT *, ROW_NUMBER() OVER (ORDER BY id) AS posicion FROM lista_espera WHERE id_torneo = ? ORDER BY id",
+        (tournament_id,),
+    ).fetchall()
+    return [EntradaEspera(**row) for row in rows]
+
+def delete_waitlist_entry(db: sqlite3.Connection, entry_id: int) -> bool:
+    """
+    Retira un equipo de la lista de espera.
+
+    Args:
+        db: Conexión a la base de datos.
+        entry_id: ID de la entrada a eliminar.
+
+    Returns:
+        True si la entrada fue eliminada, False en caso contrario.
+    """
+    cursor = db.execute("DELETE FROM lista_espera WHERE id = ?", (entry_id,))
+    db.commit()
+    return cursor.rowcount > 0
 
 def get_inscription(db: sqlite3.Connection, inscription_id: int) -> Optional[Inscripcion]:
     """
@@ -43,7 +119,7 @@ def get_inscription(db: sqlite3.Connection, inscription_id: int) -> Optional[Ins
         return Inscripcion(**row)
     return None
 
-def get_inscriptions(db: sqlite3.Connection, skip: int = 0, limit: int = 100) -> List[Inscripcion]:
+def get_inscriptions(db: sqlite3.Connection, skip: int = 0, limit: int = 100, after_id: Optional[int] = None) -> List[Inscripcion]:
     """
     Obtiene una lista de todas las inscripciones.
 
@@ -51,17 +127,24 @@ def get_inscriptions(db: sqlite3.Connection, skip: int = 0, limit: int = 100) ->
         db: Conexión a la base de datos.
         skip: Número de inscripciones a omitir.
         limit: Número máximo de inscripciones a devolver.
+        after_id: ID del último registro de la página anterior (paginación por cursor); si se indica, se ignora `skip`.
 
     Returns:
         Una lista de inscripciones.
     """
-    rows = db.execute("SELECT * FROM inscripciones LIMIT ? OFFSET ?", (limit, skip)).fetchall()
+    if after_id is not None:
+        rows = db.execute("SELECT * FROM inscripciones WHERE id > ? ORDER BY id LIMIT ?", (after_id, limit)).fetchall()
+    else:
+        rows = db.execute("SELECT * FROM inscripciones ORDER BY id LIMIT ? OFFSET ?", (limit, skip)).fetchall()
     return [Inscripcion(**row) for row in rows]
 
 def delete_inscription(db: sqlite3.Connection, inscription_id: int) -> bool:
     """
     Elimina una inscripción de la base de datos.
 
+    La plaza liberada pasa, en la misma transacción, al primer equipo de la lista de
+    espera del torneo (trigger `trg_inscripciones_inscritos_del`).
+
     Args:
         db: Conexión a la base de datos.
         inscription_id: ID de la inscripción a eliminar.
@@ -69,7 +152,30 @@ def delete_inscription(db: sqlite3.Connection, inscription_id: int) -> bool:
     Returns:
         True si la inscripción fue eliminada, False en caso contrario.
     """
-    cursor = db.execute("DELETE FROM inscripciones WHERE id = ?", (inscription_id,))
+    row = db.execute("DELETE FROM inscripciones WHERE id = ? RETURNING id_torneo", (inscription_id,)).fetchone()
     db.commit()
-    return cursor.rowcount > 0
+    if row is None:
+        return False
+    crud_tournament.invalidate_cache(row["id_torneo"])
+    return True
 
+def create_inscriptions_bulk(db: sqlite3.Connection, inscriptions: List[InscripcionCreate], atomic: bool = True) -> ResultadoLote:
+    """
+    Crea muchas inscripciones en una sola transacción.
+
+    Las inscripciones que superan el cupo de su torneo fallan con "El torneo está
+    completo" (no pasan a la lista de espera).
+
+    Args:
+        db: Conexión a la base de datos.
+        inscriptions: Inscripciones a crear.
+        atomic: True para todo o nada, False para guardar las válidas.
+
+    Returns:
+        Resultado de cada inscripción (ID asignado o error).
+    """
+    rows = [(inscription.id_equipo, inscription.id_torneo) for inscription in inscriptions]
+    result = bulk_insert(db, "inscripciones", ("id_equipo", "id_torneo"), rows, atomic=atomic)
+    for tournament_id in {inscription.id_torneo for inscription in inscriptions}:
+        crud_tournament.invalidate_cache(tournament_id)
+    return result
@@ -1,24 +1,143 @@
 # app/crud/crud_match.py
 import sqlite3
-from typing import List, Optional
+from typing import List, Optional, Tuple
 
+from fastapi import HTTPException
+
+from app.crud import crud_rating, crud_standings
+from app.crud.bulk import bulk_insert
+from app.crud.errors import integrity_error
+from app.live.broker import live_broker
+from app.schemas.bulk import ResultadoLote
 from app.schemas.match import Partido, PartidoCreate
+from app.services.scheduler import DESCANSO_MINIMO_MIN, DURACION_PARTIDO_MIN, IntervalIndex, to_timestamp
+
+# Partido que choca con [inicio, fin) en la columna indicada. Con los índices
+# (columna, inicio) son dos búsquedas O(log n): los partidos que empiezan dentro
+# del intervalo ampliado con el margen y el inmediatamente anterior, el único que
+# puede seguir en juego si los partidos de esa clave no se solapan entre sí.
+_CONFLICT_SQL = """
+    SELECT id FROM partidos WHERE {col} = :clave AND inicio >= :inicio AND inicio < :hasta
+    UNION ALL
+    SELECT id FROM (
+        SELECT id, fin FROM partidos WHERE {col} = :clave AND inicio < :inicio ORDER BY inicio DESC LIMIT 1
+    ) WHERE fin > :desde
+    LIMIT 1
+"""
+
+
+def find_conflict(db: sqlite3.Connection, equipos: Tuple[int, ...], sede: Optional[str], inicio: int, fin: int, descanso: int = 0) -> Optional[int]:
+    """
+    Busca un partido programado que impida jugar en `[inicio, fin)`.
+
+    Un equipo no puede tener otro partido a menos de `descanso` segundos, y una sede
+    no puede tener dos partidos a la vez.
+
+    Args:
+        db: Conexión a la base de datos.
+        equipos: IDs de los equipos del partido.
+        sede: Sede del partido (None para no comprobarla).
+        inicio: Inicio del partido (segundos UTC).
+        fin: Fin del partido (segundos UTC).
+        descanso: Descanso mínimo entre partidos de un mismo equipo (segundos).
+
+    Returns:
+        El ID del partido en conflicto, o None si no hay ninguno.
+    """
+    checks = [(col, equipo, descanso) for equipo in equipos for col in ("equipo_local", "equipo_visitante")]
+    if sede is not None:
+        checks.append(("sede", sede, 0))
+    for col, clave, margen in checks:
+        row = db.execute(
+            _CONFLICT_SQL.format(col=col),
+            {"clave": clave, "inicio": inicio, "hasta": fin + margen, "desde": inicio - margen},
+        ).fetchone()
+        if row is not None:
+            return row[0]
+    return None
 
 
-def create_match(db: sqlite3.Connection, match: PartidoCreate) -> Optional[Partido]:
+def find_overlaps(db: sqlite3.Connection) -> List[int]:
+    """
+    Busca en toda la tabla los partidos programados cuyo horario choca con otro
+    anterior del mismo equipo (a menos de `DESCANSO_MINIMO_MIN` minutos) o de la
+    misma sede.
+
+    Es la comprobación de `find_conflict` para horarios que no pasaron por ella
+    (rellenados desde `fecha` o cargados en bloque): los partidos se recorren por
+    orden de inicio y cada uno se compara con los ya aceptados.
+
+    Args:
+        db: Conexión a la base de datos.
+
+    Returns:
+        Los IDs de los partidos que chocan con uno anterior, en orden de inicio.
+    """
+    descanso = DESCANSO_MINIMO_MIN * 60
+    equipos = IntervalIndex()
+    sedes = IntervalIndex()
+    overlapping = []
+    for match_id, local, visitante, sede, inicio, fin in db.execute(
+        "SELECT id, equipo_local, equipo_visitante, sede, inicio, fin FROM partidos "
+        "WHERE inicio IS NOT NULL ORDER BY inicio, id"
+    ).fetchall():
+        if (
+            equipos.conflicts(local, inicio, fin, descanso)
+            or equipos.conflicts(visitante, inicio, fin, descanso)
+            or (sede is not None and sedes.conflicts(sede, inicio, fin))
+        ):
+            overlapping.append(match_id)
+            continue
+        equipos.add(local, inicio, fin)
+        equipos.add(visitante, inicio, fin)
+        if sede is not None:
+            sedes.add(sede, inicio, fin)
+    return overlapping
+
+
+def _apply_result_change(db: sqlite3.Connection, match_id: int, tournament_id: int, local: int, visitante: int, old: Tuple[Optional[int], Optional[int]], new: Tuple[Optional[int], Optional[int]], inserted: bool = False) -> None:
+    """
+    Mantiene las tablas derivadas de los resultados (clasificación y ratings) dentro
+    de la transacción en curso. Con `inserted` el partido es nuevo y no hay rating
+    anterior que deshacer.
+    """
+    crud_standings.apply_result_change(db, tournament_id, local, visitante, old, new)
+    crud_rating.apply_result_change(db, match_id, local, visitante, new, counted=not inserted)
+
+
+
+def create_match(db: sqlite3.Connection, match: PartidoCreate) -> Partido:
     """
     Crea un nuevo partido en la base de datos.
 
+    Si la fecha es ISO 8601, el partido queda programado de `fecha` a `fecha` más
+    `DURACION_PARTIDO_MIN` minutos, y antes de insertarlo se comprueba (ver
+    `find_conflict`) que ninguno de sus equipos juega a menos de `DESCANSO_MINIMO_MIN`
+    minutos y que la sede está libre. La comprobación y la inserción van en la misma
+    transacción `BEGIN IMMEDIATE`.
+
     Args:
         db: Conexión a la base de datos.
         match: Datos del partido a crear.
 
+    Raises:
+        HTTPException: 400 si ocurre un error de integridad; 409 si el horario choca con otro partido.
+
     Returns:
-        El partido creado o None si ocurre un error de integridad.
+        El partido creado.
     """
+    inicio = to_timestamp(match.fecha)
+    fin = inicio + DURACION_PARTIDO_MIN * 60 if inicio is not None else None
+    db.execute("BEGIN IMMEDIATE")
     try:
-        cursor = db.execute(
-            "INSERT INTO partidos (id_torneo, equipo_local, equipo_visitante, fecha, resultado_local, resultado_visitante) VALUES (?, ?, ?, ?, ?, ?)",
+        if inicio is not None:
+            conflict = find_conflict(
+                db, (match.equipo_local, match.equipo_visitante), match.sede, inicio, fin, DESCANSO_MINIMO_MIN * 60
+            )
+            if conflict is not None:
+                raise HTTPException(status_code=409, detail=f"El horario choca con el partido {conflict}")
+        row = db.execute(
+            "INSERT INTO partidos (id_torneo, equipo_local, equipo_visitante, fecha, resultado_local, resultado_visitante, sede, inicio, fin) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?) RETURNING *",
             (
                 match.id_torneo,
                 match.equipo_local,
@@ -26,13 +145,24 @@ def create_match(db: sqlite3.Connection, match: PartidoCreate) -> Optional[Parti
                 match.fecha,
                 match.resultado_local,
                 match.resultado_visitante,
+                match.sede,
+                inicio,
+                fin,
             ),
-        )
+        ).fetchone()
+        if row["resultado_local"] is not None and row["resultado_visitante"] is not None:
+            _apply_result_change(
+                db, row["id"], row["id_torneo"], row["equipo_local"], row["equipo_visitante"],
+                (None, None), (row["resultado_local"], row["resultado_visitante"]), inserted=True,
+            )
         db.commit()
-        match_id = cursor.lastrowid
-        return get_match(db, match_id)
-    except sqlite3.IntegrityError:
-        return None
+    except sqlite3.IntegrityError as exc:
+        db.rollback()
+        raise integrity_error(exc)
+    except Exception:
+        db.rollback()
+        raise
+    return Partido(**row)
 
 def get_match(db: sqlite3.Connection, match_id: int) -> Optional[Partido]:
     """
@@ -50,7 +180,7 @@ def get_match(db: sqlite3.Connection, match_id: int) -> Optional[Partido]:
         return Partido(**row)
     return None
 
-def get_matches(db: sqlite3.Connection, skip: int = 0, limit: int = 100) -> List[Partido]:
+def get_matches(db: sqlite3.Connection, skip: int = 0, limit: int = 100, after_id: Optional[int] = None) -> List[Partido]:
     """
     Obtiene una lista de todos los partidos.
 
@@ -58,16 +188,25 @@ def get_matches(db: sqlite3.Connection, skip: int = 0, limit: int = 100) -> List
         db: Conexión a la base de datos.
         skip: Número de partidos a omitir.
         limit: Número máximo de partidos a devolver.
+        after_id: ID del último registro de la página anterior (paginación por cursor); si se indica, se ignora `skip`.
 
     Returns:
         Una lista de partidos.
     """
-    rows = db.execute("SELECT * FROM partidos LIMIT ? OFFSET ?", (limit, skip)).fetchall()
+    if after_id is not None:
+        rows = db.execute("SELECT * FROM partidos WHERE id > ? ORDER BY id LIMIT ?", (after_id, limit)).fetchall()
+    else:
+        rows = db.execute("SELECT * FROM partidos ORDER BY id LIMIT ? OFFSET ?", (limit, skip)).fetchall()
     return [Partido(**row) for row in rows]
 
 def update_match_result(db: sqlite3.Connection, match_id: int, resultado_local: int, resultado_visitante: int) -> Optional[Partido]:
     """
-    Actualiza el resultado de un partido.
+    Actualiza el resultado de un partido y, en la misma transacción, la clasificación.
+
+    La transacción se abre con `BEGIN IMMEDIATE` para que el resultado anterior
+    leído no pueda cambiar antes de aplicar la diferencia a la clasificación.
+    Tras el commit, si alguien sigue el torneo en vivo, publica el evento
+    `resultado` con el partido y la clasificación de sus dos equipos.
 
     Args:
         db: Conexión a la base de datos.
@@ -78,14 +217,34 @@ def update_match_result(db: sqlite3.Connection, match_id: int, resultado_local:
     Returns:
         El partido actualizado o None si el partido no fue encontrado.
     """
-    cursor = db.execute(
-        "UPDATE partidos SET resultado_local = ?, resultado_visitante = ? WHERE id = ?",
-        (resultado_local, resultado_visitante, match_id),
-    )
-    db.commit()
-    if cursor.rowcount > 0:
-        return get_match(db, match_id)
-    return None
+    db.execute("BEGIN IMMEDIATE")
+    try:
+        old = db.execute(
+            "SELECT resultado_local, resultado_visitante FROM partidos WHERE id = ?", (match_id,)
+        ).fetchone()
+        if old is None:
+            db.rollback()
+            return None
+        row = db.execute(
+            "UPDATE partidos SET resultado_local = ?, resultado_visitante = ? WHERE id = ? RETURNING *",
+            (resultado_local, resultado_visitante, match_id),
+        ).fetchone()
+        _apply_result_change(
+            db, match_id, row["id_torneo"], row["equipo_local"], row["equipo_visitante"],
+            (old["resultado_local"], old["resultado_visitante"]), (resultado_local, resultado_visitante),
+        )
+        db.commit()
+    except sqlite3.IntegrityError as exc:
+        db.rollback()
+        raise integrity_error(exc)
+    partido = Partido(**row)
+    if live_broker.has_subscribers(partido.id_torneo):
+        standings = crud_standings.get_team_standings(db, partido.id_torneo, (partido.equipo_local, partido.equipo_visitante))
+        live_broker.publish(partido.id_torneo, "resultado", {
+            "partido": partido.model_dump(),
+            "clasificacion": [fila.model_dump() for fila in standings],
+        })
+    return partido
 
 def delete_match(db: sqlite3.Connection, match_id: int) -> bool:
     """
@@ -98,7 +257,65 @@ def delete_match(db: sqlite3.Connection, match_id: int) -> bool:
     Returns:
         True si el partido fue eliminado, False en caso contrario.
     """
-    cursor = db.execute("DELETE FROM partidos WHERE id = ?", (match_id,))
+    row = db.execute("DELETE FROM partidos WHERE id = ? RETURNING *", (match_id,)).fetchone()
+    if row is None:
+        db.commit()
+        return False
+    _apply_result_change(
+        db, match_id, row["id_torneo"], row["equipo_local"], row["equipo_visitante"],
+        (row["resultado_local"], row["resultado_visitante"]), (None, None),
+    )
     db.commit()
-    return cursor.rowcount > 0
+    return True
+
+def create_matches_bulk(db: sqlite3.Connection, matches: List[PartidoCreate], atomic: bool = True) -> ResultadoLote:
+    """
+    Crea muchos partidos en una sola transacción.
+
+    Igual que en `create_match`, los partidos con fecha ISO 8601 quedan programados
+    y cada uno se comprueba con `find_conflict` antes de insertarlo, contra los
+    partidos ya guardados y los anteriores del lote; los que chocan fallan con el
+    motivo del conflicto.
+
+    Args:
+        db: Conexión a la base de datos.
+        matches: Partidos a crear.
+        atomic: True para todo o nada, False para guardar los válidos.
+
+    Returns:
+        Resultado de cada partido (ID asignado o error).
+    """
+    rows = []
+    for match in matches:
+        inicio = to_timestamp(match.fecha)
+        rows.append((
+            match.id_torneo,
+            match.equipo_local,
+            match.equipo_visitante,
+            match.fecha,
+            match.resultado_local,
+            match.resultado_visitante,
+            match.sede,
+            inicio,
+            inicio + DURACION_PARTIDO_MIN * 60 if inicio is not None else None,
+        ))
+    columns = ("id_torneo", "equipo_local", "equipo_visitante", "fecha", "resultado_local", "resultado_visitante", "sede", "inicio", "fin")
+
+    def check_schedule(db: sqlite3.Connection, row: Tuple) -> Optional[str]:
+        _, local, visitante, _, _, _, sede, inicio, fin = row
+        if inicio is None:
+            return None
+        conflict = find_conflict(db, (local, visitante), sede, inicio, fin, DESCANSO_MINIMO_MIN * 60)
+        return f"El horario choca con el partido {conflict}" if conflict is not None else None
+
+    def update_derived(db: sqlite3.Connection, inserted: List[Tuple[int, int]]) -> None:
+        for index, match_id in inserted:
+            match = matches[index]
+            if match.resultado_local is None or match.resultado_visitante is None:
+                continue
+            _apply_result_change(
+                db, match_id, match.id_torneo, match.equipo_local, match.equipo_visitante,
+                (None, None), (match.resultado_local, match.resultado_visitante), inserted=True,
+            )
 
+    return bulk_insert(db, "partidos", columns, rows, atomic=atomic, on_insert=update_derived, check=check_schedule)
@@ -2,36 +2,38 @@
 import sqlite3
 from typing import List, Optional
 
+from app.crud.errors import integrity_error
 from app.schemas.member import Miembro, MiembroCreate
 
 
-def add_member(db: sqlite3.Connection, member: MiembroCreate) -> Optional[Miembro]:
+def add_member(db: sqlite3.Connection, member: MiembroCreate) -> Miembro:
     """
     Añade un nuevo miembro a un equipo.
 
+    Que un usuario pertenezca a un solo equipo lo garantiza el índice único
+    `idx_miembros_usuario`, por lo que no hace falta consultarlo antes de insertar.
+
     Args:
         db: Conexión a la base de datos.
         member: Datos del miembro a añadir.
 
+    Raises:
+        HTTPException: 400 si el usuario ya es miembro de un equipo, el equipo ya
+            tiene capitán o las referencias no existen.
+
     Returns:
-        El miembro añadido o None si el usuario ya es miembro de un equipo.
+        El miembro añadido.
     """
-    # Check if the user is already a member of another team
-    user_id = member.id_usuario
-    existing_member = db.execute("SELECT * FROM miembros_equipo WHERE id_usuario = ?", (user_id,)).fetchone()
-    if existing_member:
-        return None  # Indicate that the user is already in a team
-
     try:
-        cursor = db.execute(
-            "INSERT INTO miembros_equipo (id_equipo, id_usuario, rol) VALUES (?, ?, ?)",
+        row = db.execute(
+            "INSERT INTO miembros_equipo (id_equipo, id_usuario, rol) VALUES (?, ?, ?) RETURNING *",
             (member.id_equipo, member.id_usuario, member.rol),
-        )
+        ).fetchone()
         db.commit()
-        member_id = cursor.lastrowid
-        return get_member(db, member_id)
-    except sqlite3.IntegrityError:
-        return None
+    except sqlite3.IntegrityError as exc:
+        db.rollback()
+        raise integrity_error(exc)
+    return Miembro(**row)
 
 def get_member(db: sqlite3.Connection, member_id: int) -> Optional[Miembro]:
     """
@@ -49,7 +51,7 @@ def get_member(db: sqlite3.Connection, member_id: int) -> Optional[Miembro]:
         return Miembro(**row)
     return None
 
-def get_members(db: sqlite3.Connection, skip: int = 0, limit: int = 100) -> List[Miembro]:
+def get_members(db: sqlite3.Connection, skip: int = 0, limit: int = 100, after_id: Optional[int] = None) -> List[Miembro]:
     """
     Obtiene una lista de todos los miembros de equipos.
 
@@ -57,11 +59,15 @@ def get_members(db: sqlite3.Connection, skip: int = 0, limit: int = 100) -> List
         db: Conexión a la base de datos.
         skip: Número de miembros a omitir.
         limit: Número máximo de miembros a devolver.
+        after_id: ID del último registro de la página anterior (paginación por cursor); si se indica, se ignora `skip`.
 
     Returns:
         Una lista de miembros.
     """
-    rows = db.execute("SELECT * FROM miembros_equipo LIMIT ? OFFSET ?", (limit, skip)).fetchall()
+    if after_id is not None:
+        rows = db.execute("SELECT * FROM miembros_equipo WHERE id > ? ORDER BY id LIMIT ?", (after_id, limit)).fetchall()
+    else:
+        rows = db.execute("SELECT * FROM miembros_equipo ORDER BY id LIMIT ? OFFSET ?", (limit, skip)).fetchall()
     return [Miembro(**row) for row in rows]
 
 def delete_member(db: sqlite3.Connection, member_id: int) -> bool:
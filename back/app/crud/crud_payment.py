@@ -2,10 +2,13 @@
 import sqlite3
 from typing import List, Optional
 
+from app.crud.bulk import bulk_insert
+from app.crud.errors import integrity_error
+from app.schemas.bulk import ResultadoLote
 from app.schemas.payment import Pago, PagoCreate
 
 
-def create_payment(db: sqlite3.Connection, payment: PagoCreate) -> Optional[Pago]:
+def create_payment(db: sqlite3.Connection, payment: PagoCreate) -> Pago:
     """
     Registra un nuevo pago en la base de datos.
 
@@ -13,19 +16,22 @@ def create_payment(db: sqlite3.Connection, payment: PagoCreate) -> Optional[Pago
         db: Conexión a la base de datos.
         payment: Datos del pago a registrar.
 
+    Raises:
+        HTTPException: 400 si ocurre un error de integridad.
+
     Returns:
-        El pago registrado o None si ocurre un error de integridad.
+        El pago registrado.
     """
     try:
-        cursor = db.execute(
-            "INSERT INTO pagos (id_equipo, id_torneo, monto_cent, estado) VALUES (?, ?, ?, ?)",
+        row = db.execute(
+            "INSERT INTO pagos (id_equipo, id_torneo, monto_cent, estado) VALUES (?, ?, ?, ?) RETURNING *",
             (payment.id_equipo, payment.id_torneo, payment.monto_cent, payment.estado),
-        )
+        ).fetchone()
         db.commit()
-        payment_id = cursor.lastrowid
-        return get_payment(db, payment_id)
-    except sqlite3.IntegrityError:
-        return None
+    except sqlite3.IntegrityError as exc:
+        db.rollback()
+        raise integrity_error(exc)
+    return Pago(**row)
 
 def get_payment(db: sqlite3.Connection, payment_id: int) -> Optional[Pago]:
     """
@@ -43,7 +49,7 @@ def get_payment(db: sqlite3.Connection, payment_id: int) -> Optional[Pago]:
         return Pago(**row)
     return None
 
-def get_payments(db: sqlite3.Connection, skip: int = 0, limit: int = 100) -> List[Pago]:
+def get_payments(db: sqlite3.Connection, skip: int = 0, limit: int = 100, after_id: Optional[int] = None) -> List[Pago]:
     """
     Obtiene una lista de todos los pagos.
 
@@ -51,11 +57,15 @@ def get_payments(db: sqlite3.Connection, skip: int = 0, limit: int = 100) -> Lis
         db: Conexión a la base de datos.
         skip: Número de pagos a omitir.
         limit: Número máximo de pagos a devolver.
+        after_id: ID del último registro de la página anterior (paginación por cursor); si se indica, se ignora `skip`.
 
     Returns:
         Una lista de pagos.
     """
-    rows = db.execute("SELECT * FROM pagos LIMIT ? OFFSET ?", (limit, skip)).fetchall()
+    if after_id is not None:
+        rows = db.execute("SELECT * FROM pagos WHERE id > ? ORDER BY id LIMIT ?", (after_id, limit)).fetchall()
+    else:
+        rows = db.execute("SELECT * FROM pagos ORDER BY id LIMIT ? OFFSET ?", (limit, skip)).fetchall()
     return [Pago(**row) for row in rows]
 
 def delete_payment(db: sqlite3.Connection, payment_id: int) -> bool:
@@ -73,3 +83,17 @@ def delete_payment(db: sqlite3.Connection, payment_id: int) -> bool:
     db.commit()
     return cursor.rowcount > 0
 
+def create_payments_bulk(db: sqlite3.Connection, payments: List[PagoCreate], atomic: bool = True) -> ResultadoLote:
+    """
+    Registra muchos pagos en una sola transacción.
+
+    Args:
+        db: Conexión a la base de datos.
+        payments: Pagos a registrar.
+        atomic: True para todo o nada, False para guardar los válidos.
+
+    Returns:
+        Resultado de cada pago (ID asignado o error).
+    """
+    rows = [(payment.id_equipo, payment.id_torneo, payment.monto_cent, payment.estado) for payment in payments]
+    return bulk_insert(db, "pagos", ("id_equipo", "id_torneo", "monto_cent", "estado"), rows, atomic=atomic)
@@ -0,0 +1,221 @@
+# app/crud/crud_rating.py
+import sqlite3
+from typing import Dict, List, Optional, Tuple
+
+from app.schemas.rating import PuntoHistorialRating, Rating, RatingEquipo
+from app.services import ratings
+
+# Índices de historial_rating, que se reconstruyen tras el recálculo completo
+_HISTORY_INDEXES = (
+    "CREATE INDEX idx_historial_rating_equipo  ON historial_rating(id_equipo, id)",
+    "CREATE INDEX idx_historial_rating_partido ON historial_rating(id_partido)",
+)
+
+_INSERT_HISTORY = """
+    INSERT INTO historial_rating (id_equipo, id_partido, rating_antes, rating_despues)
+    VALUES (?, ?, ?, ?)
+"""
+
+
+def _current(db: sqlite3.Connection, team_id: int) -> float:
+    row = db.execute("SELECT rating FROM ratings WHERE id_equipo = ?", (team_id,)).fetchone()
+    return row[0] if row else ratings.RATING_INICIAL
+
+
+def apply_result_change(
+    db: sqlite3.Connection,
+    match_id: int,
+    local: int,
+    visitante: int,
+    new: Tuple[Optional[int], Optional[int]],
+    counted: bool = True,
+) -> None:
+    """
+    Actualiza incrementalmente el rating de los dos equipos de un partido cuyo resultado cambia.
+
+    Si el partido ya había contado, primero se deshace su aportación (guardada en
+    `historial_rating`) y después se aplica la del nuevo resultado con los ratings
+    actuales. Corregir un resultado antiguo es, por tanto, una aproximación: el
+    recálculo completo (`recompute_ratings`) reproduce el orden cronológico exacto.
+    No hace commit.
+
+    Args:
+        db: Conexión a la base de datos.
+        match_id: ID del partido.
+        local: ID del equipo local.
+        visitante: ID del equipo visitante.
+        new: Resultado nuevo `(local, visitante)`; `(None, None)` si se borra el resultado o el partido.
+        counted: False si el partido acaba de insertarse y no puede haber contado
+            todavía (no se busca aportación que deshacer).
+    """
+    previous = []
+    if counted:
+        previous = db.execute(
+            "DELETE FROM historial_rating WHERE id_partido = ? RETURNING id_equipo, rating_despues - rating_antes",
+            (match_id,),
+        ).fetchall()
+    for team_id, delta in previous:
+        db.execute(
+            "UPDATE ratings SET rating = rating - ?, partidos = partidos - 1 WHERE id_equipo = ?",
+            (delta, team_id),
+        )
+
+    if new[0] is None or new[1] is None:
+        return
+    rating_local = _current(db, local)
+    rating_visitante = _current(db, visitante)
+    delta = ratings.elo_delta(rating_local, rating_visitante, new[0], new[1])
+    db.executemany(
+        """
+        INSERT INTO ratings (id_equipo, rating, partidos) VALUES (?, ?, 1)
+        ON CONFLICT(id_equipo) DO UPDATE SET rating = excluded.rating, partidos = partidos + 1
+        """,
+        [(local, rating_local + delta), (visitante, rating_visitante - delta)],
+    )
+    db.executemany(
+        _INSERT_HISTORY,
+        [
+            (local, match_id, rating_local, rating_local + delta),
+            (visitante, match_id, rating_visitante, rating_visitante - delta),
+        ],
+    )
+
+
+def revert_tournament(db: sqlite3.Connection, tournament_id: int) -> int:
+    """
+    Deshace la aportación al rating de todos los partidos de un torneo, antes de
+    borrarlo. No hace commit.
+
+    `ratings` e `historial_rating` no tienen claves foráneas hacia los partidos,
+    así que el borrado en cascada del torneo no los toca. Igual que al borrar un
+    partido (`apply_result_change`), se resta el delta guardado de cada partido;
+    es una aproximación que el recálculo completo (`recompute_ratings`) corrige.
+
+    Args:
+        db: Conexión a la base de datos.
+        tournament_id: ID del torneo que se va a borrar.
+
+    Returns:
+        Número de filas de historial eliminadas.
+    """
+    previous = db.execute(
+        """
+        DELETE FROM historial_rating
+        WHERE id_partido IN (SELECT id FROM partidos WHERE id_torneo = ?)
+        RETURNING id_equipo, rating_despues - rating_antes
+        """,
+        (tournament_id,),
+    ).fetchall()
+    totals: Dict[int, Tuple[float, int]] = {}
+    for team_id, delta in previous:
+        rating, played = totals.get(team_id, (0.0, 0))
+        totals[team_id] = (rating + delta, played + 1)
+    db.executemany(
+        "UPDATE ratings SET rating = rating - ?, partidos = partidos - ? WHERE id_equipo = ?",
+        [(rating, played, team_id) for team_id, (rating, played) in totals.items()],
+    )
+    return len(previous)
+
+
+def recompute_ratings(db: sqlite3.Connection) -> int:
+    """
+    Recalcula todos los ratings y su historial desde cero, en orden cronológico
+    (`fecha`, `id`). No hace commit.
+
+    El historial se reescribe entero: sus índices se eliminan antes de la carga y
+    se recrean al final, que es más rápido que mantenerlos fila a fila.
+
+    Args:
+        db: Conexión a la base de datos.
+
+    Returns:
+        Número de partidos procesados.
+    """
+    matches = db.execute(
+        """
+        SELECT id, equipo_local, equipo_visitante, resultado_local, resultado_visitante
+        FROM partidos
+        WHERE resultado_local IS NOT NULL AND resultado_visitante IS NOT NULL
+        ORDER BY fecha, id
+        """
+    ).fetchall()
+    final, played, history = ratings.recompute([tuple(row) for row in matches])
+
+    db.execute("DROP INDEX IF EXISTS idx_historial_rating_equipo")
+    db.execute("DROP INDEX IF EXISTS idx_historial_rating_partido")
+    db.execute("DELETE FROM historial_rating")
+    db.execute("DELETE FROM ratings")
+    db.executemany(
+        "INSERT INTO ratings (id_equipo, rating, partidos) VALUES (?, ?, ?)",
+        [(team_id, rating, played[team_id]) for team_id, rating in final.items()],
+    )
+    db.executemany(
+        _INSERT_HISTORY,
+        (
+            row
+            for match_id, local, visitante, local_antes, local_despues, visitante_antes, visitante_despues in history
+            for row in (
+                (local, match_id, local_antes, local_despues),
+                (visitante, match_id, visitante_antes, visitante_despues),
+            )
+        ),
+    )
+    for statement in _HISTORY_INDEXES:
+        db.execute(statement)
+    return len(history)
+
+
+def get_team_rating(db: sqlite3.Connection, team_id: int, history_limit: int = 20) -> RatingEquipo:
+    """
+    Obtiene el rating de un equipo y sus últimos cambios.
+
+    Args:
+        db: Conexión a la base de datos.
+        team_id: ID del equipo.
+        history_limit: Número máximo de cambios a devolver.
+
+    Returns:
+        El rating del equipo (el inicial si aún no ha jugado).
+    """
+    row = db.execute("SELECT id_equipo, rating, partidos FROM ratings WHERE id_equipo = ?", (team_id,)).fetchone()
+    history = db.execute(
+        """
+        SELECT h.id_partido, p.fecha, h.rating_antes, h.rating_despues
+        FROM historial_rating h LEFT JOIN partidos p ON p.id = h.id_partido
+        WHERE h.id_equipo = ?
+        ORDER BY h.id DESC
+        LIMIT ?
+        """,
+        (team_id, history_limit),
+    ).fetchall()
+    base = dict(row) if row else {"id_equipo": team_id, "rating": ratings.RATING_INICIAL, "partidos": 0}
+    return RatingEquipo(**base, historial=[PuntoHistorialRating(**h) for h in history])
+
+
+def get_ranking(db: sqlite3.Connection, limit: int = 100, after: Optional[Tuple[float, int]] = None) -> List[Rating]:
+    """
+    Obtiene la clasificación de equipos por rating, de mayor a menor.
+
+    Args:
+        db: Conexión a la base de datos.
+        limit: Número máximo de equipos a devolver.
+        after: `(rating, id_equipo)` del último equipo de la página anterior (paginación por cursor).
+
+    Returns:
+        Una lista de ratings.
+    """
+    if after is not None:
+        rows = db.execute(
+            """
+            SELECT id_equipo, rating, partidos FROM ratings
+            WHERE rating < ? OR (rating = ? AND id_equipo > ?)
+            ORDER BY rating DESC, id_equipo
+            LIMIT ?
+            """,
+            (after[0], after[0], after[1], limit),
+        ).fetchall()
+    else:
+        rows = db.execute(
+            "SELECT id_equipo, rating, partidos FROM ratings ORDER BY rating DESC, id_equipo LIMIT ?", (limit,)
+        ).fetchall()
+    return [Rating(**row) for row in rows]
@@ -0,0 +1,83 @@
+# app/crud/crud_schedule.py
+import sqlite3
+from typing import Optional
+
+from fastapi import HTTPException
+
+from app.crud.crud_match import find_conflict
+from app.crud.errors import integrity_error
+from app.schemas.schedule import ProgramacionCreate, ResultadoProgramacion
+from app.services import scheduler
+
+
+def schedule_matches(db: sqlite3.Connection, tournament_id: int, programacion: ProgramacionCreate) -> Optional[ResultadoProgramacion]:
+    """
+    Programa los partidos pendientes de un torneo en las franjas y sedes indicadas.
+
+    Son pendientes los partidos sin horario (`inicio` nulo) ni resultado, como los
+    que crea el generador de calendario, cuyas fechas son orientativas. Se colocan
+    por orden de creación (el de las jornadas) respetando los partidos ya
+    programados de cualquier torneo que coincidan con las franjas, tanto de los
+    equipos como de las sedes (ver `app.services.scheduler.schedule`). Antes de
+    guardar cada horario se repite la comprobación de `find_conflict` en la base de
+    datos, y los partidos que chocan quedan sin programar. La lectura y la
+    actualización van en una única transacción `BEGIN IMMEDIATE`.
+
+    Args:
+        db: Conexión a la base de datos.
+        tournament_id: ID del torneo.
+        programacion: Franjas, sedes, duración y descanso mínimo.
+
+    Raises:
+        HTTPException: 400 si alguna franja no es una fecha ISO 8601.
+
+    Returns:
+        El resultado de la programación, o None si el torneo no existe.
+    """
+    slots = []
+    for franja in programacion.franjas:
+        inicio = scheduler.to_timestamp(franja)
+        if inicio is None:
+            raise HTTPException(status_code=400, detail=f"Franja inválida: '{franja}'")
+        slots.append(inicio)
+    duracion = programacion.duracion_minutos * 60
+    descanso = programacion.descanso_minutos * 60
+
+    db.execute("BEGIN IMMEDIATE")
+    try:
+        if db.execute("SELECT 1 FROM torneos WHERE id = ?", (tournament_id,)).fetchone() is None:
+            db.rollback()
+            return None
+        pending = db.execute(
+            "SELECT id, equipo_local, equipo_visitante FROM partidos "
+            "WHERE id_torneo = ? AND inicio IS NULL AND resultado_local IS NULL ORDER BY id",
+            (tournament_id,),
+        ).fetchall()
+        busy = db.execute(
+            "SELECT equipo_local, equipo_visitante, inicio, fin, sede FROM partidos "
+            "WHERE inicio IS NOT NULL AND inicio < ? AND fin > ?",
+            (max(slots) + duracion + descanso, min(slots) - descanso),
+        ).fetchall()
+        asignaciones, sin_programar = scheduler.schedule(
+            [tuple(row) for row in pending], slots, programacion.sedes, duracion, descanso, [tuple(row) for row in busy]
+        )
+        equipos = {row["id"]: (row["equipo_local"], row["equipo_visitante"]) for row in pending}
+        programados = []
+        for a in asignaciones:
+            if find_conflict(db, equipos[a.id_partido], a.sede, a.inicio, a.fin, descanso) is not None:
+                sin_programar.append(a.id_partido)
+                continue
+            db.execute(
+                "UPDATE partidos SET fecha = ?, inicio = ?, fin = ?, sede = ? WHERE id = ?",
+                (scheduler.to_iso(a.inicio), a.inicio, a.fin, a.sede, a.id_partido),
+            )
+            programados.append(a)
+        asignaciones = programados
+        db.commit()
+    except sqlite3.IntegrityError as exc:
+        db.rollback()
+        raise integrity_error(exc)
+    except Exception:
+        db.rollback()
+        raise
+    return ResultadoProgramacion(programados=len(asignaciones), sin_programar=sin_programar)
@@ -0,0 +1,122 @@
+# app/crud/crud_search.py
+import os
+import re
+import sqlite3
+from typing import List, Optional, Tuple
+
+from app.schemas.search import ResultadoBusqueda
+
+# Por encima de este número de coincidencias en una tabla no se ordena por relevancia:
+# calcular BM25 para todas cuesta segundos con millones de filas y, siendo tan comunes
+# los términos, apenas distingue entre ellas.
+SEARCH_RANK_MAX = int(os.environ.get("SEARCH_RANK_MAX", "1000"))
+
+# Relevancia BM25 de cada tabla FTS5 (el nombre pesa más que el resto de columnas)
+_RANKS = {
+    "usuarios": "bm25(usuarios_fts, 2.0, 1.0)",
+    "equipos": "bm25(equipos_fts)",
+    "torneos": "bm25(torneos_fts, 2.0, 1.0)",
+}
+
+# Título y detalle que se muestran de cada tabla. Se leen de la tabla base por ID salvo
+# el fragmento de la descripción de los torneos, que necesita la coincidencia FTS5.
+_DISPLAY = {
+    "usuarios": "SELECT id, nombre, nickname FROM usuarios WHERE id IN ({ids})",
+    "equipos": "SELECT id, nombre, NULL FROM equipos WHERE id IN ({ids})",
+    "torneos": (
+        "SELECT rowid, nombre, snippet(torneos_fts, 1, '', '', '…', 12) FROM torneos_fts "
+        "WHERE torneos_fts MATCH :q AND rowid IN ({ids})"
+    ),
+}
+SEARCH_TYPES = tuple(_RANKS)
+
+
+def to_match_query(text: str) -> Optional[str]:
+    """
+    Convierte el texto de la caja de búsqueda en una consulta FTS5 segura.
+
+    Cada palabra se busca exacta o como prefijo (`("pal" OR "pal"*)`, de modo que
+    las coincidencias exactas puntúan más) y todas deben aparecer. La sintaxis FTS5
+    del usuario (comillas, operadores, columnas) no se interpreta.
+
+    Args:
+        text: Texto introducido por el usuario.
+
+    Returns:
+        La expresión para `MATCH`, o None si el texto no contiene ninguna palabra.
+    """
+    words = re.findall(r"\w+", text)
+    if not words:
+        return None
+    return " AND ".join(f'("{word}" OR "{word}"*)' for word in words)
+
+
+def _candidates(db: sqlite3.Connection, tipo: str, query: str, top: int) -> List[Tuple[float, int]]:
+    """
+    Devuelve como mucho `top` pares `(relevancia, id)` de una tabla, los mejores primero.
+
+    Se puntúan como mucho `SEARCH_RANK_MAX + 1` coincidencias sin ordenar (calcular
+    BM25 cuesta más que encontrarlas); si hay más, la tabla se devuelve por ID con
+    relevancia 0.0.
+    """
+    rows = db.execute(
+        f"SELECT {_RANKS[tipo]}, rowid FROM {tipo}_fts WHERE {tipo}_fts MATCH ? LIMIT ?",
+        (query, SEARCH_RANK_MAX + 1),
+    ).fetchall()
+    if len(rows) > SEARCH_RANK_MAX:
+        rows = db.execute(
+            f"SELECT 0.0, rowid FROM {tipo}_fts WHERE {tipo}_fts MATCH ? ORDER BY rowid LIMIT ?",
+            (query, top),
+        ).fetchall()
+    return sorted(tuple(row) for row in rows)[:top]
+
+
+def search(db: sqlite3.Connection, text: str, tipo: Optional[str] = None, skip: int = 0, limit: int = 20) -> List[ResultadoBusqueda]:
+    """
+    Busca usuarios, equipos y torneos por sus textos, ordenados por relevancia.
+
+    Cada tabla aporta como mucho `skip + limit` candidatos y sólo se leen el título
+    y el detalle de los de la página pedida. Las tablas con más de `SEARCH_RANK_MAX`
+    coincidencias se devuelven por ID y sin puntuación, detrás de las ordenadas.
+    Candidatos y detalles se leen en la misma transacción de lectura, así que una
+    fila borrada entre medias no deja un candidato sin título.
+
+    Args:
+        db: Conexión a la base de datos.
+        text: Texto a buscar (cada palabra como prefijo).
+        tipo: Limita la búsqueda a 'usuarios', 'equipos' o 'torneos'.
+        skip: Número de resultados a omitir.
+        limit: Número máximo de resultados a devolver.
+
+    Returns:
+        Los resultados de la página pedida.
+    """
+    query = to_match_query(text)
+    if query is None:
+        return []
+    tipos = (tipo,) if tipo else SEARCH_TYPES
+    results = []
+    db.execute("BEGIN")
+    try:
+        ranked = sorted(
+            (relevancia, orden, rowid)
+            for orden, t in enumerate(tipos)
+            for relevancia, rowid in _candidates(db, t, query, skip + limit)
+        )[skip:skip + limit]
+
+        for orden, t in enumerate(tipos):
+            ids = [rowid for _, o, rowid in ranked if o == orden]
+            if not ids:
+                continue
+            params = {f"id{i}": rowid for i, rowid in enumerate(ids)}
+            params["q"] = query
+            rows = db.execute(_DISPLAY[t].format(ids=", ".join(f":{name}" for name in params if name != "q")), params).fetchall()
+            shown = {row[0]: (row[1], row[2]) for row in rows}
+            results += [
+                ResultadoBusqueda(tipo=t, id=rowid, titulo=shown[rowid][0], detalle=shown[rowid][1], relevancia=relevancia)
+                for relevancia, o, rowid in ranked if o == orden
+            ]
+    finally:
+        db.rollback()
+    results.sort(key=lambda r: r.relevancia)
+    return results
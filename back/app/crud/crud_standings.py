@@ -0,0 +1,185 @@
+# app/crud/crud_standings.py
+import sqlite3
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from app.schemas.standings import FilaClasificacion
+from app.services.standings import PUNTOS_DERROTA, PUNTOS_EMPATE, PUNTOS_VICTORIA, Estadisticas, result_delta
+
+_UPSERT = """
+    INSERT INTO clasificacion (id_torneo, id_equipo, jugados, ganados, empatados, perdidos, goles_favor, goles_contra, puntos)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT(id_torneo, id_equipo) DO UPDATE SET
+      jugados = jugados + excluded.jugados,
+      ganados = ganados + excluded.ganados,
+      empatados = empatados + excluded.empatados,
+      perdidos = perdidos + excluded.perdidos,
+      goles_favor = goles_favor + excluded.goles_favor,
+      goles_contra = goles_contra + excluded.goles_contra,
+      puntos = puntos + excluded.puntos
+"""
+
+# Aportación de cada partido jugado, vista desde cada uno de sus dos equipos
+_RESULTADOS = """
+    SELECT id_torneo, equipo_local AS id_equipo, resultado_local AS gf, resultado_visitante AS gc
+    FROM partidos
+    WHERE resultado_local IS NOT NULL AND resultado_visitante IS NOT NULL AND (:torneo IS NULL OR id_torneo = :torneo)
+    UNION ALL
+    SELECT id_torneo, equipo_visitante, resultado_visitante, resultado_local
+    FROM partidos
+    WHERE resultado_local IS NOT NULL AND resultado_visitante IS NOT NULL AND (:torneo IS NULL OR id_torneo = :torneo)
+"""
+
+_AGREGADO = f"""
+    SELECT id_torneo, id_equipo,
+           COUNT(*) AS jugados,
+           SUM(gf > gc) AS ganados,
+           SUM(gf = gc) AS empatados,
+           SUM(gf < gc) AS perdidos,
+           SUM(gf) AS goles_favor,
+           SUM(gc) AS goles_contra,
+           SUM(CASE WHEN gf > gc THEN {PUNTOS_VICTORIA} WHEN gf = gc THEN {PUNTOS_EMPATE} ELSE {PUNTOS_DERROTA} END) AS puntos
+    FROM ({_RESULTADOS})
+    GROUP BY id_torneo, id_equipo
+"""
+
+
+def apply_result_change(
+    db: sqlite3.Connection,
+    tournament_id: int,
+    local: int,
+    visitante: int,
+    old: Tuple[Optional[int], Optional[int]],
+    new: Tuple[Optional[int], Optional[int]],
+) -> None:
+    """
+    Aplica a la clasificación la diferencia entre el resultado anterior y el nuevo de un partido.
+
+    No hace commit: debe llamarse dentro de la misma transacción que modifica el
+    partido, para que clasificación y resultados no puedan divergir.
+
+    Args:
+        db: Conexión a la base de datos.
+        tournament_id: ID del torneo del partido.
+        local: ID del equipo local.
+        visitante: ID del equipo visitante.
+        old: Resultado anterior `(local, visitante)`; `(None, None)` si no lo había.
+        new: Resultado nuevo `(local, visitante)`; `(None, None)` si se borra.
+    """
+    deltas = result_delta(old[0], old[1], new[0], new[1])
+    changed = [(team, delta) for team, delta in zip((local, visitante), deltas) if not delta.is_zero()]
+    if not changed:
+        return
+    db.executemany(_UPSERT, [(tournament_id, team, *delta) for team, delta in changed])
+    db.execute(
+        f"DELETE FROM clasificacion WHERE id_torneo = ? AND id_equipo IN ({', '.join('?' for _ in changed)}) AND jugados = 0",
+        (tournament_id, *(team for team, _ in changed)),
+    )
+
+
+def get_standings(db: sqlite3.Connection, tournament_id: int) -> List[FilaClasificacion]:
+    """
+    Obtiene la clasificación de un torneo ordenada por puntos, diferencia de goles y goles a favor.
+
+    Args:
+        db: Conexión a la base de datos.
+        tournament_id: ID del torneo.
+
+    Returns:
+        Las filas de la clasificación, con su posición.
+    """
+    rows = db.execute(
+        """
+        SELECT id_equipo, jugados, ganados, empatados, perdidos, goles_favor, goles_contra,
+               goles_favor - goles_contra AS diferencia, puntos
+        FROM clasificacion
+        WHERE id_torneo = ?
+        ORDER BY puntos DESC, goles_favor - goles_contra DESC, goles_favor DESC, id_equipo
+        """,
+        (tournament_id,),
+    ).fetchall()
+    return [FilaClasificacion(posicion=index, **row) for index, row in enumerate(rows, start=1)]
+
+
+def get_team_standings(db: sqlite3.Connection, tournament_id: int, team_ids: Sequence[int]) -> List[FilaClasificacion]:
+    """
+    Obtiene las filas de la clasificación de unos equipos, con su posición en el torneo.
+
+    Args:
+        db: Conexión a la base de datos.
+        tournament_id: ID del torneo.
+        team_ids: IDs de los equipos.
+
+    Returns:
+        Las filas de los equipos que tienen partidos jugados, por posición.
+    """
+    rows = db.execute(
+        f"""
+        SELECT * FROM (
+            SELECT ROW_NUMBER() OVER (ORDER BY puntos DESC, goles_favor - goles_contra DESC, goles_favor DESC, id_equipo) AS posicion,
+                   id_equipo, jugados, ganados, empatados, perdidos, goles_favor, goles_contra,
+                   goles_favor - goles_contra AS diferencia, puntos
+            FROM clasificacion
+            WHERE id_torneo = ?
+        )
+        WHERE id_equipo IN ({', '.join('?' for _ in team_ids)})
+        ORDER BY posicion
+        """,
+        (tournament_id, *team_ids),
+    ).fetchall()
+    return [FilaClasificacion(**row) for row in rows]
+
+
+def compute_standings(db: sqlite3.Connection, tournament_id: Optional[int] = None) -> Dict[Tuple[int, int], Estadisticas]:
+    """
+    Calcula la clasificación desde cero a partir de todos los partidos con resultado.
+
+    Args:
+        db: Conexión a la base de datos.
+        tournament_id: Torneo a calcular (None para todos).
+
+    Returns:
+        Estadísticas por `(id_torneo, id_equipo)`.
+    """
+    return {
+        (row["id_torneo"], row["id_equipo"]): Estadisticas(*tuple(row)[2:])
+        for row in db.execute(_AGREGADO, {"torneo": tournament_id})
+    }
+
+
+def stored_standings(db: sqlite3.Connection, tournament_id: Optional[int] = None) -> Dict[Tuple[int, int], Estadisticas]:
+    """
+    Lee la clasificación mantenida incrementalmente.
+
+    Args:
+        db: Conexión a la base de datos.
+        tournament_id: Torneo a leer (None para todos).
+
+    Returns:
+        Estadísticas por `(id_torneo, id_equipo)`.
+    """
+    rows = db.execute(
+        "SELECT id_torneo, id_equipo, jugados, ganados, empatados, perdidos, goles_favor, goles_contra, puntos "
+        "FROM clasificacion WHERE (:torneo IS NULL OR id_torneo = :torneo)",
+        {"torneo": tournament_id},
+    )
+    return {(row["id_torneo"], row["id_equipo"]): Estadisticas(*tuple(row)[2:]) for row in rows}
+
+
+def rebuild_standings(db: sqlite3.Connection, tournament_id: Optional[int] = None) -> int:
+    """
+    Reconstruye la clasificación desde los partidos. No hace commit.
+
+    Args:
+        db: Conexión a la base de datos.
+        tournament_id: Torneo a reconstruir (None para todos).
+
+    Returns:
+        Número de filas escritas.
+    """
+    db.execute("DELETE FROM clasificacion WHERE (:torneo IS NULL OR id_torneo = :torneo)", {"torneo": tournament_id})
+    cursor = db.execute(
+        "INSERT INTO clasificacion (id_torneo, id_equipo, jugados, ganados, empatados, perdidos, goles_favor, goles_contra, puntos) "
+        + _AGREGADO,
+        {"torneo": tournament_id},
+    )
+    return cursor.rowcount
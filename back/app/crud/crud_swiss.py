@@ -0,0 +1,106 @@
+# app/crud/crud_swiss.py
+import math
+import sqlite3
+from typing import Dict, Optional, Set
+
+from fastapi import HTTPException
+
+from app.crud import crud_tournament
+from app.crud.crud_fixture import assign_seeds
+from app.crud.errors import integrity_error
+from app.schemas.fixture import RondaSuiza
+from app.schemas.match import Partido
+from app.services import fixtures, swiss
+
+
+def next_round(db: sqlite3.Connection, tournament_id: int, fecha: Optional[str] = None) -> Optional[RondaSuiza]:
+    """
+    Genera la siguiente ronda suiza de un torneo a partir de los resultados registrados.
+
+    La primera llamada fija las semillas de los inscritos y marca el torneo como
+    suizo. Cada ronda se empareja por grupos de puntuación sin revanchas, con los
+    desempates Buchholz y Sonneborn-Berger (ver `app.services.swiss`), y se inserta
+    en una única transacción `BEGIN IMMEDIATE`.
+
+    Args:
+        db: Conexión a la base de datos.
+        tournament_id: ID del torneo.
+        fecha: Fecha de los partidos de la ronda (ISO 8601). Por defecto se reparten
+            las rondas entre el inicio y el fin del torneo, suponiendo ⌈log2(n)⌉ rondas.
+
+    Raises:
+        HTTPException: 400 si hay menos de dos equipos; 409 si el torneo tiene otro
+            formato o la ronda anterior tiene partidos sin resultado.
+
+    Returns:
+        La ronda generada, o None si el torneo no existe.
+    """
+    db.execute("BEGIN IMMEDIATE")
+    try:
+        tournament = db.execute(
+            "SELECT fecha_inicio, fecha_fin, formato FROM torneos WHERE id = ?", (tournament_id,)
+        ).fetchone()
+        if tournament is None:
+            db.rollback()
+            return None
+        if tournament["formato"] not in (None, "suizo"):
+            raise HTTPException(status_code=409, detail=f"El torneo ya tiene un calendario de formato '{tournament['formato']}'")
+        if tournament["formato"] is None:
+            assign_seeds(db, tournament_id)
+            db.execute("UPDATE torneos SET formato = 'suizo' WHERE id = ?", (tournament_id,))
+
+        seeds = {
+            row["id_equipo"]: row["semilla"] for row in db.execute(
+                "SELECT id_equipo, semilla FROM inscripciones WHERE id_torneo = ? AND semilla IS NOT NULL",
+                (tournament_id,),
+            )
+        }
+        if len(seeds) < 2:
+            raise HTTPException(status_code=400, detail="El torneo necesita al menos dos equipos inscritos")
+
+        matches = db.execute(
+            "SELECT ronda, equipo_local, equipo_visitante, resultado_local, resultado_visitante "
+            "FROM partidos WHERE id_torneo = ? AND llave = ?",
+            (tournament_id, fixtures.LLAVE_SUIZO),
+        ).fetchall()
+        pending = [m["ronda"] for m in matches if m["resultado_local"] is None or m["resultado_visitante"] is None]
+        if pending:
+            raise HTTPException(status_code=409, detail=f"La ronda {max(pending)} todavía tiene partidos sin resultado")
+
+        ronda = max((m["ronda"] for m in matches), default=0) + 1
+        played: Dict[int, Set[int]] = {}
+        for m in matches:
+            played.setdefault(m["equipo_local"], set()).add(m["equipo_visitante"])
+            played.setdefault(m["equipo_visitante"], set()).add(m["equipo_local"])
+        ranking = swiss.standings(seeds, [tuple(m) for m in matches])
+        pairs, bye = swiss.pair_round(ranking, played)
+
+        if fecha is None:
+            jornadas = max(math.ceil(math.log2(len(seeds))), ronda)
+            try:
+                fecha = fixtures.spread_dates(tournament["fecha_inicio"], tournament["fecha_fin"], jornadas)[ronda - 1]
+            except ValueError as exc:
+                raise HTTPException(status_code=400, detail=f"Fechas del torneo inválidas: {exc}")
+
+        db.executemany(
+            "INSERT INTO partidos (id_torneo, equipo_local, equipo_visitante, fecha, llave, ronda, posicion) VALUES (?, ?, ?, ?, ?, ?, ?)",
+            [
+                (tournament_id, local, visitante, fecha, fixtures.LLAVE_SUIZO, ronda, posicion)
+                for posicion, (local, visitante) in enumerate(pairs)
+            ],
+        )
+        rows = db.execute(
+            "SELECT * FROM partidos WHERE id_torneo = ? AND llave = ? AND ronda = ? ORDER BY posicion",
+            (tournament_id, fixtures.LLAVE_SUIZO, ronda),
+        ).fetchall()
+        db.commit()
+    except sqlite3.IntegrityError as exc:
+        db.rollback()
+        raise integrity_error(exc)
+    except Exception:
+        db.rollback()
+        raise
+
+    if ronda == 1:
+        crud_tournament.invalidate_cache(tournament_id)
+    return RondaSuiza(ronda=ronda, descanso=bye, partidos=[Partido(**row) for row in rows])
@@ -2,37 +2,47 @@
 import sqlite3
 from typing import List, Optional
 
+from app.cache.autocomplete import autocomplete_index
+from app.cache.cache import response_cache
+from app.crud import crud_tournament
+from app.crud.bulk import bulk_insert
+from app.crud.errors import integrity_error
+from app.schemas.bulk import ResultadoLote
 from app.schemas.team import Equipo, EquipoCreate, EquipoBase
 
 
-def create_team(db: sqlite3.Connection, team: EquipoCreate) -> Optional[Equipo]:
+def create_team(db: sqlite3.Connection, team: EquipoCreate) -> Equipo:
     """
-    Crea un nuevo equipo en la base de datos y verifica que el capitán no esté liderando otro equipo.
+    Crea un nuevo equipo en la base de datos.
+
+    La unicidad del nombre y que el capitán no lidere otro equipo las garantizan
+    las restricciones UNIQUE de `equipos`, así que basta con una sola sentencia.
 
     Args:
         db: Conexión a la base de datos.
         team: Datos del equipo a crear.
 
+    Raises:
+        HTTPException: 400 si el nombre ya existe, el capitán ya lidera otro equipo
+            o el capitán no existe.
+
     Returns:
-        El equipo creado si la operación es exitosa, o None si el capitán ya está asignado a otro equipo.
+        El equipo creado.
     """
-    captain_id = team.id_capitan
-    existing_team = db.execute("SELECT * FROM equipos WHERE id_capitan = ?", (captain_id,)).fetchone()
-    if existing_team:
-        return None  # Indicate that the captain is already leading a team
-
     try:
-        cursor = db.execute(
-            "INSERT INTO equipos (nombre, id_capitan) VALUES (?, ?)",
+        row = db.execute(
+            "INSERT INTO equipos (nombre, id_capitan) VALUES (?, ?) RETURNING *",
             (team.nombre, team.id_capitan),
-        )
+        ).fetchone()
         db.commit()
-        team_id = cursor.lastrowid
-        return get_team(db, team_id)
-    except sqlite3.IntegrityError:
-        return None
+    except sqlite3.IntegrityError as exc:
+        db.rollback()
+        raise integrity_error(exc)
+    autocomplete_index.add("equipos", row["id"], row["nombre"])
+    return Equipo(**row)
 
 
+@response_cache.cached("/teams/{id}", Equipo)
 def get_team(db: sqlite3.Connection, team_id: int) -> Optional[Equipo]:
     """
     Obtiene un equipo específico por su ID.
@@ -50,7 +60,7 @@ def get_team(db: sqlite3.Connection, team_id: int) -> Optional[Equipo]:
     return None
 
 
-def get_teams(db: sqlite3.Connection, skip: int = 0, limit: int = 100) -> List[Equipo]:
+def get_teams(db: sqlite3.Connection, skip: int = 0, limit: int = 100, after_id: Optional[int] = None) -> List[Equipo]:
     """
     Obtiene una lista paginada de todos los equipos.
 
@@ -58,11 +68,15 @@ def get_teams(db: sqlite3.Connection, skip: int = 0, limit: int = 100) -> List[E
         db: Conexión a la base de datos.
         skip: Número de equipos a omitir.
         limit: Número máximo de equipos a devolver.
+        after_id: ID del último registro de la página anterior (paginación por cursor); si se indica, se ignora `skip`.
 
     Returns:
         Una lista de equipos.
     """
-    rows = db.execute("SELECT * FROM equipos LIMIT ? OFFSET ?", (limit, skip)).fetchall()
+    if after_id is not None:
+        rows = db.execute("SELECT * FROM equipos WHERE id > ? ORDER BY id LIMIT ?", (after_id, limit)).fetchall()
+    else:
+        rows = db.execute("SELECT * FROM equipos ORDER BY id LIMIT ? OFFSET ?", (limit, skip)).fetchall()
     return [Equipo(**row) for row in rows]
 
 
@@ -75,16 +89,33 @@ def update_team(db: sqlite3.Connection, team_id: int, team: EquipoBase) -> Optio
         team_id: ID del equipo a actualizar.
         team: Datos nuevos para el equipo.
 
+    Raises:
+        HTTPException: 400 si el nombre o el capitán ya pertenecen a otro equipo.
+
     Returns:
         El equipo actualizado o None si el equipo no fue encontrado.
     """
-    cursor = db.execute(
-        "UPDATE equipos SET nombre = ?, id_capitan = ? WHERE id = ?",
-        (team.nombre, team.id_capitan, team_id),
-    )
-    db.commit()
-    if cursor.rowcount > 0:
-        return get_team(db, team_id)
+    # El nombre anterior se lee en la misma transacción para sacarlo del autocompletado
+    db.execute("BEGIN IMMEDIATE")
+    try:
+        previous = db.execute("SELECT nombre FROM equipos WHERE id = ?", (team_id,)).fetchone()
+        row = db.execute(
+            "UPDATE equipos SET nombre = ?, id_capitan = ? WHERE id = ? RETURNING *",
+            (team.nombre, team.id_capitan, team_id),
+        ).fetchone()
+        db.commit()
+    except sqlite3.IntegrityError as exc:
+        db.rollback()
+        raise integrity_error(exc)
+    except Exception:
+        db.rollback()
+        raise
+    if row:
+        if previous["nombre"] != row["nombre"]:
+            autocomplete_index.remove("equipos", team_id, previous["nombre"])
+            autocomplete_index.add("equipos", team_id, row["nombre"])
+        response_cache.invalidate("/teams/{id}", team_id)
+        return Equipo(**row)
     return None
 
 
@@ -99,7 +130,34 @@ def delete_team(db: sqlite3.Connection, team_id: int) -> bool:
     Returns:
         True si el equipo fue eliminado, False en caso contrario.
     """
-    cursor = db.execute("DELETE FROM equipos WHERE id = ?", (team_id,))
+    # Sus inscripciones se borran en cascada y cambian el contador de esos torneos
+    tournaments = [row[0] for row in db.execute("SELECT id_torneo FROM inscripciones WHERE id_equipo = ?", (team_id,))]
+    row = db.execute("DELETE FROM equipos WHERE id = ? RETURNING nombre", (team_id,)).fetchone()
     db.commit()
-    return cursor.rowcount > 0
+    if row:
+        autocomplete_index.remove("equipos", team_id, row["nombre"])
+        response_cache.invalidate("/teams/{id}", team_id)
+        for tournament_id in tournaments:
+            crud_tournament.invalidate_cache(tournament_id)
+        return True
+    return False
+
 
+def create_teams_bulk(db: sqlite3.Connection, teams: List[EquipoCreate], atomic: bool = True) -> ResultadoLote:
+    """
+    Crea muchos equipos en una sola transacción.
+
+    Args:
+        db: Conexión a la base de datos.
+        teams: Equipos a crear.
+        atomic: True para todo o nada, False para guardar los válidos.
+
+    Returns:
+        Resultado de cada equipo (ID asignado o error).
+    """
+    rows = [(team.nombre, team.id_capitan) for team in teams]
+    result = bulk_insert(db, "equipos", ("nombre", "id_capitan"), rows, atomic=atomic)
+    for item in result.resultados:
+        if item.ok:
+            autocomplete_index.add("equipos", item.id, teams[item.indice].nombre)
+    return result
@@ -1,10 +1,32 @@
 # app/crud/crud_tournament.py
 import sqlite3
-from typing import List, Optional
+from typing import Dict, List, Optional, Sequence
 
-from app.schemas.tournament import Torneo, TorneoCreate, TorneoBase
+from app.cache.cache import response_cache
+from app.crud import crud_rating
+from app.crud.errors import integrity_error
+from app.schemas.match import Partido
+from app.schemas.member import Miembro
+from app.schemas.payment import Pago
+from app.schemas.tournament import EquipoInscrito, Torneo, TorneoCreate, TorneoBase, TorneoDetalle
 
+# Estados posibles de un torneo (claves de la caché de `/tournaments/status/{status}`)
+TOURNAMENT_STATUSES = ("programado", "en_curso", "finalizado")
 
+# Secciones opcionales de `/tournaments/{id}/full`
+DETAIL_SECTIONS = ("equipos", "miembros", "partidos", "pagos")
+
+
+def invalidate_cache(tournament_id: Optional[int] = None) -> None:
+    """
+    Invalida las entradas de caché afectadas por una escritura sobre torneos.
+    """
+    if tournament_id is not None:
+        response_cache.invalidate("/tournaments/{id}", tournament_id)
+    response_cache.invalidate("/tournaments/status/{status}", *TOURNAMENT_STATUSES)
+
+
+@response_cache.cached("/tournaments/status/{status}", List[Torneo])
 def get_tournaments_by_status(db: sqlite3.Connection, status: str) -> List[Torneo]:
     """
     Obtiene una lista de torneos filtrados por estado.
@@ -28,26 +50,34 @@ def create_tournament(db: sqlite3.Connection, tournament: TorneoCreate) -> Torne
         db: Conexión a la base de datos.
         tournament: Datos del torneo a crear.
 
+    Raises:
+        HTTPException: 400 si el nombre ya está registrado o los datos son inválidos.
+
     Returns:
         El torneo creado.
     """
-    cursor = db.execute(
-        "INSERT INTO torneos (nombre, descripcion, fecha_inicio, fecha_fin, max_equipos, estado, stream_url, id_organizador) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
-        (
-            tournament.nombre,
-            tournament.descripcion,
-            tournament.fecha_inicio,
-            tournament.fecha_fin,
-            tournament.max_equipos,
-            tournament.estado,
-            tournament.stream_url,
-            tournament.id_organizador,
-        ),
-    )
-    db.commit()
-    tournament_id = cursor.lastrowid
-    return get_tournament(db, tournament_id)
+    try:
+        row = db.execute(
+            "INSERT INTO torneos (nombre, descripcion, fecha_inicio, fecha_fin, max_equipos, estado, stream_url, id_organizador) VALUES (?, ?, ?, ?, ?, ?, ?, ?) RETURNING *",
+            (
+                tournament.nombre,
+                tournament.descripcion,
+                tournament.fecha_inicio,
+                tournament.fecha_fin,
+                tournament.max_equipos,
+                tournament.estado,
+                tournament.stream_url,
+                tournament.id_organizador,
+            ),
+        ).fetchone()
+        db.commit()
+    except sqlite3.IntegrityError as exc:
+        db.rollback()
+        raise integrity_error(exc)
+    invalidate_cache()
+    return Torneo(**row)
 
+@response_cache.cached("/tournaments/{id}", Torneo)
 def get_tournament(db: sqlite3.Connection, tournament_id: int) -> Optional[Torneo]:
     """
     Obtiene un torneo por su ID.
@@ -64,7 +94,86 @@ def get_tournament(db: sqlite3.Connection, tournament_id: int) -> Optional[Torne
         return Torneo(**row)
     return None
 
-def get_tournaments(db: sqlite3.Connection, skip: int = 0, limit: int = 100) -> List[Torneo]:
+
+def get_tournament_detail(
+    db: sqlite3.Connection, tournament_id: int, include: Sequence[str] = DETAIL_SECTIONS
+) -> Optional[TorneoDetalle]:
+    """
+    Obtiene un torneo con sus equipos inscritos, plantillas, partidos y pagos.
+
+    Cada sección es una única consulta por torneo (a lo sumo cinco en total, sea
+    cual sea el número de equipos) y las plantillas y el estado de pago se reparten
+    entre los equipos en memoria. Todas se leen en la misma transacción de lectura,
+    así que la respuesta es una foto coherente aunque haya escrituras en curso.
+
+    Args:
+        db: Conexión a la base de datos.
+        tournament_id: ID del torneo.
+        include: Secciones a incluir (claves de `DETAIL_SECTIONS`); `miembros`
+            implica `equipos`.
+
+    Returns:
+        El torneo con las secciones pedidas, o None si no existe.
+    """
+    db.execute("BEGIN")
+    try:
+        row = db.execute("SELECT * FROM torneos WHERE id = ?", (tournament_id,)).fetchone()
+        if row is None:
+            return None
+        detail = TorneoDetalle(**row)
+
+        payments: List[Pago] = []
+        if "pagos" in include:
+            payments = [
+                Pago(**r) for r in db.execute("SELECT * FROM pagos WHERE id_torneo = ? ORDER BY id", (tournament_id,))
+            ]
+            detail.pagos = payments
+
+        if "partidos" in include:
+            detail.partidos = [
+                Partido(**r) for r in db.execute("SELECT * FROM partidos WHERE id_torneo = ? ORDER BY id", (tournament_id,))
+            ]
+
+        if "equipos" in include or "miembros" in include:
+            teams = [
+                EquipoInscrito(**r)
+                for r in db.execute(
+                    """
+                    SELECT e.id, e.nombre, e.id_capitan, i.id AS id_inscripcion, i.fecha_inscripcion
+                    FROM inscripciones i JOIN equipos e ON e.id = i.id_equipo
+                    WHERE i.id_torneo = ? ORDER BY i.id
+                    """,
+                    (tournament_id,),
+                )
+            ]
+            if "miembros" in include:
+                rosters: Dict[int, List[Miembro]] = {team.id: [] for team in teams}
+                for r in db.execute(
+                    """
+                    SELECT m.* FROM inscripciones i JOIN miembros_equipo m ON m.id_equipo = i.id_equipo
+                    WHERE i.id_torneo = ? ORDER BY m.id
+                    """,
+                    (tournament_id,),
+                ):
+                    rosters[r["id_equipo"]].append(Miembro(**r))
+                for team in teams:
+                    team.miembros = rosters[team.id]
+            if "pagos" in include:
+                by_team: Dict[int, List[Pago]] = {}
+                for payment in payments:
+                    by_team.setdefault(payment.id_equipo, []).append(payment)
+                for team in teams:
+                    team_payments = by_team.get(team.id, [])
+                    confirmed = [payment.monto_cent for payment in team_payments if payment.estado == "confirmado"]
+                    team.pagado_cent = sum(confirmed)
+                    team.estado_pago = "confirmado" if confirmed else "pendiente" if team_payments else "sin_pago"
+            detail.equipos = teams
+        return detail
+    finally:
+        db.rollback()
+
+
+def get_tournaments(db: sqlite3.Connection, skip: int = 0, limit: int = 100, after_id: Optional[int] = None) -> List[Torneo]:
     """
     Obtiene una lista de todos los torneos.
 
@@ -72,48 +181,64 @@ def get_tournaments(db: sqlite3.Connection, skip: int = 0, limit: int = 100) ->
         db: Conexión a la base de datos.
         skip: Número de torneos a omitir.
         limit: Número máximo de torneos a devolver.
+        after_id: ID del último registro de la página anterior (paginación por cursor); si se indica, se ignora `skip`.
 
     Returns:
         Una lista de torneos.
     """
-    rows = db.execute("SELECT * FROM torneos LIMIT ? OFFSET ?", (limit, skip)).fetchall()
+    if after_id is not None:
+        rows = db.execute("SELECT * FROM torneos WHERE id > ? ORDER BY id LIMIT ?", (after_id, limit)).fetchall()
+    else:
+        rows = db.execute("SELECT * FROM torneos ORDER BY id LIMIT ? OFFSET ?", (limit, skip)).fetchall()
     return [Torneo(**row) for row in rows]
 
 def update_tournament(db: sqlite3.Connection, tournament_id: int, tournament: TorneoBase) -> Optional[Torneo]:
     """
     Actualiza la información de un torneo existente.
 
+    El estado no se toca aquí: se cambia con `update_tournament_status`.
+
     Args:
         db: Conexión a la base de datos.
         tournament_id: ID del torneo a actualizar.
         tournament: Datos nuevos para el torneo.
 
+    Raises:
+        HTTPException: 400 si el nombre ya pertenece a otro torneo o los datos son inválidos.
+
     Returns:
         El torneo actualizado o None si el torneo no fue encontrado.
     """
-    cursor = db.execute(
-        "UPDATE torneos SET nombre = ?, descripcion = ?, fecha_inicio = ?, fecha_fin = ?, max_equipos = ?, estado = ?, stream_url = ?, id_organizador = ? WHERE id = ?",
-        (
-            tournament.nombre,
-            tournament.descripcion,
-            tournament.fecha_inicio,
-            tournament.fecha_fin,
-            tournament.max_equipos,
-            tournament.estado,
-            tournament.stream_url,
-            tournament.id_organizador,
-            tournament_id,
-        ),
-    )
-    db.commit()
-    if cursor.rowcount > 0:
-        return get_tournament(db, tournament_id)
+    try:
+        row = db.execute(
+            "UPDATE torneos SET nombre = ?, descripcion = ?, fecha_inicio = ?, fecha_fin = ?, max_equipos = ?, stream_url = ?, id_organizador = ? WHERE id = ? RETURNING *",
+            (
+                tournament.nombre,
+                tournament.descripcion,
+                tournament.fecha_inicio,
+                tournament.fecha_fin,
+                tournament.max_equipos,
+                tournament.stream_url,
+                tournament.id_organizador,
+                tournament_id,
+            ),
+        ).fetchone()
+        db.commit()
+    except sqlite3.IntegrityError as exc:
+        db.rollback()
+        raise integrity_error(exc)
+    if row:
+        invalidate_cache(tournament_id)
+        return Torneo(**row)
     return None
 
 def delete_tournament(db: sqlite3.Connection, tournament_id: int) -> bool:
     """
     Elimina un torneo de la base de datos.
 
+    Sus partidos, inscripciones y clasificación se borran en cascada; la
+    aportación de sus partidos al rating se deshace en la misma transacción.
+
     Args:
         db: Conexión a la base de datos.
         tournament_id: ID del torneo a eliminar.
@@ -121,9 +246,18 @@ def delete_tournament(db: sqlite3.Connection, tournament_id: int) -> bool:
     Returns:
         True si el torneo fue eliminado, False en caso contrario.
     """
-    cursor = db.execute("DELETE FROM torneos WHERE id = ?", (tournament_id,))
-    db.commit()
-    return cursor.rowcount > 0
+    db.execute("BEGIN IMMEDIATE")
+    try:
+        crud_rating.revert_tournament(db, tournament_id)
+        cursor = db.execute("DELETE FROM torneos WHERE id = ?", (tournament_id,))
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    if cursor.rowcount > 0:
+        invalidate_cache(tournament_id)
+        return True
+    return False
 
 def update_tournament_status(db: sqlite3.Connection, tournament_id: int, status: str) -> Optional[Torneo]:
     """
@@ -134,15 +268,23 @@ def update_tournament_status(db: sqlite3.Connection, tournament_id: int, status:
         tournament_id: ID del torneo a actualizar.
         status: Nuevo estado del torneo.
 
+    Raises:
+        HTTPException: 400 si el estado no es válido.
+
     Returns:
         El torneo actualizado o None si el torneo no fue encontrado.
     """
-    cursor = db.execute(
-        "UPDATE torneos SET estado = ? WHERE id = ?",
-        (status, tournament_id),
-    )
-    db.commit()
-    if cursor.rowcount > 0:
-        return get_tournament(db, tournament_id)
+    try:
+        row = db.execute(
+            "UPDATE torneos SET estado = ? WHERE id = ? RETURNING *",
+            (status, tournament_id),
+        ).fetchone()
+        db.commit()
+    except sqlite3.IntegrityError as exc:
+        db.rollback()
+        raise integrity_error(exc)
+    if row:
+        invalidate_cache(tournament_id)
+        return Torneo(**row)
     return None
 
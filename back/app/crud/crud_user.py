@@ -2,42 +2,48 @@
 import sqlite3
 from typing import List, Optional
 
-from fastapi import HTTPException, status
-
+from app.cache.autocomplete import autocomplete_index
+from app.cache.cache import response_cache
+from app.crud.bulk import bulk_insert
+from app.crud.errors import integrity_error
+from app.schemas.bulk import ResultadoLote
 from app.schemas.user import Usuario, UsuarioCreate, UsuarioBase
 from app.security import security
+from app.security.token_cache import token_cache
 
 
-def create_user(db: sqlite3.Connection, user: UsuarioCreate) -> Usuario:
+def create_user(db: sqlite3.Connection, user: UsuarioCreate, hashed_password: Optional[str] = None) -> Usuario:
     """
     Crea un nuevo usuario en la base de datos.
 
     Args:
         db (sqlite3.Connection): Conexión a la base de datos.
         user (UsuarioCreate): Datos del usuario a crear.
+        hashed_password (Optional[str]): Hash ya calculado de la contraseña (por ejemplo,
+            con `security.get_password_hash_async`). Si no se indica, se calcula aquí.
 
     Raises:
-        HTTPException: Si el email ya está registrado.
+        HTTPException: Si el email o el nickname ya están registrados.
 
     Returns:
         Usuario: El usuario creado.
     """
-    hashed_password = security.get_password_hash(user.password)
+    if hashed_password is None:
+        hashed_password = security.get_password_hash(user.password)
     try:
-        cursor = db.execute(
-            "INSERT INTO usuarios (nombre, nickname, email, pwd_hash) VALUES (?, ?, ?, ?)",
+        row = db.execute(
+            "INSERT INTO usuarios (nombre, nickname, email, pwd_hash) VALUES (?, ?, ?, ?) RETURNING *",
             (user.nombre, user.nickname, user.email, hashed_password),
-        )
+        ).fetchone()
         db.commit()
-        user_id = cursor.lastrowid
-        return get_user(db, user_id)
-    except sqlite3.IntegrityError:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="El email ya está registrado.",
-        )
+    except sqlite3.IntegrityError as exc:
+        db.rollback()
+        raise integrity_error(exc)
+    autocomplete_index.add("usuarios", row["id"], row["nickname"])
+    return Usuario(**row)
 
 
+@response_cache.cached("/users/{id}", Usuario)
 def get_user(db: sqlite3.Connection, user_id: int) -> Optional[Usuario]:
     """
     Obtiene un usuario por su ID.
@@ -72,6 +78,29 @@ def get_user_by_email(db: sqlite3.Connection, email: str) -> Optional[Usuario]:
     return None
 
 
+def get_user_version(db: sqlite3.Connection, user_id: int) -> Optional[int]:
+    """
+    Obtiene la versión de un usuario: el `seq` de su último cambio en el registro
+    de cambios, o de la última recarga completa de `usuarios`.
+
+    Cambia con cualquier modificación o borrado del usuario, lo haga el proceso que
+    lo haga, así que sirve para revocar en todos los workers los tokens cacheados.
+
+    Args:
+        db (sqlite3.Connection): Conexión a la base de datos.
+        user_id (int): ID del usuario.
+
+    Returns:
+        Optional[int]: La versión, o None si el usuario no tiene cambios registrados.
+    """
+    row = db.execute(
+        "SELECT (SELECT MAX(seq) FROM cambios WHERE entidad = 'usuarios' AND id_entidad = ?), "
+        "(SELECT MAX(seq) FROM cambios WHERE entidad = 'usuarios' AND id_entidad IS NULL)",
+        (user_id,),
+    ).fetchone()
+    return max((seq for seq in row if seq is not None), default=None)
+
+
 def get_user_by_nickname(db: sqlite3.Connection, nickname: str) -> Optional[Usuario]:
     """
     Obtiene un usuario por su nickname.
@@ -89,7 +118,7 @@ def get_user_by_nickname(db: sqlite3.Connection, nickname: str) -> Optional[Usua
     return None
 
 
-def get_users(db: sqlite3.Connection, skip: int = 0, limit: int = 100) -> List[Usuario]:
+def get_users(db: sqlite3.Connection, skip: int = 0, limit: int = 100, after_id: Optional[int] = None) -> List[Usuario]:
     """
     Obtiene una lista de usuarios.
 
@@ -97,11 +126,15 @@ def get_users(db: sqlite3.Connection, skip: int = 0, limit: int = 100) -> List[U
         db (sqlite3.Connection): Conexión a la base de datos.
         skip (int): Número de registros a omitir.
         limit (int): Número máximo de registros a devolver.
+        after_id (Optional[int]): ID del último registro de la página anterior (paginación por cursor); si se indica, se ignora `skip`.
 
     Returns:
         List[Usuario]: Lista de usuarios.
     """
-    rows = db.execute("SELECT * FROM usuarios LIMIT ? OFFSET ?", (limit, skip)).fetchall()
+    if after_id is not None:
+        rows = db.execute("SELECT * FROM usuarios WHERE id > ? ORDER BY id LIMIT ?", (after_id, limit)).fetchall()
+    else:
+        rows = db.execute("SELECT * FROM usuarios ORDER BY id LIMIT ? OFFSET ?", (limit, skip)).fetchall()
     return [Usuario(**row) for row in rows]
 
 
@@ -114,16 +147,34 @@ def update_user(db: sqlite3.Connection, user_id: int, user: UsuarioBase) -> Opti
         user_id (int): ID del usuario a actualizar.
         user (UsuarioBase): Datos del usuario a actualizar.
 
+    Raises:
+        HTTPException: Si el email o el nickname ya pertenecen a otro usuario.
+
     Returns:
         Optional[Usuario]: El usuario actualizado si se encuentra, de lo contrario None.
     """
-    cursor = db.execute(
-        "UPDATE usuarios SET nombre = ?, nickname = ?, email = ? WHERE id = ?",
-        (user.nombre, user.nickname, user.email, user_id),
-    )
-    db.commit()
-    if cursor.rowcount > 0:
-        return get_user(db, user_id)
+    # El nickname anterior se lee en la misma transacción para sacarlo del autocompletado
+    db.execute("BEGIN IMMEDIATE")
+    try:
+        previous = db.execute("SELECT nickname FROM usuarios WHERE id = ?", (user_id,)).fetchone()
+        row = db.execute(
+            "UPDATE usuarios SET nombre = ?, nickname = ?, email = ? WHERE id = ? RETURNING *",
+            (user.nombre, user.nickname, user.email, user_id),
+        ).fetchone()
+        db.commit()
+    except sqlite3.IntegrityError as exc:
+        db.rollback()
+        raise integrity_error(exc)
+    except Exception:
+        db.rollback()
+        raise
+    if row:
+        if previous["nickname"] != row["nickname"]:
+            autocomplete_index.remove("usuarios", user_id, previous["nickname"])
+            autocomplete_index.add("usuarios", user_id, row["nickname"])
+        token_cache.invalidate_user(user_id)
+        response_cache.invalidate("/users/{id}", user_id)
+        return Usuario(**row)
     return None
 
 
@@ -138,7 +189,39 @@ def delete_user(db: sqlite3.Connection, user_id: int) -> bool:
     Returns:
         bool: True si el usuario fue eliminado, False en caso contrario.
     """
-    cursor = db.execute("DELETE FROM usuarios WHERE id = ?", (user_id,))
+    row = db.execute("DELETE FROM usuarios WHERE id = ? RETURNING nickname", (user_id,)).fetchone()
     db.commit()
-    return cursor.rowcount > 0
+    if row:
+        autocomplete_index.remove("usuarios", user_id, row["nickname"])
+        token_cache.invalidate_user(user_id)
+        response_cache.invalidate("/users/{id}", user_id)
+        return True
+    return False
+
 
+def create_users_bulk(db: sqlite3.Connection, users: List[UsuarioCreate], atomic: bool = True, hashes: Optional[List[str]] = None) -> ResultadoLote:
+    """
+    Crea muchos usuarios en una sola transacción.
+
+    Args:
+        db (sqlite3.Connection): Conexión a la base de datos.
+        users (List[UsuarioCreate]): Usuarios a crear.
+        atomic (bool): True para todo o nada, False para guardar los válidos.
+        hashes (Optional[List[str]]): Hashes ya calculados de las contraseñas, en el
+            orden de `users` (por ejemplo, con `security.hash_passwords_async`). Si no
+            se indican, se calculan aquí.
+
+    Returns:
+        ResultadoLote: Resultado de cada usuario (ID asignado o error).
+    """
+    if hashes is None:
+        hashes = security.hash_passwords([user.password for user in users])
+    rows = [
+        (user.nombre, user.nickname, user.email, hashed)
+        for user, hashed in zip(users, hashes)
+    ]
+    result = bulk_insert(db, "usuarios", ("nombre", "nickname", "email", "pwd_hash"), rows, atomic=atomic)
+    for item in result.resultados:
+        if item.ok:
+            autocomplete_index.add("usuarios", item.id, users[item.indice].nickname)
+    return result
@@ -0,0 +1,62 @@
+# app/crud/errors.py
+import sqlite3
+
+from fastapi import HTTPException, status
+
+# Mensajes para cada restricción de la base de datos. La clave es el texto que SQLite
+# incluye tras "UNIQUE constraint failed: " (tabla.columna[, tabla.columna...]).
+UNIQUE_MESSAGES = {
+    "usuarios.email": "El email ya está registrado.",
+    "usuarios.nickname": "El nickname ya está registrado.",
+    "equipos.nombre": "El nombre del equipo ya está registrado",
+    "equipos.id_capitan": "El capitán ya lidera otro equipo",
+    "torneos.nombre": "El nombre del torneo ya está registrado",
+    "miembros_equipo.id_usuario": "El usuario ya es miembro de un equipo",
+    "miembros_equipo.id_equipo, miembros_equipo.id_usuario": "El usuario ya es miembro de este equipo",
+    "miembros_equipo.id_equipo": "El equipo ya tiene un capitán",
+    "inscripciones.id_equipo, inscripciones.id_torneo": "El equipo ya está inscrito en este torneo",
+    "lista_espera.id_equipo, lista_espera.id_torneo": "El equipo ya está en la lista de espera de este torneo",
+}
+
+# Mensajes para los errores que lanzan los triggers con RAISE(ABORT, '<clave>').
+TRIGGER_MESSAGES = {
+    "torneo_completo": "El torneo está completo",
+}
+
+
+def integrity_message(exc: sqlite3.IntegrityError) -> str:
+    """
+    Traduce un error de integridad de SQLite a un mensaje para el cliente.
+
+    Args:
+        exc: Error de integridad lanzado por SQLite.
+
+    Returns:
+        str: Mensaje legible que identifica la restricción violada.
+    """
+    message = str(exc)
+    if message in TRIGGER_MESSAGES:
+        return TRIGGER_MESSAGES[message]
+    if message.startswith("UNIQUE constraint failed: "):
+        columns = message[len("UNIQUE constraint failed: "):]
+        return UNIQUE_MESSAGES.get(columns, "El registro ya existe")
+    if message.startswith("FOREIGN KEY constraint failed"):
+        return "Alguna de las referencias indicadas no existe"
+    if message.startswith("CHECK constraint failed"):
+        return "Datos inválidos"
+    if message.startswith("NOT NULL constraint failed"):
+        return "Faltan datos obligatorios"
+    return "Datos inválidos"
+
+
+def integrity_error(exc: sqlite3.IntegrityError) -> HTTPException:
+    """
+    Construye la HTTPException 400 correspondiente a un error de integridad.
+
+    Args:
+        exc: Error de integridad lanzado por SQLite.
+
+    Returns:
+        HTTPException: Excepción lista para lanzarse desde el CRUD.
+    """
+    return HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=integrity_message(exc))
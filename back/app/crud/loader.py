@@ -0,0 +1,81 @@
+# app/crud/loader.py
+import sqlite3
+from typing import Dict, Iterable, List, Optional
+
+from pydantic import BaseModel
+
+from app.schemas.match import Partido
+from app.schemas.team import Equipo
+from app.schemas.tournament import Torneo
+from app.schemas.user import Usuario
+
+# IDs por sentencia `IN (...)`: por debajo del límite de variables de SQLite
+# (999 en las versiones anteriores a 3.32, 32766 después)
+IN_CHUNK_SIZE = 500
+
+# Modelo con el que se devuelve cada tabla cargada por ID
+LOADER_MODELS: Dict[str, type] = {
+    "usuarios": Usuario,
+    "equipos": Equipo,
+    "torneos": Torneo,
+    "partidos": Partido,
+}
+
+
+def fetch_by_ids(db: sqlite3.Connection, table: str, ids: Iterable[int], columns: str = "*") -> Dict[int, sqlite3.Row]:
+    """
+    Lee las filas de una tabla con los IDs indicados en consultas `IN (...)` de
+    hasta `IN_CHUNK_SIZE` IDs.
+
+    Args:
+        db: Conexión a la base de datos.
+        table: Tabla con clave primaria `id`.
+        ids: IDs a leer (se ignoran los repetidos).
+        columns: Columnas a leer; deben incluir `id`.
+
+    Returns:
+        Las filas encontradas por ID (los IDs inexistentes no aparecen).
+    """
+    unique = list(dict.fromkeys(ids))
+    rows: Dict[int, sqlite3.Row] = {}
+    for start in range(0, len(unique), IN_CHUNK_SIZE):
+        chunk = unique[start:start + IN_CHUNK_SIZE]
+        placeholders = ", ".join("?" * len(chunk))
+        for row in db.execute(f"SELECT {columns} FROM {table} WHERE id IN ({placeholders})", chunk):
+            rows[row["id"]] = row
+    return rows
+
+
+class DataLoader:
+    """
+    Carga por ID de usuarios, equipos, torneos y partidos durante una petición.
+
+    Cada `load_many` lee todos los IDs pedidos con `fetch_by_ids` (una consulta por
+    cada `IN_CHUNK_SIZE` IDs, sin repetir los duplicados) y los devuelve como
+    modelos en el orden pedido.
+
+    No se comparte entre peticiones ni hilos; se obtiene con la dependencia
+    `get_loader`, que crea uno por petición.
+
+    Args:
+        db: Conexión de la petición.
+    """
+
+    def __init__(self, db: sqlite3.Connection):
+        self._db = db
+
+    def load_many(self, table: str, ids: Iterable[int]) -> List[Optional[BaseModel]]:
+        """
+        Devuelve las filas con esos IDs en el mismo orden (None si no existe).
+
+        Args:
+            table: Tabla (clave de `LOADER_MODELS`).
+            ids: IDs de las filas.
+
+        Returns:
+            Los modelos de las filas, en el orden de `ids`.
+        """
+        ids = list(ids)
+        model = LOADER_MODELS[table]
+        rows = fetch_by_ids(self._db, table, ids)
+        return [model(**rows[row_id]) if row_id in rows else None for row_id in ids]
@@ -0,0 +1,82 @@
+# app/crud/projection.py
+import sqlite3
+from typing import Any, Dict, List, Optional, Sequence
+
+from app.crud.loader import fetch_by_ids
+
+
+def _to_dicts(cursor: sqlite3.Cursor, columns: Sequence[str]) -> List[Dict[str, Any]]:
+    return [dict(zip(columns, row)) for row in cursor]
+
+
+def get_rows(
+    db: sqlite3.Connection,
+    table: str,
+    columns: Sequence[str],
+    skip: int = 0,
+    limit: int = 100,
+    after_id: Optional[int] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Lee una página de una tabla con sólo las columnas indicadas (`fields=`).
+
+    Devuelve diccionarios listos para serializar, sin construir los modelos de
+    pydantic: en tablas anchas, o con columnas grandes como `pwd_hash`, se leen y
+    envían sólo los datos que pide el cliente.
+
+    Args:
+        db: Conexión a la base de datos.
+        table: Tabla a leer.
+        columns: Columnas a leer, ya validadas contra el modelo de la tabla.
+        skip: Número de filas a omitir.
+        limit: Número máximo de filas a devolver.
+        after_id: ID de la última fila de la página anterior (paginación por cursor); si se indica, se ignora `skip`.
+
+    Returns:
+        Las filas como diccionarios con las columnas pedidas, ordenadas por ID.
+    """
+    cursor = db.cursor()
+    cursor.row_factory = None
+    select = f"SELECT {', '.join(columns)} FROM {table}"
+    if after_id is not None:
+        cursor.execute(f"{select} WHERE id > ? ORDER BY id LIMIT ?", (after_id, limit))
+    else:
+        cursor.execute(f"{select} ORDER BY id LIMIT ? OFFSET ?", (limit, skip))
+    return _to_dicts(cursor, columns)
+
+
+def get_row(db: sqlite3.Connection, table: str, row_id: int, columns: Sequence[str]) -> Optional[Dict[str, Any]]:
+    """
+    Lee una fila por ID con sólo las columnas indicadas.
+
+    Args:
+        db: Conexión a la base de datos.
+        table: Tabla a leer.
+        row_id: ID de la fila.
+        columns: Columnas a leer, ya validadas contra el modelo de la tabla.
+
+    Returns:
+        La fila como diccionario, o None si no existe.
+    """
+    cursor = db.cursor()
+    cursor.row_factory = None
+    cursor.execute(f"SELECT {', '.join(columns)} FROM {table} WHERE id = ?", (row_id,))
+    rows = _to_dicts(cursor, columns)
+    return rows[0] if rows else None
+
+
+def get_rows_by_ids(db: sqlite3.Connection, table: str, ids: Sequence[int], columns: Sequence[str]) -> List[Dict[str, Any]]:
+    """
+    Lee las filas con los IDs indicados con sólo las columnas pedidas.
+
+    Args:
+        db: Conexión a la base de datos.
+        table: Tabla a leer.
+        ids: IDs de las filas, sin repetir.
+        columns: Columnas a leer; deben incluir `id`.
+
+    Returns:
+        Las filas como diccionarios en el orden de `ids`, sin los IDs inexistentes.
+    """
+    rows = fetch_by_ids(db, table, ids, columns=", ".join(columns))
+    return [dict(rows[row_id]) for row_id in ids if row_id in rows]
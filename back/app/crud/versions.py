@@ -0,0 +1,41 @@
+# app/crud/versions.py
+import sqlite3
+from typing import Optional
+
+# Tablas con columna `version` mantenida por triggers (migración 4)
+VERSIONED_TABLES = ("torneos", "partidos", "equipos", "inscripciones")
+
+
+def get_row_version(db: sqlite3.Connection, table: str, row_id: int) -> Optional[int]:
+    """
+    Obtiene la versión de una fila sin leer el resto de sus columnas.
+
+    Args:
+        db: Conexión a la base de datos.
+        table: Tabla versionada.
+        row_id: ID de la fila.
+
+    Returns:
+        La versión de la fila o None si no existe.
+    """
+    if table not in VERSIONED_TABLES:
+        raise ValueError(f"Tabla sin versión: {table}")
+    row = db.execute(f"SELECT version FROM {table} WHERE id = ?", (row_id,)).fetchone()
+    return row[0] if row else None
+
+
+def get_collection_version(db: sqlite3.Connection, table: str) -> int:
+    """
+    Obtiene la versión de una colección, que cambia con cada alta, baja o modificación de sus filas.
+
+    Args:
+        db: Conexión a la base de datos.
+        table: Tabla versionada.
+
+    Returns:
+        La versión de la colección.
+    """
+    if table not in VERSIONED_TABLES:
+        raise ValueError(f"Tabla sin versión: {table}")
+    row = db.execute("SELECT version FROM versiones_coleccion WHERE tabla = ?", (table,)).fetchone()
+    return row[0] if row else 0
@@ -1,36 +1,310 @@
 # app/db/database.py
 import os
 import sqlite3
+import threading
+from contextlib import contextmanager
+from typing import AsyncIterator, Dict, Iterator, Optional
+
+import anyio
+
+from app.db.maintenance import ChangeLogCompactor, PeriodicTask, WalCheckpointer
+from app.db.migrations import migrate
+from app.db.pool import ConnectionPool
 
 DB_PATH = "app_db.db"
 
-def get_db():
+# Configuración del pool de conexiones (uno por proceso/worker)
+DB_POOL_SIZE = int(os.environ.get("DB_POOL_SIZE", "8"))
+DB_POOL_TIMEOUT = float(os.environ.get("DB_POOL_TIMEOUT", "5"))
+# Con DB_POOL_DISABLED=1 cada petición abre y cierra su propia conexión (útil en pruebas)
+DB_POOL_DISABLED = os.environ.get("DB_POOL_DISABLED", "0") == "1"
+# Hilos que pueden estar esperando a la vez una conexión libre del pool
+DB_POOL_WAITERS = int(os.environ.get("DB_POOL_WAITERS", "64"))
+
+# Perfiles de durabilidad/rendimiento que se aplican a cada conexión nueva.
+# cache_size negativo se expresa en KiB; mmap_size en bytes; busy_timeout en ms.
+PRAGMA_PROFILES: Dict[str, Dict[str, object]] = {
+    # Máxima durabilidad: fsync en cada commit, sin memoria mapeada.
+    "durable": {
+        "journal_mode": "WAL",
+        "synchronous": "FULL",
+        "cache_size": -16000,
+        "mmap_size": 0,
+        "temp_store": "DEFAULT",
+        "busy_timeout": 5000,
+        "journal_size_limit": 64 * 1024 * 1024,
+    },
+    # Por defecto: en WAL, synchronous=NORMAL no pierde consistencia ante caídas,
+    # sólo las últimas transacciones confirmadas si se corta la luz.
+    "balanced": {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "cache_size": -64000,
+        "mmap_size": 256 * 1024 * 1024,
+        "temp_store": "MEMORY",
+        "busy_timeout": 5000,
+        "journal_size_limit": 64 * 1024 * 1024,
+    },
+    # Cargas masivas o entornos desechables: sin fsync.
+    "fast": {
+        "journal_mode": "WAL",
+        "synchronous": "OFF",
+        "cache_size": -128000,
+        "mmap_size": 1024 * 1024 * 1024,
+        "temp_store": "MEMORY",
+        "busy_timeout": 10000,
+        "journal_size_limit": 256 * 1024 * 1024,
+    },
+}
+DB_PROFILE = os.environ.get("DB_PROFILE", "balanced")
+
+# Checkpoint periódico del WAL
+DB_CHECKPOINT_INTERVAL = float(os.environ.get("DB_CHECKPOINT_INTERVAL", "30"))
+DB_WAL_MAX_BYTES = int(os.environ.get("DB_WAL_MAX_BYTES", str(64 * 1024 * 1024)))
+
+# Días que se conservan las entradas del registro de cambios (0: sin límite) y
+# segundos entre purgas y compactaciones
+CHANGES_RETENTION_DAYS = float(os.environ.get("CHANGES_RETENTION_DAYS", "7"))
+CHANGES_COMPACT_INTERVAL = float(os.environ.get("CHANGES_COMPACT_INTERVAL", "60"))
+
+_pool: Optional[ConnectionPool] = None
+_pool_lock = threading.Lock()
+
+_checkpointer: Optional[WalCheckpointer] = None
+_checkpoint_task: Optional[PeriodicTask] = None
+
+_change_compactor: Optional[ChangeLogCompactor] = None
+_change_compact_task: Optional[PeriodicTask] = None
+
+
+def apply_pragma_profile(conn: sqlite3.Connection, profile: Optional[str] = None) -> None:
     """
-    Dependencia que proporciona una conexión a la base de datos SQLite.
+    Aplica un perfil de PRAGMAs (journal_mode, synchronous, cache_size, mmap_size,
+    temp_store, busy_timeout, journal_size_limit) a una conexión.
 
-    Establece una conexión a la base de datos 'app_db.db', configura la
-    factoría de filas para que devuelva diccionarios (sqlite3.Row) y asegura
-    que las claves foráneas estén habilitadas. La conexión se cierra
-    automáticamente después de su uso.
+    Args:
+        conn: Conexión a configurar.
+        profile: Nombre del perfil en `PRAGMA_PROFILES`. Por defecto `DB_PROFILE`.
 
-    Yields:
-        sqlite3.Connection: Objeto de conexión a la base de datos.
+    Raises:
+        ValueError: Si el perfil no existe.
+    """
+    name = profile or DB_PROFILE
+    if name not in PRAGMA_PROFILES:
+        raise ValueError(f"Perfil de base de datos desconocido: {name}")
+    for pragma, value in PRAGMA_PROFILES[name].items():
+        conn.execute(f"PRAGMA {pragma} = {value};")
+
+
+def create_connection() -> sqlite3.Connection:
+    """
+    Abre una conexión nueva a la base de datos y la deja lista para usarse.
+
+    Configura la factoría de filas para que devuelva diccionarios (sqlite3.Row),
+    habilita las claves foráneas y aplica el perfil de PRAGMAs activo
+    (ver `PRAGMA_PROFILES`).
+
+    Returns:
+        sqlite3.Connection: Conexión configurada.
     """
     conn = sqlite3.connect(DB_PATH, check_same_thread=False)
     conn.row_factory = sqlite3.Row
     conn.execute("PRAGMA foreign_keys = ON;")
+    apply_pragma_profile(conn)
+    return conn
+
+
+def get_pool() -> ConnectionPool:
+    """
+    Devuelve el pool de conexiones del proceso, creándolo la primera vez.
+
+    Returns:
+        ConnectionPool: Pool compartido por todas las peticiones del worker.
+    """
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ConnectionPool(create_connection, size=DB_POOL_SIZE, timeout=DB_POOL_TIMEOUT)
+    return _pool
+
+
+def close_pool() -> None:
+    """
+    Cierra el pool de conexiones del proceso, si existe.
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.close()
+            _pool = None
+
+
+def set_pool_enabled(enabled: bool) -> None:
+    """
+    Activa o desactiva el uso del pool. Con el pool desactivado cada petición
+    abre una conexión nueva y la cierra al terminar.
+
+    Args:
+        enabled: `True` para usar el pool, `False` para omitirlo.
+    """
+    global DB_POOL_DISABLED
+    DB_POOL_DISABLED = not enabled
+    if not enabled:
+        close_pool()
+
+
+def get_pool_stats() -> Dict[str, object]:
+    """
+    Devuelve las métricas del pool de conexiones.
+
+    Returns:
+        Diccionario con las métricas del pool, o `{"enabled": False}` si está desactivado.
+    """
+    if DB_POOL_DISABLED:
+        return {"enabled": False}
+    return {"enabled": True, **get_pool().stats()}
+
+
+def start_wal_checkpointer() -> None:
+    """
+    Arranca la tarea de fondo que hace checkpoint del WAL cada
+    `DB_CHECKPOINT_INTERVAL` segundos.
+    """
+    global _checkpointer, _checkpoint_task
+    if _checkpoint_task is not None:
+        return
+    _checkpointer = WalCheckpointer(create_connection, DB_PATH, DB_WAL_MAX_BYTES)
+    _checkpoint_task = PeriodicTask("wal-checkpoint", DB_CHECKPOINT_INTERVAL, _checkpointer.run)
+    _checkpoint_task.start()
+
+
+def stop_wal_checkpointer() -> None:
+    """
+    Detiene la tarea de checkpoint del WAL, si está en marcha.
+    """
+    global _checkpoint_task
+    if _checkpoint_task is not None:
+        _checkpoint_task.stop()
+        _checkpoint_task = None
+
+
+def get_checkpoint_stats() -> Dict[str, object]:
+    """
+    Devuelve las métricas de los checkpoints del WAL.
+
+    Returns:
+        Diccionario con las métricas del checkpointer, o vacío si no se ha arrancado.
+    """
+    if _checkpointer is None:
+        return {}
+    return {"profile": DB_PROFILE, **_checkpointer.stats()}
+
+
+def start_change_log_compactor() -> None:
+    """
+    Arranca la tarea de fondo que purga (según `CHANGES_RETENTION_DAYS`) y compacta
+    el registro de cambios cada `CHANGES_COMPACT_INTERVAL` segundos.
+    """
+    global _change_compactor, _change_compact_task
+    if _change_compact_task is not None:
+        return
+    _change_compactor = ChangeLogCompactor(create_connection, CHANGES_RETENTION_DAYS)
+    _change_compact_task = PeriodicTask("change-log-compact", CHANGES_COMPACT_INTERVAL, _change_compactor.run)
+    _change_compact_task.start()
+
+
+def stop_change_log_compactor() -> None:
+    """
+    Detiene la tarea de mantenimiento del registro de cambios, si está en marcha.
+    """
+    global _change_compact_task
+    if _change_compact_task is not None:
+        _change_compact_task.stop()
+        _change_compact_task = None
+
+
+def get_change_log_stats() -> Dict[str, object]:
+    """
+    Devuelve las métricas del mantenimiento del registro de cambios.
+
+    Returns:
+        Diccionario con las métricas del compactador, o vacío si no se ha arrancado.
+    """
+    if _change_compactor is None:
+        return {}
+    return _change_compactor.stats()
+
+
+@contextmanager
+def connection() -> Iterator[sqlite3.Connection]:
+    """
+    Context manager que presta una conexión del pool y la devuelve al salir.
+
+    Si el pool está desactivado, abre una conexión nueva y la cierra al salir.
+
+    Yields:
+        sqlite3.Connection: Objeto de conexión a la base de datos.
+    """
+    if DB_POOL_DISABLED:
+        conn = create_connection()
+        try:
+            yield conn
+        finally:
+            conn.close()
+        return
+
+    pool = get_pool()
+    conn = pool.acquire()
     try:
         yield conn
     finally:
-        conn.close()
+        pool.release(conn)
+
+
+_acquire_limiter: Optional[anyio.CapacityLimiter] = None
+
+
+async def get_db() -> AsyncIterator[sqlite3.Connection]:
+    """
+    Dependencia que proporciona una conexión a la base de datos SQLite.
+
+    Toma una conexión ya configurada del pool del proceso (ver `create_connection`)
+    y la devuelve al pool después de su uso, revirtiendo cualquier transacción
+    pendiente.
+
+    La espera por una conexión libre se hace en hilos propios (como mucho
+    `DB_POOL_WAITERS`) y no en el threadpool de los endpoints: si no, con muchas
+    peticiones simultáneas los hilos bloqueados esperando conexión ocupan todo el
+    threadpool, las peticiones que ya tienen conexión no pueden ejecutarse para
+    devolverla y todo se detiene hasta agotar `DB_POOL_TIMEOUT`.
+
+    Yields:
+        sqlite3.Connection: Objeto de conexión a la base de datos.
+    """
+    if DB_POOL_DISABLED:
+        with connection() as conn:
+            yield conn
+        return
+
+    global _acquire_limiter
+    if _acquire_limiter is None:
+        _acquire_limiter = anyio.CapacityLimiter(DB_POOL_WAITERS)
+    pool = get_pool()
+    conn = await anyio.to_thread.run_sync(pool.acquire, limiter=_acquire_limiter)
+    try:
+        yield conn
+    finally:
+        pool.release(conn)
 
 def initialize_database():
     """
     Inicializa la base de datos al inicio de la aplicación.
 
-    Este procedimiento verifica si el archivo de base de datos (`app_db.db`) existe. Si no,
-    lo crea y configura todas las tablas necesarias para el funcionamiento del sistema,
-    incluyendo restricciones de claves foráneas y restricciones únicas.
+    Aplica las migraciones pendientes de `app.db.migrations` (ver `migrate`). En una
+    base de datos nueva esto crea todas las tablas; en una existente sólo aplica los
+    cambios posteriores a la versión registrada en `schema_version`, de modo que las
+    instalaciones ya desplegadas también reciben los índices y columnas nuevos.
 
     **Tablas principales**:
     - `usuarios`: Almacena información básica de los usuarios, como nombre, nickname
@@ -58,96 +332,10 @@ def initialize_database():
     Cada tabla está diseñada con integridad referencial en mente para mantener la
     cohesión y consistencia de los datos.
     """
-    if not os.path.exists(DB_PATH):
-        with sqlite3.connect(DB_PATH) as conn:
-            cur = conn.cursor()
-            cur.executescript("""
-            PRAGMA foreign_keys = ON;
-
-            CREATE TABLE usuarios (
-              id          INTEGER PRIMARY KEY AUTOINCREMENT,
-              nombre      TEXT    NOT NULL,
-              nickname    TEXT    NOT NULL,
-              email       TEXT    NOT NULL UNIQUE,
-              pwd_hash    TEXT    NOT NULL,
-              fecha_reg   DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP
-            );
-
-            CREATE TABLE equipos (
-              id          INTEGER PRIMARY KEY AUTOINCREMENT,
-              nombre      TEXT    NOT NULL UNIQUE,
-              id_capitan  INTEGER NOT NULL,
-              FOREIGN KEY(id_capitan) REFERENCES usuarios(id) ON DELETE RESTRICT
-            );
-
-            CREATE TABLE miembros_equipo (
-              id           INTEGER PRIMARY KEY AUTOINCREMENT,
-              id_equipo    INTEGER NOT NULL,
-              id_usuario   INTEGER NOT NULL,
-              rol          TEXT    NOT NULL DEFAULT 'jugador'
-                                   CHECK(rol IN ('jugador','capitan','suplente')),
-              UNIQUE(id_equipo, id_usuario),
-              FOREIGN KEY(id_equipo) REFERENCES equipos(id) ON DELETE CASCADE,
-              FOREIGN KEY(id_usuario) REFERENCES usuarios(id) ON DELETE CASCADE
-            );
-
-            CREATE UNIQUE INDEX idx_unq_capitan_equipo
-              ON miembros_equipo(id_equipo)
-              WHERE rol = 'capitan';
-
-            CREATE TABLE torneos (
-              id           INTEGER PRIMARY KEY AUTOINCREMENT,
-              nombre       TEXT    NOT NULL,
-              descripcion  TEXT,
-              fecha_inicio DATETIME NOT NULL,
-              fecha_fin    DATETIME NOT NULL,
-              max_equipos  INTEGER NOT NULL CHECK(max_equipos > 0),
-              estado       TEXT    NOT NULL DEFAULT 'programado'
-                                   CHECK(estado IN ('programado','en_curso','finalizado')),
-              stream_url   TEXT,
-              id_organizador INTEGER NOT NULL,
-              FOREIGN KEY(id_organizador) REFERENCES usuarios(id) ON DELETE RESTRICT
-            );
-
-            CREATE TABLE inscripciones (
-              id                   INTEGER PRIMARY KEY AUTOINCREMENT,
-              id_equipo            INTEGER NOT NULL,
-              id_torneo            INTEGER NOT NULL,
-              fecha_inscripcion    DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
-              UNIQUE(id_equipo, id_torneo),
-              FOREIGN KEY(id_equipo) REFERENCES equipos(id) ON DELETE CASCADE,
-              FOREIGN KEY(id_torneo) REFERENCES torneos(id) ON DELETE CASCADE
-            );
-
-            CREATE TABLE pagos (
-              id            INTEGER PRIMARY KEY AUTOINCREMENT,
-              id_equipo     INTEGER NOT NULL,
-              id_torneo     INTEGER NOT NULL,
-              monto_cent    INTEGER NOT NULL CHECK(monto_cent >= 0),
-              estado        TEXT NOT NULL DEFAULT 'pendiente'
-                                    CHECK(estado IN ('pendiente','confirmado')),
-              fecha_pago    DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
-              FOREIGN KEY(id_equipo) REFERENCES equipos(id) ON DELETE CASCADE,
-              FOREIGN KEY(id_torneo) REFERENCES torneos(id) ON DELETE CASCADE
-            );
-
-            CREATE TABLE partidos (
-              id                   INTEGER PRIMARY KEY AUTOINCREMENT,
-              id_torneo            INTEGER NOT NULL,
-              equipo_local         INTEGER NOT NULL,
-              equipo_visitante     INTEGER NOT NULL,
-              fecha                DATETIME NOT NULL,
-              resultado_local      INTEGER,
-              resultado_visitante  INTEGER,
-              FOREIGN KEY(id_torneo) REFERENCES torneos(id) ON DELETE CASCADE,
-              FOREIGN KEY(equipo_local) REFERENCES equipos(id) ON DELETE RESTRICT,
-              FOREIGN KEY(equipo_visitante) REFERENCES equipos(id) ON DELETE RESTRICT,
-              CHECK(equipo_local <> equipo_visitante)
-            );
-
-            CREATE INDEX idx_usuarios_nickname ON usuarios(nickname);
-            CREATE INDEX idx_insc_torneo     ON inscripciones(id_torneo);
-            CREATE INDEX idx_pagos_torneo    ON pagos(id_torneo);
-            """)
-            print("🔧 DB creada.")
-
+    conn = create_connection()
+    try:
+        applied = migrate(conn)
+    finally:
+        conn.close()
+    if applied:
+        print(f"🔧 Migraciones aplicadas: {', '.join(str(v) for v in applied)}")
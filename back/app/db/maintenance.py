@@ -0,0 +1,262 @@
+# app/db/maintenance.py
+import logging
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class PeriodicTask:
+    """
+    Ejecuta una función cada `interval` segundos en un hilo de fondo.
+
+    Los errores de una ejecución se registran en el log y no detienen la tarea.
+
+    Args:
+        name: Nombre del hilo (para logs y depuración).
+        interval: Segundos entre ejecuciones.
+        func: Función sin argumentos a ejecutar.
+    """
+
+    def __init__(self, name: str, interval: float, func: Callable[[], None]):
+        self.name = name
+        self.interval = interval
+        self._func = func
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        """
+        Arranca el hilo de fondo si no está en marcha.
+        """
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """
+        Detiene el hilo de fondo y espera a que termine.
+
+        Args:
+            timeout: Segundos máximos de espera.
+        """
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            try:
+                self._func()
+            except Exception:
+                logger.exception("Error en la tarea periódica %s", self.name)
+
+
+class WalCheckpointer:
+    """
+    Mantiene acotado el fichero `-wal` de la base de datos.
+
+    En cada ejecución hace un checkpoint PASSIVE (no bloquea a lectores ni
+    escritores). Si el fichero `-wal` supera `max_wal_bytes`, hace un checkpoint
+    TRUNCATE para devolverlo a tamaño cero. Registra la duración y las páginas
+    procesadas del último checkpoint.
+
+    Args:
+        connect: Función que abre una conexión a la base de datos.
+        db_path: Ruta del fichero de base de datos.
+        max_wal_bytes: Tamaño del `-wal` a partir del cual se trunca.
+    """
+
+    def __init__(self, connect: Callable[[], sqlite3.Connection], db_path: str, max_wal_bytes: int):
+        self._connect = connect
+        self._wal_path = f"{db_path}-wal"
+        self.max_wal_bytes = max_wal_bytes
+        self._lock = threading.Lock()
+        self._stats: Dict[str, object] = {
+            "runs": 0,
+            "truncates": 0,
+            "busy": 0,
+            "last_mode": None,
+            "last_duration_ms": 0.0,
+            "last_log_pages": 0,
+            "last_checkpointed_pages": 0,
+            "total_checkpointed_pages": 0,
+            "wal_bytes": 0,
+        }
+
+    def _wal_size(self) -> int:
+        try:
+            return os.path.getsize(self._wal_path)
+        except OSError:
+            return 0
+
+    def run(self) -> None:
+        """
+        Ejecuta un checkpoint y actualiza las métricas.
+        """
+        mode = "TRUNCATE" if self._wal_size() > self.max_wal_bytes else "PASSIVE"
+        conn = self._connect()
+        try:
+            start = time.perf_counter()
+            busy, log_pages, checkpointed = conn.execute(f"PRAGMA wal_checkpoint({mode});").fetchone()
+            duration = time.perf_counter() - start
+        finally:
+            conn.close()
+
+        with self._lock:
+            self._stats["runs"] += 1
+            if mode == "TRUNCATE":
+                self._stats["truncates"] += 1
+            if busy:
+                self._stats["busy"] += 1
+            self._stats["last_mode"] = mode
+            self._stats["last_duration_ms"] = duration * 1000
+            self._stats["last_log_pages"] = log_pages
+            self._stats["last_checkpointed_pages"] = checkpointed
+            self._stats["total_checkpointed_pages"] += max(checkpointed, 0)
+            self._stats["wal_bytes"] = self._wal_size()
+
+    def stats(self) -> Dict[str, object]:
+        """
+        Devuelve las métricas de los checkpoints realizados.
+
+        Returns:
+            Diccionario con número de ejecuciones, duración y páginas del último checkpoint.
+        """
+        with self._lock:
+            return dict(self._stats)
+
+
+class ChangeLogCompactor:
+    """
+    Mantiene acotado el registro de cambios (`cambios`) que sirve `/changes`.
+
+    En cada ejecución:
+
+    - Purga las entradas con más de `retention_days` días, por lotes de
+      `batch_size` en transacciones cortas, y anota en `cambios_retencion` el último
+      `seq` purgado (los cursores anteriores reciben 410 y deben resincronizar).
+    - Compacta las entradas nuevas desde la última ejecución: borra las anteriores
+      de la misma fila (basta con la última para sincronizar) y las de una entidad
+      recargada entera ('reload'). Sólo recorre lo añadido desde `compactado_hasta`,
+      así que su coste depende de los cambios nuevos y no del tamaño del registro.
+
+    Args:
+        connect: Función que abre una conexión a la base de datos.
+        retention_days: Días que se conservan las entradas (0 o menos: sin límite).
+        batch_size: Entradas purgadas por transacción.
+    """
+
+    def __init__(self, connect: Callable[[], sqlite3.Connection], retention_days: float, batch_size: int = 10000):
+        self._connect = connect
+        self.retention_days = retention_days
+        self.batch_size = batch_size
+        self._lock = threading.Lock()
+        self._stats: Dict[str, object] = {
+            "runs": 0,
+            "purged": 0,
+            "compacted": 0,
+            "last_duration_ms": 0.0,
+            "purged_through": 0,
+            "compacted_through": 0,
+        }
+
+    def _purge(self, conn: sqlite3.Connection) -> int:
+        if self.retention_days <= 0:
+            return 0
+        cutoff = (datetime.now(timezone.utc) - timedelta(days=self.retention_days)).strftime("%Y-%m-%dT%H:%M:%S.000Z")
+        total = 0
+        while True:
+            # `fecha` crece con `seq`: las entradas caducadas son un prefijo del registro
+            (last,) = conn.execute(
+                "SELECT MAX(seq) FROM (SELECT seq, fecha FROM cambios ORDER BY seq LIMIT ?) WHERE fecha < ?",
+                (self.batch_size, cutoff),
+            ).fetchone()
+            if last is None:
+                return total
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                deleted = conn.execute("DELETE FROM cambios WHERE seq <= ?", (last,)).rowcount
+                conn.execute("UPDATE cambios_retencion SET purgado_hasta = MAX(purgado_hasta, ?)", (last,))
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+            total += deleted
+            if deleted < self.batch_size:
+                return total
+
+    def _compact(self, conn: sqlite3.Connection) -> int:
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            (start,) = conn.execute("SELECT compactado_hasta FROM cambios_retencion").fetchone()
+            (head,) = conn.execute("SELECT COALESCE(MAX(seq), 0) FROM cambios").fetchone()
+            deleted = 0
+            if head > start:
+                deleted += conn.execute(
+                    """
+                    DELETE FROM cambios WHERE seq IN (
+                      SELECT o.seq FROM cambios n
+                      JOIN cambios o ON o.entidad = n.entidad AND o.id_entidad = n.id_entidad AND o.seq < n.seq
+                      WHERE n.seq > ? AND n.seq <= ?
+                    )
+                    """,
+                    (start, head),
+                ).rowcount
+                deleted += conn.execute(
+                    """
+                    DELETE FROM cambios WHERE seq IN (
+                      SELECT o.seq FROM cambios r
+                      JOIN cambios o ON o.entidad = r.entidad AND o.seq < r.seq
+                      WHERE r.op = 'reload' AND r.seq > ? AND r.seq <= ?
+                    )
+                    """,
+                    (start, head),
+                ).rowcount
+                conn.execute("UPDATE cambios_retencion SET compactado_hasta = ?", (head,))
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        return deleted
+
+    def run(self) -> None:
+        """
+        Purga y compacta el registro de cambios y actualiza las métricas.
+        """
+        conn = self._connect()
+        try:
+            start = time.perf_counter()
+            purged = self._purge(conn)
+            compacted = self._compact(conn)
+            duration = time.perf_counter() - start
+            purged_through, compacted_through = conn.execute(
+                "SELECT purgado_hasta, compactado_hasta FROM cambios_retencion"
+            ).fetchone()
+        finally:
+            conn.close()
+
+        with self._lock:
+            self._stats["runs"] += 1
+            self._stats["purged"] += purged
+            self._stats["compacted"] += compacted
+            self._stats["last_duration_ms"] = duration * 1000
+            self._stats["purged_through"] = purged_through
+            self._stats["compacted_through"] = compacted_through
+
+    def stats(self) -> Dict[str, object]:
+        """
+        Devuelve las métricas del mantenimiento del registro de cambios.
+
+        Returns:
+            Diccionario con entradas purgadas y compactadas y hasta qué `seq`.
+        """
+        with self._lock:
+            return {"retention_days": self.retention_days, **self._stats}
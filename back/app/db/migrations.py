@@ -0,0 +1,879 @@
+# app/db/migrations.py
+import json
+import logging
+import sqlite3
+from datetime import datetime, timezone
+from typing import Callable, List, NamedTuple, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class Migration(NamedTuple):
+    """
+    Cambio versionado del esquema.
+
+    Attributes:
+        version: Número de versión, único y creciente.
+        description: Descripción breve del cambio.
+        sql: Script SQL a ejecutar (puede contener varias sentencias y triggers).
+        probes: Consultas `(sql, params)` cuyo EXPLAIN QUERY PLAN se registra
+            antes y después de aplicar la migración.
+        func: Paso opcional en Python que se ejecuta tras el SQL, dentro de la
+            misma transacción (por ejemplo, para rellenar columnas nuevas).
+        preflight: Comprobación opcional que se ejecuta antes del SQL, dentro de la
+            misma transacción; lanza `MigrationError` si los datos existentes
+            impiden aplicar la migración.
+    """
+    version: int
+    description: str
+    sql: str
+    probes: Tuple[Tuple[str, tuple], ...] = ()
+    func: Optional[Callable[[sqlite3.Connection], None]] = None
+    preflight: Optional[Callable[[sqlite3.Connection], None]] = None
+
+
+class MigrationError(RuntimeError):
+    """
+    Los datos de la base de datos impiden aplicar una migración.
+    """
+
+
+# Columnas que la migración 3 convierte en UNIQUE
+_UNIQUE_COLUMNS = (
+    ("usuarios", "nickname"),
+    ("torneos", "nombre"),
+    ("equipos", "id_capitan"),
+    ("miembros_equipo", "id_usuario"),
+)
+
+
+def _check_unique_duplicates(conn: sqlite3.Connection) -> None:
+    """
+    Comprueba que no haya valores repetidos en las columnas de `_UNIQUE_COLUMNS`.
+
+    Crear el índice UNIQUE con duplicados fallaría con un error de SQLite que no
+    dice qué filas sobran. En su lugar se listan los valores repetidos con los IDs
+    de sus filas (hasta 20 por columna) para que se corrijan antes de arrancar.
+
+    Raises:
+        MigrationError: Si alguna columna tiene valores repetidos.
+    """
+    problems = []
+    for table, column in _UNIQUE_COLUMNS:
+        rows = conn.execute(
+            f"SELECT {column}, group_concat(id, ', ') FROM {table} WHERE {column} IS NOT NULL "
+            f"GROUP BY {column} HAVING COUNT(*) > 1 ORDER BY {column} LIMIT 20"
+        ).fetchall()
+        problems.extend(f"  - {table}.{column} = {value!r} (ids {ids})" for value, ids in rows)
+    if problems:
+        raise MigrationError(
+            "No se pueden crear las restricciones UNIQUE: hay valores repetidos. "
+            "Corríjalos (renombrar o borrar las filas sobrantes) y vuelva a arrancar:\n" + "\n".join(problems)
+        )
+
+
+def _rebuild_standings(conn: sqlite3.Connection) -> None:
+    """
+    Rellena la clasificación a partir de los partidos ya registrados.
+    """
+    from app.crud.crud_standings import rebuild_standings
+
+    rebuild_standings(conn)
+
+
+def _recompute_ratings(conn: sqlite3.Connection) -> None:
+    """
+    Calcula los ratings a partir de los partidos ya registrados.
+    """
+    from app.crud.crud_rating import recompute_ratings
+
+    recompute_ratings(conn)
+
+
+def _fill_match_times(conn: sqlite3.Connection) -> None:
+    """
+    Rellena `inicio` y `fin` de los partidos creados a mano cuya fecha es ISO 8601.
+
+    Los partidos generados por el calendario (`llave` no nula) tienen fechas
+    orientativas y quedan sin programar, igual que los que chocarían con otro
+    (ver `_unschedule_overlaps`).
+    """
+    from app.services.scheduler import DURACION_PARTIDO_MIN, to_timestamp
+
+    rows = []
+    for match_id, fecha in conn.execute("SELECT id, fecha FROM partidos WHERE llave IS NULL"):
+        inicio = to_timestamp(fecha)
+        if inicio is not None:
+            rows.append((inicio, inicio + DURACION_PARTIDO_MIN * 60, match_id))
+    conn.executemany("UPDATE partidos SET inicio = ?, fin = ? WHERE id = ?", rows)
+    _unschedule_overlaps(conn)
+
+
+def _unschedule_overlaps(conn: sqlite3.Connection) -> None:
+    """
+    Deja sin programar (`inicio` y `fin` nulos) los partidos cuyo horario choca con
+    otro anterior del mismo equipo o de la misma sede.
+
+    `find_conflict` sólo mira el partido inmediatamente anterior de cada equipo y
+    sede, lo que supone que sus horarios no se solapan entre sí. Los horarios
+    rellenados desde `fecha` no pasaron por esa comprobación: se quitan los que
+    chocan con uno anterior (ver `find_overlaps`). Conservan su `fecha` y se pueden
+    volver a programar; sus IDs se registran como aviso.
+    """
+    from app.crud.crud_match import find_overlaps
+
+    overlapping = find_overlaps(conn)
+    if overlapping:
+        conn.executemany("UPDATE partidos SET inicio = NULL, fin = NULL WHERE id = ?", [(i,) for i in overlapping])
+        logger.warning(
+            "%d partidos con horario solapado quedan sin programar: %s",
+            len(overlapping), ", ".join(str(i) for i in overlapping),
+        )
+
+
+# Marca de tiempo UTC con milisegundos; su orden como texto es el cronológico
+_NOW_SQL = "strftime('%Y-%m-%dT%H:%M:%fZ', 'now')"
+
+
+def _updated_at_sql(table: str, created: Optional[str], versioned: bool) -> str:
+    """
+    SQL que añade a `table` la columna `actualizado_en`, la rellena (con la fecha de
+    creación si la hay) y la mantiene con triggers en cada inserción y actualización.
+
+    En las tablas con `version` se sustituye su trigger de versión por uno que
+    actualiza ambas columnas a la vez; el sellado de las inserciones sólo cambia
+    `actualizado_en` y no cuenta como nueva versión.
+    """
+    backfill = f"strftime('%Y-%m-%dT%H:%M:%fZ', {created})" if created else _NOW_SQL
+    sql = f"""
+        ALTER TABLE {table} ADD COLUMN actualizado_en TEXT;
+        CREATE TRIGGER trg_{table}_actualizado_ins AFTER INSERT ON {table}
+        BEGIN
+          UPDATE {table} SET actualizado_en = {_NOW_SQL} WHERE id = NEW.id;
+        END;
+    """
+    if versioned:
+        sql += f"""
+        DROP TRIGGER trg_{table}_version;
+        CREATE TRIGGER trg_{table}_version AFTER UPDATE ON {table}
+          FOR EACH ROW WHEN NEW.version = OLD.version AND NEW.actualizado_en IS OLD.actualizado_en
+        BEGIN
+          UPDATE {table} SET version = OLD.version + 1, actualizado_en = {_NOW_SQL} WHERE id = NEW.id;
+        END;
+        """
+    else:
+        sql += f"""
+        CREATE TRIGGER trg_{table}_actualizado_upd AFTER UPDATE ON {table}
+          FOR EACH ROW WHEN NEW.actualizado_en IS OLD.actualizado_en
+        BEGIN
+          UPDATE {table} SET actualizado_en = {_NOW_SQL} WHERE id = NEW.id;
+        END;
+        """
+    sql += f"""
+        UPDATE {table} SET actualizado_en = COALESCE({backfill}, {_NOW_SQL});
+        CREATE INDEX idx_{table}_actualizado ON {table}(actualizado_en);
+    """
+    return sql
+
+
+# Tablas del registro de cambios (`cambios`) y si tienen columna `version`
+_CHANGELOG_TABLES = (
+    ("usuarios", False),
+    ("equipos", True),
+    ("miembros_equipo", False),
+    ("torneos", True),
+    ("inscripciones", True),
+    ("pagos", False),
+    ("partidos", True),
+)
+
+
+def _changelog_sql(table: str, versioned: bool) -> str:
+    """
+    SQL que registra en `cambios` cada inserción, actualización y borrado de `table`.
+
+    Las inserciones y actualizaciones se anotan en los triggers que sellan
+    `actualizado_en`, que se disparan una sola vez por fila (su propio UPDATE no
+    vuelve a dispararlos ni a los demás, por la condición sobre `actualizado_en`).
+    Un trigger aparte en cada tabla duplicaría la entrada al dispararse también con
+    ese UPDATE interno.
+    """
+    log = "INSERT INTO cambios (entidad, id_entidad, op) VALUES ('{table}', {row}.id, '{op}');"
+    sql = f"""
+        DROP TRIGGER trg_{table}_actualizado_ins;
+        CREATE TRIGGER trg_{table}_actualizado_ins AFTER INSERT ON {table}
+        BEGIN
+          UPDATE {table} SET actualizado_en = {_NOW_SQL} WHERE id = NEW.id;
+          {log.format(table=table, row="NEW", op="insert")}
+        END;
+        CREATE TRIGGER trg_{table}_cambios_del AFTER DELETE ON {table}
+        BEGIN
+          {log.format(table=table, row="OLD", op="delete")}
+        END;
+    """
+    if versioned:
+        sql += f"""
+        DROP TRIGGER trg_{table}_version;
+        CREATE TRIGGER trg_{table}_version AFTER UPDATE ON {table}
+          FOR EACH ROW WHEN NEW.version = OLD.version AND NEW.actualizado_en IS OLD.actualizado_en
+        BEGIN
+          UPDATE {table} SET version = OLD.version + 1, actualizado_en = {_NOW_SQL} WHERE id = NEW.id;
+          {log.format(table=table, row="NEW", op="update")}
+        END;
+        """
+    else:
+        sql += f"""
+        DROP TRIGGER trg_{table}_actualizado_upd;
+        CREATE TRIGGER trg_{table}_actualizado_upd AFTER UPDATE ON {table}
+          FOR EACH ROW WHEN NEW.actualizado_en IS OLD.actualizado_en
+        BEGIN
+          UPDATE {table} SET actualizado_en = {_NOW_SQL} WHERE id = NEW.id;
+          {log.format(table=table, row="NEW", op="update")}
+        END;
+        """
+    return sql
+
+
+MIGRATIONS: List[Migration] = [
+    Migration(
+        version=1,
+        description="Esquema inicial",
+        sql="""
+        CREATE TABLE IF NOT EXISTS usuarios (
+          id          INTEGER PRIMARY KEY AUTOINCREMENT,
+          nombre      TEXT    NOT NULL,
+          nickname    TEXT    NOT NULL,
+          email       TEXT    NOT NULL UNIQUE,
+          pwd_hash    TEXT    NOT NULL,
+          fecha_reg   DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP
+        );
+
+        CREATE TABLE IF NOT EXISTS equipos (
+          id          INTEGER PRIMARY KEY AUTOINCREMENT,
+          nombre      TEXT    NOT NULL UNIQUE,
+          id_capitan  INTEGER NOT NULL,
+          FOREIGN KEY(id_capitan) REFERENCES usuarios(id) ON DELETE RESTRICT
+        );
+
+        CREATE TABLE IF NOT EXISTS miembros_equipo (
+          id           INTEGER PRIMARY KEY AUTOINCREMENT,
+          id_equipo    INTEGER NOT NULL,
+          id_usuario   INTEGER NOT NULL,
+          rol          TEXT    NOT NULL DEFAULT 'jugador'
+                               CHECK(rol IN ('jugador','capitan','suplente')),
+          UNIQUE(id_equipo, id_usuario),
+          FOREIGN KEY(id_equipo) REFERENCES equipos(id) ON DELETE CASCADE,
+          FOREIGN KEY(id_usuario) REFERENCES usuarios(id) ON DELETE CASCADE
+        );
+
+        CREATE UNIQUE INDEX IF NOT EXISTS idx_unq_capitan_equipo
+          ON miembros_equipo(id_equipo)
+          WHERE rol = 'capitan';
+
+        CREATE TABLE IF NOT EXISTS torneos (
+          id           INTEGER PRIMARY KEY AUTOINCREMENT,
+          nombre       TEXT    NOT NULL,
+          descripcion  TEXT,
+          fecha_inicio DATETIME NOT NULL,
+          fecha_fin    DATETIME NOT NULL,
+          max_equipos  INTEGER NOT NULL CHECK(max_equipos > 0),
+          estado       TEXT    NOT NULL DEFAULT 'programado'
+                               CHECK(estado IN ('programado','en_curso','finalizado')),
+          stream_url   TEXT,
+          id_organizador INTEGER NOT NULL,
+          FOREIGN KEY(id_organizador) REFERENCES usuarios(id) ON DELETE RESTRICT
+        );
+
+        CREATE TABLE IF NOT EXISTS inscripciones (
+          id                   INTEGER PRIMARY KEY AUTOINCREMENT,
+          id_equipo            INTEGER NOT NULL,
+          id_torneo            INTEGER NOT NULL,
+          fecha_inscripcion    DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+          UNIQUE(id_equipo, id_torneo),
+          FOREIGN KEY(id_equipo) REFERENCES equipos(id) ON DELETE CASCADE,
+          FOREIGN KEY(id_torneo) REFERENCES torneos(id) ON DELETE CASCADE
+        );
+
+        CREATE TABLE IF NOT EXISTS pagos (
+          id            INTEGER PRIMARY KEY AUTOINCREMENT,
+          id_equipo     INTEGER NOT NULL,
+          id_torneo     INTEGER NOT NULL,
+          monto_cent    INTEGER NOT NULL CHECK(monto_cent >= 0),
+          estado        TEXT NOT NULL DEFAULT 'pendiente'
+                                CHECK(estado IN ('pendiente','confirmado')),
+          fecha_pago    DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+          FOREIGN KEY(id_equipo) REFERENCES equipos(id) ON DELETE CASCADE,
+          FOREIGN KEY(id_torneo) REFERENCES torneos(id) ON DELETE CASCADE
+        );
+
+        CREATE TABLE IF NOT EXISTS partidos (
+          id                   INTEGER PRIMARY KEY AUTOINCREMENT,
+          id_torneo            INTEGER NOT NULL,
+          equipo_local         INTEGER NOT NULL,
+          equipo_visitante     INTEGER NOT NULL,
+          fecha                DATETIME NOT NULL,
+          resultado_local      INTEGER,
+          resultado_visitante  INTEGER,
+          FOREIGN KEY(id_torneo) REFERENCES torneos(id) ON DELETE CASCADE,
+          FOREIGN KEY(equipo_local) REFERENCES equipos(id) ON DELETE RESTRICT,
+          FOREIGN KEY(equipo_visitante) REFERENCES equipos(id) ON DELETE RESTRICT,
+          CHECK(equipo_local <> equipo_visitante)
+        );
+
+        CREATE INDEX IF NOT EXISTS idx_usuarios_nickname ON usuarios(nickname);
+        CREATE INDEX IF NOT EXISTS idx_insc_torneo     ON inscripciones(id_torneo);
+        CREATE INDEX IF NOT EXISTS idx_pagos_torneo    ON pagos(id_torneo);
+        """,
+    ),
+    Migration(
+        version=2,
+        description="Índices para las consultas más frecuentes",
+        sql="""
+        CREATE INDEX IF NOT EXISTS idx_miembros_usuario      ON miembros_equipo(id_usuario);
+        CREATE INDEX IF NOT EXISTS idx_equipos_capitan       ON equipos(id_capitan);
+        CREATE INDEX IF NOT EXISTS idx_torneos_estado        ON torneos(estado);
+        CREATE INDEX IF NOT EXISTS idx_torneos_nombre        ON torneos(nombre);
+        CREATE INDEX IF NOT EXISTS idx_partidos_torneo       ON partidos(id_torneo);
+        CREATE INDEX IF NOT EXISTS idx_partidos_local        ON partidos(equipo_local);
+        CREATE INDEX IF NOT EXISTS idx_partidos_visitante    ON partidos(equipo_visitante);
+        CREATE INDEX IF NOT EXISTS idx_pagos_equipo          ON pagos(id_equipo);
+        """,
+        probes=(
+            ("SELECT * FROM miembros_equipo WHERE id_usuario = ?", (1,)),
+            ("SELECT * FROM equipos WHERE id_capitan = ?", (1,)),
+            ("SELECT * FROM torneos WHERE estado = ?", ("programado",)),
+            ("SELECT * FROM torneos WHERE nombre = ?", ("x",)),
+            ("SELECT * FROM partidos WHERE id_torneo = ?", (1,)),
+            ("SELECT * FROM partidos WHERE equipo_local = ? OR equipo_visitante = ?", (1, 1)),
+            ("SELECT * FROM pagos WHERE id_equipo = ?", (1,)),
+        ),
+    ),
+    Migration(
+        version=3,
+        description="Restricciones UNIQUE para validar la unicidad en una sola sentencia",
+        sql="""
+        DROP INDEX IF EXISTS idx_usuarios_nickname;
+        CREATE UNIQUE INDEX idx_usuarios_nickname ON usuarios(nickname);
+        DROP INDEX IF EXISTS idx_torneos_nombre;
+        CREATE UNIQUE INDEX idx_torneos_nombre ON torneos(nombre);
+        DROP INDEX IF EXISTS idx_equipos_capitan;
+        CREATE UNIQUE INDEX idx_equipos_capitan ON equipos(id_capitan);
+        DROP INDEX IF EXISTS idx_miembros_usuario;
+        CREATE UNIQUE INDEX idx_miembros_usuario ON miembros_equipo(id_usuario);
+        """,
+        probes=(
+            ("SELECT id FROM usuarios WHERE nickname = ?", ("x",)),
+            ("SELECT id FROM torneos WHERE nombre = ?", ("x",)),
+        ),
+        preflight=_check_unique_duplicates,
+    ),
+    Migration(
+        version=4,
+        description="Versiones de fila y de colección para ETags",
+        sql="""
+        CREATE TABLE versiones_coleccion (
+          tabla    TEXT    PRIMARY KEY,
+          version  INTEGER NOT NULL DEFAULT 1
+        ) WITHOUT ROWID;
+
+        INSERT INTO versiones_coleccion (tabla) VALUES ('torneos'), ('partidos'), ('equipos'), ('inscripciones');
+
+        ALTER TABLE torneos ADD COLUMN version INTEGER NOT NULL DEFAULT 1;
+        CREATE TRIGGER trg_torneos_version AFTER UPDATE ON torneos
+          FOR EACH ROW WHEN NEW.version = OLD.version
+        BEGIN
+          UPDATE torneos SET version = OLD.version + 1 WHERE id = NEW.id;
+        END;
+        CREATE TRIGGER trg_torneos_col_ins AFTER INSERT ON torneos
+        BEGIN
+          UPDATE versiones_coleccion SET version = version + 1 WHERE tabla = 'torneos';
+        END;
+        CREATE TRIGGER trg_torneos_col_upd AFTER UPDATE OF version ON torneos
+          FOR EACH ROW WHEN NEW.version <> OLD.version
+        BEGIN
+          UPDATE versiones_coleccion SET version = version + 1 WHERE tabla = 'torneos';
+        END;
+        CREATE TRIGGER trg_torneos_col_del AFTER DELETE ON torneos
+        BEGIN
+          UPDATE versiones_coleccion SET version = version + 1 WHERE tabla = 'torneos';
+        END;
+
+        ALTER TABLE partidos ADD COLUMN version INTEGER NOT NULL DEFAULT 1;
+        CREATE TRIGGER trg_partidos_version AFTER UPDATE ON partidos
+          FOR EACH ROW WHEN NEW.version = OLD.version
+        BEGIN
+          UPDATE partidos SET version = OLD.version + 1 WHERE id = NEW.id;
+        END;
+        CREATE TRIGGER trg_partidos_col_ins AFTER INSERT ON partidos
+        BEGIN
+          UPDATE versiones_coleccion SET version = version + 1 WHERE tabla = 'partidos';
+        END;
+        CREATE TRIGGER trg_partidos_col_upd AFTER UPDATE OF version ON partidos
+          FOR EACH ROW WHEN NEW.version <> OLD.version
+        BEGIN
+          UPDATE versiones_coleccion SET version = version + 1 WHERE tabla = 'partidos';
+        END;
+        CREATE TRIGGER trg_partidos_col_del AFTER DELETE ON partidos
+        BEGIN
+          UPDATE versiones_coleccion SET version = version + 1 WHERE tabla = 'partidos';
+        END;
+
+        ALTER TABLE equipos ADD COLUMN version INTEGER NOT NULL DEFAULT 1;
+        CREATE TRIGGER trg_equipos_version AFTER UPDATE ON equipos
+          FOR EACH ROW WHEN NEW.version = OLD.version
+        BEGIN
+          UPDATE equipos SET version = OLD.version + 1 WHERE id = NEW.id;
+        END;
+        CREATE TRIGGER trg_equipos_col_ins AFTER INSERT ON equipos
+        BEGIN
+          UPDATE versiones_coleccion SET version = version + 1 WHERE tabla = 'equipos';
+        END;
+        CREATE TRIGGER trg_equipos_col_upd AFTER UPDATE OF version ON equipos
+          FOR EACH ROW WHEN NEW.version <> OLD.version
+        BEGIN
+          UPDATE versiones_coleccion SET version = version + 1 WHERE tabla = 'equipos';
+        END;
+        CREATE TRIGGER trg_equipos_col_del AFTER DELETE ON equipos
+        BEGIN
+          UPDATE versiones_coleccion SET version = version + 1 WHERE tabla = 'equipos';
+        END;
+
+        ALTER TABLE inscripciones ADD COLUMN version INTEGER NOT NULL DEFAULT 1;
+        CREATE TRIGGER trg_inscripciones_version AFTER UPDATE ON inscripciones
+          FOR EACH ROW WHEN NEW.version = OLD.version
+        BEGIN
+          UPDATE inscripciones SET version = OLD.version + 1 WHERE id = NEW.id;
+        END;
+        CREATE TRIGGER trg_inscripciones_col_ins AFTER INSERT ON inscripciones
+        BEGIN
+          UPDATE versiones_coleccion SET version = version + 1 WHERE tabla = 'inscripciones';
+        END;
+        CREATE TRIGGER trg_inscripciones_col_upd AFTER UPDATE OF version ON inscripciones
+          FOR EACH ROW WHEN NEW.version <> OLD.version
+        BEGIN
+          UPDATE versiones_coleccion SET version = version + 1 WHERE tabla = 'inscripciones';
+        END;
+        CREATE TRIGGER trg_inscripciones_col_del AFTER DELETE ON inscripciones
+        BEGIN
+          UPDATE versiones_coleccion SET version = version + 1 WHERE tabla = 'inscripciones';
+        END;
+        """,
+    ),
+    Migration(
+        version=5,
+        description="Formato de torneo, semillas y posición de los partidos en el cuadro",
+        sql="""
+        ALTER TABLE torneos ADD COLUMN formato TEXT
+          CHECK(formato IN ('liga','eliminacion','doble_eliminacion'));
+        ALTER TABLE inscripciones ADD COLUMN semilla INTEGER;
+        ALTER TABLE partidos ADD COLUMN llave TEXT
+          CHECK(llave IN ('liga','ganadores','perdedores','final'));
+        ALTER TABLE partidos ADD COLUMN ronda INTEGER;
+        ALTER TABLE partidos ADD COLUMN posicion INTEGER;
+
+        CREATE UNIQUE INDEX idx_partidos_cuadro ON partidos(id_torneo, llave, ronda, posicion)
+          WHERE llave IS NOT NULL;
+        """,
+        probes=(
+            ("SELECT * FROM partidos WHERE id_torneo = ? AND llave IS NOT NULL", (1,)),
+        ),
+    ),
+    Migration(
+        version=6,
+        description="Clasificación mantenida incrementalmente",
+        sql="""
+        CREATE TABLE clasificacion (
+          id_torneo     INTEGER NOT NULL,
+          id_equipo     INTEGER NOT NULL,
+          jugados       INTEGER NOT NULL DEFAULT 0,
+          ganados       INTEGER NOT NULL DEFAULT 0,
+          empatados     INTEGER NOT NULL DEFAULT 0,
+          perdidos      INTEGER NOT NULL DEFAULT 0,
+          goles_favor   INTEGER NOT NULL DEFAULT 0,
+          goles_contra  INTEGER NOT NULL DEFAULT 0,
+          puntos        INTEGER NOT NULL DEFAULT 0,
+          PRIMARY KEY (id_torneo, id_equipo),
+          FOREIGN KEY(id_torneo) REFERENCES torneos(id) ON DELETE CASCADE,
+          FOREIGN KEY(id_equipo) REFERENCES equipos(id) ON DELETE CASCADE
+        ) WITHOUT ROWID;
+
+        CREATE INDEX idx_clasificacion_orden
+          ON clasificacion(id_torneo, puntos DESC, (goles_favor - goles_contra) DESC, goles_favor DESC, id_equipo);
+        """,
+        probes=(
+            (
+                "SELECT * FROM clasificacion WHERE id_torneo = ? "
+                "ORDER BY puntos DESC, goles_favor - goles_contra DESC, goles_favor DESC, id_equipo",
+                (1,),
+            ),
+        ),
+        func=_rebuild_standings,
+    ),
+    Migration(
+        version=7,
+        description="Ratings Elo de los equipos y su historial",
+        sql="""
+        CREATE TABLE ratings (
+          id_equipo  INTEGER PRIMARY KEY,
+          rating     REAL    NOT NULL,
+          partidos   INTEGER NOT NULL DEFAULT 0,
+          FOREIGN KEY(id_equipo) REFERENCES equipos(id) ON DELETE CASCADE
+        );
+        CREATE INDEX idx_ratings_ranking ON ratings(rating DESC, id_equipo);
+
+        CREATE TABLE historial_rating (
+          id              INTEGER PRIMARY KEY,
+          id_equipo       INTEGER NOT NULL,
+          id_partido      INTEGER NOT NULL,
+          rating_antes    REAL    NOT NULL,
+          rating_despues  REAL    NOT NULL
+        );
+        CREATE INDEX idx_historial_rating_equipo  ON historial_rating(id_equipo, id);
+        CREATE INDEX idx_historial_rating_partido ON historial_rating(id_partido);
+        """,
+        probes=(
+            ("SELECT * FROM ratings ORDER BY rating DESC, id_equipo LIMIT ?", (100,)),
+        ),
+        func=_recompute_ratings,
+    ),
+    Migration(
+        version=8,
+        description="Formato y llave 'suizo' (se recrean las columnas para ampliar su CHECK)",
+        sql="""
+        ALTER TABLE torneos ADD COLUMN formato_nuevo TEXT
+          CHECK(formato_nuevo IN ('liga','eliminacion','doble_eliminacion','suizo'));
+        UPDATE torneos SET formato_nuevo = formato WHERE formato IS NOT NULL;
+        ALTER TABLE torneos DROP COLUMN formato;
+        ALTER TABLE torneos RENAME COLUMN formato_nuevo TO formato;
+
+        DROP INDEX idx_partidos_cuadro;
+        ALTER TABLE partidos ADD COLUMN llave_nueva TEXT
+          CHECK(llave_nueva IN ('liga','ganadores','perdedores','final','suizo'));
+        UPDATE partidos SET llave_nueva = llave WHERE llave IS NOT NULL;
+        ALTER TABLE partidos DROP COLUMN llave;
+        ALTER TABLE partidos RENAME COLUMN llave_nueva TO llave;
+        CREATE UNIQUE INDEX idx_partidos_cuadro ON partidos(id_torneo, llave, ronda, posicion)
+          WHERE llave IS NOT NULL;
+        """,
+    ),
+    Migration(
+        version=9,
+        description="Horario (inicio y fin en segundos UTC) y sede de los partidos",
+        sql="""
+        ALTER TABLE partidos ADD COLUMN sede TEXT;
+        ALTER TABLE partidos ADD COLUMN inicio INTEGER;
+        ALTER TABLE partidos ADD COLUMN fin INTEGER;
+
+        CREATE INDEX idx_partidos_local_inicio     ON partidos(equipo_local, inicio)     WHERE inicio IS NOT NULL;
+        CREATE INDEX idx_partidos_visitante_inicio ON partidos(equipo_visitante, inicio) WHERE inicio IS NOT NULL;
+        CREATE INDEX idx_partidos_sede_inicio      ON partidos(sede, inicio)             WHERE inicio IS NOT NULL;
+        """,
+        probes=(
+            ("SELECT id FROM partidos WHERE equipo_local = ? AND inicio >= ? AND inicio < ?", (1, 0, 1)),
+            ("SELECT fin FROM partidos WHERE equipo_visitante = ? AND inicio < ? ORDER BY inicio DESC LIMIT 1", (1, 0)),
+            ("SELECT id FROM partidos WHERE sede = ? AND inicio >= ? AND inicio < ?", ("x", 0, 1)),
+        ),
+        func=_fill_match_times,
+    ),
+    Migration(
+        version=10,
+        description="Contador de inscritos con control de cupo y lista de espera",
+        sql="""
+        ALTER TABLE torneos ADD COLUMN inscritos INTEGER NOT NULL DEFAULT 0;
+        UPDATE torneos SET inscritos = (SELECT COUNT(*) FROM inscripciones WHERE id_torneo = torneos.id);
+
+        CREATE TABLE lista_espera (
+          id            INTEGER PRIMARY KEY AUTOINCREMENT,
+          id_equipo     INTEGER NOT NULL,
+          id_torneo     INTEGER NOT NULL,
+          fecha_alta    DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+          UNIQUE(id_equipo, id_torneo),
+          FOREIGN KEY(id_equipo) REFERENCES equipos(id) ON DELETE CASCADE,
+          FOREIGN KEY(id_torneo) REFERENCES torneos(id) ON DELETE CASCADE
+        );
+        CREATE INDEX idx_lista_espera_torneo ON lista_espera(id_torneo, id);
+
+        -- El cupo se comprueba en la propia inserción, así que ninguna vía (individual,
+        -- masiva o promoción) puede superar max_equipos.
+        CREATE TRIGGER trg_inscripciones_cupo BEFORE INSERT ON inscripciones
+        BEGIN
+          SELECT RAISE(ABORT, 'torneo_completo')
+          WHERE (SELECT inscritos >= max_equipos FROM torneos WHERE id = NEW.id_torneo);
+        END;
+        CREATE TRIGGER trg_inscripciones_inscritos_ins AFTER INSERT ON inscripciones
+        BEGIN
+          UPDATE torneos SET inscritos = inscritos + 1 WHERE id = NEW.id_torneo;
+          DELETE FROM lista_espera WHERE id_torneo = NEW.id_torneo AND id_equipo = NEW.id_equipo;
+        END;
+        -- Al liberarse una plaza se inscribe al primero de la lista de espera
+        CREATE TRIGGER trg_inscripciones_inscritos_del AFTER DELETE ON inscripciones
+        BEGIN
+          UPDATE torneos SET inscritos = inscritos - 1 WHERE id = OLD.id_torneo;
+          INSERT INTO inscripciones (id_equipo, id_torneo)
+            SELECT id_equipo, id_torneo FROM lista_espera
+            WHERE id_torneo = OLD.id_torneo
+              AND (SELECT inscritos < max_equipos FROM torneos WHERE id = OLD.id_torneo)
+            ORDER BY id LIMIT 1;
+        END;
+        CREATE TRIGGER trg_torneos_cupo AFTER UPDATE OF max_equipos ON torneos
+          FOR EACH ROW WHEN NEW.max_equipos > OLD.max_equipos
+        BEGIN
+          INSERT INTO inscripciones (id_equipo, id_torneo)
+            SELECT id_equipo, id_torneo FROM lista_espera
+            WHERE id_torneo = NEW.id
+            ORDER BY id LIMIT max(NEW.max_equipos - NEW.inscritos, 0);
+        END;
+        """,
+        probes=(
+            ("SELECT * FROM lista_espera WHERE id_torneo = ? ORDER BY id", (1,)),
+        ),
+    ),
+    Migration(
+        version=11,
+        description="Fecha de última modificación (actualizado_en) para las exportaciones incrementales",
+        sql=(
+            _updated_at_sql("usuarios", "fecha_reg", versioned=False)
+            + _updated_at_sql("equipos", None, versioned=True)
+            + _updated_at_sql("miembros_equipo", None, versioned=False)
+            + _updated_at_sql("torneos", None, versioned=True)
+            + _updated_at_sql("inscripciones", "fecha_inscripcion", versioned=True)
+            + _updated_at_sql("pagos", "fecha_pago", versioned=False)
+            + _updated_at_sql("partidos", None, versioned=True)
+        ),
+        probes=(
+            ("SELECT * FROM pagos WHERE actualizado_en > ? ORDER BY actualizado_en", ("2024-01-01",)),
+        ),
+    ),
+    Migration(
+        version=12,
+        description="Búsqueda de texto completo (FTS5) sobre usuarios, equipos y torneos",
+        sql="""
+        CREATE VIRTUAL TABLE usuarios_fts USING fts5(
+          nombre, nickname,
+          content='usuarios', content_rowid='id',
+          tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+        );
+        CREATE TRIGGER trg_usuarios_fts_ins AFTER INSERT ON usuarios
+        BEGIN
+          INSERT INTO usuarios_fts (rowid, nombre, nickname) VALUES (NEW.id, NEW.nombre, NEW.nickname);
+        END;
+        CREATE TRIGGER trg_usuarios_fts_del AFTER DELETE ON usuarios
+        BEGIN
+          INSERT INTO usuarios_fts (usuarios_fts, rowid, nombre, nickname) VALUES ('delete', OLD.id, OLD.nombre, OLD.nickname);
+        END;
+        CREATE TRIGGER trg_usuarios_fts_upd AFTER UPDATE OF nombre, nickname ON usuarios
+        BEGIN
+          INSERT INTO usuarios_fts (usuarios_fts, rowid, nombre, nickname) VALUES ('delete', OLD.id, OLD.nombre, OLD.nickname);
+          INSERT INTO usuarios_fts (rowid, nombre, nickname) VALUES (NEW.id, NEW.nombre, NEW.nickname);
+        END;
+        INSERT INTO usuarios_fts (usuarios_fts) VALUES ('rebuild');
+
+        CREATE VIRTUAL TABLE equipos_fts USING fts5(
+          nombre,
+          content='equipos', content_rowid='id',
+          tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+        );
+        CREATE TRIGGER trg_equipos_fts_ins AFTER INSERT ON equipos
+        BEGIN
+          INSERT INTO equipos_fts (rowid, nombre) VALUES (NEW.id, NEW.nombre);
+        END;
+        CREATE TRIGGER trg_equipos_fts_del AFTER DELETE ON equipos
+        BEGIN
+          INSERT INTO equipos_fts (equipos_fts, rowid, nombre) VALUES ('delete', OLD.id, OLD.nombre);
+        END;
+        CREATE TRIGGER trg_equipos_fts_upd AFTER UPDATE OF nombre ON equipos
+        BEGIN
+          INSERT INTO equipos_fts (equipos_fts, rowid, nombre) VALUES ('delete', OLD.id, OLD.nombre);
+          INSERT INTO equipos_fts (rowid, nombre) VALUES (NEW.id, NEW.nombre);
+        END;
+        INSERT INTO equipos_fts (equipos_fts) VALUES ('rebuild');
+
+        CREATE VIRTUAL TABLE torneos_fts USING fts5(
+          nombre, descripcion,
+          content='torneos', content_rowid='id',
+          tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+        );
+        CREATE TRIGGER trg_torneos_fts_ins AFTER INSERT ON torneos
+        BEGIN
+          INSERT INTO torneos_fts (rowid, nombre, descripcion) VALUES (NEW.id, NEW.nombre, NEW.descripcion);
+        END;
+        CREATE TRIGGER trg_torneos_fts_del AFTER DELETE ON torneos
+        BEGIN
+          INSERT INTO torneos_fts (torneos_fts, rowid, nombre, descripcion) VALUES ('delete', OLD.id, OLD.nombre, OLD.descripcion);
+        END;
+        CREATE TRIGGER trg_torneos_fts_upd AFTER UPDATE OF nombre, descripcion ON torneos
+        BEGIN
+          INSERT INTO torneos_fts (torneos_fts, rowid, nombre, descripcion) VALUES ('delete', OLD.id, OLD.nombre, OLD.descripcion);
+          INSERT INTO torneos_fts (rowid, nombre, descripcion) VALUES (NEW.id, NEW.nombre, NEW.descripcion);
+        END;
+        INSERT INTO torneos_fts (torneos_fts) VALUES ('rebuild');
+        """,
+    ),
+    Migration(
+        version=13,
+        description="Registro de cambios (outbox) para la sincronización incremental",
+        sql=f"""
+        CREATE TABLE cambios (
+          seq INTEGER PRIMARY KEY AUTOINCREMENT,
+          entidad TEXT NOT NULL,
+          id_entidad INTEGER,
+          op TEXT NOT NULL CHECK(op IN ('insert', 'update', 'delete', 'reload')),
+          fecha TEXT NOT NULL DEFAULT ({_NOW_SQL})
+        );
+        CREATE INDEX idx_cambios_entidad ON cambios(entidad, id_entidad, seq);
+        CREATE TABLE cambios_retencion (
+          id INTEGER PRIMARY KEY CHECK(id = 1),
+          purgado_hasta INTEGER NOT NULL,
+          compactado_hasta INTEGER NOT NULL
+        );
+        INSERT INTO cambios_retencion (id, purgado_hasta, compactado_hasta) VALUES (1, 0, 0);
+        """
+        + "".join(_changelog_sql(table, versioned) for table, versioned in _CHANGELOG_TABLES),
+    ),
+    Migration(
+        version=14,
+        description="Recalcular ratings sin los partidos de torneos ya borrados",
+        # Hasta ahora borrar un torneo dejaba en `ratings` e `historial_rating` la
+        # aportación de sus partidos; el recálculo completo la elimina
+        sql="",
+        func=_recompute_ratings,
+    ),
+    Migration(
+        version=15,
+        description="Quitar el horario de los partidos que se solapan",
+        # Los horarios rellenados por la migración 9 y los de la carga masiva de
+        # partidos no se comprobaban; ver `_unschedule_overlaps`
+        sql="",
+        func=_unschedule_overlaps,
+    ),
+    Migration(
+        version=16,
+        description="Registro de cambios de la lista de espera",
+        # Las altas y bajas de la lista de espera (incluidas las promociones al
+        # liberarse una plaza) no llegaban a `/changes`; la entrada 'reload' avisa a
+        # los clientes de que la vuelvan a leer entera
+        sql=_updated_at_sql("lista_espera", "fecha_alta", False)
+        + _changelog_sql("lista_espera", False)
+        + "INSERT INTO cambios (entidad, op) VALUES ('lista_espera', 'reload');",
+    ),
+]
+
+
+def _split_statements(script: str) -> List[str]:
+    """
+    Divide un script SQL en sentencias completas, respetando los cuerpos de los triggers.
+    """
+    statements = []
+    buffer = ""
+    for line in script.splitlines(keepends=True):
+        buffer += line
+        if sqlite3.complete_statement(buffer):
+            if buffer.strip():
+                statements.append(buffer.strip())
+            buffer = ""
+    if buffer.strip():
+        statements.append(buffer.strip())
+    return statements
+
+
+def _explain(conn: sqlite3.Connection, probes: Tuple[Tuple[str, tuple], ...]) -> List[dict]:
+    """
+    Obtiene el EXPLAIN QUERY PLAN de cada consulta de prueba.
+    """
+    plans = []
+    for query, params in probes:
+        try:
+            rows = conn.execute(f"EXPLAIN QUERY PLAN {query}", params).fetchall()
+            plans.append({"query": query, "plan": [row[3] for row in rows]})
+        except sqlite3.Error as exc:
+            plans.append({"query": query, "error": str(exc)})
+    return plans
+
+
+def get_schema_version(conn: sqlite3.Connection) -> int:
+    """
+    Devuelve la versión de esquema aplicada (0 si la base de datos está vacía).
+
+    Args:
+        conn: Conexión a la base de datos.
+
+    Returns:
+        La versión más alta registrada en `schema_version`.
+    """
+    exists = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'schema_version'"
+    ).fetchone()
+    if not exists:
+        return 0
+    return conn.execute("SELECT COALESCE(MAX(version), 0) FROM schema_version").fetchone()[0]
+
+
+def migrate(conn: sqlite3.Connection, migrations: Optional[List[Migration]] = None) -> List[int]:
+    """
+    Aplica las migraciones pendientes en orden de versión.
+
+    Cada migración se ejecuta en su propia transacción junto con su registro en
+    `schema_version`, que guarda además el EXPLAIN QUERY PLAN de sus consultas de
+    prueba antes y después del cambio. Si una migración falla, se revierte y se
+    detiene el proceso.
+
+    Varios workers pueden arrancar a la vez sobre la misma base de datos: cada
+    migración se vuelve a comprobar dentro de su transacción `BEGIN IMMEDIATE` (que
+    tiene el bloqueo de escritura), y si otro proceso ya la aplicó se salta.
+
+    Args:
+        conn: Conexión a la base de datos.
+        migrations: Lista de migraciones (por defecto `MIGRATIONS`).
+
+    Returns:
+        Las versiones aplicadas en esta ejecución.
+    """
+    migrations = sorted(migrations or MIGRATIONS, key=lambda m: m.version)
+    previous_isolation = conn.isolation_level
+    conn.isolation_level = None  # control manual de transacciones
+    applied = []
+    try:
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS schema_version (
+              version      INTEGER PRIMARY KEY,
+              description  TEXT    NOT NULL,
+              applied_at   DATETIME NOT NULL,
+              plan_before  TEXT,
+              plan_after   TEXT
+            )
+        """)
+        current = get_schema_version(conn)
+        for migration in migrations:
+            if migration.version <= current:
+                continue
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                if conn.execute("SELECT 1 FROM schema_version WHERE version = ?", (migration.version,)).fetchone():
+                    conn.execute("ROLLBACK")
+                    continue
+                if migration.preflight is not None:
+                    migration.preflight(conn)
+                plan_before = _explain(conn, migration.probes)
+                for statement in _split_statements(migration.sql):
+                    conn.execute(statement)
+                if migration.func is not None:
+                    migration.func(conn)
+                plan_after = _explain(conn, migration.probes)
+                conn.execute(
+                    "INSERT INTO schema_version (version, description, applied_at, plan_before, plan_after) VALUES (?, ?, ?, ?, ?)",
+                    (
+                        migration.version,
+                        migration.description,
+                        datetime.now(timezone.utc).isoformat(),
+                        json.dumps(plan_before, ensure_ascii=False),
+                        json.dumps(plan_after, ensure_ascii=False),
+                    ),
+                )
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+            applied.append(migration.version)
+    finally:
+        conn.isolation_level = previous_isolation
+    return applied
@@ -0,0 +1,167 @@
+# app/db/pool.py
+import queue
+import sqlite3
+import threading
+import time
+from typing import Callable, Dict
+
+
+class PoolTimeoutError(Exception):
+    """
+    Se lanza cuando no hay conexiones libres en el pool tras esperar el tiempo máximo.
+    """
+
+
+class ConnectionPool:
+    """
+    Pool acotado de conexiones SQLite ya configuradas.
+
+    Las conexiones se crean bajo demanda mediante `factory` hasta alcanzar `size`;
+    a partir de ahí, `acquire` espera como máximo `timeout` segundos a que otra
+    petición devuelva la suya. Es seguro entre hilos: las conexiones se abren con
+    `check_same_thread=False` y cada una sólo es usada por un hilo a la vez.
+
+    Cada proceso (worker de uvicorn) mantiene su propio pool.
+
+    Args:
+        factory: Función que abre y configura una conexión nueva.
+        size: Número máximo de conexiones abiertas simultáneamente.
+        timeout: Segundos máximos de espera por una conexión libre.
+    """
+
+    def __init__(self, factory: Callable[[], sqlite3.Connection], size: int = 8, timeout: float = 5.0):
+        if size < 1:
+            raise ValueError("El tamaño del pool debe ser al menos 1")
+        self._factory = factory
+        self.size = size
+        self.timeout = timeout
+        self._idle: "queue.LifoQueue[sqlite3.Connection]" = queue.LifoQueue()
+        self._lock = threading.Lock()
+        self._created = 0
+        self._in_use = 0
+        self._closed = False
+        # Métricas
+        self._checkouts = 0
+        self._waits = 0
+        self._timeouts = 0
+        self._wait_time_total = 0.0
+        self._wait_time_max = 0.0
+
+    def acquire(self) -> sqlite3.Connection:
+        """
+        Obtiene una conexión del pool, creando una nueva si aún no se alcanzó el límite.
+
+        Raises:
+            PoolTimeoutError: Si no se libera ninguna conexión dentro de `timeout`.
+
+        Returns:
+            sqlite3.Connection: Conexión lista para usarse.
+        """
+        if self._closed:
+            raise RuntimeError("El pool de conexiones está cerrado")
+
+        try:
+            conn = self._idle.get_nowait()
+        except queue.Empty:
+            conn = None
+
+        if conn is None:
+            with self._lock:
+                can_create = self._created < self.size
+                if can_create:
+                    self._created += 1
+            if can_create:
+                try:
+                    conn = self._factory()
+                except Exception:
+                    with self._lock:
+                        self._created -= 1
+                    raise
+            else:
+                start = time.perf_counter()
+                try:
+                    conn = self._idle.get(timeout=self.timeout)
+                except queue.Empty:
+                    with self._lock:
+                        self._waits += 1
+                        self._timeouts += 1
+                        self._wait_time_total += time.perf_counter() - start
+                    raise PoolTimeoutError(
+                        f"No hay conexiones libres tras esperar {self.timeout} s"
+                    )
+                waited = time.perf_counter() - start
+                with self._lock:
+                    self._waits += 1
+                    self._wait_time_total += waited
+                    self._wait_time_max = max(self._wait_time_max, waited)
+
+        with self._lock:
+            self._checkouts += 1
+            self._in_use += 1
+        return conn
+
+    def release(self, conn: sqlite3.Connection) -> None:
+        """
+        Devuelve una conexión al pool.
+
+        Cualquier transacción que haya quedado abierta se revierte para que la
+        siguiente petición reciba la conexión en un estado limpio. Si la conexión
+        está dañada se descarta y se libera su hueco.
+
+        Args:
+            conn: Conexión obtenida previamente con `acquire`.
+        """
+        with self._lock:
+            self._in_use -= 1
+        try:
+            if conn.in_transaction:
+                conn.rollback()
+        except sqlite3.Error:
+            self._discard(conn)
+            return
+        if self._closed:
+            self._discard(conn)
+            return
+        self._idle.put(conn)
+
+    def _discard(self, conn: sqlite3.Connection) -> None:
+        with self._lock:
+            self._created -= 1
+        try:
+            conn.close()
+        except sqlite3.Error:
+            pass
+
+    def close(self) -> None:
+        """
+        Cierra todas las conexiones ociosas. Las que estén en uso se cierran al devolverse.
+        """
+        self._closed = True
+        while True:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            self._discard(conn)
+
+    def stats(self) -> Dict[str, float]:
+        """
+        Devuelve las métricas del pool.
+
+        Returns:
+            Diccionario con tamaño, conexiones abiertas/en uso/ociosas y
+            estadísticas de checkout y espera.
+        """
+        with self._lock:
+            return {
+                "size": self.size,
+                "timeout": self.timeout,
+                "open": self._created,
+                "in_use": self._in_use,
+                "idle": self._idle.qsize(),
+                "checkouts": self._checkouts,
+                "waits": self._waits,
+                "timeouts": self._timeouts,
+                "wait_time_avg_ms": (self._wait_time_total / self._waits * 1000) if self._waits else 0.0,
+                "wait_time_max_ms": self._wait_time_max * 1000,
+            }
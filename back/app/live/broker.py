@@ -0,0 +1,206 @@
+# app/live/broker.py
+import asyncio
+import json
+import os
+import threading
+from typing import Any, Dict, NamedTuple, Optional, Set
+
+# Mensajes pendientes por suscriptor antes de considerarlo lento y desconectarlo,
+# y segundos entre comentarios de keep-alive en los streams SSE
+LIVE_QUEUE_SIZE = int(os.environ.get("LIVE_QUEUE_SIZE", "64"))
+LIVE_HEARTBEAT = float(os.environ.get("LIVE_HEARTBEAT", "15"))
+
+
+class Mensaje(NamedTuple):
+    """
+    Evento ya serializado para cada transporte (se serializa una sola vez por publicación).
+    `ws` es None en los mensajes que sólo van a los streams SSE.
+    """
+    sse: bytes
+    ws: Optional[str]
+
+
+# Comentario SSE que mantiene abiertas las conexiones sin eventos a través de proxies
+KEEP_ALIVE = Mensaje(sse=b": keep-alive\n\n", ws=None)
+
+
+class Suscriptor:
+    """
+    Conexión en vivo de un cliente a un torneo, con su cola acotada de mensajes.
+
+    Un mensaje None indica que el broker ha desconectado al suscriptor por no leer
+    a tiempo (la cola se llenó).
+    """
+
+    def __init__(self, tournament_id: int, transport: str, max_queue: int):
+        self.tournament_id = tournament_id
+        self.transport = transport
+        self.queue: "asyncio.Queue[Optional[Mensaje]]" = asyncio.Queue(maxsize=max_queue + 1)
+        self.max_queue = max_queue
+        self.dropped = False
+
+
+class LiveBroker:
+    """
+    Reparte en el proceso los eventos de un torneo a sus suscriptores SSE y WebSocket.
+
+    Las escrituras del CRUD publican desde los hilos del threadpool con `publish`,
+    que serializa el evento una vez y lo entrega al bucle de eventos con
+    `call_soon_threadsafe`; allí se copia a la cola de cada suscriptor del torneo
+    sin esperar a ninguno. Si la cola de un suscriptor está llena (cliente lento o
+    conexión atascada), se vacía, se le desconecta y el cliente debe reconectar y
+    volver a leer el estado. Así un cliente lento no retiene memoria ni retrasa
+    al resto.
+
+    Cada `heartbeat` segundos una única tarea envía un keep-alive a los suscriptores
+    SSE con la cola vacía, en lugar de un temporizador por conexión.
+
+    Cada worker tiene su propio broker: sólo llegan los eventos publicados por
+    escrituras atendidas en el mismo proceso.
+
+    Args:
+        max_queue: Mensajes pendientes por suscriptor antes de desconectarlo.
+        heartbeat: Segundos entre keep-alives de los streams SSE.
+    """
+
+    def __init__(self, max_queue: int = LIVE_QUEUE_SIZE, heartbeat: float = LIVE_HEARTBEAT):
+        self.max_queue = max_queue
+        self.heartbeat = heartbeat
+        self._heartbeat_task: Optional[asyncio.Task] = None
+        self._topics: Dict[int, Set[Suscriptor]] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._lock = threading.Lock()
+        self._next_id = 0
+        self._connections = {"sse": 0, "ws": 0}
+        self._stats: Dict[str, int] = {
+            "published": 0,
+            "delivered": 0,
+            "dropped": 0,
+            "peak_subscribers": 0,
+        }
+
+    def subscribe(self, tournament_id: int, transport: str) -> Suscriptor:
+        """
+        Registra un suscriptor a los eventos de un torneo. Debe llamarse desde el
+        bucle de eventos.
+
+        Args:
+            tournament_id: ID del torneo.
+            transport: 'sse' o 'ws' (para las métricas).
+
+        Returns:
+            El suscriptor, cuya cola recibe los mensajes.
+        """
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop or self._heartbeat_task is None or self._heartbeat_task.done():
+            self._loop = loop
+            self._heartbeat_task = loop.create_task(self._keep_alive())
+        subscriber = Suscriptor(tournament_id, transport, self.max_queue)
+        with self._lock:
+            self._topics.setdefault(tournament_id, set()).add(subscriber)
+            self._connections[transport] += 1
+            total = sum(self._connections.values())
+            self._stats["peak_subscribers"] = max(self._stats["peak_subscribers"], total)
+        return subscriber
+
+    def unsubscribe(self, subscriber: Suscriptor) -> None:
+        """
+        Da de baja a un suscriptor (al cerrarse su conexión).
+        """
+        with self._lock:
+            subscribers = self._topics.get(subscriber.tournament_id)
+            if subscribers is None or subscriber not in subscribers:
+                return
+            subscribers.discard(subscriber)
+            self._connections[subscriber.transport] -= 1
+            if not subscribers:
+                del self._topics[subscriber.tournament_id]
+
+    def has_subscribers(self, tournament_id: int) -> bool:
+        """
+        Indica si alguien escucha un torneo, para no calcular eventos que nadie recibe.
+        """
+        return tournament_id in self._topics
+
+    def publish(self, tournament_id: int, event: str, data: Any) -> None:
+        """
+        Publica un evento para los suscriptores de un torneo. Puede llamarse desde
+        cualquier hilo y no espera a la entrega.
+
+        Args:
+            tournament_id: ID del torneo.
+            event: Nombre del evento (p. ej. 'resultado').
+            data: Datos del evento, serializables a JSON.
+        """
+        loop = self._loop
+        if loop is None or loop.is_closed() or not self.has_subscribers(tournament_id):
+            return
+        with self._lock:
+            self._next_id += 1
+            event_id = self._next_id
+            self._stats["published"] += 1
+        payload = json.dumps(data, ensure_ascii=False, separators=(",", ":"))
+        message = Mensaje(
+            sse=f"id: {event_id}\nevent: {event}\ndata: {payload}\n\n".encode(),
+            ws=f'{{"id":{event_id},"evento":"{event}","datos":{payload}}}',
+        )
+        try:
+            loop.call_soon_threadsafe(self._fan_out, tournament_id, message)
+        except RuntimeError:
+            # El bucle se ha cerrado (apagado del servidor)
+            pass
+
+    async def _keep_alive(self) -> None:
+        while True:
+            await asyncio.sleep(self.heartbeat)
+            with self._lock:
+                idle = [
+                    subscriber
+                    for subscribers in self._topics.values()
+                    for subscriber in subscribers
+                    if subscriber.transport == "sse" and subscriber.queue.empty()
+                ]
+            for subscriber in idle:
+                subscriber.queue.put_nowait(KEEP_ALIVE)
+
+    def _fan_out(self, tournament_id: int, message: Mensaje) -> None:
+        with self._lock:
+            subscribers = list(self._topics.get(tournament_id, ()))
+        delivered = dropped = 0
+        for subscriber in subscribers:
+            if subscriber.dropped:
+                continue
+            if subscriber.queue.qsize() < subscriber.max_queue:
+                subscriber.queue.put_nowait(message)
+                delivered += 1
+                continue
+            # Cliente lento: se descartan sus mensajes y se le avisa para que cierre
+            subscriber.dropped = True
+            while not subscriber.queue.empty():
+                subscriber.queue.get_nowait()
+            subscriber.queue.put_nowait(None)
+            self.unsubscribe(subscriber)
+            dropped += 1
+        with self._lock:
+            self._stats["delivered"] += delivered
+            self._stats["dropped"] += dropped
+
+    def stats(self) -> Dict[str, object]:
+        """
+        Devuelve las métricas del broker: conexiones abiertas por transporte y torneos
+        escuchados, eventos publicados y entregados y suscriptores desconectados por lentos.
+
+        Returns:
+            Diccionario con las métricas.
+        """
+        with self._lock:
+            return {
+                **self._stats,
+                "subscribers": sum(self._connections.values()),
+                "connections": dict(self._connections),
+                "tournaments": len(self._topics),
+                "max_queue": self.max_queue,
+            }
+
+
+live_broker = LiveBroker()
@@ -0,0 +1,108 @@
+# app/live/changes.py
+import asyncio
+import logging
+import os
+from typing import Callable, Dict, Optional
+
+from starlette.concurrency import run_in_threadpool
+
+from app.crud import crud_changes
+from app.db.database import connection
+
+logger = logging.getLogger(__name__)
+
+# Segundos entre lecturas del último `seq` mientras hay peticiones de long-poll esperando
+CHANGES_POLL_INTERVAL = float(os.environ.get("CHANGES_POLL_INTERVAL", "0.5"))
+
+
+def _read_head() -> int:
+    with connection() as db:
+        return crud_changes.get_head(db)
+
+
+class ChangeNotifier:
+    """
+    Despierta a las peticiones de long-poll de `/changes` cuando hay cambios nuevos.
+
+    Los cambios entran en el registro desde triggers, en cualquier proceso (otros
+    workers, la carga masiva), así que no hay un aviso en memoria: mientras alguna
+    petición espera, una única tarea por proceso lee el último `seq` cada
+    `poll_interval` segundos y, si ha avanzado, despierta a todas a la vez. Con
+    miles de clientes esperando sigue siendo una consulta por intervalo, y sin
+    ninguno no se consulta nada.
+
+    Args:
+        read_head: Función bloqueante que devuelve el último `seq`.
+        poll_interval: Segundos entre lecturas.
+    """
+
+    def __init__(self, read_head: Callable[[], int], poll_interval: float = CHANGES_POLL_INTERVAL):
+        self._read_head = read_head
+        self.poll_interval = poll_interval
+        self._head = 0
+        self._event: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._waiting = 0
+        self._stats: Dict[str, int] = {"polls": 0, "wakeups": 0, "timeouts": 0}
+
+    async def wait(self, since: int, timeout: float) -> bool:
+        """
+        Espera a que el registro tenga cambios posteriores a `since`.
+
+        Args:
+            since: Último `seq` ya devuelto al cliente.
+            timeout: Segundos máximos de espera.
+
+        Returns:
+            True si hay cambios nuevos; False si se agotó el tiempo.
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        self._waiting += 1
+        try:
+            if self._loop is not loop or self._task is None or self._task.done():
+                self._loop = loop
+                self._event = asyncio.Event()
+                self._task = loop.create_task(self._poll())
+            while self._head <= since:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    self._stats["timeouts"] += 1
+                    return False
+                try:
+                    await asyncio.wait_for(self._event.wait(), remaining)
+                except asyncio.TimeoutError:
+                    pass
+            self._stats["wakeups"] += 1
+            return True
+        finally:
+            self._waiting -= 1
+
+    async def _poll(self) -> None:
+        while self._waiting:
+            try:
+                head = await run_in_threadpool(self._read_head)
+            except Exception:
+                logger.exception("Error al leer el registro de cambios")
+            else:
+                self._stats["polls"] += 1
+                if head != self._head:
+                    self._head = head
+                    # Cada aviso usa un Event nuevo: las esperas ya despertadas no se quedan en un Event activo
+                    event, self._event = self._event, asyncio.Event()
+                    event.set()
+            await asyncio.sleep(self.poll_interval)
+
+    def stats(self) -> Dict[str, object]:
+        """
+        Devuelve las métricas del long-poll: peticiones esperando, lecturas del
+        registro, esperas atendidas y agotadas, y último `seq` visto.
+
+        Returns:
+            Diccionario con las métricas.
+        """
+        return {**self._stats, "waiting": self._waiting, "head": self._head, "poll_interval": self.poll_interval}
+
+
+change_notifier = ChangeNotifier(_read_head)
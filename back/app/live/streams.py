@@ -0,0 +1,76 @@
+# app/live/streams.py
+import asyncio
+from typing import AsyncIterator
+
+from starlette.websockets import WebSocket, WebSocketDisconnect
+
+from app.live.broker import live_broker
+
+
+async def sse_events(tournament_id: int) -> AsyncIterator[bytes]:
+    """
+    Genera el stream Server-Sent Events de un torneo.
+
+    El suscriptor se registra al empezar a enviar la respuesta y se da de baja
+    cuando el cliente se desconecta (Starlette cancela el generador). Si el broker
+    desconecta al cliente por lento, se envía el evento `desconectado` y se cierra
+    el stream.
+    """
+    subscriber = live_broker.subscribe(tournament_id, "sse")
+    try:
+        # Reintento del EventSource del navegador tras un corte, en milisegundos
+        yield b"retry: 3000\n\n"
+        while True:
+            message = await subscriber.queue.get()
+            if message is None:
+                yield b"event: desconectado\ndata: {}\n\n"
+                return
+            yield message.sse
+    finally:
+        live_broker.unsubscribe(subscriber)
+
+
+async def _wait_disconnect(websocket: WebSocket) -> None:
+    # Los mensajes del cliente se ignoran: el canal sólo envía eventos
+    while True:
+        message = await websocket.receive()
+        if message["type"] == "websocket.disconnect":
+            return
+
+
+async def serve_websocket(websocket: WebSocket, tournament_id: int) -> None:
+    """
+    Envía por un WebSocket ya aceptado los eventos de un torneo hasta que el
+    cliente se desconecta.
+
+    Una tarea aparte lee la conexión y, cuando el cliente se va, cancela el envío
+    (así esperar un evento no crea tareas nuevas por mensaje). Si el broker
+    desconecta al cliente por lento, se cierra con el código 1013 (volver a
+    intentar más tarde).
+    """
+    subscriber = live_broker.subscribe(tournament_id, "ws")
+    sender = asyncio.current_task()
+
+    def stop_sending(_: asyncio.Future) -> None:
+        sender.cancel()
+
+    disconnected = asyncio.ensure_future(_wait_disconnect(websocket))
+    disconnected.add_done_callback(stop_sending)
+    try:
+        while True:
+            message = await subscriber.queue.get()
+            if message is None:
+                await websocket.close(code=1013, reason="Cliente lento")
+                return
+            if message.ws is not None:
+                await websocket.send_text(message.ws)
+    except asyncio.CancelledError:
+        # Sólo se absorbe la cancelación provocada por la desconexión del cliente
+        if not disconnected.done() or disconnected.cancelled():
+            raise
+    except WebSocketDisconnect:
+        pass
+    finally:
+        disconnected.remove_done_callback(stop_sending)
+        disconnected.cancel()
+        live_broker.unsubscribe(subscriber)
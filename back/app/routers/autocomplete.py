@@ -0,0 +1,33 @@
+# app/routers/autocomplete.py
+from typing import List, Optional
+
+from fastapi import APIRouter, Query
+from fastapi.concurrency import run_in_threadpool
+
+from app.crud import crud_autocomplete
+from app.db.database import connection
+from app.schemas.autocomplete import Sugerencia
+
+router = APIRouter()
+
+# Número máximo de sugerencias por petición
+MAX_SUGERENCIAS = 50
+
+
+def _autocomplete_from_db(prefix: str, tipo: Optional[str], limit: int) -> List[Sugerencia]:
+    with connection() as db:
+        return crud_autocomplete.autocomplete(prefix, tipo=tipo, limit=limit, db=db)
+
+
+@router.get("/", response_model=List[Sugerencia])
+async def autocomplete(
+    prefix: str = Query(..., min_length=1, max_length=100, description="Texto tecleado; no distingue mayúsculas ni acentos."),
+    tipo: Optional[str] = Query(None, pattern="^(usuarios|equipos)$", description="Limita las sugerencias a una entidad."),
+    limit: int = Query(10, ge=1, le=MAX_SUGERENCIAS, description="Número máximo de sugerencias."),
+):
+    # Desde el índice en memoria se responde en el propio bucle de eventos, sin pasar
+    # por el threadpool ni el pool de conexiones; sólo la consulta de reserva va a un hilo
+    suggestions = crud_autocomplete.autocomplete(prefix, tipo=tipo, limit=limit)
+    if suggestions is None:
+        suggestions = await run_in_threadpool(_autocomplete_from_db, prefix, tipo, limit)
+    return suggestions
@@ -0,0 +1,60 @@
+# app/routers/changes.py
+import time
+from typing import Optional, Sequence
+
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.concurrency import run_in_threadpool
+
+from app.crud import crud_changes
+from app.db.database import connection
+from app.live.changes import change_notifier
+from app.routers.deps import MAX_PAGE_SIZE
+from app.schemas.changes import PaginaCambios
+
+router = APIRouter()
+
+# Segundos máximos que una petición puede esperar cambios nuevos (long-poll)
+MAX_ESPERA = 60
+
+
+def _changes_page(since: int, limit: int, entidades: Optional[Sequence[str]]) -> PaginaCambios:
+    with connection() as db:
+        return crud_changes.list_changes(db, since=since, limit=limit, entidades=entidades)
+
+
+@router.get(
+    "/",
+    response_model=PaginaCambios,
+    responses={
+        410: {
+            "description": "El cursor es anterior a los cambios conservados. Las cabeceras `X-Changes-Head` y "
+            "`X-Changes-Oldest` indican el último `seq` (desde el que continuar tras volver a leer los datos) "
+            "y el más antiguo conservado."
+        }
+    },
+)
+async def list_changes(
+    since: int = Query(0, ge=0, description="Último `seq` aplicado por el cliente (el `siguiente` de la respuesta anterior)."),
+    limit: int = Query(MAX_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE, description="Número máximo de entradas del registro a leer."),
+    entidades: Optional[str] = Query(None, description="Tablas separadas por comas. Por defecto, todas."),
+    wait: float = Query(0, ge=0, le=MAX_ESPERA, description="Segundos a esperar cambios nuevos si no hay ninguno (long-poll)."),
+):
+    tables = None
+    if entidades:
+        tables = tuple(entity.strip() for entity in entidades.split(",") if entity.strip())
+        unknown = [entity for entity in tables if entity not in crud_changes.CHANGE_ENTITIES]
+        if unknown or not tables:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Entidades no válidas: {', '.join(unknown)}. Disponibles: {', '.join(crud_changes.CHANGE_ENTITIES)}",
+            )
+    # La lectura va a un hilo; la espera del long-poll no ocupa hilo ni conexión
+    page = await run_in_threadpool(_changes_page, since, limit, tables)
+    remaining = wait
+    while not page.cambios and not page.hay_mas and remaining > 0:
+        started = time.monotonic()
+        if not await change_notifier.wait(page.siguiente, remaining):
+            break
+        remaining -= time.monotonic() - started
+        page = await run_in_threadpool(_changes_page, page.siguiente, limit, tables)
+    return page
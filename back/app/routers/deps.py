@@ -0,0 +1,252 @@
+# app/routers/deps.py
+import base64
+import json
+import os
+from typing import Any, Callable, List, Optional, Sequence, Tuple, Type
+
+import sqlite3
+from fastapi import Depends, HTTPException, Query, Request, Response
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+from app.crud.loader import DataLoader
+from app.db.database import get_db
+
+# Tamaño máximo de página aceptado por los endpoints de listado
+MAX_PAGE_SIZE = int(os.environ.get("MAX_PAGE_SIZE", "500"))
+
+
+def encode_cursor(*values: Any) -> str:
+    """
+    Codifica los valores de la clave de ordenación de la última fila en un cursor opaco.
+
+    Args:
+        values: Valores de la clave de ordenación (por ejemplo, el ID).
+
+    Returns:
+        str: Cursor en base64 url-safe.
+    """
+    raw = json.dumps(list(values), separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> List[Any]:
+    """
+    Decodifica un cursor generado por `encode_cursor`.
+
+    Args:
+        cursor: Cursor opaco recibido del cliente.
+
+    Raises:
+        HTTPException: 400 si el cursor no es válido.
+
+    Returns:
+        La lista de valores de la clave de ordenación.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Cursor inválido")
+    if not isinstance(values, list) or not values:
+        raise HTTPException(status_code=400, detail="Cursor inválido")
+    return values
+
+
+def set_next_cursor(response: Response, next_cursor: Optional[str]) -> None:
+    """
+    Publica el cursor de la página siguiente en la cabecera `X-Next-Cursor`.
+
+    Args:
+        response: Respuesta en curso.
+        next_cursor: Cursor de la página siguiente, o None si no hay más resultados.
+    """
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+
+
+def make_etag(*parts: Any) -> str:
+    """
+    Construye una ETag fuerte a partir de las partes que identifican la versión del recurso.
+
+    Args:
+        parts: Partes de la versión (por ejemplo, tabla, ID y versión de la fila).
+
+    Returns:
+        str: ETag entre comillas.
+    """
+    return '"' + "-".join(str(part) for part in parts) + '"'
+
+
+def check_etag(request: Request, response: Response, etag: str) -> Optional[Response]:
+    """
+    Compara la ETag actual con la cabecera `If-None-Match` de la petición.
+
+    Si coinciden devuelve una respuesta `304 Not Modified`, que el endpoint debe
+    devolver tal cual sin leer ni construir los modelos. Si no, publica la ETag en
+    la respuesta en curso y devuelve None.
+
+    Args:
+        request: Petición en curso.
+        response: Respuesta en curso.
+        etag: ETag de la versión actual del recurso.
+
+    Returns:
+        La respuesta 304, o None si el cliente no tiene la versión actual.
+    """
+    header = request.headers.get("if-none-match")
+    if header:
+        tags = [tag.strip().removeprefix("W/") for tag in header.split(",")]
+        if "*" in tags or etag in tags:
+            return Response(status_code=304, headers={"ETag": etag})
+    response.headers["ETag"] = etag
+    return None
+
+
+class PageParams:
+    """
+    Parámetros de paginación comunes a los endpoints de listado.
+
+    La paginación recomendada es por cursor (keyset): el cliente envía el valor de
+    `X-Next-Cursor` de la respuesta anterior en `cursor` y el servidor continúa a
+    partir del último ID visto, con coste constante sea cual sea la profundidad.
+    `skip` (OFFSET) se mantiene sólo por compatibilidad y se ignora si hay cursor.
+    """
+
+    def __init__(
+        self,
+        skip: int = Query(0, ge=0, description="Número de registros a omitir (obsoleto, use `cursor`)."),
+        limit: int = Query(100, ge=1, description=f"Número máximo de registros a devolver (máximo {MAX_PAGE_SIZE})."),
+        cursor: Optional[str] = Query(None, description="Cursor opaco devuelto en la cabecera `X-Next-Cursor`."),
+    ):
+        self.limit = min(limit, MAX_PAGE_SIZE)
+        self.after_id: Optional[int] = None
+        self.skip = skip
+        if cursor is not None:
+            values = decode_cursor(cursor)
+            if not isinstance(values[0], int):
+                raise HTTPException(status_code=400, detail="Cursor inválido")
+            self.after_id = values[0]
+            self.skip = 0
+
+    def next_cursor(self, items: Sequence[Any]) -> Optional[str]:
+        """
+        Calcula el cursor de la página siguiente a partir de la página devuelta.
+
+        Args:
+            items: Elementos de la página actual, ordenados por ID (modelos o, con
+                `fields=`, diccionarios).
+
+        Returns:
+            El cursor de la siguiente página, o None si ésta es la última.
+        """
+        if len(items) < self.limit:
+            return None
+        last = items[-1]
+        return encode_cursor(last["id"] if isinstance(last, dict) else last.id)
+
+    def apply(self, response: Response, items: Sequence[Any]) -> Sequence[Any]:
+        """
+        Publica el cursor de la página siguiente y devuelve los elementos sin cambios.
+
+        Args:
+            response: Respuesta en curso.
+            items: Elementos de la página actual.
+
+        Returns:
+            Los mismos elementos.
+        """
+        set_next_cursor(response, self.next_cursor(items))
+        return items
+
+
+def parse_ids(
+    ids: Optional[str] = Query(
+        None,
+        description=f"IDs separados por comas (máximo {MAX_PAGE_SIZE}). Si se indica, se devuelven esos registros en ese orden, sin los inexistentes, en lugar de una página.",
+    ),
+) -> Optional[List[int]]:
+    """
+    Dependencia que lee el parámetro `ids` de los endpoints de listado.
+
+    Raises:
+        HTTPException: 400 si algún ID no es un entero o hay demasiados.
+
+    Returns:
+        Los IDs sin repetir, en el orden recibido, o None si no se indicó `ids`.
+    """
+    if ids is None:
+        return None
+    try:
+        values = [int(value) for value in ids.split(",") if value.strip()]
+    except ValueError:
+        raise HTTPException(status_code=400, detail="ids debe ser una lista de enteros separados por comas")
+    values = list(dict.fromkeys(values))
+    if not values or len(values) > MAX_PAGE_SIZE:
+        raise HTTPException(status_code=400, detail=f"ids admite entre 1 y {MAX_PAGE_SIZE} IDs")
+    return values
+
+
+async def get_loader(db: sqlite3.Connection = Depends(get_db)) -> DataLoader:
+    """
+    Dependencia que proporciona el `DataLoader` de la petición.
+
+    FastAPI resuelve cada dependencia una vez por petición, así que todas las que
+    la declaran comparten el mismo loader (y la misma conexión que `get_db`).
+
+    Returns:
+        DataLoader: Loader sobre la conexión de la petición.
+    """
+    return DataLoader(db)
+
+
+def field_selector(model: Type[BaseModel]) -> Callable[..., Optional[Tuple[str, ...]]]:
+    """
+    Crea la dependencia que lee el parámetro `fields` (sparse fieldsets) de los
+    endpoints que devuelven `model`.
+
+    Los campos válidos son los del modelo, que coinciden con columnas de su tabla,
+    así que pueden usarse directamente en el SELECT. `id` se incluye siempre (lo
+    necesitan los cursores de paginación y los clientes para identificar la fila).
+
+    Args:
+        model: Modelo de respuesta del endpoint.
+
+    Returns:
+        La dependencia, que devuelve las columnas pedidas o None si no se indicó `fields`.
+    """
+    available = tuple(model.model_fields)
+
+    def parse_fields(
+        fields: Optional[str] = Query(
+            None,
+            description=f"Campos a devolver separados por comas ({', '.join(available)}); `id` se incluye siempre. Por defecto, todos.",
+        ),
+    ) -> Optional[Tuple[str, ...]]:
+        if fields is None:
+            return None
+        columns = tuple(dict.fromkeys(field.strip() for field in fields.split(",") if field.strip()))
+        unknown = [column for column in columns if column not in available]
+        if unknown or not columns:
+            raise HTTPException(status_code=400, detail=f"Campos no válidos: {', '.join(unknown)}. Disponibles: {', '.join(available)}")
+        if "id" not in columns:
+            columns = ("id",) + columns
+        return columns
+
+    return parse_fields
+
+
+def projected_response(response: Response, content: Any) -> JSONResponse:
+    """
+    Devuelve filas ya proyectadas con `fields=` sin validarlas con el `response_model`.
+
+    Conserva las cabeceras publicadas en la respuesta en curso (`ETag`, `X-Next-Cursor`).
+
+    Args:
+        response: Respuesta en curso.
+        content: Diccionario o lista de diccionarios con las columnas pedidas.
+
+    Returns:
+        JSONResponse: La respuesta a devolver tal cual desde el endpoint.
+    """
+    return JSONResponse(content=content, headers=dict(response.headers))
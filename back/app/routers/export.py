@@ -0,0 +1,48 @@
+# app/routers/export.py
+from datetime import datetime, timezone
+from typing import Optional
+
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import StreamingResponse
+
+from app.crud import crud_export
+from app.services.scheduler import to_timestamp
+
+router = APIRouter()
+
+MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv; charset=utf-8"}
+
+
+@router.get("/{entity}", response_class=StreamingResponse)
+def export_entity(
+    entity: str,
+    formato: str = Query("ndjson", pattern="^(ndjson|csv)$", description="Formato de salida: 'ndjson' (un objeto JSON por línea) o 'csv'."),
+    fields: Optional[str] = Query(None, description="Columnas a exportar separadas por comas. Por defecto, todas."),
+    updated_since: Optional[str] = Query(None, description="Sólo las filas creadas o modificadas desde esta fecha (ISO 8601)."),
+):
+    if entity not in crud_export.EXPORT_COLUMNS:
+        raise HTTPException(status_code=404, detail="Entity not found")
+    available = crud_export.EXPORT_COLUMNS[entity]
+    columns = available
+    if fields:
+        columns = tuple(field.strip() for field in fields.split(",") if field.strip())
+        unknown = [column for column in columns if column not in available]
+        if unknown or not columns:
+            raise HTTPException(status_code=400, detail=f"Columnas no válidas: {', '.join(unknown)}. Disponibles: {', '.join(available)}")
+    since = None
+    if updated_since is not None:
+        timestamp = to_timestamp(updated_since)
+        if timestamp is None:
+            raise HTTPException(status_code=400, detail="updated_since debe ser una fecha ISO 8601")
+        since = datetime.fromtimestamp(timestamp, tz=timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.000Z")
+
+    batches = crud_export.export_batches(entity, columns, since)
+    if formato == "csv":
+        body = crud_export.stream_csv(columns, batches)
+    else:
+        body = crud_export.stream_ndjson(columns, batches)
+    return StreamingResponse(
+        body,
+        media_type=MEDIA_TYPES[formato],
+        headers={"Content-Disposition": f'attachment; filename="{entity}.{formato}"'},
+    )
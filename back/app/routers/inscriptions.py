@@ -1,28 +1,61 @@
 # app/routers/inscriptions.py
-from typing import List
+from typing import List, Optional, Tuple
 
 import sqlite3
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from fastapi.responses import JSONResponse
 
-from app.crud import crud_inscription
+from app.crud import crud_inscription, projection
+from app.crud.versions import get_collection_version
 from app.db.database import get_db
-from app.schemas.inscription import Inscripcion, InscripcionCreate
+from app.routers.deps import PageParams, check_etag, field_selector, make_etag, projected_response
+from app.schemas.bulk import ResultadoLote
+from app.schemas.inscription import EntradaEspera, Inscripcion, InscripcionCreate, InscripcionLote
 
 router = APIRouter()
 
+inscription_fields = field_selector(Inscripcion)
 
-@router.post("/", response_model=Inscripcion)
+
+@router.post(
+    "/",
+    response_model=Inscripcion,
+    responses={202: {"model": EntradaEspera, "description": "Torneo completo: el equipo pasa a la lista de espera."}},
+)
 def create_inscription(inscription: InscripcionCreate, db: sqlite3.Connection = Depends(get_db)):
-    db_inscription = crud_inscription.create_inscription(db, inscription=inscription)
-    if db_inscription is None:
-        raise HTTPException(status_code=400, detail="Invalid inscription data")
-    return db_inscription
+    result = crud_inscription.create_inscription(db, inscription=inscription)
+    if isinstance(result, EntradaEspera):
+        return JSONResponse(status_code=status.HTTP_202_ACCEPTED, content=result.model_dump())
+    return result
+
+
+@router.post("/bulk", response_model=ResultadoLote)
+def create_inscriptions_bulk(batch: InscripcionLote, db: sqlite3.Connection = Depends(get_db)):
+    return crud_inscription.create_inscriptions_bulk(db, inscriptions=batch.items, atomic=batch.modo == "atomico")
 
 
 @router.get("/", response_model=List[Inscripcion])
-def read_inscriptions(skip: int = 0, limit: int = 100, db: sqlite3.Connection = Depends(get_db)):
-    inscriptions = crud_inscription.get_inscriptions(db, skip=skip, limit=limit)
-    return inscriptions
+def read_inscriptions(
+    request: Request,
+    response: Response,
+    page: PageParams = Depends(),
+    fields: Optional[Tuple[str, ...]] = Depends(inscription_fields),
+    db: sqlite3.Connection = Depends(get_db),
+):
+    not_modified = check_etag(request, response, make_etag("inscripciones", get_collection_version(db, "inscripciones")))
+    if not_modified:
+        return not_modified
+    if fields is not None:
+        rows = projection.get_rows(db, "inscripciones", fields, skip=page.skip, limit=page.limit, after_id=page.after_id)
+        return projected_response(response, page.apply(response, rows))
+    inscriptions = crud_inscription.get_inscriptions(db, skip=page.skip, limit=page.limit, after_id=page.after_id)
+    return page.apply(response, inscriptions)
+
+
+@router.delete("/waitlist/{entry_id}", status_code=status.HTTP_204_NO_CONTENT)
+def delete_waitlist_entry(entry_id: int, db: sqlite3.Connection = Depends(get_db)):
+    if not crud_inscription.delete_waitlist_entry(db, entry_id=entry_id):
+        raise HTTPException(status_code=404, detail="Waitlist entry not found")
 
 
 @router.delete("/{inscription_id}", status_code=status.HTTP_204_NO_CONTENT)
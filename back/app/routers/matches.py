@@ -1,28 +1,54 @@
 # app/routers/matches.py
-from typing import List
+from typing import List, Optional, Tuple
 
 import sqlite3
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
 
-from app.crud import crud_match
+from app.crud import crud_match, projection
+from app.crud.loader import DataLoader
+from app.crud.versions import get_collection_version
 from app.db.database import get_db
-from app.schemas.match import Partido, PartidoCreate
+from app.routers.deps import PageParams, check_etag, field_selector, get_loader, make_etag, parse_ids, projected_response
+from app.schemas.bulk import ResultadoLote
+from app.schemas.match import Partido, PartidoCreate, PartidoLote
 
 router = APIRouter()
 
+match_fields = field_selector(Partido)
+
 
 @router.post("/", response_model=Partido)
 def create_match(match: PartidoCreate, db: sqlite3.Connection = Depends(get_db)):
-    db_match = crud_match.create_match(db, match=match)
-    if db_match is None:
-        raise HTTPException(status_code=400, detail="Invalid match data")
-    return db_match
+    return crud_match.create_match(db, match=match)
+
+
+@router.post("/bulk", response_model=ResultadoLote)
+def create_matches_bulk(batch: PartidoLote, db: sqlite3.Connection = Depends(get_db)):
+    return crud_match.create_matches_bulk(db, matches=batch.items, atomic=batch.modo == "atomico")
 
 
 @router.get("/", response_model=List[Partido])
-def read_matches(skip: int = 0, limit: int = 100, db: sqlite3.Connection = Depends(get_db)):
-    matches = crud_match.get_matches(db, skip=skip, limit=limit)
-    return matches
+def read_matches(
+    request: Request,
+    response: Response,
+    page: PageParams = Depends(),
+    ids: Optional[List[int]] = Depends(parse_ids),
+    fields: Optional[Tuple[str, ...]] = Depends(match_fields),
+    loader: DataLoader = Depends(get_loader),
+    db: sqlite3.Connection = Depends(get_db),
+):
+    not_modified = check_etag(request, response, make_etag("partidos", get_collection_version(db, "partidos")))
+    if not_modified:
+        return not_modified
+    if fields is not None:
+        if ids is not None:
+            return projected_response(response, projection.get_rows_by_ids(db, "partidos", ids, fields))
+        rows = projection.get_rows(db, "partidos", fields, skip=page.skip, limit=page.limit, after_id=page.after_id)
+        return projected_response(response, page.apply(response, rows))
+    if ids is not None:
+        return [match for match in loader.load_many("partidos", ids) if match is not None]
+    matches = crud_match.get_matches(db, skip=page.skip, limit=page.limit, after_id=page.after_id)
+    return page.apply(response, matches)
 
 
 @router.put("/{match_id}", response_model=Partido)
@@ -1,28 +1,36 @@
 # app/routers/members.py
-from typing import List
+from typing import List, Optional, Tuple
 
 import sqlite3
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Response, status
 
-from app.crud import crud_member
+from app.crud import crud_member, projection
 from app.db.database import get_db
+from app.routers.deps import PageParams, field_selector, projected_response
 from app.schemas.member import Miembro, MiembroCreate
 
 router = APIRouter()
 
+member_fields = field_selector(Miembro)
+
 
 @router.post("/", response_model=Miembro)
 def add_member(member: MiembroCreate, db: sqlite3.Connection = Depends(get_db)):
-    db_member = crud_member.add_member(db, member=member)
-    if db_member is None:
-        raise HTTPException(status_code=400, detail="Invalid member data")
-    return db_member
+    return crud_member.add_member(db, member=member)
 
 
 @router.get("/", response_model=List[Miembro])
-def read_members(skip: int = 0, limit: int = 100, db: sqlite3.Connection = Depends(get_db)):
-    members = crud_member.get_members(db, skip=skip, limit=limit)
-    return members
+def read_members(
+    response: Response,
+    page: PageParams = Depends(),
+    fields: Optional[Tuple[str, ...]] = Depends(member_fields),
+    db: sqlite3.Connection = Depends(get_db),
+):
+    if fields is not None:
+        rows = projection.get_rows(db, "miembros_equipo", fields, skip=page.skip, limit=page.limit, after_id=page.after_id)
+        return projected_response(response, page.apply(response, rows))
+    members = crud_member.get_members(db, skip=page.skip, limit=page.limit, after_id=page.after_id)
+    return page.apply(response, members)
 
 
 @router.delete("/{member_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -1,28 +1,42 @@
 # app/routers/payments.py
-from typing import List
+from typing import List, Optional, Tuple
 
 import sqlite3
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Response, status
 
-from app.crud import crud_payment
+from app.crud import crud_payment, projection
 from app.db.database import get_db
-from app.schemas.payment import Pago, PagoCreate
+from app.routers.deps import PageParams, field_selector, projected_response
+from app.schemas.bulk import ResultadoLote
+from app.schemas.payment import Pago, PagoCreate, PagoLote
 
 router = APIRouter()
 
+payment_fields = field_selector(Pago)
+
 
 @router.post("/", response_model=Pago)
 def create_payment(payment: PagoCreate, db: sqlite3.Connection = Depends(get_db)):
-    db_payment = crud_payment.create_payment(db, payment=payment)
-    if db_payment is None:
-        raise HTTPException(status_code=400, detail="Invalid payment data")
-    return db_payment
+    return crud_payment.create_payment(db, payment=payment)
+
+
+@router.post("/bulk", response_model=ResultadoLote)
+def create_payments_bulk(batch: PagoLote, db: sqlite3.Connection = Depends(get_db)):
+    return crud_payment.create_payments_bulk(db, payments=batch.items, atomic=batch.modo == "atomico")
 
 
 @router.get("/", response_model=List[Pago])
-def read_payments(skip: int = 0, limit: int = 100, db: sqlite3.Connection = Depends(get_db)):
-    payments = crud_payment.get_payments(db, skip=skip, limit=limit)
-    return payments
+def read_payments(
+    response: Response,
+    page: PageParams = Depends(),
+    fields: Optional[Tuple[str, ...]] = Depends(payment_fields),
+    db: sqlite3.Connection = Depends(get_db),
+):
+    if fields is not None:
+        rows = projection.get_rows(db, "pagos", fields, skip=page.skip, limit=page.limit, after_id=page.after_id)
+        return projected_response(response, page.apply(response, rows))
+    payments = crud_payment.get_payments(db, skip=page.skip, limit=page.limit, after_id=page.after_id)
+    return page.apply(response, payments)
 
 
 @router.delete("/{payment_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -0,0 +1,23 @@
+# app/routers/search.py
+from typing import List, Optional
+
+import sqlite3
+from fastapi import APIRouter, Depends, Query
+
+from app.crud import crud_search
+from app.db.database import get_db
+from app.routers.deps import MAX_PAGE_SIZE
+from app.schemas.search import ResultadoBusqueda
+
+router = APIRouter()
+
+
+@router.get("/", response_model=List[ResultadoBusqueda])
+def search(
+    q: str = Query(..., min_length=1, max_length=200, description="Texto a buscar; cada palabra se busca como prefijo."),
+    tipo: Optional[str] = Query(None, pattern="^(usuarios|equipos|torneos)$", description="Limita la búsqueda a una entidad."),
+    skip: int = Query(0, ge=0, description="Número de resultados a omitir."),
+    limit: int = Query(20, ge=1, description=f"Número máximo de resultados a devolver (máximo {MAX_PAGE_SIZE})."),
+    db: sqlite3.Connection = Depends(get_db),
+):
+    return crud_search.search(db, text=q, tipo=tipo, skip=skip, limit=min(limit, MAX_PAGE_SIZE))
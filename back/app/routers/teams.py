@@ -1,36 +1,107 @@
 # app/routers/teams.py
-from typing import List
+from typing import List, Optional, Tuple
 
 import sqlite3
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
 
-from app.crud import crud_team
+from app.crud import crud_rating, crud_team, projection
+from app.crud.loader import DataLoader
+from app.crud.versions import get_collection_version, get_row_version
 from app.db.database import get_db
-from app.schemas.team import Equipo, EquipoCreate, EquipoBase
+from app.routers.deps import (
+    MAX_PAGE_SIZE, PageParams, check_etag, decode_cursor, encode_cursor, field_selector, get_loader, make_etag, parse_ids,
+    projected_response, set_next_cursor,
+)
+from app.schemas.bulk import ResultadoLote
+from app.schemas.rating import Rating, RatingEquipo
+from app.schemas.team import Equipo, EquipoCreate, EquipoBase, EquipoLote
 
 router = APIRouter()
 
+team_fields = field_selector(Equipo)
+
 
 @router.post("/", response_model=Equipo)
 def create_team(team: EquipoCreate, db: sqlite3.Connection = Depends(get_db)):
-    # Validar unicidad de nombre de equipo
-    existing_team = db.execute("SELECT * FROM equipos WHERE nombre = ?", (team.nombre,)).fetchone()
-    if existing_team:
-        raise HTTPException(status_code=400, detail="El nombre del equipo ya está registrado")
-    db_team = crud_team.create_team(db, team=team)
-    if db_team is None:
-        raise HTTPException(status_code=400, detail="El capitán ya lidera otro equipo o datos inválidos")
-    return db_team
+    # La unicidad de nombre y capitán la validan las restricciones UNIQUE
+    return crud_team.create_team(db, team=team)
+
+
+@router.post("/bulk", response_model=ResultadoLote)
+def create_teams_bulk(batch: EquipoLote, db: sqlite3.Connection = Depends(get_db)):
+    return crud_team.create_teams_bulk(db, teams=batch.items, atomic=batch.modo == "atomico")
 
 
 @router.get("/", response_model=List[Equipo])
-def read_teams(skip: int = 0, limit: int = 100, db: sqlite3.Connection = Depends(get_db)):
-    teams = crud_team.get_teams(db, skip=skip, limit=limit)
-    return teams
+def read_teams(
+    request: Request,
+    response: Response,
+    page: PageParams = Depends(),
+    ids: Optional[List[int]] = Depends(parse_ids),
+    fields: Optional[Tuple[str, ...]] = Depends(team_fields),
+    loader: DataLoader = Depends(get_loader),
+    db: sqlite3.Connection = Depends(get_db),
+):
+    not_modified = check_etag(request, response, make_etag("equipos", get_collection_version(db, "equipos")))
+    if not_modified:
+        return not_modified
+    if fields is not None:
+        if ids is not None:
+            return projected_response(response, projection.get_rows_by_ids(db, "equipos", ids, fields))
+        rows = projection.get_rows(db, "equipos", fields, skip=page.skip, limit=page.limit, after_id=page.after_id)
+        return projected_response(response, page.apply(response, rows))
+    if ids is not None:
+        return [team for team in loader.load_many("equipos", ids) if team is not None]
+    teams = crud_team.get_teams(db, skip=page.skip, limit=page.limit, after_id=page.after_id)
+    return page.apply(response, teams)
+
+
+@router.get("/ratings", response_model=List[Rating])
+def read_ranking(
+    response: Response,
+    limit: int = Query(100, ge=1, description=f"Número máximo de equipos a devolver (máximo {MAX_PAGE_SIZE})."),
+    cursor: Optional[str] = Query(None, description="Cursor opaco devuelto en la cabecera `X-Next-Cursor`."),
+    db: sqlite3.Connection = Depends(get_db),
+):
+    limit = min(limit, MAX_PAGE_SIZE)
+    after = None
+    if cursor is not None:
+        values = decode_cursor(cursor)
+        if len(values) != 2 or not isinstance(values[0], (int, float)) or not isinstance(values[1], int):
+            raise HTTPException(status_code=400, detail="Cursor inválido")
+        after = (values[0], values[1])
+    ranking = crud_rating.get_ranking(db, limit=limit, after=after)
+    if len(ranking) == limit:
+        set_next_cursor(response, encode_cursor(ranking[-1].rating, ranking[-1].id_equipo))
+    return ranking
+
+
+@router.get("/{team_id}/rating", response_model=RatingEquipo)
+def read_team_rating(team_id: int, db: sqlite3.Connection = Depends(get_db)):
+    if crud_team.get_team(db, team_id=team_id) is None:
+        raise HTTPException(status_code=404, detail="Team not found")
+    return crud_rating.get_team_rating(db, team_id=team_id)
 
 
 @router.get("/{team_id}", response_model=Equipo)
-def read_team(team_id: int, db: sqlite3.Connection = Depends(get_db)):
+def read_team(
+    team_id: int,
+    request: Request,
+    response: Response,
+    fields: Optional[Tuple[str, ...]] = Depends(team_fields),
+    db: sqlite3.Connection = Depends(get_db),
+):
+    version = get_row_version(db, "equipos", team_id)
+    if version is None:
+        raise HTTPException(status_code=404, detail="Team not found")
+    not_modified = check_etag(request, response, make_etag("equipos", team_id, version))
+    if not_modified:
+        return not_modified
+    if fields is not None:
+        row = projection.get_row(db, "equipos", team_id, fields)
+        if row is None:
+            raise HTTPException(status_code=404, detail="Team not found")
+        return projected_response(response, row)
     db_team = crud_team.get_team(db, team_id=team_id)
     if db_team is None:
         raise HTTPException(status_code=404, detail="Team not found")
@@ -39,10 +110,6 @@ def read_team(team_id: int, db: sqlite3.Connection = Depends(get_db)):
 
 @router.put("/{team_id}", response_model=Equipo)
 def update_team(team_id: int, team: EquipoBase, db: sqlite3.Connection = Depends(get_db)):
-    # Validar unicidad de nombre de equipo (excepto para el propio equipo)
-    existing_team = db.execute("SELECT * FROM equipos WHERE nombre = ? AND id != ?", (team.nombre, team_id)).fetchone()
-    if existing_team:
-        raise HTTPException(status_code=400, detail="El nombre del equipo ya está registrado por otro equipo")
     db_team = crud_team.update_team(db, team_id=team_id, team=team)
     if db_team is None:
         raise HTTPException(status_code=404, detail="Team not found")
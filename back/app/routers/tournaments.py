@@ -1,52 +1,119 @@
 # app/routers/tournaments.py
-from typing import List
+from typing import List, Optional, Tuple
 
 import sqlite3
-from fastapi import APIRouter, Depends, HTTPException, status
-
-from app.crud import crud_tournament
-from app.db.database import get_db
-from app.schemas.tournament import Torneo, TorneoCreate, TorneoBase, TorneoStatusUpdate
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, WebSocket, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+
+from app.crud import crud_fixture, crud_inscription, crud_schedule, crud_standings, crud_swiss, crud_tournament, projection
+from app.crud.loader import DataLoader
+from app.crud.versions import get_collection_version, get_row_version
+from app.db.database import connection, get_db
+from app.live.streams import serve_websocket, sse_events
+from app.routers.deps import PageParams, check_etag, field_selector, get_loader, make_etag, parse_ids, projected_response
+from app.schemas.fixture import FixtureCreate, ResultadoFixture, RondaSuiza
+from app.schemas.inscription import EntradaEspera
+from app.schemas.schedule import ProgramacionCreate, ResultadoProgramacion
+from app.schemas.standings import FilaClasificacion
+from app.schemas.tournament import Torneo, TorneoCreate, TorneoBase, TorneoDetalle, TorneoStatusUpdate
 
 router = APIRouter()
 
+tournament_fields = field_selector(Torneo)
+
 
 @router.get("/status/{status}", response_model=List[Torneo])
-def read_tournaments_by_status(status: str, db: sqlite3.Connection = Depends(get_db)):
+def read_tournaments_by_status(status: str, request: Request, response: Response, db: sqlite3.Connection = Depends(get_db)):
+    not_modified = check_etag(request, response, make_etag("torneos", get_collection_version(db, "torneos")))
+    if not_modified:
+        return not_modified
     return crud_tournament.get_tournaments_by_status(db, status=status)
 
 
 @router.post("/", response_model=Torneo)
 def create_tournament(tournament: TorneoCreate, db: sqlite3.Connection = Depends(get_db)):
-    # Validar unicidad de nombre de torneo
-    existing = db.execute("SELECT * FROM torneos WHERE nombre = ?", (tournament.nombre,)).fetchone()
-    if existing:
-        raise HTTPException(status_code=400, detail="El nombre del torneo ya está registrado")
+    # La unicidad del nombre la valida la restricción UNIQUE de torneos.nombre
     return crud_tournament.create_tournament(db=db, tournament=tournament)
 
 
 @router.get("/", response_model=List[Torneo])
-def read_tournaments(skip: int = 0, limit: int = 100, db: sqlite3.Connection = Depends(get_db)):
-    tournaments = crud_tournament.get_tournaments(db, skip=skip, limit=limit)
-    return tournaments
+def read_tournaments(
+    request: Request,
+    response: Response,
+    page: PageParams = Depends(),
+    ids: Optional[List[int]] = Depends(parse_ids),
+    fields: Optional[Tuple[str, ...]] = Depends(tournament_fields),
+    loader: DataLoader = Depends(get_loader),
+    db: sqlite3.Connection = Depends(get_db),
+):
+    not_modified = check_etag(request, response, make_etag("torneos", get_collection_version(db, "torneos")))
+    if not_modified:
+        return not_modified
+    if fields is not None:
+        if ids is not None:
+            return projected_response(response, projection.get_rows_by_ids(db, "torneos", ids, fields))
+        rows = projection.get_rows(db, "torneos", fields, skip=page.skip, limit=page.limit, after_id=page.after_id)
+        return projected_response(response, page.apply(response, rows))
+    if ids is not None:
+        return [tournament for tournament in loader.load_many("torneos", ids) if tournament is not None]
+    tournaments = crud_tournament.get_tournaments(db, skip=page.skip, limit=page.limit, after_id=page.after_id)
+    return page.apply(response, tournaments)
 
 
 @router.get("/{tournament_id}", response_model=Torneo)
-def read_tournament(tournament_id: int, db: sqlite3.Connection = Depends(get_db)):
+def read_tournament(
+    tournament_id: int,
+    request: Request,
+    response: Response,
+    fields: Optional[Tuple[str, ...]] = Depends(tournament_fields),
+    db: sqlite3.Connection = Depends(get_db),
+):
+    version = get_row_version(db, "torneos", tournament_id)
+    if version is None:
+        raise HTTPException(status_code=404, detail="Tournament not found")
+    not_modified = check_etag(request, response, make_etag("torneos", tournament_id, version))
+    if not_modified:
+        return not_modified
+    if fields is not None:
+        row = projection.get_row(db, "torneos", tournament_id, fields)
+        if row is None:
+            raise HTTPException(status_code=404, detail="Tournament not found")
+        return projected_response(response, row)
     db_tournament = crud_tournament.get_tournament(db, tournament_id=tournament_id)
     if db_tournament is None:
         raise HTTPException(status_code=404, detail="Tournament not found")
     return db_tournament
 
 
+@router.get("/{tournament_id}/full", response_model=TorneoDetalle, response_model_exclude_unset=True)
+def read_tournament_detail(
+    tournament_id: int,
+    include: Optional[str] = Query(
+        None,
+        description=f"Secciones a incluir separadas por comas ({', '.join(crud_tournament.DETAIL_SECTIONS)}). Por defecto, todas.",
+    ),
+    db: sqlite3.Connection = Depends(get_db),
+):
+    sections = crud_tournament.DETAIL_SECTIONS
+    if include is not None:
+        sections = tuple(section.strip() for section in include.split(",") if section.strip())
+        unknown = [section for section in sections if section not in crud_tournament.DETAIL_SECTIONS]
+        if unknown:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Secciones no válidas: {', '.join(unknown)}. Disponibles: {', '.join(crud_tournament.DETAIL_SECTIONS)}",
+            )
+    db_tournament = crud_tournament.get_tournament_detail(db, tournament_id=tournament_id, include=sections)
+    if db_tournament is None:
+        raise HTTPException(status_code=404, detail="Tournament not found")
+    return db_tournament
+
+
 @router.put("/{tournament_id}", response_model=Torneo)
 def update_tournament(
     tournament_id: int, tournament: TorneoBase, db: sqlite3.Connection = Depends(get_db)
 ):
-    # Validar unicidad de nombre de torneo (excepto para el propio torneo)
-    existing = db.execute("SELECT * FROM torneos WHERE nombre = ? AND id != ?", (tournament.nombre, tournament_id)).fetchone()
-    if existing:
-        raise HTTPException(status_code=400, detail="El nombre del torneo ya está registrado por otro torneo")
     db_tournament = crud_tournament.update_tournament(
         db, tournament_id=tournament_id, tournament=tournament
     )
@@ -63,6 +130,85 @@ def update_tournament_status(tournament_id: int, status_update: TorneoStatusUpda
     if db_tournament is None:
         raise HTTPException(status_code=404, detail="Tournament not found")
     return db_tournament
+
+
+@router.post("/{tournament_id}/fixtures", response_model=ResultadoFixture)
+def generate_fixtures(tournament_id: int, fixture: FixtureCreate, db: sqlite3.Connection = Depends(get_db)):
+    result = crud_fixture.generate_fixtures(
+        db, tournament_id=tournament_id, formato=fixture.formato, ida_y_vuelta=fixture.ida_y_vuelta
+    )
+    if result is None:
+        raise HTTPException(status_code=404, detail="Tournament not found")
+    return result
+
+
+@router.post("/{tournament_id}/rounds/next", response_model=RondaSuiza)
+def generate_next_swiss_round(
+    tournament_id: int,
+    fecha: Optional[str] = Query(None, description="Fecha de los partidos de la ronda (ISO 8601). Por defecto se reparte entre el inicio y el fin del torneo."),
+    db: sqlite3.Connection = Depends(get_db),
+):
+    result = crud_swiss.next_round(db, tournament_id=tournament_id, fecha=fecha)
+    if result is None:
+        raise HTTPException(status_code=404, detail="Tournament not found")
+    return result
+
+
+@router.post("/{tournament_id}/schedule", response_model=ResultadoProgramacion)
+def schedule_matches(tournament_id: int, programacion: ProgramacionCreate, db: sqlite3.Connection = Depends(get_db)):
+    result = crud_schedule.schedule_matches(db, tournament_id=tournament_id, programacion=programacion)
+    if result is None:
+        raise HTTPException(status_code=404, detail="Tournament not found")
+    return result
+
+
+@router.get("/{tournament_id}/waitlist", response_model=List[EntradaEspera])
+def read_waitlist(tournament_id: int, db: sqlite3.Connection = Depends(get_db)):
+    if crud_tournament.get_tournament(db, tournament_id=tournament_id) is None:
+        raise HTTPException(status_code=404, detail="Tournament not found")
+    return crud_inscription.get_waitlist(db, tournament_id=tournament_id)
+
+
+def _tournament_exists(tournament_id: int) -> bool:
+    # Los canales en vivo no usan Depends(get_db): la conexión se devuelve al pool
+    # nada más comprobar el torneo y no queda retenida mientras siguen abiertos
+    with connection() as db:
+        return get_row_version(db, "torneos", tournament_id) is not None
+
+
+@router.get("/{tournament_id}/live", response_class=StreamingResponse)
+async def live_events(tournament_id: int):
+    # Evento `resultado` (partido y clasificación de sus dos equipos) en cada cambio de
+    # resultado. Tras `desconectado` (cliente lento) hay que reconectar y volver a leer
+    # la clasificación con GET /tournaments/{id}/standings
+    if not await run_in_threadpool(_tournament_exists, tournament_id):
+        raise HTTPException(status_code=404, detail="Tournament not found")
+    return StreamingResponse(
+        sse_events(tournament_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.websocket("/{tournament_id}/live/ws")
+async def live_websocket(websocket: WebSocket, tournament_id: int):
+    # Mismos eventos que el stream SSE, como `{"id", "evento", "datos"}`
+    if not await run_in_threadpool(_tournament_exists, tournament_id):
+        await websocket.close(code=1008, reason="Tournament not found")
+        return
+    await websocket.accept()
+    await serve_websocket(websocket, tournament_id)
+
+
+@router.get("/{tournament_id}/standings", response_model=List[FilaClasificacion])
+def read_standings(tournament_id: int, request: Request, response: Response, db: sqlite3.Connection = Depends(get_db)):
+    if crud_tournament.get_tournament(db, tournament_id=tournament_id) is None:
+        raise HTTPException(status_code=404, detail="Tournament not found")
+    # La clasificación sólo cambia cuando cambian los partidos
+    not_modified = check_etag(request, response, make_etag("clasificacion", tournament_id, get_collection_version(db, "partidos")))
+    if not_modified:
+        return not_modified
+    return crud_standings.get_standings(db, tournament_id=tournament_id)
 def delete_tournament(tournament_id: int, db: sqlite3.Connection = Depends(get_db)):
     if not crud_tournament.delete_tournament(db, tournament_id=tournament_id):
         raise HTTPException(status_code=404, detail="Tournament not found")
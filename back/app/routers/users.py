@@ -1,18 +1,44 @@
 # app/routers/users.py
-from typing import List
+from typing import List, Optional, Tuple
 
 import sqlite3
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Response, status
 from fastapi.security import OAuth2PasswordRequestForm
+from starlette.concurrency import run_in_threadpool
 
-from app.crud import crud_user
-from app.db.database import get_db
-from app.schemas.user import Usuario, UsuarioCreate, UsuarioBase
+from app.crud import crud_user, projection
+from app.crud.loader import DataLoader
+from app.db.database import connection, get_db
+from app.routers.deps import PageParams, field_selector, get_loader, parse_ids, projected_response
+from app.schemas.bulk import ResultadoLote
+from app.schemas.user import Usuario, UsuarioActual, UsuarioCreate, UsuarioBase, UsuarioLote
 from app.schemas.token import Token
 from app.security import security
+from app.security.auth import get_current_user
 
 router = APIRouter()
 
+user_fields = field_selector(Usuario)
+
+
+# Las rutas que hashean o verifican contraseñas no usan Depends(get_db): esperar al
+# pool de bcrypt con una conexión prestada dejaría el pool de conexiones sin
+# conexiones libres para el resto de peticiones. Toman la conexión sólo para leer o
+# escribir, en el threadpool, con estas funciones.
+def _insert_user(user: UsuarioCreate, hashed_password: str) -> Usuario:
+    with connection() as db:
+        return crud_user.create_user(db, user, hashed_password)
+
+
+def _insert_users(batch: UsuarioLote, hashes: List[str]) -> ResultadoLote:
+    with connection() as db:
+        return crud_user.create_users_bulk(db, users=batch.items, atomic=batch.modo == "atomico", hashes=hashes)
+
+
+def _find_user_by_email(email: str):
+    with connection() as db:
+        return crud_user.get_user_by_email(db, email)
+
 
 @router.post(
     "/", 
@@ -48,31 +74,60 @@ router = APIRouter()
             "description": "Email ya registrado o datos inválidos",
             "content": {
                 "application/json": {
-                    "example": {"detail": "Email already registered"}
+                    "example": {"detail": "El email ya está registrado."}
                 }
             }
         }
     }
 )
-def create_user(user: UsuarioCreate, db: sqlite3.Connection = Depends(get_db)):
+async def create_user(user: UsuarioCreate):
     """
     Crea un nuevo usuario en el sistema.
+
+    El hash bcrypt se calcula en el pool de procesos de `security` sin ocupar
+    ninguna conexión; después, la escritura toma una conexión en el threadpool.
     
     Args:
         user: Datos del usuario a crear (nombre, nickname, email, pwd_hash)
-        db: Conexión a la base de datos (inyectada automáticamente)
         
     Returns:
         Usuario creado con ID y fecha de registro asignados
         
     Raises:
-        HTTPException 400: Si el email ya está registrado
+        HTTPException 400: Si el email o el nickname ya están registrados
         HTTPException 422: Si los datos de entrada no son válidos
     """
-    db_user = crud_user.get_user_by_email(db, email=user.email)
-    if db_user:
-        raise HTTPException(status_code=400, detail="Email already registered")
-    return crud_user.create_user(db=db, user=user)
+    hashed_password = await security.get_password_hash_async(user.password)
+    return await run_in_threadpool(_insert_user, user, hashed_password)
+
+
+@router.post(
+    "/bulk",
+    response_model=ResultadoLote,
+    summary="Crear usuarios de forma masiva",
+    description="""
+    Registra muchos usuarios en una sola transacción.
+
+    - **modo=atomico**: si algún usuario es inválido (email o nickname repetido) no se guarda ninguno.
+    - **modo=parcial**: se guardan los usuarios válidos y se informa del error de los demás.
+
+    La respuesta indica, para cada elemento de `items`, el ID asignado o el motivo del fallo.
+    """
+)
+async def create_users_bulk(batch: UsuarioLote):
+    """
+    Crea usuarios de forma masiva.
+
+    Las contraseñas se hashean antes de tomar una conexión para la escritura.
+
+    Args:
+        batch: Usuarios a crear y modo del lote
+
+    Returns:
+        Resultado de cada usuario del lote
+    """
+    hashes = await security.hash_passwords_async([user.password for user in batch.items])
+    return await run_in_threadpool(_insert_users, batch, hashes)
 
 
 @router.get(
@@ -83,24 +138,69 @@ def create_user(user: UsuarioCreate, db: sqlite3.Connection = Depends(get_db)):
     Obtiene una lista paginada de todos los usuarios registrados en el sistema.
     
     Parámetros de paginación:
-    - **skip**: Número de registros a omitir (por defecto: 0)
-    - **limit**: Número máximo de registros a devolver (por defecto: 100, máximo: 100)
+    - **cursor**: Cursor opaco de la página siguiente (cabecera `X-Next-Cursor` de la respuesta anterior)
+    - **limit**: Número máximo de registros a devolver (por defecto: 100, máximo configurable con `MAX_PAGE_SIZE`)
+    - **skip**: Número de registros a omitir (obsoleto, se mantiene por compatibilidad)
+
+    Con **ids** (lista separada por comas) devuelve en cambio esos usuarios, en una sola consulta.
+    Con **fields** (p. ej. `fields=nickname`) sólo se leen y devuelven esos campos y el `id`.
     """
 )
-def read_users(skip: int = 0, limit: int = 100, db: sqlite3.Connection = Depends(get_db)):
+def read_users(
+    response: Response,
+    page: PageParams = Depends(),
+    ids: Optional[List[int]] = Depends(parse_ids),
+    fields: Optional[Tuple[str, ...]] = Depends(user_fields),
+    loader: DataLoader = Depends(get_loader),
+    db: sqlite3.Connection = Depends(get_db),
+):
     """
-    Obtiene una lista de usuarios con paginación.
+    Obtiene una lista de usuarios con paginación, o los usuarios con los IDs indicados.
     
     Args:
-        skip: Número de registros a omitir para paginación
-        limit: Número máximo de registros a devolver
+        response: Respuesta en curso (recibe la cabecera `X-Next-Cursor`)
+        page: Parámetros de paginación (cursor, limit, skip)
+        ids: IDs de los usuarios a devolver (sin paginación)
+        fields: Campos a devolver (por defecto, todos)
+        loader: Loader por ID de la petición
         db: Conexión a la base de datos
         
     Returns:
         Lista de usuarios encontrados
     """
-    users = crud_user.get_users(db, skip=skip, limit=limit)
-    return users
+    if fields is not None:
+        if ids is not None:
+            return projected_response(response, projection.get_rows_by_ids(db, "usuarios", ids, fields))
+        rows = projection.get_rows(db, "usuarios", fields, skip=page.skip, limit=page.limit, after_id=page.after_id)
+        return projected_response(response, page.apply(response, rows))
+    if ids is not None:
+        return [user for user in loader.load_many("usuarios", ids) if user is not None]
+    users = crud_user.get_users(db, skip=page.skip, limit=page.limit, after_id=page.after_id)
+    return page.apply(response, users)
+
+
+@router.get(
+    "/me",
+    response_model=UsuarioActual,
+    summary="Obtener el usuario autenticado",
+    description="Devuelve los datos del usuario identificado por el token Bearer del header Authorization.",
+    responses={
+        401: {
+            "description": "Token ausente, inválido o caducado",
+        }
+    }
+)
+def read_current_user(current_user: UsuarioActual = Depends(get_current_user)):
+    """
+    Obtiene el usuario autenticado.
+
+    Args:
+        current_user: Usuario resuelto a partir del token (inyectado automáticamente)
+
+    Returns:
+        Datos del usuario autenticado
+    """
+    return current_user
 
 
 @router.get(
@@ -133,20 +233,32 @@ def read_users(skip: int = 0, limit: int = 100, db: sqlite3.Connection = Depends
         }
     }
 )
-def read_user(user_id: int, db: sqlite3.Connection = Depends(get_db)):
+def read_user(
+    user_id: int,
+    response: Response,
+    fields: Optional[Tuple[str, ...]] = Depends(user_fields),
+    db: sqlite3.Connection = Depends(get_db),
+):
     """
     Obtiene un usuario por su ID.
     
     Args:
         user_id: ID único del usuario a buscar
+        response: Respuesta en curso
+        fields: Campos a devolver (por defecto, todos; sin pasar por la caché)
         db: Conexión a la base de datos
         
     Returns:
-        Datos completos del usuario
+        Datos completos del usuario, o sólo los campos pedidos
         
     Raises:
         HTTPException 404: Si el usuario no existe
     """
+    if fields is not None:
+        row = projection.get_row(db, "usuarios", user_id, fields)
+        if row is None:
+            raise HTTPException(status_code=404, detail="User not found")
+        return projected_response(response, row)
     db_user = crud_user.get_user(db, user_id=user_id)
     if db_user is None:
         raise HTTPException(status_code=404, detail="User not found")
@@ -228,13 +340,7 @@ def update_user(user_id: int, user: UsuarioBase, db: sqlite3.Connection = Depend
         HTTPException 404: Si el usuario no existe
         HTTPException 400: Si hay conflicto con email/nickname
     """
-    # Validar unicidad de email y nickname (excepto para el propio usuario)
-    existing_email = crud_user.get_user_by_email(db, user.email)
-    if existing_email and existing_email.id != user_id:
-        raise HTTPException(status_code=400, detail="Email ya registrado por otro usuario")
-    existing_nick = crud_user.get_user_by_nickname(db, user.nickname)
-    if existing_nick and existing_nick.id != user_id:
-        raise HTTPException(status_code=400, detail="Nickname ya registrado por otro usuario")
+    # La unicidad de email y nickname la validan las restricciones UNIQUE
     db_user = crud_user.update_user(db, user_id=user_id, user=user)
     if db_user is None:
         raise HTTPException(status_code=404, detail="User not found")
@@ -314,13 +420,15 @@ def delete_user(user_id: int, db: sqlite3.Connection = Depends(get_db)):
         }
     }
 )
-def login_for_access_token(form_data: OAuth2PasswordRequestForm = Depends(), db: sqlite3.Connection = Depends(get_db)):
+async def login_for_access_token(form_data: OAuth2PasswordRequestForm = Depends()):
     """
     Autentica un usuario y genera un token de acceso.
+
+    La conexión sólo se usa para leer el usuario y se devuelve al pool antes de
+    verificar la contraseña.
     
     Args:
         form_data: Formulario con credenciales (username=email, password)
-        db: Conexión a la base de datos
         
     Returns:
         Token JWT y tipo de token
@@ -328,8 +436,8 @@ def login_for_access_token(form_data: OAuth2PasswordRequestForm = Depends(), db:
     Raises:
         HTTPException 401: Si las credenciales son incorrectas
     """
-    user = crud_user.get_user_by_email(db, email=form_data.username)
-    if not user or not security.verify_password(form_data.password, user.pwd_hash):
+    user = await run_in_threadpool(_find_user_by_email, form_data.username)
+    if not user or not await security.verify_password_async(form_data.password, user.pwd_hash):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect username or password",
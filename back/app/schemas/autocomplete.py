@@ -0,0 +1,11 @@
+
+from pydantic import BaseModel, Field
+
+
+class Sugerencia(BaseModel):
+    """
+    Sugerencia de autocompletado.
+    """
+    tipo: str = Field(..., description="Entidad sugerida: 'usuarios' o 'equipos'.")
+    id: int = Field(..., description="ID de la entidad.")
+    texto: str = Field(..., description="Nickname del usuario o nombre del equipo.")
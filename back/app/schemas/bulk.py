@@ -0,0 +1,36 @@
+
+from typing import List, Optional
+from pydantic import BaseModel, Field
+
+# Número máximo de elementos aceptados en una sola petición de creación masiva
+MAX_LOTE = 10000
+
+
+class LoteBase(BaseModel):
+    """
+    Esquema base para las peticiones de creación masiva. Cada entidad define su propio lote con la lista `items`.
+    """
+    modo: str = Field(
+        "atomico",
+        pattern="^(atomico|parcial)$",
+        description="'atomico': si algún elemento falla no se guarda ninguno. 'parcial': se guardan los elementos válidos y se informa de los que fallan."
+    )
+
+
+class ResultadoItem(BaseModel):
+    """
+    Resultado de la creación de un elemento dentro de un lote.
+    """
+    indice: int = Field(..., description="Posición del elemento en la lista `items` de la petición.")
+    ok: bool = Field(..., description="Indica si el elemento se guardó.")
+    id: Optional[int] = Field(None, description="ID asignado al elemento, si se guardó.")
+    error: Optional[str] = Field(None, description="Motivo del fallo, si no se guardó.")
+
+
+class ResultadoLote(BaseModel):
+    """
+    Resultado de una petición de creación masiva.
+    """
+    creados: int = Field(..., description="Número de elementos guardados.")
+    fallidos: int = Field(..., description="Número de elementos que no se guardaron.")
+    resultados: List[ResultadoItem] = Field(..., description="Resultado de cada elemento, en el mismo orden que la petición.")
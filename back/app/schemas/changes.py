@@ -0,0 +1,23 @@
+
+from typing import Any, Dict, List, Optional
+from pydantic import BaseModel, Field
+
+
+class Cambio(BaseModel):
+    """
+    Cambio de una fila desde el cursor pedido (sólo el último de cada fila).
+    """
+    seq: int = Field(..., description="Posición del cambio en el registro.")
+    entidad: str = Field(..., description="Tabla modificada (p. ej. 'usuarios' o 'partidos').")
+    id: Optional[int] = Field(None, description="ID de la fila; nulo en las operaciones 'reload'.")
+    op: str = Field(..., description="'insert', 'update', 'delete' o 'reload' (la tabla entera se recargó y debe leerse de nuevo).")
+    datos: Optional[Dict[str, Any]] = Field(None, description="Estado actual de la fila en 'insert' y 'update' (columnas de la exportación).")
+
+
+class PaginaCambios(BaseModel):
+    """
+    Página del registro de cambios.
+    """
+    cambios: List[Cambio] = Field(..., description="Cambios en orden de `seq`.")
+    siguiente: int = Field(..., description="Cursor para la siguiente petición (`since`).")
+    hay_mas: bool = Field(..., description="Si quedan cambios posteriores sin devolver.")
@@ -0,0 +1,40 @@
+
+from typing import List, Optional
+from pydantic import BaseModel, Field
+
+from app.schemas.match import Partido
+
+
+class FixtureCreate(BaseModel):
+    """
+    Esquema para generar el calendario de un torneo a partir de sus inscripciones.
+    """
+    formato: str = Field(
+        ...,
+        pattern="^(liga|eliminacion|doble_eliminacion)$",
+        description="'liga': todos contra todos. 'eliminacion': eliminación directa. 'doble_eliminacion': cuadro de ganadores y de perdedores con final."
+    )
+    ida_y_vuelta: bool = Field(False, description="Sólo para 'liga': añade una segunda vuelta con la localía invertida.")
+
+
+class ResultadoFixture(BaseModel):
+    """
+    Resultado de una generación de calendario.
+
+    En liga se generan todas las jornadas de una vez. En eliminación sólo se generan
+    los cruces cuyos equipos ya se conocen: hay que volver a llamar al endpoint tras
+    registrar los resultados de cada ronda.
+    """
+    formato: str = Field(..., description="Formato del torneo.")
+    creados: int = Field(..., description="Número de partidos creados en esta llamada.")
+    jornadas: int = Field(..., description="Número total de jornadas del calendario.")
+    campeon: Optional[int] = Field(None, description="ID del equipo campeón, si el cuadro de eliminación ya está decidido.")
+
+
+class RondaSuiza(BaseModel):
+    """
+    Ronda suiza generada.
+    """
+    ronda: int = Field(..., description="Número de la ronda generada.")
+    descanso: Optional[int] = Field(None, description="ID del equipo que descansa en esta ronda (si el número de equipos es impar).")
+    partidos: List[Partido] = Field(..., description="Partidos de la ronda, del primer tablero al último.")
@@ -1,9 +1,12 @@
 
+from typing import List
 
 from pydantic import BaseModel, Field, ConfigDict
 
 from pydantic import validator
 
+from app.schemas.bulk import LoteBase, MAX_LOTE
+
 class InscripcionBase(BaseModel):
     """
     Esquema base para una inscripción. Contiene los campos comunes que se utilizan tanto para la creación como para la lectura de una inscripción.
@@ -49,3 +52,26 @@ class Inscripcion(InscripcionBase):
         }
     )
 
+
+class EntradaEspera(InscripcionBase):
+    """
+    Esquema para leer una entrada de la lista de espera de un torneo completo.
+    """
+    id: int = Field(..., description="Identificador único de la entrada.")
+    fecha_alta: str = Field(..., description="Fecha y hora en que el equipo entró en la lista de espera (formato ISO 8601).")
+    posicion: int = Field(..., description="Posición en la lista de espera (1 = el próximo en inscribirse cuando quede una plaza libre).")
+
+    model_config = ConfigDict(
+        json_schema_extra={
+            "examples": [
+                {"id": 1, "id_equipo": 101, "id_torneo": 1, "fecha_alta": "2024-06-20T10:00:00Z", "posicion": 1}
+            ]
+        }
+    )
+
+
+class InscripcionLote(LoteBase):
+    """
+    Esquema para la creación masiva de inscripciones.
+    """
+    items: List[InscripcionCreate] = Field(..., min_length=1, max_length=MAX_LOTE, description="Inscripciones a crear.")
@@ -1,9 +1,11 @@
 
-from typing import Optional
+from typing import List, Optional
 from pydantic import BaseModel, Field, ConfigDict
 
 from pydantic import validator
 
+from app.schemas.bulk import LoteBase, MAX_LOTE
+
 class PartidoBase(BaseModel):
     """
     Esquema base para un partido. Contiene los campos comunes que se utilizan tanto para la creación como para la lectura de un partido.
@@ -14,6 +16,7 @@ class PartidoBase(BaseModel):
     fecha: str = Field(..., description="Fecha y hora programada del partido (formato ISO 8601, ej. 'YYYY-MM-DDTHH:MM:SSZ').")
     resultado_local: Optional[int] = Field(None, ge=0, description="Puntuación del equipo local (opcional, para resultados). unlawfully-awesome-amphibian")
     resultado_visitante: Optional[int] = Field(None, ge=0, description="Puntuación del equipo visitante (opcional, para resultados). unlawfully-awesome-amphibian")
+    sede: Optional[str] = Field(None, min_length=1, max_length=100, description="Sede en la que se juega el partido (opcional).")
 
     @validator('id_torneo', 'equipo_local', 'equipo_visitante')
     def id_positivo(cls, v):
@@ -31,7 +34,8 @@ class PartidoBase(BaseModel):
                     "equipo_visitante": 102,
                     "fecha": "2024-07-05T20:00:00Z",
                     "resultado_local": None,
-                    "resultado_visitante": None
+                    "resultado_visitante": None,
+                    "sede": "Pista 1"
                 }
             ]
         }
@@ -50,6 +54,9 @@ class Partido(PartidoBase):
     Esquema completo de un partido, incluyendo su ID.
     """
     id: int = Field(..., description="Identificador único del partido.")
+    llave: Optional[str] = Field(None, description="Cuadro del partido si fue generado por el calendario (liga, ganadores, perdedores, final).")
+    ronda: Optional[int] = Field(None, description="Ronda del partido dentro de su cuadro.")
+    posicion: Optional[int] = Field(None, description="Posición del partido dentro de la ronda.")
 
     model_config = ConfigDict(
         json_schema_extra={
@@ -67,3 +74,9 @@ class Partido(PartidoBase):
         }
     )
 
+
+class PartidoLote(LoteBase):
+    """
+    Esquema para la creación masiva de partidos.
+    """
+    items: List[PartidoCreate] = Field(..., min_length=1, max_length=MAX_LOTE, description="Partidos a crear.")
@@ -1,9 +1,11 @@
 
-from typing import Optional
+from typing import List, Optional
 from pydantic import BaseModel, Field, ConfigDict
 
 from pydantic import validator
 
+from app.schemas.bulk import LoteBase, MAX_LOTE
+
 class PagoBase(BaseModel):
     """
     Esquema base para un pago. Contiene los campos comunes que se utilizan tanto para la creación como para la lectura de un pago.
@@ -61,3 +63,9 @@ class Pago(PagoBase):
         }
     )
 
+
+class PagoLote(LoteBase):
+    """
+    Esquema para la creación masiva de pagos.
+    """
+    items: List[PagoCreate] = Field(..., min_length=1, max_length=MAX_LOTE, description="Pagos a crear.")
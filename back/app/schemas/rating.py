@@ -0,0 +1,38 @@
+
+from typing import List, Optional
+from pydantic import BaseModel, Field, ConfigDict
+
+
+class Rating(BaseModel):
+    """
+    Rating Elo de un equipo.
+    """
+    id_equipo: int = Field(..., description="ID del equipo.")
+    rating: float = Field(..., description="Rating Elo actual (1500 de partida).")
+    partidos: int = Field(..., description="Partidos con resultado que han contado para el rating.")
+
+    model_config = ConfigDict(
+        from_attributes=True,
+        json_schema_extra={
+            "examples": [
+                {"id_equipo": 101, "rating": 1563.2, "partidos": 12}
+            ]
+        }
+    )
+
+
+class PuntoHistorialRating(BaseModel):
+    """
+    Cambio de rating de un equipo en un partido.
+    """
+    id_partido: int = Field(..., description="ID del partido.")
+    fecha: Optional[str] = Field(None, description="Fecha del partido.")
+    rating_antes: float = Field(..., description="Rating antes del partido.")
+    rating_despues: float = Field(..., description="Rating después del partido.")
+
+
+class RatingEquipo(Rating):
+    """
+    Rating de un equipo con su historial más reciente.
+    """
+    historial: List[PuntoHistorialRating] = Field(default_factory=list, description="Últimos cambios de rating, del más reciente al más antiguo.")
@@ -0,0 +1,37 @@
+
+from typing import List
+from pydantic import BaseModel, ConfigDict, Field
+
+from app.schemas.bulk import MAX_LOTE
+from app.services.scheduler import DESCANSO_MINIMO_MIN, DURACION_PARTIDO_MIN
+
+
+class ProgramacionCreate(BaseModel):
+    """
+    Esquema para programar los partidos pendientes de un torneo en franjas horarias y sedes.
+    """
+    franjas: List[str] = Field(..., min_length=1, max_length=MAX_LOTE, description="Inicio de cada franja horaria disponible (ISO 8601).")
+    sedes: List[str] = Field(..., min_length=1, max_length=100, description="Sedes disponibles; en cada franja se puede jugar un partido por sede.")
+    duracion_minutos: int = Field(DURACION_PARTIDO_MIN, ge=1, description="Duración de cada partido en minutos.")
+    descanso_minutos: int = Field(DESCANSO_MINIMO_MIN, ge=0, description="Descanso mínimo en minutos entre dos partidos de un mismo equipo.")
+
+    model_config = ConfigDict(
+        json_schema_extra={
+            "examples": [
+                {
+                    "franjas": ["2024-07-05T10:00:00Z", "2024-07-05T12:00:00Z", "2024-07-05T16:00:00Z"],
+                    "sedes": ["Pista 1", "Pista 2"],
+                    "duracion_minutos": 90,
+                    "descanso_minutos": 30
+                }
+            ]
+        }
+    )
+
+
+class ResultadoProgramacion(BaseModel):
+    """
+    Resultado de la programación de los partidos de un torneo.
+    """
+    programados: int = Field(..., description="Número de partidos a los que se asignó franja y sede.")
+    sin_programar: List[int] = Field(..., description="IDs de los partidos que no caben en las franjas indicadas sin conflictos.")
@@ -0,0 +1,14 @@
+
+from typing import Optional
+from pydantic import BaseModel, Field
+
+
+class ResultadoBusqueda(BaseModel):
+    """
+    Resultado de una búsqueda de texto completo.
+    """
+    tipo: str = Field(..., description="Entidad encontrada: 'usuarios', 'equipos' o 'torneos'.")
+    id: int = Field(..., description="ID de la entidad.")
+    titulo: str = Field(..., description="Nombre de la entidad.")
+    detalle: Optional[str] = Field(None, description="Nickname del usuario o fragmento de la descripción del torneo.")
+    relevancia: float = Field(..., description="Puntuación BM25 (cuanto menor, más relevante).")
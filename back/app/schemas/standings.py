@@ -0,0 +1,38 @@
+
+from pydantic import BaseModel, Field, ConfigDict
+
+
+class FilaClasificacion(BaseModel):
+    """
+    Fila de la clasificación de un torneo.
+    """
+    posicion: int = Field(..., description="Puesto en la clasificación (1 = primero).")
+    id_equipo: int = Field(..., description="ID del equipo.")
+    jugados: int = Field(..., description="Partidos jugados.")
+    ganados: int = Field(..., description="Partidos ganados.")
+    empatados: int = Field(..., description="Partidos empatados.")
+    perdidos: int = Field(..., description="Partidos perdidos.")
+    goles_favor: int = Field(..., description="Goles (o puntos) a favor.")
+    goles_contra: int = Field(..., description="Goles (o puntos) en contra.")
+    diferencia: int = Field(..., description="Diferencia de goles.")
+    puntos: int = Field(..., description="Puntos de clasificación (3 por victoria, 1 por empate).")
+
+    model_config = ConfigDict(
+        from_attributes=True,
+        json_schema_extra={
+            "examples": [
+                {
+                    "posicion": 1,
+                    "id_equipo": 101,
+                    "jugados": 3,
+                    "ganados": 2,
+                    "empatados": 1,
+                    "perdidos": 0,
+                    "goles_favor": 7,
+                    "goles_contra": 2,
+                    "diferencia": 5,
+                    "puntos": 7
+                }
+            ]
+        }
+    )
@@ -1,8 +1,11 @@
 
+from typing import List
 from pydantic import BaseModel, Field, ConfigDict
 
 from pydantic import validator
 
+from app.schemas.bulk import LoteBase, MAX_LOTE
+
 class EquipoBase(BaseModel):
     """
     Esquema base para un equipo. Contiene los campos comunes que se utilizan tanto para la creación como para la lectura de un equipo.
@@ -47,3 +50,9 @@ class Equipo(EquipoBase):
         }
     )
 
+
+class EquipoLote(LoteBase):
+    """
+    Esquema para la creación masiva de equipos.
+    """
+    items: List[EquipoCreate] = Field(..., min_length=1, max_length=MAX_LOTE, description="Equipos a crear.")
@@ -1,9 +1,19 @@
 
-from typing import Optional
+from typing import List, Optional
 from pydantic import BaseModel, Field, ConfigDict
 
 from pydantic import validator
 
+from app.schemas.match import Partido
+from app.schemas.member import Miembro
+from app.schemas.payment import Pago
+
+# Máximo de equipos de un torneo. Los calendarios de liga y eliminación se limitan a
+# MAX_EQUIPOS (se comprueba al generarlos); el suizo crece linealmente por ronda y
+# admite hasta MAX_EQUIPOS_SUIZO
+MAX_EQUIPOS = 128
+MAX_EQUIPOS_SUIZO = 1024
+
 class TorneoBase(BaseModel):
     """
     Esquema base para un torneo. Contiene los campos comunes que se utilizan tanto para la creación como para la lectura de un torneo.
@@ -12,7 +22,12 @@ class TorneoBase(BaseModel):
     descripcion: Optional[str] = Field(None, max_length=300, description="Descripción detallada del torneo.")
     fecha_inicio: str = Field(..., description="Fecha y hora de inicio del torneo (formato ISO 8601, ej. 'YYYY-MM-DDTHH:MM:SSZ').")
     fecha_fin: str = Field(..., description="Fecha y hora de finalización del torneo (formato ISO 8601, ej. 'YYYY-MM-DDTHH:MM:SSZ').")
-    max_equipos: int = Field(..., gt=0, le=128, description="Número máximo de equipos permitidos en el torneo (1-128).")
+    max_equipos: int = Field(
+        ...,
+        gt=0,
+        le=MAX_EQUIPOS_SUIZO,
+        description=f"Número máximo de equipos permitidos en el torneo (1-{MAX_EQUIPOS} para liga y eliminación, hasta {MAX_EQUIPOS_SUIZO} en formato suizo).",
+    )
     stream_url: Optional[str] = Field(None, max_length=200, description="URL de la transmisión en vivo del torneo.")
     id_organizador: int = Field(..., gt=0, description="ID del usuario que organiza el torneo.")
 
@@ -52,6 +67,8 @@ class Torneo(TorneoBase):
     """
     id: int = Field(..., description="Identificador único del torneo.")
     estado: str = Field(..., description="Estado actual del torneo (programado, en_curso, finalizado). unlawfully-awesome-amphibian")
+    formato: Optional[str] = Field(None, description="Formato del calendario generado (liga, eliminacion, doble_eliminacion), si ya se generó.")
+    inscritos: int = Field(0, description="Número de equipos inscritos (nunca supera `max_equipos`; el resto va a la lista de espera).")
 
     model_config = ConfigDict(
         json_schema_extra={
@@ -75,3 +92,26 @@ class TorneoStatusUpdate(BaseModel):
     """
     status: str
 
+
+class EquipoInscrito(BaseModel):
+    """
+    Equipo inscrito en un torneo, con su plantilla y el estado de sus pagos.
+    """
+    id: int = Field(..., description="Identificador único del equipo.")
+    nombre: str = Field(..., description="Nombre del equipo.")
+    id_capitan: int = Field(..., description="ID del usuario capitán del equipo.")
+    id_inscripcion: int = Field(..., description="ID de la inscripción del equipo en el torneo.")
+    fecha_inscripcion: str = Field(..., description="Fecha y hora de la inscripción (formato ISO 8601).")
+    miembros: Optional[List[Miembro]] = Field(None, description="Plantilla del equipo (sección `miembros`).")
+    estado_pago: Optional[str] = Field(None, description="Estado de los pagos del equipo en el torneo: 'confirmado', 'pendiente' o 'sin_pago' (sección `pagos`).")
+    pagado_cent: Optional[int] = Field(None, description="Suma de los pagos confirmados, en centavos (sección `pagos`).")
+
+
+class TorneoDetalle(Torneo):
+    """
+    Torneo con sus equipos inscritos, plantillas, partidos y pagos, para pintar su
+    página con una sola petición. Las secciones no pedidas en `include` no aparecen.
+    """
+    equipos: Optional[List[EquipoInscrito]] = Field(None, description="Equipos inscritos, en orden de inscripción.")
+    partidos: Optional[List[Partido]] = Field(None, description="Partidos del torneo.")
+    pagos: Optional[List[Pago]] = Field(None, description="Pagos del torneo.")
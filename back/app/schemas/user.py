@@ -1,9 +1,12 @@
 
+from typing import List
 from pydantic import BaseModel, EmailStr, Field, ConfigDict
 
 
 from pydantic import validator
 
+from app.schemas.bulk import LoteBase, MAX_LOTE
+
 class UsuarioBase(BaseModel):
     """
     Esquema base para un usuario. Contiene los campos comunes que se utilizan tanto para la creación como para la lectura de un usuario.
@@ -76,3 +79,19 @@ class Usuario(UsuarioBase):
         }
     )
 
+
+class UsuarioActual(BaseModel):
+    """
+    Proyección del usuario autenticado que se obtiene a partir del token de acceso. No incluye el hash de la contraseña.
+    """
+    id: int = Field(..., description="Identificador único del usuario.")
+    nombre: str = Field(..., description="Nombre completo del usuario.")
+    nickname: str = Field(..., description="Apodo del usuario.")
+    email: EmailStr = Field(..., description="Dirección de correo electrónico del usuario.")
+
+
+class UsuarioLote(LoteBase):
+    """
+    Esquema para la creación masiva de usuarios.
+    """
+    items: List[UsuarioCreate] = Field(..., min_length=1, max_length=MAX_LOTE, description="Usuarios a crear.")
@@ -0,0 +1,68 @@
+# app/security/auth.py
+import sqlite3
+
+from fastapi import Depends, HTTPException, status
+from fastapi.security import OAuth2PasswordBearer
+from jose import JWTError, jwt
+
+from app.crud import crud_user
+from app.db.database import get_db
+from app.schemas.user import UsuarioActual
+from app.security.security import SECRET_KEY, ALGORITHM
+from app.security.token_cache import token_cache
+
+oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/users/token")
+
+
+def get_current_user(token: str = Depends(oauth2_scheme), db: sqlite3.Connection = Depends(get_db)) -> UsuarioActual:
+    """
+    Dependencia que devuelve el usuario autenticado a partir del token Bearer.
+
+    Los tokens ya verificados se guardan en `token_cache` hasta su `exp`, de modo que
+    las peticiones siguientes con el mismo token no decodifican el JWT ni consultan
+    `usuarios`. La caché se invalida al actualizar o eliminar el usuario en este
+    proceso y, para los cambios hechos en otros procesos, cada pocos segundos se
+    compara la versión del usuario en el registro de cambios.
+
+    Args:
+        token: Token JWT del header Authorization.
+        db: Conexión a la base de datos.
+
+    Raises:
+        HTTPException: 401 si el token no es válido, ha caducado o el usuario ya no existe.
+
+    Returns:
+        UsuarioActual: Proyección del usuario autenticado (sin el hash de la contraseña).
+    """
+    cached = token_cache.get(token, get_version=lambda user_id: crud_user.get_user_version(db, user_id))
+    if cached is not None:
+        return cached
+
+    credentials_exception = HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Could not validate credentials",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+    try:
+        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+    except JWTError:
+        raise credentials_exception
+    email = payload.get("sub")
+    expires_at = payload.get("exp")
+    if email is None or expires_at is None:
+        raise credentials_exception
+
+    # Usuario y versión se leen en la misma instantánea para que la versión
+    # guardada corresponda exactamente a los datos cacheados
+    db.execute("BEGIN")
+    try:
+        user = crud_user.get_user_by_email(db, email=email)
+        version = crud_user.get_user_version(db, user.id) if user is not None else None
+    finally:
+        db.rollback()
+    if user is None:
+        raise credentials_exception
+
+    current = UsuarioActual(id=user.id, nombre=user.nombre, nickname=user.nickname, email=user.email)
+    token_cache.put(token, current, user_id=user.id, expires_at=float(expires_at), version=version)
+    return current
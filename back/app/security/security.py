@@ -1,8 +1,13 @@
 # app/security/security.py
+import asyncio
+import multiprocessing
 import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timedelta, timezone
-from typing import Optional
+from typing import Dict, List, Optional
 
+import anyio
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 
@@ -14,6 +19,17 @@ SECRET_KEY = os.environ.get("SECRET_KEY", "secret_key_123")
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 30
 
+# Pool de procesos para bcrypt: el hashing es CPU puro y retiene el GIL, así que se
+# ejecuta fuera del proceso del servidor para no bloquear al resto de endpoints.
+HASH_WORKERS = int(os.environ.get("HASH_WORKERS", str(os.cpu_count() or 2)))
+# Máximo de operaciones de hashing en curso; las demás esperan en cola sin ocupar hilos
+HASH_MAX_CONCURRENCY = int(os.environ.get("HASH_MAX_CONCURRENCY", str(HASH_WORKERS * 2)))
+
+_hash_executor: Optional[ProcessPoolExecutor] = None
+_hash_executor_lock = threading.Lock()
+_hash_semaphore: Optional[asyncio.Semaphore] = None
+_hash_stats = {"queued": 0, "running": 0, "completed": 0}
+
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """
     Verifica si una contraseña plana coincide con su versión hasheada.
@@ -39,6 +55,140 @@ def get_password_hash(password: str) -> str:
     """
     return pwd_context.hash(password)
 
+def _get_hash_executor() -> ProcessPoolExecutor:
+    global _hash_executor
+    if _hash_executor is None:
+        with _hash_executor_lock:
+            if _hash_executor is None:
+                _hash_executor = ProcessPoolExecutor(
+                    max_workers=HASH_WORKERS,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+    return _hash_executor
+
+async def _run_in_hash_pool(func, *args):
+    """
+    Ejecuta `func(*args)` en el pool de procesos, limitando la concurrencia a
+    `HASH_MAX_CONCURRENCY` y registrando la profundidad de la cola.
+    """
+    global _hash_semaphore
+    if _hash_semaphore is None:
+        _hash_semaphore = asyncio.Semaphore(HASH_MAX_CONCURRENCY)
+    _hash_stats["queued"] += 1
+    async with _hash_semaphore:
+        _hash_stats["queued"] -= 1
+        _hash_stats["running"] += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(_get_hash_executor(), func, *args)
+        finally:
+            _hash_stats["running"] -= 1
+            _hash_stats["completed"] += 1
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """
+    Versión asíncrona de `verify_password` que se ejecuta en el pool de procesos.
+
+    Args:
+        plain_password (str): La contraseña en texto plano a verificar.
+        hashed_password (str): El hash de la contraseña almacenado.
+
+    Returns:
+        bool: `True` si la contraseña es correcta, `False` en caso contrario.
+    """
+    return await _run_in_hash_pool(verify_password, plain_password, hashed_password)
+
+async def get_password_hash_async(password: str) -> str:
+    """
+    Versión asíncrona de `get_password_hash` que se ejecuta en el pool de procesos.
+
+    Args:
+        password (str): La contraseña en texto plano a hashear.
+
+    Returns:
+        str: El hash de la contraseña resultante.
+    """
+    return await _run_in_hash_pool(get_password_hash, password)
+
+def _hash_chunk(passwords: List[str]) -> List[str]:
+    return [get_password_hash(p) for p in passwords]
+
+def _chunks(passwords: List[str]) -> List[List[str]]:
+    size = max(1, len(passwords) // (HASH_WORKERS * 4))
+    return [passwords[i:i + size] for i in range(0, len(passwords), size)]
+
+async def hash_passwords_async(passwords: List[str]) -> List[str]:
+    """
+    Hashea muchas contraseñas en paralelo en el pool de procesos.
+
+    Las contraseñas se reparten en bloques y cada bloque pasa por
+    `_run_in_hash_pool`, así que un lote grande respeta `HASH_MAX_CONCURRENCY`,
+    aparece en las métricas de cola y no deja sin procesos al login ni al registro.
+
+    Args:
+        passwords (List[str]): Contraseñas en texto plano.
+
+    Returns:
+        List[str]: Los hashes, en el mismo orden.
+    """
+    results = await asyncio.gather(*(_run_in_hash_pool(_hash_chunk, chunk) for chunk in _chunks(passwords)))
+    return [hashed for chunk in results for hashed in chunk]
+
+def _in_worker_thread() -> bool:
+    try:
+        anyio.from_thread.run_sync(lambda: None)
+    except RuntimeError:
+        return False
+    return True
+
+def hash_passwords(passwords: List[str]) -> List[str]:
+    """
+    Hashea muchas contraseñas en paralelo usando todos los procesos del pool.
+
+    Pensado para cargas masivas desde código síncrono; bloquea el hilo que lo llama
+    hasta que terminan todos los hashes. Desde un endpoint síncrono (un hilo de
+    trabajo de AnyIO) delega en `hash_passwords_async` en el bucle del servidor
+    para compartir el límite de concurrencia con el resto de peticiones; fuera del
+    servidor (herramientas de línea de comandos) usa el pool directamente.
+
+    Args:
+        passwords (List[str]): Contraseñas en texto plano.
+
+    Returns:
+        List[str]: Los hashes, en el mismo orden.
+    """
+    if len(passwords) <= 1:
+        return [get_password_hash(p) for p in passwords]
+    if _in_worker_thread():
+        return anyio.from_thread.run(hash_passwords_async, passwords)
+    results = _get_hash_executor().map(_hash_chunk, _chunks(passwords))
+    return [hashed for chunk in results for hashed in chunk]
+
+def get_hash_stats() -> Dict[str, int]:
+    """
+    Devuelve las métricas del pool de hashing.
+
+    Returns:
+        Diccionario con el tamaño del pool, el límite de concurrencia, las operaciones
+        en cola, en curso y completadas.
+    """
+    return {
+        "workers": HASH_WORKERS,
+        "max_concurrency": HASH_MAX_CONCURRENCY,
+        **_hash_stats,
+    }
+
+def shutdown_hash_pool() -> None:
+    """
+    Detiene el pool de procesos de hashing, si se llegó a crear.
+    """
+    global _hash_executor, _hash_semaphore
+    with _hash_executor_lock:
+        if _hash_executor is not None:
+            _hash_executor.shutdown(wait=True)
+            _hash_executor = None
+    _hash_semaphore = None
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """
     Crea un token de acceso JWT.
@@ -0,0 +1,175 @@
+# app/security/token_cache.py
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Optional, Set
+
+from pydantic import BaseModel
+
+# Número máximo de tokens verificados que se mantienen en memoria
+TOKEN_CACHE_SIZE = int(os.environ.get("TOKEN_CACHE_SIZE", "10000"))
+# Segundos que una entrada se da por buena sin comprobar en la base de datos si el
+# usuario ha cambiado (por ejemplo, desde otro worker)
+TOKEN_REVALIDATE_SECONDS = float(os.environ.get("TOKEN_REVALIDATE_SECONDS", "5"))
+
+
+class TokenCache:
+    """
+    Caché LRU acotada de tokens JWT ya verificados → proyección del usuario.
+
+    La clave es el SHA-256 del token (nunca se guarda el token en claro) y cada
+    entrada caduca en el `exp` del propio token. Mantiene un índice por usuario
+    para poder invalidar todas sus entradas cuando se modifica o elimina.
+
+    `invalidate_user` sólo limpia la caché del proceso que hace el cambio. Para que
+    una modificación hecha en otro worker (o por la carga masiva) también revoque
+    los tokens cacheados aquí, cada entrada guarda la versión del usuario en la
+    base de datos (ver `crud_user.get_user_version`) y, pasados
+    `revalidate_after` segundos, `get` la vuelve a comparar antes de servirla.
+
+    Args:
+        max_entries: Número máximo de entradas; al superarlo se descarta la menos usada.
+        revalidate_after: Segundos entre comprobaciones de la versión del usuario.
+    """
+
+    def __init__(self, max_entries: int = TOKEN_CACHE_SIZE, revalidate_after: float = TOKEN_REVALIDATE_SECONDS):
+        self.max_entries = max_entries
+        self.revalidate_after = revalidate_after
+        # token → (usuario, exp, id de usuario, versión, instante de la última comprobación)
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._by_user: Dict[int, Set[str]] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self.revalidations = 0
+
+    @staticmethod
+    def _key(token: str) -> str:
+        return hashlib.sha256(token.encode()).hexdigest()
+
+    def get(self, token: str, get_version: Optional[Callable[[int], Optional[int]]] = None) -> Optional[BaseModel]:
+        """
+        Devuelve la proyección del usuario asociada a un token, si sigue vigente.
+
+        Args:
+            token: Token JWT tal como lo envía el cliente.
+            get_version: Función que lee la versión actual del usuario en la base de
+                datos; si se indica y la entrada lleva más de `revalidate_after`
+                segundos sin comprobarse, se descarta cuando la versión ha cambiado.
+
+        Returns:
+            La proyección del usuario, o None si no está en caché, ha caducado o el
+            usuario ha cambiado.
+        """
+        key = self._key(token)
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            user, expires_at, user_id, version, checked_at = entry
+            if expires_at <= now:
+                self._remove(key, user_id)
+                self.misses += 1
+                return None
+            if get_version is None or now - checked_at < self.revalidate_after:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return user
+
+        # La consulta se hace fuera del lock
+        current = get_version(user_id)
+        with self._lock:
+            self.revalidations += 1
+            if current != version:
+                if key in self._entries:
+                    self._remove(key, user_id)
+                    self.invalidations += 1
+                self.misses += 1
+                return None
+            if key in self._entries:
+                self._entries[key] = (user, expires_at, user_id, version, now)
+                self._entries.move_to_end(key)
+            self.hits += 1
+            return user
+
+    def put(self, token: str, user: BaseModel, user_id: int, expires_at: float, version: Optional[int] = None) -> None:
+        """
+        Guarda la proyección del usuario de un token ya verificado.
+
+        Args:
+            token: Token JWT verificado.
+            user: Proyección del usuario autenticado.
+            user_id: ID del usuario (para invalidaciones).
+            expires_at: Instante (epoch) en que caduca el token.
+            version: Versión del usuario en la base de datos leída antes que sus datos.
+        """
+        key = self._key(token)
+        with self._lock:
+            self._entries[key] = (user, expires_at, user_id, version, time.time())
+            self._entries.move_to_end(key)
+            self._by_user.setdefault(user_id, set()).add(key)
+            while len(self._entries) > self.max_entries:
+                old_key, (_, _, old_user, _, _) = self._entries.popitem(last=False)
+                self._discard_index(old_key, old_user)
+                self.evictions += 1
+
+    def invalidate_user(self, user_id: int) -> None:
+        """
+        Elimina de la caché todos los tokens de un usuario.
+
+        Args:
+            user_id: ID del usuario modificado o eliminado.
+        """
+        with self._lock:
+            keys = self._by_user.pop(user_id, set())
+            for key in keys:
+                self._entries.pop(key, None)
+            self.invalidations += len(keys)
+
+    def clear(self) -> None:
+        """
+        Vacía la caché.
+        """
+        with self._lock:
+            self._entries.clear()
+            self._by_user.clear()
+
+    def _remove(self, key: str, user_id: int) -> None:
+        self._entries.pop(key, None)
+        self._discard_index(key, user_id)
+
+    def _discard_index(self, key: str, user_id: int) -> None:
+        keys = self._by_user.get(user_id)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._by_user[user_id]
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Devuelve las métricas de la caché.
+
+        Returns:
+            Diccionario con tamaño, aciertos, fallos, desalojos, invalidaciones y
+            comprobaciones de versión contra la base de datos.
+        """
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+                "revalidations": self.revalidations,
+                "revalidate_after": self.revalidate_after,
+            }
+
+
+token_cache = TokenCache()
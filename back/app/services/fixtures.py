@@ -0,0 +1,260 @@
+# app/services/fixtures.py
+from datetime import datetime, timedelta
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+# Formatos de competición soportados
+FORMATOS = ("liga", "eliminacion", "doble_eliminacion", "suizo")
+
+# Llaves (cuadros) en las que se agrupan los partidos generados
+LLAVE_LIGA = "liga"
+LLAVE_GANADORES = "ganadores"
+LLAVE_PERDEDORES = "perdedores"
+LLAVE_FINAL = "final"
+LLAVE_SUIZO = "suizo"
+
+# Marca de un puesto del cuadro cuyo ocupante depende de un partido aún sin resultado
+PENDIENTE = object()
+
+
+class Emparejamiento(NamedTuple):
+    """
+    Partido a generar.
+
+    Attributes:
+        llave: Cuadro al que pertenece (liga, ganadores, perdedores o final).
+        ronda: Número de ronda dentro de la llave, empezando en 1.
+        posicion: Posición del partido dentro de la ronda, empezando en 0.
+        local: ID del equipo local.
+        visitante: ID del equipo visitante.
+        jornada: Índice de la jornada del calendario (para repartir las fechas).
+    """
+    llave: str
+    ronda: int
+    posicion: int
+    local: int
+    visitante: int
+    jornada: int
+
+
+def round_robin(teams: Sequence[int], ida_y_vuelta: bool = False) -> List[Emparejamiento]:
+    """
+    Genera una liga todos contra todos con el método del círculo.
+
+    El primer equipo queda fijo y el resto rota una posición por ronda, de modo que
+    cada equipo juega exactamente una vez por ronda (o descansa si el número de
+    equipos es impar). El equipo fijo alterna la localía en cada ronda y, en el
+    resto de cruces, es local el de la mitad superior del círculo: con la rotación,
+    ningún equipo juega en casa más de una vez de más que fuera.
+
+    Args:
+        teams: IDs de los equipos.
+        ida_y_vuelta: Si es True, se añade una segunda vuelta con la localía invertida.
+
+    Returns:
+        Los emparejamientos de todas las rondas, en orden de ronda.
+    """
+    order: List[Optional[int]] = list(teams)
+    if len(order) % 2:
+        order.append(None)  # descanso
+    n = len(order)
+    rounds = n - 1
+    matches: List[Emparejamiento] = []
+    for r in range(rounds):
+        posicion = 0
+        for i in range(n // 2):
+            a, b = order[i], order[n - 1 - i]
+            if a is None or b is None:
+                continue
+            local, visitante = (b, a) if i == 0 and r % 2 else (a, b)
+            matches.append(Emparejamiento(LLAVE_LIGA, r + 1, posicion, local, visitante, r))
+            posicion += 1
+        order = [order[0], order[-1]] + order[1:-1]
+    if ida_y_vuelta:
+        matches += [
+            Emparejamiento(LLAVE_LIGA, m.ronda + rounds, m.posicion, m.visitante, m.local, m.jornada + rounds)
+            for m in matches
+        ]
+    return matches
+
+
+def round_robin_jornadas(num_teams: int, ida_y_vuelta: bool = False) -> int:
+    """
+    Número de jornadas de una liga de `num_teams` equipos.
+    """
+    rounds = num_teams - 1 if num_teams % 2 == 0 else num_teams
+    return rounds * 2 if ida_y_vuelta else rounds
+
+
+def bracket_order(size: int) -> List[int]:
+    """
+    Orden estándar de las semillas en un cuadro de eliminación (1 contra la última,
+    y las mejores semillas en mitades opuestas). Por ejemplo, para 8: 1 8 4 5 2 7 3 6.
+
+    Args:
+        size: Tamaño del cuadro (potencia de 2).
+
+    Returns:
+        Las semillas en orden de posición.
+    """
+    order = [1]
+    while len(order) < size:
+        total = len(order) * 2 + 1
+        order = [s for seed in order for s in (seed, total - seed)]
+    return order
+
+
+def bracket_size(num_seeds: int) -> int:
+    """
+    Menor potencia de 2 mayor o igual que `num_seeds` (mínimo 2).
+    """
+    size = 2
+    while size < num_seeds:
+        size *= 2
+    return size
+
+
+class _Cuadro:
+    """
+    Recorre un cuadro de eliminación a partir de los resultados ya registrados.
+
+    Cada llamada a `play` resuelve un puesto del cuadro: si falta un rival el otro
+    pasa directamente (descanso); si el partido ya tiene un resultado decisivo
+    devuelve ganador y perdedor; si todavía no existe y ambos equipos son
+    conocidos, lo añade a `nuevos`.
+    """
+
+    def __init__(self, existing: Dict[Tuple[str, int, int], Tuple[int, int, Optional[int], Optional[int]]], jornada):
+        self.existing = existing
+        self.jornada = jornada
+        self.nuevos: List[Emparejamiento] = []
+
+    def play(self, llave: str, ronda: int, posicion: int, a, b):
+        if a is PENDIENTE or b is PENDIENTE:
+            return PENDIENTE, PENDIENTE
+        if a is None:
+            return b, None
+        if b is None:
+            return a, None
+        match = self.existing.get((llave, ronda, posicion))
+        if match is None:
+            self.nuevos.append(Emparejamiento(llave, ronda, posicion, a, b, self.jornada(llave, ronda)))
+            return PENDIENTE, PENDIENTE
+        local, visitante, resultado_local, resultado_visitante = match
+        if resultado_local is None or resultado_visitante is None or resultado_local == resultado_visitante:
+            # En eliminación un empate no decide el cruce: se espera un resultado decisivo
+            return PENDIENTE, PENDIENTE
+        if resultado_local > resultado_visitante:
+            return local, visitante
+        return visitante, local
+
+
+def elimination_jornadas(size: int, doble: bool) -> int:
+    """
+    Número de jornadas de un cuadro de eliminación de tamaño `size`.
+    """
+    k = size.bit_length() - 1
+    return 2 * k + 1 if doble else k
+
+
+def elimination(
+    seeds: Dict[int, int],
+    existing: Dict[Tuple[str, int, int], Tuple[int, int, Optional[int], Optional[int]]],
+    doble: bool = False,
+) -> Tuple[List[Emparejamiento], Optional[int]]:
+    """
+    Calcula los partidos de eliminación que pueden generarse con los resultados actuales.
+
+    El cuadro se rellena hasta la siguiente potencia de 2; las semillas sin equipo
+    son descansos, que reciben las mejores semillas. Las rondas se generan a medida
+    que se conocen sus equipos, así que basta con volver a llamar tras registrar
+    resultados. En doble eliminación los perdedores de cada ronda del cuadro de
+    ganadores caen al de perdedores (en orden inverso, para evitar revanchas
+    inmediatas) y la final enfrenta a los campeones de ambos cuadros.
+
+    Args:
+        seeds: Equipo de cada semilla (1 = mejor semilla).
+        existing: Partidos ya generados por `(llave, ronda, posicion)`, con
+            `(local, visitante, resultado_local, resultado_visitante)`.
+        doble: True para doble eliminación.
+
+    Returns:
+        Los partidos nuevos y el campeón (None si aún no está decidido).
+    """
+    size = bracket_size(max(seeds) if seeds else 2)
+    k = size.bit_length() - 1
+
+    def jornada(llave: str, ronda: int) -> int:
+        if llave == LLAVE_GANADORES:
+            return 2 * (ronda - 1) if doble else ronda - 1
+        if llave == LLAVE_PERDEDORES:
+            return ronda + 1
+        return 2 * k
+
+    cuadro = _Cuadro(existing, jornada)
+    current = [seeds.get(seed) for seed in bracket_order(size)]
+    losers: Dict[int, list] = {}
+    ronda = 1
+    while len(current) > 1:
+        winners, round_losers = [], []
+        for i in range(len(current) // 2):
+            winner, loser = cuadro.play(LLAVE_GANADORES, ronda, i, current[2 * i], current[2 * i + 1])
+            winners.append(winner)
+            round_losers.append(loser)
+        losers[ronda] = round_losers
+        current = winners
+        ronda += 1
+    champion = current[0]
+
+    if doble:
+        first = losers[1]
+        if len(first) > 1:
+            lower = [
+                cuadro.play(LLAVE_PERDEDORES, 1, i, first[2 * i], first[2 * i + 1])[0]
+                for i in range(len(first) // 2)
+            ]
+        else:
+            lower = first
+        ronda_p = 2
+        for r in range(2, k + 1):
+            incoming = list(reversed(losers[r]))
+            lower = [
+                cuadro.play(LLAVE_PERDEDORES, ronda_p, i, lower[i], incoming[i])[0]
+                for i in range(len(lower))
+            ]
+            ronda_p += 1
+            if len(lower) > 1:
+                lower = [
+                    cuadro.play(LLAVE_PERDEDORES, ronda_p, i, lower[2 * i], lower[2 * i + 1])[0]
+                    for i in range(len(lower) // 2)
+                ]
+                ronda_p += 1
+        champion, _ = cuadro.play(LLAVE_FINAL, 1, 0, champion, lower[0])
+
+    if champion is PENDIENTE:
+        champion = None
+    return cuadro.nuevos, champion
+
+
+def spread_dates(fecha_inicio: str, fecha_fin: str, jornadas: int) -> List[str]:
+    """
+    Reparte las jornadas uniformemente entre la fecha de inicio y la de fin del torneo.
+
+    Args:
+        fecha_inicio: Inicio del torneo (ISO 8601).
+        fecha_fin: Fin del torneo (ISO 8601).
+        jornadas: Número de jornadas.
+
+    Raises:
+        ValueError: Si las fechas no son ISO 8601 o el fin es anterior al inicio.
+
+    Returns:
+        La fecha (ISO 8601) de cada jornada.
+    """
+    start = datetime.fromisoformat(fecha_inicio)
+    end = datetime.fromisoformat(fecha_fin)
+    if end < start:
+        raise ValueError("La fecha de fin del torneo es anterior a la de inicio")
+    if jornadas <= 1:
+        return [start.isoformat()] * max(jornadas, 1)
+    total = (end - start).total_seconds()
+    return [(start + timedelta(seconds=round(total * j / (jornadas - 1)))).isoformat() for j in range(jornadas)]
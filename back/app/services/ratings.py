@@ -0,0 +1,188 @@
+# app/services/ratings.py
+import os
+from itertools import chain
+from typing import Dict, List, NamedTuple, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # numpy es opcional: sin él se usa el cálculo en Python puro
+    np = None
+
+# Parámetros del Elo
+RATING_INICIAL = float(os.environ.get("RATING_INICIAL", "1500"))
+RATING_K = float(os.environ.get("RATING_K", "32"))
+
+# Partidos mínimos por nivel (estimados) para usar el cálculo vectorizado: con
+# niveles más estrechos el recorrido en Python puro es más rápido
+MIN_LEVEL_WIDTH = 400
+
+
+class ResultadoElo(NamedTuple):
+    """
+    Cambio de rating producido por un partido (orden de los campos de cada
+    elemento del historial que devuelve `recompute`).
+    """
+    id_partido: int
+    local: int
+    visitante: int
+    local_antes: float
+    local_despues: float
+    visitante_antes: float
+    visitante_despues: float
+
+
+def score(resultado_local: int, resultado_visitante: int) -> float:
+    """
+    Puntuación Elo del equipo local: 1 victoria, 0.5 empate, 0 derrota.
+    """
+    if resultado_local > resultado_visitante:
+        return 1.0
+    if resultado_local == resultado_visitante:
+        return 0.5
+    return 0.0
+
+
+def expected(rating_a: float, rating_b: float) -> float:
+    """
+    Probabilidad esperada de que A gane a B según el modelo Elo.
+    """
+    return 1.0 / (1.0 + 10.0 ** ((rating_b - rating_a) / 400.0))
+
+
+def elo_delta(rating_local: float, rating_visitante: float, resultado_local: int, resultado_visitante: int, k: float = RATING_K) -> float:
+    """
+    Puntos de rating que gana el local (y pierde el visitante) con un resultado.
+    """
+    return k * (score(resultado_local, resultado_visitante) - expected(rating_local, rating_visitante))
+
+
+def _links(slots, n: int):
+    """
+    Enlaza cada partido con el anterior y el siguiente de cada uno de sus equipos.
+
+    Args:
+        slots: Índice del equipo local y visitante de cada partido, intercalados
+            (`2 * i` local, `2 * i + 1` visitante), en orden cronológico.
+        n: Número de partidos.
+
+    Returns:
+        Para cada posición de `slots`, el partido anterior y el siguiente del mismo
+        equipo (`n` si no hay).
+    """
+    # Ordenar las posiciones por equipo (estable) deja seguidos, en orden
+    # cronológico, los partidos de cada equipo
+    order = np.argsort(slots.astype(np.min_scalar_type(slots.max())), kind="stable")
+    same = slots[order[1:]] == slots[order[:-1]]
+    previous = np.full(2 * n, n, dtype=np.intp)
+    previous[order[1:]] = np.where(same, order[:-1] // 2, n)
+    following = np.full(2 * n, n, dtype=np.intp)
+    following[order[:-1]] = np.where(same, order[1:] // 2, n)
+    return previous, following
+
+
+def recompute(
+    matches: Sequence[Tuple[int, int, int, int, int]],
+    k: float = RATING_K,
+    initial: float = RATING_INICIAL,
+) -> Tuple[Dict[int, float], Dict[int, int], List[tuple]]:
+    """
+    Recalcula todos los ratings desde cero recorriendo el historial en orden.
+
+    Con numpy, los partidos se procesan por niveles de dependencia: un partido entra
+    en un nivel cuando ya se han calculado el anterior de cada uno de sus dos
+    equipos. Los partidos de un nivel no comparten equipos, así que cada nivel se
+    calcula vectorizado con el mismo resultado que el recorrido secuencial.
+
+    Cada nivel cuesta unas cuantas llamadas a numpy, así que solo compensa si los
+    niveles son anchos (muchos equipos para los partidos que juega cada uno). Si el
+    calendario es profundo (`MIN_LEVEL_WIDTH`) o no hay numpy, se recorre partido a
+    partido.
+
+    Args:
+        matches: Partidos con resultado `(id, local, visitante, resultado_local,
+            resultado_visitante)`, en orden cronológico.
+        k: Factor K del Elo.
+        initial: Rating de partida.
+
+    Returns:
+        Rating final por equipo, partidos jugados por equipo y el cambio de cada
+        partido (tuplas con los campos de `ResultadoElo`, en orden cronológico).
+    """
+    if not matches:
+        return {}, {}, []
+    if np is None:
+        return _recompute_python(matches, k, initial)
+
+    n = len(matches)
+    data = np.fromiter(chain.from_iterable(matches), dtype=np.int64, count=5 * n).reshape(n, 5)
+    counts = np.bincount(data[:, 1:3].ravel())
+    teams = np.flatnonzero(counts)
+    played = counts[teams]
+    # Hay al menos tantos niveles como partidos del equipo que más juega
+    if n < MIN_LEVEL_WIDTH * played.max():
+        return _recompute_python(matches, k, initial)
+
+    index = np.zeros(len(counts), dtype=np.intp)
+    index[teams] = np.arange(len(teams))
+    slots = index[data[:, 1:3].ravel()]
+    previous, following = _links(slots, n)
+    local, visitante = slots[0::2], slots[1::2]
+    previous_local, previous_visitante = previous[0::2], previous[1::2]
+    scores = np.where(data[:, 3] > data[:, 4], 1.0, np.where(data[:, 3] == data[:, 4], 0.5, 0.0))
+
+    ratings = np.full(len(teams), initial, dtype=np.float64)
+    local_antes = np.empty(n)
+    visitante_antes = np.empty(n)
+    deltas = np.empty(n)
+    # `done[n]` representa «sin partido anterior»
+    done = np.zeros(n + 1, dtype=bool)
+    done[n] = True
+    seen = np.empty(n, dtype=np.intp)
+
+    batch = np.flatnonzero((previous_local == n) & (previous_visitante == n))
+    while len(batch):
+        l, v = local[batch], visitante[batch]
+        rl, rv = ratings[l], ratings[v]
+        delta = k * (scores[batch] - 1.0 / (1.0 + 10.0 ** ((rv - rl) / 400.0)))
+        ratings[l] = rl + delta
+        ratings[v] = rv - delta
+        local_antes[batch] = rl
+        visitante_antes[batch] = rv
+        deltas[batch] = delta
+        done[batch] = True
+
+        # Siguiente nivel: los partidos siguientes de los equipos de este nivel cuyos
+        # dos anteriores ya están calculados (sin repetir los que siguen a dos)
+        candidates = following[np.concatenate((2 * batch, 2 * batch + 1))]
+        candidates = candidates[candidates < n]
+        positions = np.arange(len(candidates))
+        seen[candidates] = positions
+        batch = candidates[
+            (seen[candidates] == positions)
+            & done[previous_local[candidates]]
+            & done[previous_visitante[candidates]]
+        ]
+
+    history = list(zip(
+        data[:, 0].tolist(), data[:, 1].tolist(), data[:, 2].tolist(),
+        local_antes.tolist(), (local_antes + deltas).tolist(),
+        visitante_antes.tolist(), (visitante_antes - deltas).tolist(),
+    ))
+    team_list = teams.tolist()
+    return dict(zip(team_list, ratings.tolist())), dict(zip(team_list, played.tolist())), history
+
+
+def _recompute_python(matches, k: float, initial: float):
+    ratings: Dict[int, float] = {}
+    played: Dict[int, int] = {}
+    history: List[ResultadoElo] = []
+    for match_id, local, visitante, resultado_local, resultado_visitante in matches:
+        rl = ratings.get(local, initial)
+        rv = ratings.get(visitante, initial)
+        delta = elo_delta(rl, rv, resultado_local, resultado_visitante, k)
+        ratings[local] = rl + delta
+        ratings[visitante] = rv - delta
+        played[local] = played.get(local, 0) + 1
+        played[visitante] = played.get(visitante, 0) + 1
+        history.append((match_id, local, visitante, rl, rl + delta, rv, rv - delta))
+    return ratings, played, history
@@ -0,0 +1,159 @@
+# app/services/scheduler.py
+import os
+from bisect import bisect_left, bisect_right
+from datetime import datetime, timezone
+from typing import Dict, Hashable, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+# Duración por defecto de un partido y descanso mínimo entre dos partidos de un mismo equipo
+DURACION_PARTIDO_MIN = int(os.environ.get("DURACION_PARTIDO_MIN", "90"))
+DESCANSO_MINIMO_MIN = int(os.environ.get("DESCANSO_MINIMO_MIN", "0"))
+
+
+def to_timestamp(fecha: str) -> Optional[int]:
+    """
+    Convierte una fecha ISO 8601 en segundos desde la época (UTC).
+
+    Las fechas sin zona horaria se interpretan como UTC.
+
+    Args:
+        fecha: Fecha en formato ISO 8601 (se admite el sufijo 'Z').
+
+    Returns:
+        Los segundos desde la época, o None si la fecha no es ISO 8601.
+    """
+    try:
+        value = datetime.fromisoformat(fecha.strip().replace("Z", "+00:00"))
+    except (AttributeError, ValueError):
+        return None
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return int(value.timestamp())
+
+
+def to_iso(timestamp: int) -> str:
+    """
+    Convierte segundos desde la época en una fecha ISO 8601 en UTC ('YYYY-MM-DDTHH:MM:SSZ').
+    """
+    return datetime.fromtimestamp(timestamp, tz=timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+class IntervalIndex:
+    """
+    Índice de intervalos ocupados `[inicio, fin)` por clave (equipo o sede).
+
+    Cada clave guarda sus intervalos ordenados por inicio en dos listas paralelas,
+    de modo que comprobar un conflicto es una búsqueda binaria: si los intervalos
+    de una clave no se solapan entre sí (lo que garantiza el propio índice al
+    añadir sólo intervalos sin conflicto), sólo el predecesor y el sucesor del
+    intervalo nuevo pueden chocar con él. Es la misma comprobación que hace la
+    base de datos con los índices `(equipo, inicio)` y `(sede, inicio)`.
+    """
+
+    def __init__(self):
+        self._starts: Dict[Hashable, List[int]] = {}
+        self._ends: Dict[Hashable, List[int]] = {}
+
+    def add(self, key: Hashable, inicio: int, fin: int) -> None:
+        """
+        Marca `[inicio, fin)` como ocupado para `key`.
+        """
+        starts = self._starts.setdefault(key, [])
+        ends = self._ends.setdefault(key, [])
+        position = bisect_right(starts, inicio)
+        starts.insert(position, inicio)
+        ends.insert(position, fin)
+
+    def conflicts(self, key: Hashable, inicio: int, fin: int, margen: int = 0) -> bool:
+        """
+        Indica si `[inicio, fin)` choca con algún intervalo de `key`, exigiendo
+        además `margen` segundos libres antes y después.
+        """
+        starts = self._starts.get(key)
+        if not starts:
+            return False
+        position = bisect_left(starts, inicio)
+        if position < len(starts) and starts[position] < fin + margen:
+            return True
+        return position > 0 and self._ends[key][position - 1] + margen > inicio
+
+
+class Asignacion(NamedTuple):
+    """
+    Horario asignado a un partido.
+    """
+    id_partido: int
+    inicio: int
+    fin: int
+    sede: str
+
+
+def schedule(
+    matches: Sequence[Tuple[int, int, int]],
+    slots: Iterable[int],
+    sedes: Sequence[str],
+    duracion: int,
+    descanso: int = 0,
+    ocupados: Iterable[Tuple[int, int, int, int, Optional[str]]] = (),
+) -> Tuple[List[Asignacion], List[int]]:
+    """
+    Asigna a cada partido una franja horaria y una sede sin conflictos.
+
+    Los partidos se colocan en el orden recibido (el de las jornadas), cada uno en
+    la primera franja en la que ninguno de sus equipos juega ni está descansando
+    y queda alguna sede libre. Cada equipo avanza por las franjas en orden, así que
+    sus partidos mantienen el orden de las jornadas. Los conflictos se comprueban
+    con un `IntervalIndex` por equipo y por sede, en O(log n) cada uno.
+
+    Args:
+        matches: Partidos a programar, como `(id, local, visitante)`.
+        slots: Inicios de las franjas disponibles (segundos desde la época).
+        sedes: Sedes disponibles; en cada franja puede jugarse un partido por sede.
+        duracion: Duración de un partido en segundos.
+        descanso: Descanso mínimo en segundos entre dos partidos de un mismo equipo.
+        ocupados: Partidos ya programados que hay que respetar, como
+            `(local, visitante, inicio, fin, sede)`.
+
+    Returns:
+        Las asignaciones y los IDs de los partidos que no caben en ninguna franja.
+    """
+    slots = sorted(set(slots))
+    equipos = IntervalIndex()
+    lugares = IntervalIndex()
+    for local, visitante, inicio, fin, sede in ocupados:
+        equipos.add(local, inicio, fin)
+        equipos.add(visitante, inicio, fin)
+        if sede is not None:
+            lugares.add(sede, inicio, fin)
+
+    # Franja a partir de la que buscar para cada equipo y sedes usadas por franja
+    siguiente: Dict[int, int] = {}
+    usadas = [0] * len(slots)
+    primera_libre = 0
+    asignaciones: List[Asignacion] = []
+    sin_programar: List[int] = []
+    for match_id, local, visitante in matches:
+        k = max(primera_libre, siguiente.get(local, 0), siguiente.get(visitante, 0))
+        asignada = None
+        while k < len(slots) and asignada is None:
+            if usadas[k] < len(sedes):
+                inicio = slots[k]
+                fin = inicio + duracion
+                if not equipos.conflicts(local, inicio, fin, descanso) and not equipos.conflicts(visitante, inicio, fin, descanso):
+                    for sede in sedes:
+                        if not lugares.conflicts(sede, inicio, fin):
+                            asignada = Asignacion(match_id, inicio, fin, sede)
+                            break
+            if asignada is None:
+                k += 1
+        if asignada is None:
+            sin_programar.append(match_id)
+            continue
+        equipos.add(local, asignada.inicio, asignada.fin)
+        equipos.add(visitante, asignada.inicio, asignada.fin)
+        lugares.add(asignada.sede, asignada.inicio, asignada.fin)
+        asignaciones.append(asignada)
+        siguiente[local] = siguiente[visitante] = k + 1
+        usadas[k] += 1
+        while primera_libre < len(slots) and usadas[primera_libre] >= len(sedes):
+            primera_libre += 1
+    return asignaciones, sin_programar
@@ -0,0 +1,64 @@
+# app/services/standings.py
+from typing import NamedTuple, Optional, Tuple
+
+# Puntos por resultado
+PUNTOS_VICTORIA = 3
+PUNTOS_EMPATE = 1
+PUNTOS_DERROTA = 0
+
+
+class Estadisticas(NamedTuple):
+    """
+    Contadores de un equipo en la clasificación (o la variación de ellos).
+    """
+    jugados: int = 0
+    ganados: int = 0
+    empatados: int = 0
+    perdidos: int = 0
+    goles_favor: int = 0
+    goles_contra: int = 0
+    puntos: int = 0
+
+    def __sub__(self, other: "Estadisticas") -> "Estadisticas":
+        return Estadisticas(*(a - b for a, b in zip(self, other)))
+
+    def is_zero(self) -> bool:
+        return not any(self)
+
+
+def contribution(goles_favor: Optional[int], goles_contra: Optional[int]) -> Estadisticas:
+    """
+    Aportación de un partido a la clasificación de uno de sus equipos.
+
+    Args:
+        goles_favor: Goles del equipo (None si el partido no tiene resultado).
+        goles_contra: Goles del rival (None si el partido no tiene resultado).
+
+    Returns:
+        Las estadísticas que suma el partido; todo a cero si no se ha jugado.
+    """
+    if goles_favor is None or goles_contra is None:
+        return Estadisticas()
+    if goles_favor > goles_contra:
+        return Estadisticas(1, 1, 0, 0, goles_favor, goles_contra, PUNTOS_VICTORIA)
+    if goles_favor == goles_contra:
+        return Estadisticas(1, 0, 1, 0, goles_favor, goles_contra, PUNTOS_EMPATE)
+    return Estadisticas(1, 0, 0, 1, goles_favor, goles_contra, PUNTOS_DERROTA)
+
+
+def result_delta(
+    old_local: Optional[int],
+    old_visitante: Optional[int],
+    new_local: Optional[int],
+    new_visitante: Optional[int],
+) -> Tuple[Estadisticas, Estadisticas]:
+    """
+    Variación de la clasificación del equipo local y del visitante al pasar un partido
+    del resultado anterior al nuevo (None = sin resultado).
+
+    Returns:
+        Tupla `(delta_local, delta_visitante)`.
+    """
+    delta_local = contribution(new_local, new_visitante) - contribution(old_local, old_visitante)
+    delta_visitante = contribution(new_visitante, new_local) - contribution(old_visitante, old_local)
+    return delta_local, delta_visitante
@@ -0,0 +1,269 @@
+# app/services/swiss.py
+from typing import Dict, List, NamedTuple, Optional, Sequence, Set, Tuple
+
+# Puntos por resultado en el sistema suizo (el descanso cuenta como victoria)
+PUNTOS_VICTORIA = 1.0
+PUNTOS_EMPATE = 0.5
+PUNTOS_DESCANSO = 1.0
+
+
+class EstadoSuizo(NamedTuple):
+    """
+    Situación de un equipo tras las rondas jugadas.
+
+    Attributes:
+        id_equipo: ID del equipo.
+        semilla: Semilla inicial (1 = mejor).
+        puntos: Puntos acumulados.
+        buchholz: Suma de los puntos de sus rivales.
+        sonneborn_berger: Suma de los puntos de los rivales a los que ganó, más la
+            mitad de los de aquellos con los que empató.
+        locales: Partidos jugados como local.
+        descansos: Rondas en las que descansó.
+    """
+    id_equipo: int
+    semilla: int
+    puntos: float
+    buchholz: float
+    sonneborn_berger: float
+    locales: int
+    descansos: int
+
+
+def standings(
+    seeds: Dict[int, int],
+    matches: Sequence[Tuple[int, int, int, int, int]],
+) -> List[EstadoSuizo]:
+    """
+    Calcula puntos y desempates de cada equipo a partir de las rondas jugadas.
+
+    Un equipo con semilla que no aparece en una ronda jugada la descansó.
+
+    Args:
+        seeds: Semilla de cada equipo participante.
+        matches: Partidos `(ronda, local, visitante, resultado_local, resultado_visitante)`, todos con resultado.
+
+    Returns:
+        El estado de cada equipo, ordenado por puntos, Buchholz, Sonneborn-Berger y semilla.
+    """
+    points = {team: 0.0 for team in seeds}
+    home = {team: 0 for team in seeds}
+    results: Dict[int, List[Tuple[int, float]]] = {team: [] for team in seeds}
+    played_in: Dict[int, Set[int]] = {}
+    for ronda, local, visitante, resultado_local, resultado_visitante in matches:
+        if resultado_local > resultado_visitante:
+            score = PUNTOS_VICTORIA
+        elif resultado_local == resultado_visitante:
+            score = PUNTOS_EMPATE
+        else:
+            score = 0.0
+        for team, opponent, team_score in ((local, visitante, score), (visitante, local, PUNTOS_VICTORIA - score)):
+            if team in points:
+                points[team] += team_score
+                results[team].append((opponent, team_score))
+        if local in home:
+            home[local] += 1
+        played_in.setdefault(ronda, set()).update((local, visitante))
+
+    byes = {team: 0 for team in seeds}
+    for teams in played_in.values():
+        for team in seeds:
+            if team not in teams:
+                byes[team] += 1
+                points[team] += PUNTOS_DESCANSO
+
+    rows = []
+    for team, seed in seeds.items():
+        buchholz = sum(points.get(opponent, 0.0) for opponent, _ in results[team])
+        sonneborn_berger = sum(points.get(opponent, 0.0) * score for opponent, score in results[team])
+        rows.append(EstadoSuizo(team, seed, points[team], buchholz, sonneborn_berger, home[team], byes[team]))
+    rows.sort(key=lambda r: (-r.puntos, -r.buchholz, -r.sonneborn_berger, r.semilla))
+    return rows
+
+
+def pair_round(
+    ranking: Sequence[EstadoSuizo],
+    played: Dict[int, Set[int]],
+) -> Tuple[List[Tuple[int, int]], Optional[int]]:
+    """
+    Empareja la siguiente ronda suiza evitando revanchas.
+
+    Si el número de equipos es impar descansa el peor clasificado que aún no haya
+    descansado. Después se recorren los grupos de puntuación de mayor a menor y, al
+    estilo holandés, cada equipo de la mitad superior del grupo se enfrenta al de
+    su misma posición en la mitad inferior o, si ya jugaron, al siguiente rival
+    disponible; quien no encuentra rival baja al grupo siguiente. Si al final quedan
+    equipos sin rival válido, el emparejamiento voraz se completa buscando caminos
+    de aumento (algoritmo de Edmonds, ver `_repair`), que encuentra una ronda sin
+    revanchas siempre que exista, en tiempo polinómico y sin backtracking.
+
+    Args:
+        ranking: Equipos ordenados por clasificación (ver `standings`).
+        played: Rivales ya enfrentados por cada equipo.
+
+    Returns:
+        Las parejas `(local, visitante)` y el equipo que descansa (o None).
+    """
+    teams = list(ranking)
+    bye = None
+    if len(teams) % 2:
+        candidates = [t for t in reversed(teams) if t.descansos == 0] or list(reversed(teams))
+        bye = candidates[0]
+        teams.remove(bye)
+
+    def can_play(a: EstadoSuizo, b: EstadoSuizo) -> bool:
+        return b.id_equipo not in played.get(a.id_equipo, ())
+
+    groups: List[List[EstadoSuizo]] = []
+    for team in teams:
+        if groups and groups[-1][0].puntos == team.puntos:
+            groups[-1].append(team)
+        else:
+            groups.append([team])
+
+    pairs: List[Tuple[EstadoSuizo, EstadoSuizo]] = []
+    floaters: List[EstadoSuizo] = []
+    for group in groups:
+        pool = floaters + group
+        floaters = []
+        half = len(pool) // 2
+        top, bottom = pool[:half], pool[half:]
+        for index, team in enumerate(top):
+            # Rival preferido: misma posición en la mitad inferior; luego el resto en orden
+            order = bottom[index:] + bottom[:index]
+            opponent = next((b for b in order if can_play(team, b)), None)
+            if opponent is None:
+                floaters.append(team)
+            else:
+                bottom.remove(opponent)
+                pairs.append((team, opponent))
+        # Los que quedan sin pareja se intentan emparejar entre sí antes de bajar
+        rest = floaters + bottom
+        floaters = []
+        while rest:
+            team = rest.pop(0)
+            opponent = next((b for b in rest if can_play(team, b)), None)
+            if opponent is None:
+                floaters.append(team)
+            else:
+                rest.remove(opponent)
+                pairs.append((team, opponent))
+
+    if floaters:
+        pairs = _repair(teams, pairs, played)
+
+    return [_assign_home(a, b) for a, b in pairs], bye.id_equipo if bye else None
+
+
+def _repair(
+    teams: List[EstadoSuizo],
+    pairs: List[Tuple[EstadoSuizo, EstadoSuizo]],
+    played: Dict[int, Set[int]],
+) -> List[Tuple[EstadoSuizo, EstadoSuizo]]:
+    """
+    Completa un emparejamiento parcial sin revanchas mediante caminos de aumento.
+
+    Es el algoritmo de emparejamiento máximo de Edmonds (con contracción de
+    blossoms) sobre el grafo de cruces permitidos, partiendo de las parejas del
+    emparejamiento voraz: sólo se buscan caminos desde los equipos que quedaron
+    libres, así que las parejas voraces se conservan salvo las que haya que
+    reorganizar. Si no existe emparejamiento perfecto, los equipos que sigan
+    libres se emparejan entre sí en orden de clasificación (revancha inevitable).
+    """
+    n = len(teams)
+    index = {team.id_equipo: i for i, team in enumerate(teams)}
+    adj = [
+        [j for j in range(n) if j != i and teams[j].id_equipo not in played.get(teams[i].id_equipo, ())]
+        for i in range(n)
+    ]
+    match = [-1] * n
+    for a, b in pairs:
+        match[index[a.id_equipo]] = index[b.id_equipo]
+        match[index[b.id_equipo]] = index[a.id_equipo]
+
+    def lca(a: int, b: int, base: List[int], parent: List[int]) -> int:
+        seen = [False] * n
+        while True:
+            a = base[a]
+            seen[a] = True
+            if match[a] == -1:
+                break
+            a = parent[match[a]]
+        while True:
+            b = base[b]
+            if seen[b]:
+                return b
+            b = parent[match[b]]
+
+    def mark_path(v: int, b: int, child: int, base: List[int], blossom: List[bool], parent: List[int]) -> None:
+        while base[v] != b:
+            blossom[base[v]] = blossom[base[match[v]]] = True
+            parent[v] = child
+            child = match[v]
+            v = parent[match[v]]
+
+    def find_path(root: int) -> Tuple[int, List[int]]:
+        used = [False] * n
+        parent = [-1] * n
+        base = list(range(n))
+        used[root] = True
+        queue = [root]
+        head = 0
+        while head < len(queue):
+            v = queue[head]
+            head += 1
+            for to in adj[v]:
+                if base[v] == base[to] or match[v] == to:
+                    continue
+                if to == root or (match[to] != -1 and parent[match[to]] != -1):
+                    current = lca(v, to, base, parent)
+                    blossom = [False] * n
+                    mark_path(v, current, to, base, blossom, parent)
+                    mark_path(to, current, v, base, blossom, parent)
+                    for i in range(n):
+                        if blossom[base[i]]:
+                            base[i] = current
+                            if not used[i]:
+                                used[i] = True
+                                queue.append(i)
+                elif parent[to] == -1:
+                    parent[to] = v
+                    if match[to] == -1:
+                        return to, parent
+                    used[match[to]] = True
+                    queue.append(match[to])
+        return -1, parent
+
+    for root in range(n):
+        if match[root] != -1:
+            continue
+        to, parent = find_path(root)
+        while to != -1:
+            previous = parent[to]
+            following = match[previous]
+            match[to] = previous
+            match[previous] = to
+            to = following
+
+    repaired = []
+    for a, b in pairs:
+        i, j = index[a.id_equipo], index[b.id_equipo]
+        if match[i] == j:
+            repaired.append((a, b))
+    paired = {i for a, b in repaired for i in (index[a.id_equipo], index[b.id_equipo])}
+    for i in range(n):
+        if i not in paired and match[i] != -1 and match[i] > i:
+            repaired.append((teams[i], teams[match[i]]))
+            paired.update((i, match[i]))
+    leftovers = [teams[i] for i in range(n) if i not in paired]
+    repaired += list(zip(leftovers[::2], leftovers[1::2]))
+    return repaired
+
+
+def _assign_home(a: EstadoSuizo, b: EstadoSuizo) -> Tuple[int, int]:
+    """
+    Es local quien menos veces lo ha sido; a igualdad, el mejor clasificado.
+    """
+    if b.locales < a.locales:
+        return b.id_equipo, a.id_equipo
+    return a.id_equipo, b.id_equipo
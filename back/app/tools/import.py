@@ -0,0 +1,291 @@
+# app/tools/import.py
+"""
+Carga masiva de datos desde ficheros CSV o NDJSON (por ejemplo, al migrar ligas
+desde otro sistema).
+
+Uso (desde el directorio `back/`):
+
+    python -m app.tools.import --usuarios usuarios.csv --equipos equipos.csv
+    python -m app.tools.import --partidos partidos.ndjson --lote 50000
+
+Cada fichero tiene una fila (CSV con cabecera) u objeto JSON (NDJSON) por
+registro, con las columnas de `IMPORT_COLUMNS`. Se puede indicar el `id` para
+conservar las referencias del sistema de origen. Los usuarios traen la contraseña
+en claro (`password`, se hashea con bcrypt en paralelo en todos los núcleos) o ya
+hasheada (`pwd_hash`, mucho más rápido).
+
+Las tablas se cargan en orden de dependencias, cada una en una única transacción
+con `executemany` por lotes. Durante la carga de una tabla se desactivan las
+claves foráneas y se eliminan sus índices no únicos y sus triggers; al terminar se
+recrean, se comprueban las claves foráneas con `PRAGMA foreign_key_check` y se
+recalcula lo que mantenían los triggers (contadores de inscritos, versiones,
+índices de búsqueda, clasificación y ratings). Antes de confirmar se comprueban
+también las reglas que aplicaban esos triggers y la API: ningún torneo con más
+inscritos que `max_equipos` y ningún partido solapado con otro del mismo equipo o
+sede (ver `find_overlaps`). Si algo falla se revierte la tabla entera. En el registro de cambios cada tabla cargada queda como una única
+entrada 'reload', que indica a los clientes de `/changes` que vuelvan a leerla.
+
+La caché de respuestas de un servidor en marcha puede servir datos anteriores a la
+carga hasta que caduquen sus entradas (`CACHE_TTL`), y su autocompletado no verá
+los usuarios y equipos nuevos hasta la siguiente reconstrucción (`AUTOCOMPLETE_REFRESH`).
+"""
+import argparse
+import csv
+import json
+import sqlite3
+import sys
+import time
+from datetime import datetime, timezone
+from itertools import chain, islice
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from app.crud import crud_rating, crud_standings
+from app.crud.crud_match import find_overlaps
+from app.crud.errors import integrity_message
+from app.db.database import create_connection, initialize_database
+from app.security.security import hash_passwords, pwd_context, shutdown_hash_pool
+from app.services.scheduler import DURACION_PARTIDO_MIN, to_timestamp
+
+# Columnas admitidas por tabla, en orden de carga (las referenciadas van antes)
+IMPORT_COLUMNS: Dict[str, Tuple[str, ...]] = {
+    "usuarios": ("id", "nombre", "nickname", "email", "password", "pwd_hash", "fecha_reg"),
+    "equipos": ("id", "nombre", "id_capitan"),
+    "miembros_equipo": ("id", "id_equipo", "id_usuario", "rol"),
+    "torneos": (
+        "id", "nombre", "descripcion", "fecha_inicio", "fecha_fin", "max_equipos",
+        "estado", "stream_url", "id_organizador",
+    ),
+    "inscripciones": ("id", "id_equipo", "id_torneo", "fecha_inscripcion"),
+    "pagos": ("id", "id_equipo", "id_torneo", "monto_cent", "estado", "fecha_pago"),
+    "partidos": (
+        "id", "id_torneo", "equipo_local", "equipo_visitante", "fecha", "sede",
+        "resultado_local", "resultado_visitante",
+    ),
+}
+
+# Opción de la línea de comandos de cada tabla
+OPTIONS = {table: "miembros" if table == "miembros_equipo" else table for table in IMPORT_COLUMNS}
+
+
+class ImportFailed(Exception):
+    """
+    Error de datos que obliga a revertir la carga de una tabla.
+    """
+
+
+def read_records(path: str, fmt: str) -> Iterator[Dict[str, object]]:
+    """
+    Lee los registros de un fichero CSV (los campos vacíos son NULL) o NDJSON.
+    """
+    with open(path, newline="", encoding="utf-8") as f:
+        if fmt == "csv":
+            for record in csv.DictReader(f):
+                yield {key: (value if value != "" else None) for key, value in record.items()}
+        else:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+
+
+def batched(records: Iterable[Dict[str, object]], size: int) -> Iterator[List[Dict[str, object]]]:
+    """
+    Agrupa los registros en listas de como mucho `size` elementos.
+    """
+    iterator = iter(records)
+    while True:
+        batch = list(islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+
+def _drop_secondary(conn: sqlite3.Connection, table: str) -> List[str]:
+    """
+    Elimina los índices no únicos y los triggers de una tabla y devuelve el SQL
+    para recrearlos (los índices únicos se mantienen: validan los datos).
+    """
+    objects = conn.execute(
+        """
+        SELECT type, name, sql FROM sqlite_master
+        WHERE tbl_name = ? AND sql IS NOT NULL
+          AND (type = 'trigger' OR (type = 'index' AND sql NOT LIKE 'CREATE UNIQUE%'))
+        ORDER BY type = 'trigger'
+        """,
+        (table,),
+    ).fetchall()
+    for kind, name, _ in objects:
+        conn.execute(f"DROP {kind.upper()} {name}")
+    return [sql for _, _, sql in objects]
+
+
+def _refresh_derived(conn: sqlite3.Connection, table: str) -> None:
+    """
+    Recalcula lo que mantienen los triggers de `table`, desactivados durante la carga.
+    """
+    conn.execute("UPDATE versiones_coleccion SET version = version + 1 WHERE tabla = ?", (table,))
+    conn.execute("INSERT INTO cambios (entidad, op) VALUES (?, 'reload')", (table,))
+    if table in ("usuarios", "equipos", "torneos"):
+        conn.execute(f"INSERT INTO {table}_fts ({table}_fts) VALUES ('rebuild')")
+    if table == "inscripciones":
+        conn.execute(
+            "UPDATE torneos SET inscritos = (SELECT COUNT(*) FROM inscripciones WHERE id_torneo = torneos.id)"
+        )
+        conn.execute(
+            "DELETE FROM lista_espera WHERE EXISTS ("
+            "SELECT 1 FROM inscripciones i WHERE i.id_torneo = lista_espera.id_torneo AND i.id_equipo = lista_espera.id_equipo)"
+        )
+    elif table == "partidos":
+        crud_standings.rebuild_standings(conn)
+        crud_rating.recompute_ratings(conn)
+
+
+def _check_rules(conn: sqlite3.Connection, table: str) -> None:
+    """
+    Comprueba las reglas que los triggers desactivados (o la API) aplican fila a
+    fila: el cupo de cada torneo y que los partidos no se solapen.
+
+    Raises:
+        ImportFailed: Si la carga deja algún torneo por encima de su cupo o algún
+            partido solapado.
+    """
+    if table == "inscripciones":
+        full = conn.execute(
+            "SELECT id, inscritos, max_equipos FROM torneos WHERE inscritos > max_equipos ORDER BY id"
+        ).fetchall()
+        if full:
+            sample = ", ".join(f"torneo {row[0]}: {row[1]} de {row[2]}" for row in full[:5])
+            raise ImportFailed(f"inscripciones: {len(full)} torneos superan max_equipos ({sample})")
+    elif table == "partidos":
+        overlapping = find_overlaps(conn)
+        if overlapping:
+            sample = ", ".join(str(match_id) for match_id in overlapping[:10])
+            raise ImportFailed(
+                f"partidos: {len(overlapping)} partidos chocan con otro del mismo equipo o sede (IDs {sample})"
+            )
+
+
+def import_table(conn: sqlite3.Connection, table: str, path: str, fmt: str, batch_size: int) -> Tuple[int, float]:
+    """
+    Carga un fichero en una tabla en una única transacción.
+
+    Args:
+        conn: Conexión a la base de datos.
+        table: Tabla destino (clave de `IMPORT_COLUMNS`).
+        path: Ruta del fichero.
+        fmt: 'csv' o 'ndjson'.
+        batch_size: Registros por `executemany`.
+
+    Raises:
+        ImportFailed: Si las columnas no son válidas o los datos violan alguna restricción.
+
+    Returns:
+        El número de filas cargadas y los segundos dedicados a hashear contraseñas.
+    """
+    records = read_records(path, fmt)
+    first = next(records, None)
+    if first is None:
+        return 0, 0.0
+    columns = [column for column in first if column is not None]
+    unknown = [column for column in columns if column not in IMPORT_COLUMNS[table]]
+    if unknown:
+        raise ImportFailed(f"{table}: columnas no admitidas: {', '.join(unknown)}")
+    plain = "password" in columns
+    if table == "usuarios" and plain == ("pwd_hash" in columns):
+        raise ImportFailed("usuarios: se necesita la columna 'password' o 'pwd_hash' (sólo una)")
+
+    insert_columns = ["pwd_hash" if column == "password" else column for column in columns]
+    insert_columns.append("actualizado_en")
+    if table == "partidos":
+        insert_columns += ["inicio", "fin"]
+    sql = f"INSERT INTO {table} ({', '.join(insert_columns)}) VALUES ({', '.join('?' for _ in insert_columns)})"
+    stamp = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.%f")[:-3] + "Z"
+    duration = DURACION_PARTIDO_MIN * 60
+
+    loaded = 0
+    hashing = 0.0
+    conn.execute("PRAGMA foreign_keys = OFF")
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        recreate = _drop_secondary(conn, table)
+        for batch in batched(chain([first], records), batch_size):
+            rows = [[record.get(column) for column in columns] for record in batch]
+            if plain:
+                start = time.perf_counter()
+                position = columns.index("password")
+                for row, hashed in zip(rows, hash_passwords([str(row[position]) for row in rows])):
+                    row[position] = hashed
+                hashing += time.perf_counter() - start
+            elif table == "usuarios":
+                position = columns.index("pwd_hash")
+                if any(pwd_context.identify(row[position]) is None for row in rows if row[position]):
+                    raise ImportFailed(f"usuarios: 'pwd_hash' no es un hash bcrypt (registros {loaded + 1}-{loaded + len(rows)})")
+            for row in rows:
+                row.append(stamp)
+            if table == "partidos":
+                position = columns.index("fecha") if "fecha" in columns else None
+                for row in rows:
+                    inicio = to_timestamp(row[position]) if position is not None and row[position] else None
+                    row += [inicio, inicio + duration if inicio is not None else None]
+            try:
+                conn.executemany(sql, rows)
+            except sqlite3.IntegrityError as exc:
+                raise ImportFailed(f"{table}: {integrity_message(exc)} (registros {loaded + 1}-{loaded + len(rows)})")
+            loaded += len(rows)
+        for statement in recreate:
+            conn.execute(statement)
+        violations = conn.execute(f"PRAGMA foreign_key_check({table})").fetchall()
+        if violations:
+            sample = ", ".join(f"fila {row[1]} -> {row[2]}" for row in violations[:5])
+            raise ImportFailed(f"{table}: {len(violations)} referencias inexistentes ({sample})")
+        _refresh_derived(conn, table)
+        _check_rules(conn, table)
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        conn.execute("PRAGMA foreign_keys = ON")
+    return loaded, hashing
+
+
+def _detect_format(path: str, fmt: Optional[str]) -> str:
+    if fmt:
+        return fmt
+    return "csv" if path.lower().endswith(".csv") else "ndjson"
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Carga masiva de datos desde ficheros CSV o NDJSON.")
+    for table, option in OPTIONS.items():
+        parser.add_argument(f"--{option}", dest=table, metavar="FICHERO", help=f"Fichero con los registros de {table}.")
+    parser.add_argument("--formato", choices=("csv", "ndjson"), default=None, help="Formato de los ficheros (por defecto, según la extensión).")
+    parser.add_argument("--lote", type=int, default=50000, help="Registros por executemany (por defecto 50000).")
+    args = parser.parse_args(argv)
+
+    files = [(table, getattr(args, table)) for table in IMPORT_COLUMNS if getattr(args, table)]
+    if not files:
+        parser.error("indica al menos un fichero")
+
+    # En una base de datos nueva, crea antes el esquema
+    initialize_database()
+    conn = create_connection()
+    try:
+        for table, path in files:
+            start = time.perf_counter()
+            try:
+                loaded, hashing = import_table(conn, table, path, _detect_format(path, args.formato), args.lote)
+            except ImportFailed as exc:
+                print(f"Error: {exc}. No se cargó ninguna fila de {table}.", file=sys.stderr)
+                return 1
+            elapsed = time.perf_counter() - start
+            rate = loaded / elapsed if elapsed > 0 else 0
+            detail = f", {hashing:.1f} s hasheando contraseñas" if hashing else ""
+            print(f"{table}: {loaded} filas en {elapsed:.1f} s ({rate:,.0f} filas/s{detail})")
+        return 0
+    finally:
+        conn.close()
+        shutdown_hash_pool()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
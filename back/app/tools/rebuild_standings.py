@@ -0,0 +1,52 @@
+# app/tools/rebuild_standings.py
+"""
+Reconstruye la clasificación desde los partidos y comprueba la mantenida incrementalmente.
+
+Uso (desde el directorio `back/`):
+
+    python -m app.tools.rebuild_standings             # compara y reconstruye todos los torneos
+    python -m app.tools.rebuild_standings --torneo 3  # sólo el torneo 3
+    python -m app.tools.rebuild_standings --check     # sólo compara; código 1 si hay diferencias
+"""
+import argparse
+import sys
+
+from app.crud import crud_standings
+from app.db.database import create_connection
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Reconstruye la tabla de clasificación desde los partidos.")
+    parser.add_argument("--torneo", type=int, default=None, help="ID del torneo (por defecto, todos).")
+    parser.add_argument("--check", action="store_true", help="Sólo comparar, sin reescribir la tabla.")
+    args = parser.parse_args(argv)
+
+    conn = create_connection()
+    try:
+        conn.execute("BEGIN IMMEDIATE")
+        expected = crud_standings.compute_standings(conn, args.torneo)
+        stored = crud_standings.stored_standings(conn, args.torneo)
+        differences = sorted(
+            key for key in expected.keys() | stored.keys() if expected.get(key) != stored.get(key)
+        )
+        for id_torneo, id_equipo in differences:
+            print(
+                f"torneo {id_torneo} equipo {id_equipo}: "
+                f"guardado={stored.get((id_torneo, id_equipo))} esperado={expected.get((id_torneo, id_equipo))}"
+            )
+        print(f"{len(expected)} filas calculadas, {len(differences)} diferencias")
+
+        if args.check:
+            conn.rollback()
+            return 1 if differences else 0
+
+        written = crud_standings.rebuild_standings(conn, args.torneo)
+        conn.commit()
+        print(f"Clasificación reconstruida: {written} filas")
+        return 0
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
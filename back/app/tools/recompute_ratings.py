@@ -0,0 +1,31 @@
+# app/tools/recompute_ratings.py
+"""
+Recalcula todos los ratings Elo y su historial desde los partidos con resultado.
+
+Uso (desde el directorio `back/`):
+
+    python -m app.tools.recompute_ratings
+"""
+import sys
+import time
+
+from app.crud import crud_rating
+from app.db.database import create_connection
+
+
+def main() -> int:
+    conn = create_connection()
+    try:
+        start = time.perf_counter()
+        conn.execute("BEGIN IMMEDIATE")
+        processed = crud_rating.recompute_ratings(conn)
+        conn.commit()
+        elapsed = time.perf_counter() - start
+        print(f"{processed} partidos procesados en {elapsed:.2f} s")
+        return 0
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,117 @@
+# bench/_common.py
+"""
+Utilidades compartidas por los scripts de rendimiento de `bench/`.
+
+Cada script arranca la aplicación sobre una base de datos temporal (nunca sobre
+`app_db.db`), la rellena con datos sintéticos y mide a través de la API.
+"""
+import os
+import shutil
+import statistics
+import tempfile
+import time
+from contextlib import contextmanager
+from typing import Callable, Iterator, Optional
+
+from fastapi.testclient import TestClient
+
+# Hash de contraseña ficticio para las filas sintéticas (no se usa para autenticarse)
+DUMMY_HASH = "$2b$12$" + "x" * 53
+
+
+@contextmanager
+def temp_database(template: Optional[str] = None) -> Iterator[str]:
+    """
+    Apunta `DB_PATH` a una base de datos en un directorio temporal y la borra al salir.
+
+    Args:
+        template: Base de datos que se copia como punto de partida (opcional).
+
+    Yields:
+        str: Ruta de la base de datos temporal.
+    """
+    from app.db import database
+
+    directory = tempfile.mkdtemp(prefix="matchpoint-bench-")
+    path = os.path.join(directory, "bench.db")
+    if template:
+        shutil.copy(template, path)
+    previous, database.DB_PATH = database.DB_PATH, path
+    try:
+        yield path
+    finally:
+        database.close_pool()
+        database.DB_PATH = previous
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+@contextmanager
+def bench_client(template: Optional[str] = None) -> Iterator[TestClient]:
+    """
+    Arranca la aplicación (migraciones y tareas de fondo incluidas) sobre una base
+    de datos temporal.
+
+    Args:
+        template: Base de datos que se copia como punto de partida (opcional).
+
+    Yields:
+        TestClient: Cliente de la aplicación.
+    """
+    import main
+
+    with temp_database(template):
+        with TestClient(main.app) as client:
+            yield client
+
+
+def seed_users(db, count: int, start: int = 0, batch: int = 50000) -> None:
+    """
+    Inserta `count` usuarios sintéticos (`usuario N`, `nickN`, `userN@example.com`).
+    """
+    for offset in range(start, start + count, batch):
+        end = min(offset + batch, start + count)
+        db.executemany(
+            "INSERT INTO usuarios (nombre, nickname, email, pwd_hash) VALUES (?, ?, ?, ?)",
+            ((f"usuario {i}", f"nick{i}", f"user{i}@example.com", DUMMY_HASH) for i in range(offset, end)),
+        )
+        db.commit()
+
+
+def seed_teams(db, count: int) -> None:
+    """
+    Inserta `count` equipos (`Equipo N`) capitaneados por los usuarios 1..count.
+    """
+    db.executemany(
+        "INSERT INTO equipos (nombre, id_capitan) VALUES (?, ?)",
+        ((f"Equipo {i}", i) for i in range(1, count + 1)),
+    )
+    db.commit()
+
+
+def seed_tournament(db, nombre: str, teams: int, formato: Optional[str] = None) -> int:
+    """
+    Crea un torneo con los equipos 1..teams inscritos y devuelve su ID.
+    """
+    tournament_id = db.execute(
+        "INSERT INTO torneos (nombre, fecha_inicio, fecha_fin, max_equipos, id_organizador, formato) "
+        "VALUES (?, '2026-01-01T10:00:00Z', '2026-06-30T10:00:00Z', ?, 1, ?) RETURNING id",
+        (nombre, teams, formato),
+    ).fetchone()[0]
+    db.executemany(
+        "INSERT INTO inscripciones (id_equipo, id_torneo) VALUES (?, ?)",
+        ((team, tournament_id) for team in range(1, teams + 1)),
+    )
+    db.commit()
+    return tournament_id
+
+
+def median_ms(func: Callable[[], object], repeat: int = 5) -> float:
+    """
+    Ejecuta `func` `repeat` veces y devuelve la mediana, en milisegundos.
+    """
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples) * 1000
@@ -0,0 +1,60 @@
+# bench/fields.py
+"""
+Compara el tamaño y la latencia de las respuestas de usuarios completas con las
+proyectadas con `fields=`.
+
+Carga `--usuarios` usuarios sintéticos y pide, a mitad de la tabla, una página de
+500 usuarios por cursor, 500 usuarios por `ids=` y el detalle de un usuario, cada
+una sin `fields` y con una selección de columnas. Informa del tamaño del cuerpo y
+de la mediana de `--repeticiones` peticiones.
+
+Uso (desde el directorio `back/`):
+
+    python -m bench.fields                     # 1M usuarios (la carga tarda más de un minuto)
+    python -m bench.fields --usuarios 100000
+"""
+import argparse
+
+from app.db.database import connection
+from app.routers.deps import encode_cursor
+from bench._common import bench_client, median_ms, seed_users
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Respuestas completas frente a proyectadas con fields=.")
+    parser.add_argument("--usuarios", type=int, default=1_000_000, help="Usuarios a cargar.")
+    parser.add_argument("--repeticiones", type=int, default=200, help="Peticiones por URL.")
+    args = parser.parse_args(argv)
+
+    middle = args.usuarios // 2
+    page = f"/users/?limit=500&cursor={encode_cursor(middle)}"
+    by_ids = "ids=" + ",".join(str(i) for i in range(middle, middle + 500))
+    urls = [
+        page,
+        page + "&fields=nickname",
+        page + "&fields=nombre,nickname,email,fecha_reg",
+        f"/users/?{by_ids}",
+        f"/users/?fields=nickname&{by_ids}",
+        f"/users/{middle}",
+        f"/users/{middle}?fields=nickname",
+    ]
+
+    with bench_client() as client:
+        with connection() as db:
+            seed_users(db, args.usuarios)
+
+        for url in urls:
+            response = client.get(url)
+            assert response.status_code == 200, response.text
+
+            def get() -> None:
+                client.get(url)
+
+            elapsed = median_ms(get, args.repeticiones)
+            label = url.replace(by_ids, "ids=<500 ids>")
+            print(f"{label:60} {len(response.content):8d} B {elapsed:8.2f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,98 @@
+# bench/fixtures.py
+"""
+Mide la generación de calendarios (`POST /tournaments/{id}/fixtures`).
+
+Compara generar una liga completa en una llamada con crear los mismos partidos
+uno a uno con `POST /matches/`, y mide cuánto tarda en generarse un cuadro de
+eliminación y de doble eliminación completo, ronda a ronda (los resultados de
+cada ronda se escriben directamente en la base de datos entre llamadas).
+
+Uso (desde el directorio `back/`):
+
+    python -m bench.fixtures              # 128 equipos
+    python -m bench.fixtures --equipos 64
+"""
+import argparse
+import random
+import time
+from datetime import datetime, timedelta, timezone
+
+from app.db.database import connection
+from app.services.fixtures import round_robin
+from app.services.scheduler import DESCANSO_MINIMO_MIN, DURACION_PARTIDO_MIN
+from bench._common import bench_client, seed_teams, seed_tournament, seed_users
+
+
+def _play_pending(tournament_id: int) -> None:
+    with connection() as db:
+        ids = [row[0] for row in db.execute(
+            "SELECT id FROM partidos WHERE id_torneo = ? AND resultado_local IS NULL", (tournament_id,)
+        )]
+        db.executemany(
+            "UPDATE partidos SET resultado_local = ?, resultado_visitante = ? WHERE id = ?",
+            [(random.choice((0, 3)), random.choice((1, 2)), match_id) for match_id in ids],
+        )
+        db.commit()
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Rendimiento de la generación de calendarios.")
+    parser.add_argument("--equipos", type=int, default=128, help="Equipos inscritos en cada torneo.")
+    parser.add_argument("--uno-a-uno", type=int, default=2000, help="Partidos a crear uno a uno para comparar.")
+    args = parser.parse_args(argv)
+    random.seed(0)
+
+    with bench_client() as client:
+        with connection() as db:
+            seed_users(db, args.equipos)
+            seed_teams(db, args.equipos)
+            tournaments = {
+                formato: seed_tournament(db, f"Torneo {formato}", args.equipos)
+                for formato in ("liga", "liga_manual", "eliminacion", "doble_eliminacion")
+            }
+
+        start = time.perf_counter()
+        response = client.post(f"/tournaments/{tournaments['liga']}/fixtures", json={"formato": "liga"})
+        elapsed = time.perf_counter() - start
+        assert response.status_code == 200, response.text
+        created = response.json()["creados"]
+        print(f"liga: {created} partidos en una llamada, {elapsed:.2f} s")
+
+        # Un partido por jornada y equipo, con jornadas separadas para no chocar
+        matches = round_robin(list(range(1, args.equipos + 1)))[:args.uno_a_uno]
+        first_day = datetime(2026, 1, 1, 10, tzinfo=timezone.utc)
+        gap = timedelta(minutes=DURACION_PARTIDO_MIN + DESCANSO_MINIMO_MIN)
+        start = time.perf_counter()
+        for match in matches:
+            fecha = first_day + gap * match.jornada
+            response = client.post("/matches/", json={
+                "id_torneo": tournaments["liga_manual"],
+                "equipo_local": match.local,
+                "equipo_visitante": match.visitante,
+                "fecha": fecha.strftime("%Y-%m-%dT%H:%M:%SZ"),
+            })
+            assert response.status_code == 200, response.text
+        elapsed = time.perf_counter() - start
+        print(f"liga: {len(matches)} partidos uno a uno con POST /matches/, {elapsed:.2f} s "
+              f"(~{elapsed * created / len(matches):.0f} s para {created})")
+
+        for formato in ("eliminacion", "doble_eliminacion"):
+            tournament_id = tournaments[formato]
+            total = calls = 0
+            generation = 0.0
+            while True:
+                start = time.perf_counter()
+                response = client.post(f"/tournaments/{tournament_id}/fixtures", json={"formato": formato})
+                generation += time.perf_counter() - start
+                assert response.status_code == 200, response.text
+                calls += 1
+                total += response.json()["creados"]
+                if response.json()["creados"] == 0:
+                    break
+                _play_pending(tournament_id)
+            print(f"{formato}: {total} partidos en {calls} llamadas, {generation * 1000:.0f} ms de generación")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,77 @@
+# bench/inscriptions.py
+"""
+Prueba de carga de `POST /inscriptions/` con el torneo lleno.
+
+Lanza a la vez `--peticiones` inscripciones de equipos distintos contra un torneo
+de `--plazas` plazas y comprueba que el cupo se respeta: exactamente `--plazas`
+equipos inscritos (contador `torneos.inscritos` y filas coinciden), el resto en
+la lista de espera con posiciones 1..N sin huecos y ningún equipo en ambas.
+
+Uso (desde el directorio `back/`):
+
+    python -m bench.inscriptions                        # 500 peticiones, 64 plazas
+    python -m bench.inscriptions --peticiones 1000 --plazas 128
+"""
+import argparse
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+from app.db.database import connection
+from bench._common import bench_client, seed_teams, seed_users
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Inscripciones concurrentes contra un torneo con cupo.")
+    parser.add_argument("--peticiones", type=int, default=500, help="Inscripciones simultáneas (una por equipo).")
+    parser.add_argument("--plazas", type=int, default=64, help="max_equipos del torneo.")
+    args = parser.parse_args(argv)
+
+    with bench_client() as client:
+        with connection() as db:
+            seed_users(db, args.peticiones)
+            seed_teams(db, args.peticiones)
+            tournament_id = db.execute(
+                "INSERT INTO torneos (nombre, fecha_inicio, fecha_fin, max_equipos, id_organizador) "
+                "VALUES ('Copa', '2026-01-01T10:00:00Z', '2026-06-30T10:00:00Z', ?, 1) RETURNING id",
+                (args.plazas,),
+            ).fetchone()[0]
+            db.commit()
+
+        def inscribe(team: int) -> int:
+            response = client.post("/inscriptions/", json={"id_equipo": team, "id_torneo": tournament_id})
+            return response.status_code
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(args.peticiones) as executor:
+            codes = Counter(executor.map(inscribe, range(1, args.peticiones + 1)))
+        elapsed = time.perf_counter() - start
+        print(f"{args.peticiones} peticiones simultáneas en {elapsed:.2f} s: {dict(sorted(codes.items()))}")
+
+        with connection() as db:
+            counter = db.execute("SELECT inscritos FROM torneos WHERE id = ?", (tournament_id,)).fetchone()[0]
+            inscribed = {row[0] for row in db.execute(
+                "SELECT id_equipo FROM inscripciones WHERE id_torneo = ?", (tournament_id,)
+            )}
+            waiting = db.execute(
+                "SELECT id_equipo FROM lista_espera WHERE id_torneo = ? ORDER BY id", (tournament_id,)
+            ).fetchall()
+        positions = [entry["posicion"] for entry in client.get(f"/tournaments/{tournament_id}/waitlist").json()]
+        print(f"inscritos: {len(inscribed)} filas, contador {counter}; lista de espera: {len(waiting)}")
+
+        errors = []
+        if codes.get(200, 0) != args.plazas or codes.get(202, 0) != args.peticiones - args.plazas:
+            errors.append("respuestas distintas de plazas/lista de espera esperadas")
+        if counter != len(inscribed) or len(inscribed) != min(args.plazas, args.peticiones):
+            errors.append("contador o filas de inscripciones incoherentes")
+        if inscribed & {row[0] for row in waiting} or len(inscribed) + len(waiting) != args.peticiones:
+            errors.append("equipos perdidos o duplicados entre inscripciones y lista de espera")
+        if positions != list(range(1, len(waiting) + 1)):
+            errors.append("posiciones de la lista de espera con huecos")
+        for error in errors:
+            print(f"ERROR: {error}")
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,171 @@
+# bench/live_fanout.py
+"""
+Mide el reparto de resultados en vivo (`/tournaments/{id}/live` por SSE y
+`/tournaments/{id}/live/ws` por WebSocket) con muchos suscriptores a la vez.
+
+Conecta `--suscriptores` clientes (mitad SSE, mitad WebSocket) a un mismo torneo,
+anota la memoria residente que añaden y mide cuánto tarda un resultado publicado
+con `PUT /matches/{id}` en llegar a todos. Los clientes hablan ASGI directamente
+con la aplicación dentro de un único bucle de eventos, sin servidor HTTP: se mide
+el broker y los endpoints, no la red.
+
+Uso (desde el directorio `back/`; sólo Linux, lee `/proc/self/statm`):
+
+    python -m bench.live_fanout                    # 10000 suscriptores
+    python -m bench.live_fanout --suscriptores 2000
+"""
+import argparse
+import asyncio
+import gc
+import json
+import os
+import time
+
+from app.db.database import connection
+from app.live.broker import live_broker
+from bench._common import seed_teams, seed_users, temp_database
+
+
+def _rss_mb() -> float:
+    with open("/proc/self/statm") as f:
+        return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+
+
+def _scope(path: str, kind: str = "http", method: str = "GET", headers=()) -> dict:
+    return {
+        "type": kind, "asgi": {"version": "3.0"}, "http_version": "1.1", "method": method,
+        "scheme": "http", "path": path, "raw_path": path.encode(), "query_string": b"",
+        "headers": list(headers), "client": ("bench", 1), "server": ("bench", 80), "root_path": "",
+    }
+
+
+class SSEClient:
+    """
+    Cliente SSE: envía la petición, nunca se desconecta y marca `received` con el
+    primer evento de datos.
+    """
+
+    def __init__(self, app, path: str):
+        self.app = app
+        self.path = path
+        self.sent = False
+        self.received = asyncio.Event()
+
+    async def receive(self) -> dict:
+        if not self.sent:
+            self.sent = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        await asyncio.Event().wait()
+
+    async def send(self, message: dict) -> None:
+        if message["type"] == "http.response.body" and b"data:" in message.get("body", b""):
+            self.received.set()
+
+    async def run(self) -> None:
+        await self.app(_scope(self.path), self.receive, self.send)
+
+
+class WSClient:
+    """
+    Cliente WebSocket: acepta la conexión y marca `received` con el primer mensaje.
+    """
+
+    def __init__(self, app, path: str):
+        self.app = app
+        self.path = path
+        self.inbox: asyncio.Queue = asyncio.Queue()
+        self.inbox.put_nowait({"type": "websocket.connect"})
+        self.received = asyncio.Event()
+
+    async def receive(self) -> dict:
+        return await self.inbox.get()
+
+    async def send(self, message: dict) -> None:
+        if message["type"] in ("websocket.send", "websocket.close"):
+            self.received.set()
+
+    async def run(self) -> None:
+        await self.app(_scope(self.path, "websocket"), self.receive, self.send)
+
+
+async def _put_result(app, match_id: int, local: int, visitante: int) -> int:
+    body = json.dumps({"resultado_local": local, "resultado_visitante": visitante}).encode()
+    scope = _scope(f"/matches/{match_id}", method="PUT", headers=[(b"content-type", b"application/json")])
+    messages = []
+    sent = False
+
+    async def receive() -> dict:
+        nonlocal sent
+        if not sent:
+            sent = True
+            return {"type": "http.request", "body": body, "more_body": False}
+        await asyncio.Event().wait()
+
+    async def send(message: dict) -> None:
+        messages.append(message)
+
+    await app(scope, receive, send)
+    return messages[0]["status"]
+
+
+async def _run(subscribers: int) -> None:
+    import main
+
+    app = main.app
+    await app.router.startup()
+    try:
+        with connection() as db:
+            seed_users(db, 2)
+            seed_teams(db, 2)
+            tournament_id = db.execute(
+                "INSERT INTO torneos (nombre, fecha_inicio, fecha_fin, max_equipos, id_organizador) "
+                "VALUES ('Final', '2026-01-01T10:00:00Z', '2026-02-01T10:00:00Z', 8, 1) RETURNING id"
+            ).fetchone()[0]
+            match_id = db.execute(
+                "INSERT INTO partidos (id_torneo, equipo_local, equipo_visitante, fecha) "
+                "VALUES (?, 1, 2, '2026-01-02T10:00:00Z') RETURNING id",
+                (tournament_id,),
+            ).fetchone()[0]
+            db.commit()
+
+        path = f"/tournaments/{tournament_id}/live"
+        gc.collect()
+        rss = _rss_mb()
+        start = time.perf_counter()
+        clients = [SSEClient(app, path) if i % 2 else WSClient(app, path + "/ws") for i in range(subscribers)]
+        tasks = [asyncio.create_task(client.run()) for client in clients]
+        while live_broker.stats()["subscribers"] < subscribers:
+            await asyncio.sleep(0.05)
+        added = _rss_mb() - rss
+        print(f"{subscribers} suscriptores conectados en {time.perf_counter() - start:.1f} s, "
+              f"memoria +{added:.0f} MB ({added * 1024 / subscribers:.1f} KB cada uno)")
+
+        # Deja pasar un ciclo de keep-alive antes de medir
+        await asyncio.sleep(2)
+        start = time.perf_counter()
+        status = await _put_result(app, match_id, 3, 1)
+        assert status == 200, status
+        await asyncio.gather(*(client.received.wait() for client in clients))
+        print(f"resultado entregado a {subscribers} suscriptores en {(time.perf_counter() - start) * 1000:.0f} ms "
+              f"(incluido el PUT)")
+        print(live_broker.stats())
+
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+    finally:
+        await app.router.shutdown()
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Reparto de resultados en vivo a muchos suscriptores.")
+    parser.add_argument("--suscriptores", type=int, default=10_000, help="Clientes conectados (mitad SSE, mitad WebSocket).")
+    args = parser.parse_args(argv)
+
+    with temp_database():
+        asyncio.run(_run(args.suscriptores))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
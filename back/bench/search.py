@@ -0,0 +1,69 @@
+# bench/search.py
+"""
+Mide la búsqueda de texto completo (`GET /search/`) sobre una tabla de usuarios
+grande.
+
+Carga `--usuarios` usuarios sintéticos (`usuario N`, `nickN`), `--equipos` equipos
+y `--torneos` torneos (`Liga N`) con los triggers de FTS activos y mide la mediana
+de cada consulta, primero con el límite de puntuación por defecto
+(`SEARCH_RANK_MAX`) y después puntuando todas las coincidencias, para ver lo que
+cuesta ordenar por BM25 un término presente en casi todas las filas.
+
+Uso (desde el directorio `back/`):
+
+    python -m bench.search                     # 1M usuarios (la carga tarda unos minutos)
+    python -m bench.search --usuarios 100000
+"""
+import argparse
+import sys
+import time
+
+from app.crud import crud_search
+from app.db.database import connection
+from bench._common import bench_client, median_ms, seed_teams, seed_users
+
+QUERIES = ("nick123456", "nick1234", "usuario 77777", "usu", "equipo 1", "liga")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Rendimiento de la búsqueda de texto completo.")
+    parser.add_argument("--usuarios", type=int, default=1_000_000, help="Usuarios a cargar.")
+    parser.add_argument("--equipos", type=int, default=10_000, help="Equipos a cargar.")
+    parser.add_argument("--torneos", type=int, default=1_000, help="Torneos a cargar.")
+    parser.add_argument("--repeticiones", type=int, default=5, help="Repeticiones de cada consulta.")
+    args = parser.parse_args(argv)
+
+    with bench_client() as client:
+        start = time.perf_counter()
+        with connection() as db:
+            seed_users(db, args.usuarios)
+            seed_teams(db, min(args.equipos, args.usuarios))
+            db.executemany(
+                "INSERT INTO torneos (nombre, fecha_inicio, fecha_fin, max_equipos, id_organizador) "
+                "VALUES (?, '2026-01-01T10:00:00Z', '2026-06-30T10:00:00Z', 16, 1)",
+                ((f"Liga {i}",) for i in range(1, args.torneos + 1)),
+            )
+            db.commit()
+        print(f"carga: {args.usuarios} usuarios, {args.equipos} equipos, {args.torneos} torneos "
+              f"en {time.perf_counter() - start:.0f} s", file=sys.stderr)
+
+        def search(q: str) -> None:
+            response = client.get("/search/", params={"q": q})
+            assert response.status_code == 200, response.text
+
+        print(f"{'consulta':16} {'resultados':>10} {'límite ' + str(crud_search.SEARCH_RANK_MAX):>14} {'todo puntuado':>14}")
+        for q in QUERIES:
+            results = len(client.get("/search/", params={"q": q}).json())
+            capped = median_ms(lambda: search(q), args.repeticiones)
+            # Con un límite mayor que cualquier tabla se puntúan todas las coincidencias
+            default, crud_search.SEARCH_RANK_MAX = crud_search.SEARCH_RANK_MAX, args.usuarios + args.equipos + args.torneos
+            try:
+                full = median_ms(lambda: search(q), args.repeticiones)
+            finally:
+                crud_search.SEARCH_RANK_MAX = default
+            print(f"{q!r:16} {results:10d} {capped:11.1f} ms {full:11.1f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,80 @@
+# bench/swiss.py
+"""
+Mide la generación de rondas suizas (`POST /tournaments/{id}/rounds/next`).
+
+Crea por la API torneos de 256 y 1024 equipos, inscribe a todos y genera las
+rondas una a una; entre ronda y ronda escribe resultados aleatorios directamente
+en la base de datos. Al final comprueba que no se ha repetido ningún cruce.
+
+Uso (desde el directorio `back/`):
+
+    python -m bench.swiss                          # 256 y 1024 equipos, 8 rondas
+    python -m bench.swiss --equipos 512 --rondas 9
+"""
+import argparse
+import random
+import time
+
+from app.db.database import connection
+from bench._common import bench_client, seed_teams, seed_users
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Rendimiento del emparejamiento suizo.")
+    parser.add_argument("--equipos", type=int, nargs="+", default=[256, 1024], help="Tamaños de torneo a medir.")
+    parser.add_argument("--rondas", type=int, default=8, help="Rondas a generar en cada torneo.")
+    args = parser.parse_args(argv)
+    random.seed(0)
+
+    with bench_client() as client:
+        with connection() as db:
+            seed_users(db, max(args.equipos))
+            seed_teams(db, max(args.equipos))
+
+        for teams in args.equipos:
+            response = client.post("/tournaments/", json={
+                "nombre": f"Open {teams}",
+                "fecha_inicio": "2026-01-01T10:00:00Z",
+                "fecha_fin": "2026-01-11T10:00:00Z",
+                "max_equipos": teams,
+                "id_organizador": 1,
+            })
+            assert response.status_code == 200, response.text
+            tournament_id = response.json()["id"]
+            with connection() as db:
+                db.executemany(
+                    "INSERT INTO inscripciones (id_equipo, id_torneo) VALUES (?, ?)",
+                    ((team, tournament_id) for team in range(1, teams + 1)),
+                )
+                db.commit()
+
+            times = []
+            for _ in range(args.rondas):
+                start = time.perf_counter()
+                response = client.post(f"/tournaments/{tournament_id}/rounds/next")
+                times.append(time.perf_counter() - start)
+                assert response.status_code == 200, response.text
+                with connection() as db:
+                    db.executemany(
+                        "UPDATE partidos SET resultado_local = ?, resultado_visitante = ? WHERE id = ?",
+                        [(random.randint(0, 3), random.randint(0, 3), match["id"]) for match in response.json()["partidos"]],
+                    )
+                    db.commit()
+
+            with connection() as db:
+                rematches = db.execute(
+                    """
+                    SELECT COUNT(*) FROM (
+                        SELECT MIN(equipo_local, equipo_visitante), MAX(equipo_local, equipo_visitante)
+                        FROM partidos WHERE id_torneo = ? GROUP BY 1, 2 HAVING COUNT(*) > 1
+                    )
+                    """,
+                    (tournament_id,),
+                ).fetchone()[0]
+            print(f"{teams} equipos: {len(times)} rondas, máx {max(times) * 1000:.0f} ms, "
+                  f"media {sum(times) / len(times) * 1000:.0f} ms por ronda, {rematches} cruces repetidos")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
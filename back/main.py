@@ -1,8 +1,27 @@
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
 
-from app.db.database import initialize_database
-from app.routers import users, teams, tournaments, inscriptions, payments, matches, members
+from app.db.database import (
+    initialize_database,
+    create_connection,
+    close_pool,
+    get_pool_stats,
+    start_wal_checkpointer,
+    stop_wal_checkpointer,
+    get_checkpoint_stats,
+    start_change_log_compactor,
+    stop_change_log_compactor,
+    get_change_log_stats,
+)
+from app.cache.autocomplete import autocomplete_index
+from app.cache.cache import response_cache
+from app.db.pool import PoolTimeoutError
+from app.live.broker import live_broker
+from app.live.changes import change_notifier
+from app.security.security import get_hash_stats, shutdown_hash_pool
+from app.security.token_cache import token_cache
+from app.routers import users, teams, tournaments, inscriptions, payments, matches, members, export, search, autocomplete, changes
 
 
 app = FastAPI(
@@ -30,6 +49,10 @@ app = FastAPI(
         {"name": "Inscriptions", "description": "Operaciones para gestionar la inscripción de equipos en torneos."},
         {"name": "Payments", "description": "Operaciones para registrar y consultar pagos de torneos."},
         {"name": "Matches", "description": "Operaciones para programar y gestionar partidos de torneos."},
+        {"name": "Export", "description": "Exportación completa o incremental de las tablas en NDJSON o CSV."},
+        {"name": "Search", "description": "Búsqueda de texto completo en usuarios, equipos y torneos."},
+        {"name": "Autocomplete", "description": "Sugerencias por prefijo de nicknames y nombres de equipo, servidas desde memoria."},
+        {"name": "Changes", "description": "Registro de cambios para la sincronización incremental, con long-poll."},
     ]
 )
 
@@ -38,9 +61,38 @@ app = FastAPI(
 def root():
     return {"message": "Bienvenido a la API de MatchPoint"}
 
+# Métricas internas del proceso (pool de conexiones, etc.)
+@app.get("/metrics", include_in_schema=False)
+def metrics():
+    return {
+        "db_pool": get_pool_stats(),
+        "wal_checkpoint": get_checkpoint_stats(),
+        "password_hashing": get_hash_stats(),
+        "auth_token_cache": token_cache.stats(),
+        "response_cache": response_cache.stats(),
+        "autocomplete": autocomplete_index.stats(),
+        "live": live_broker.stats(),
+        "change_feed": {"log": get_change_log_stats(), "long_poll": change_notifier.stats()},
+    }
+
+@app.exception_handler(PoolTimeoutError)
+def pool_timeout_handler(request: Request, exc: PoolTimeoutError):
+    return JSONResponse(status_code=503, content={"detail": "Servicio saturado, inténtelo de nuevo"})
+
 @app.on_event("startup")
 def on_startup():
     initialize_database()
+    start_wal_checkpointer()
+    start_change_log_compactor()
+    autocomplete_index.start(create_connection)
+
+@app.on_event("shutdown")
+def on_shutdown():
+    stop_wal_checkpointer()
+    stop_change_log_compactor()
+    autocomplete_index.stop()
+    close_pool()
+    shutdown_hash_pool()
 
 app.include_router(users.router, prefix="/users", tags=["Users"])
 app.include_router(teams.router, prefix="/teams", tags=["Teams"])
@@ -49,3 +101,7 @@ app.include_router(tournaments.router, prefix="/tournaments", tags=["Tournaments
 app.include_router(inscriptions.router, prefix="/inscriptions", tags=["Inscriptions"])
 app.include_router(payments.router, prefix="/payments", tags=["Payments"])
 app.include_router(matches.router, prefix="/matches", tags=["Matches"])
+app.include_router(export.router, prefix="/export", tags=["Export"])
+app.include_router(search.router, prefix="/search", tags=["Search"])
+app.include_router(autocomplete.router, prefix="/autocomplete", tags=["Autocomplete"])
+app.include_router(changes.router, prefix="/changes", tags=["Changes"])
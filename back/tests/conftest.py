@@ -0,0 +1,77 @@
+# tests/conftest.py
+"""
+Fixtures compartidas por los tests.
+
+Cada test trabaja sobre una base de datos nueva en un directorio temporal
+(`DB_PATH`), nunca sobre `app_db.db`.
+"""
+import sqlite3
+
+import pytest
+from fastapi.testclient import TestClient
+
+import main
+from app.db import database
+from app.db.database import initialize_database
+
+
+@pytest.fixture()
+def db_path(tmp_path, monkeypatch):
+    """
+    Apunta `DB_PATH` a una base de datos vacía en un directorio temporal.
+    """
+    path = str(tmp_path / "test.db")
+    monkeypatch.setattr(database, "DB_PATH", path)
+    return path
+
+
+@pytest.fixture()
+def client(db_path):
+    """
+    Arranca la aplicación (migraciones y tareas de fondo incluidas) sobre la base
+    de datos temporal.
+    """
+    with TestClient(main.app) as c:
+        yield c
+
+
+@pytest.fixture()
+def seed(db_path):
+    """
+    Devuelve una función que carga directamente en la base de datos (sin pasar por
+    el hash de contraseñas) `users` usuarios (`Usuario N`, `userN`,
+    `userN@example.com`, desde N = 0), `teams` equipos (`Equipo N`, capitaneado por
+    el usuario N) y un torneo 'Copa' organizado por el primer usuario, y devuelve
+    sus IDs en `users`, `teams` y `tournament`.
+    """
+
+    def load(users: int = 3, teams: int = 3, max_equipos: int = 8) -> dict:
+        initialize_database()
+        conn = sqlite3.connect(database.DB_PATH)
+
+        def insert(sql, params):
+            return conn.execute(sql + " RETURNING id", params).fetchone()[0]
+
+        try:
+            user_ids = [
+                insert(
+                    "INSERT INTO usuarios (nombre, nickname, email, pwd_hash) VALUES (?, ?, ?, 'sin-hash-de-prueba')",
+                    (f"Usuario {i}", f"user{i}", f"user{i}@example.com"),
+                )
+                for i in range(users)
+            ]
+            team_ids = [
+                insert("INSERT INTO equipos (nombre, id_capitan) VALUES (?, ?)", (f"Equipo {i}", user_ids[i]))
+                for i in range(teams)
+            ]
+            tournament = insert(
+                "INSERT INTO torneos (nombre, fecha_inicio, fecha_fin, max_equipos, id_organizador) "
+                "VALUES ('Copa', '2024-07-01T18:00:00Z', '2024-07-31T18:00:00Z', ?, ?)",
+                (max_equipos, user_ids[0]),
+            )
+            conn.commit()
+        finally:
+            conn.close()
+        return {"users": user_ids, "teams": team_ids, "tournament": tournament}
+
+    return load
@@ -0,0 +1,148 @@
+# tests/test_cache_redis.py
+"""
+Comprueba `RedisBackend` y la caché de lecturas sobre él contra un servidor local
+que habla el protocolo de Redis (RESP2) con los comandos que usa el backend.
+
+Ejecutar desde `back/` con `python -m pytest tests`.
+"""
+import socket
+import socketserver
+import threading
+import time
+from typing import List
+
+import pytest
+from pydantic import TypeAdapter
+
+from app.cache.backends import RedisBackend, RedisError
+from app.cache.cache import ResponseCache
+
+
+class RespServer(socketserver.ThreadingTCPServer):
+    """
+    Servidor de pruebas con GET, SET ... PX [NX] y DEL. Anota los comandos recibidos
+    y responde con un error a cualquier otro.
+    """
+
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), RespHandler)
+        self.store = {}
+        self.commands = []
+        self.lock = threading.Lock()
+
+    def run(self, args: List[bytes]) -> bytes:
+        name = args[0].upper().decode()
+        with self.lock:
+            self.commands.append([name] + [arg.decode(errors="replace") for arg in args[1:]])
+            if name == "GET":
+                value = self._alive(args[1])
+                return b"$-1\r\n" if value is None else b"$%d\r\n%s\r\n" % (len(value), value)
+            if name == "SET":
+                options = [arg.upper() for arg in args[3:]]
+                if b"NX" in options and self._alive(args[1]) is not None:
+                    return b"$-1\r\n"
+                expires_at = time.monotonic() + int(options[options.index(b"PX") + 1]) / 1000
+                self.store[args[1]] = (args[2], expires_at)
+                return b"+OK\r\n"
+            if name == "DEL":
+                return b":%d\r\n" % sum(self.store.pop(key, None) is not None for key in args[1:])
+        return b"-ERR unknown command '%s'\r\n" % name.encode()
+
+    def _alive(self, key: bytes):
+        entry = self.store.get(key)
+        if entry is None or entry[1] <= time.monotonic():
+            return None
+        return entry[0]
+
+
+class RespHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            args = []
+            for _ in range(int(line[1:])):
+                length = int(self.rfile.readline()[1:])
+                args.append(self.rfile.read(length + 2)[:-2])
+            self.wfile.write(self.server.run(args))
+
+
+@pytest.fixture()
+def server():
+    server = RespServer()
+    thread = threading.Thread(target=server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture()
+def backend(server):
+    return RedisBackend(f"redis://127.0.0.1:{server.server_address[1]}/0", prefix="test:")
+
+
+def test_get_set_and_delete(server, backend):
+    assert backend.get("a") is None
+    backend.set("a", b"uno", ttl=60, size=3)
+    assert backend.get("a") == b"uno"
+    assert server.commands[-2] == ["SET", "test:a", "uno", "PX", "60000"]
+
+    # NX: sólo se guarda si no existe, y se devuelve el valor vigente
+    assert backend.get_or_set("a", b"dos", ttl=60, size=3) == b"uno"
+    assert backend.get_or_set("b", b"dos", ttl=60, size=3) == b"dos"
+    assert server.commands[-1] == ["SET", "test:b", "dos", "PX", "60000", "NX"]
+
+    backend.delete(["a", "b"])
+    assert server.commands[-1] == ["DEL", "test:a", "test:b"]
+    assert backend.get("a") is None and backend.get("b") is None
+
+    backend.set("c", b"tres", ttl=0.05, size=4)
+    time.sleep(0.1)
+    assert backend.get("c") is None
+
+
+def test_server_errors_raise_redis_error(backend):
+    with pytest.raises(RedisError, match="unknown command"):
+        backend._command("FLUSHDB")
+    # La conexión se cierra y la siguiente orden abre otra
+    backend.set("a", b"uno", ttl=60, size=3)
+    assert backend.get("a") == b"uno"
+
+
+def test_write_during_load_is_not_served_stale(backend):
+    cache = ResponseCache(backend, ttl=60)
+    adapter = TypeAdapter(List[int])
+    stored = [1]
+
+    def load_racing_with_a_write():
+        value = list(stored)
+        # La escritura se confirma e invalida mientras esta lectura está en curso
+        stored.append(2)
+        cache.invalidate("/items", 7)
+        return value
+
+    assert cache.get_or_load("/items", 7, load_racing_with_a_write, adapter) == [1]
+    assert cache.get_or_load("/items", 7, lambda: list(stored), adapter) == [1, 2]
+    assert cache.get_or_load("/items", 7, lambda: pytest.fail("debería servirse de la caché"), adapter) == [1, 2]
+    assert cache.stats()["routes"]["/items"] == {"hits": 1, "misses": 2, "invalidations": 1, "hit_ratio": 1 / 3}
+
+
+def test_unreachable_server_falls_back_to_the_database(server, backend):
+    cache = ResponseCache(backend, ttl=60)
+    adapter = TypeAdapter(List[int])
+    assert cache.get_or_load("/items", 1, lambda: [1], adapter) == [1]
+
+    server.shutdown()
+    server.server_close()
+    backend._close()
+    # El puerto ya no acepta conexiones: se lee de la base de datos y no se propaga el error
+    with socket.socket() as probe:
+        assert probe.connect_ex(("127.0.0.1", server.server_address[1])) != 0
+    assert cache.get_or_load("/items", 1, lambda: [2], adapter) == [2]
+    cache.invalidate("/items", 1)
+    assert cache.stats()["backend"] == {"backend": "redis", "host": "127.0.0.1", "port": server.server_address[1], "db": 0}
@@ -0,0 +1,52 @@
+# tests/test_changes.py
+"""
+Comprueba el registro de cambios (`/changes`): que la lista de espera queda
+registrada y que un cursor purgado recibe 410 con el cursor desde el que seguir.
+
+Ejecutar desde `back/` con `python -m pytest tests`.
+"""
+import pytest
+
+from app.db.database import connection
+
+
+@pytest.fixture(autouse=True)
+def data(client, seed):
+    seed(users=3, teams=3, max_equipos=1)
+
+
+def _changes(client, since, entidades="lista_espera,inscripciones"):
+    response = client.get("/changes/", params={"since": since, "entidades": entidades})
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def test_waitlist_changes_are_logged(client):
+    since = _changes(client, 0)["siguiente"]
+    assert client.post("/inscriptions/", json={"id_equipo": 1, "id_torneo": 1}).status_code == 200
+    response = client.post("/inscriptions/", json={"id_equipo": 2, "id_torneo": 1})
+    assert response.status_code == 202
+    page = _changes(client, since)
+    waiting = [change for change in page["cambios"] if change["entidad"] == "lista_espera"]
+    assert [(change["op"], change["datos"]["id_equipo"]) for change in waiting] == [("insert", 2)]
+
+    # Al liberarse la plaza el equipo pasa de la lista de espera a las inscripciones
+    inscription = next(change for change in page["cambios"] if change["entidad"] == "inscripciones")
+    assert client.delete(f"/inscriptions/{inscription['id']}").status_code == 204
+    changes = {(change["entidad"], change["op"]) for change in _changes(client, page["siguiente"])["cambios"]}
+    assert changes == {("lista_espera", "delete"), ("inscripciones", "delete"), ("inscripciones", "insert")}
+
+
+def test_purged_cursor_reports_head_and_oldest(client):
+    assert client.post("/inscriptions/", json={"id_equipo": 1, "id_torneo": 1}).status_code == 200
+    with connection() as db:
+        head = db.execute("SELECT MAX(seq) FROM cambios").fetchone()[0]
+        db.execute("DELETE FROM cambios WHERE seq <= 3")
+        db.execute("UPDATE cambios_retencion SET purgado_hasta = 3")
+        db.commit()
+
+    response = client.get("/changes/", params={"since": 1})
+    assert response.status_code == 410
+    assert response.headers["X-Changes-Head"] == str(head)
+    assert response.headers["X-Changes-Oldest"] == "4"
+    assert client.get("/changes/", params={"since": head}).json()["cambios"] == []
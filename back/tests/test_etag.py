@@ -0,0 +1,100 @@
+# tests/test_etag.py
+"""
+Comprueba las ETag de filas y colecciones: sin cambios, `If-None-Match` devuelve
+304, y cualquier escritura (también las que hacen los triggers, como el contador
+`inscritos` de los torneos) cambia la ETag.
+
+Ejecutar desde `back/` con `python -m pytest tests`.
+"""
+import pytest
+
+
+@pytest.fixture()
+def data(client, seed):
+    return seed(users=4, teams=3)
+
+
+def etag(client, url):
+    """
+    Pide `url` y devuelve su ETag comprobando que una segunda petición condicional
+    con ella devuelve 304 sin cuerpo.
+    """
+    response = client.get(url)
+    assert response.status_code == 200, response.text
+    tag = response.headers["ETag"]
+    not_modified = client.get(url, headers={"If-None-Match": tag})
+    assert not_modified.status_code == 304
+    assert not_modified.content == b""
+    assert not_modified.headers["ETag"] == tag
+    return tag
+
+
+def test_if_none_match_variants(client, data):
+    url = f"/tournaments/{data['tournament']}"
+    tag = etag(client, url)
+    assert client.get(url, headers={"If-None-Match": f"W/{tag}"}).status_code == 304
+    assert client.get(url, headers={"If-None-Match": f'"otra", {tag}'}).status_code == 304
+    assert client.get(url, headers={"If-None-Match": "*"}).status_code == 304
+    assert client.get(url, headers={"If-None-Match": '"otra"'}).status_code == 200
+
+
+def test_trigger_driven_counter_changes_the_tournament_tag(client, data):
+    tournament = data["tournament"]
+    detail, collection = f"/tournaments/{tournament}", "/tournaments/"
+    tags = [(etag(client, detail), etag(client, collection))]
+
+    # `inscritos` lo actualiza un trigger de inscripciones, no el endpoint de torneos
+    response = client.post("/inscriptions/", json={"id_equipo": data["teams"][0], "id_torneo": tournament})
+    assert response.status_code == 200, response.text
+    assert client.get(detail, headers={"If-None-Match": tags[-1][0]}).json()["inscritos"] == 1
+    tags.append((etag(client, detail), etag(client, collection)))
+
+    assert client.delete(f"/inscriptions/{response.json()['id']}").status_code == 204
+    assert client.get(detail).json()["inscritos"] == 0
+    tags.append((etag(client, detail), etag(client, collection)))
+
+    body = {
+        "nombre": "Copa Renombrada", "fecha_inicio": "2024-07-01T18:00:00Z", "fecha_fin": "2024-07-31T18:00:00Z",
+        "max_equipos": 8, "id_organizador": data["users"][0],
+    }
+    assert client.put(detail, json=body).status_code == 200
+    tags.append((etag(client, detail), etag(client, collection)))
+
+    assert len({detail_tag for detail_tag, _ in tags}) == len(tags)
+    assert len({collection_tag for _, collection_tag in tags}) == len(tags)
+
+
+def test_team_writes_change_the_tags(client, data):
+    team = data["teams"][0]
+    detail, collection = f"/teams/{team}", "/teams/"
+    tags = [(etag(client, detail), etag(client, collection))]
+
+    assert client.put(detail, json={"nombre": "Equipo Renombrado", "id_capitan": data["users"][0]}).status_code == 200
+    tags.append((etag(client, detail), etag(client, collection)))
+
+    # Un alta no toca la fila del equipo pero sí la colección
+    assert client.post("/teams/", json={"nombre": "Equipo Nuevo", "id_capitan": data["users"][3]}).status_code == 200
+    assert etag(client, detail) == tags[-1][0]
+    tags.append((tags[-1][0], etag(client, collection)))
+
+    assert client.delete(f"/teams/{data['teams'][2]}").status_code == 204
+    tags.append((tags[-1][0], etag(client, collection)))
+
+    assert len({detail_tag for detail_tag, _ in tags}) == 2
+    assert len({collection_tag for _, collection_tag in tags}) == len(tags)
+
+
+def test_match_result_changes_the_standings_tag(client, data):
+    tournament = data["tournament"]
+    url = f"/tournaments/{tournament}/standings"
+    before = etag(client, url)
+    body = {"id_torneo": tournament, "equipo_local": data["teams"][0], "equipo_visitante": data["teams"][1], "fecha": "2024-07-02T18:00:00Z"}
+    response = client.post("/matches/", json=body)
+    assert response.status_code == 200, response.text
+    scheduled = etag(client, url)
+
+    assert client.put(f"/matches/{response.json()['id']}", json={"resultado_local": 1, "resultado_visitante": 0}).status_code == 200
+    played = client.get(url, headers={"If-None-Match": scheduled})
+    assert played.status_code == 200
+    assert [row["id_equipo"] for row in played.json()] == data["teams"][:2]
+    assert len({before, scheduled, etag(client, url)}) == 3
@@ -0,0 +1,51 @@
+# tests/test_export.py
+"""
+Comprueba que `/export/{entity}` recorre la tabla completa por páginas de clave y
+que no retiene conexiones del pool mientras el cliente consume la respuesta.
+
+Ejecutar desde `back/` con `python -m pytest tests`.
+"""
+import json
+
+import pytest
+
+from app.crud import crud_export
+from app.db.database import connection, get_pool
+
+
+@pytest.fixture(autouse=True)
+def users(client, seed, monkeypatch):
+    monkeypatch.setattr(crud_export, "EXPORT_BATCH_SIZE", 7)
+    seed(users=50, teams=0)
+    with connection() as db:
+        # Muchas filas con el mismo actualizado_en: la paginación debe desempatar por id
+        db.execute("UPDATE usuarios SET actualizado_en = '2026-01-01T10:00:00.000Z' WHERE id % 2 = 0")
+        db.execute("UPDATE usuarios SET actualizado_en = '2025-01-01T10:00:00.000Z' WHERE id % 2 = 1")
+        db.commit()
+
+
+def _ids(response):
+    assert response.status_code == 200, response.text
+    return [json.loads(line)["id"] for line in response.text.splitlines()]
+
+
+def test_export_pages_through_whole_table(client):
+    assert _ids(client.get("/export/usuarios")) == list(range(1, 51))
+    response = client.get("/export/usuarios", params={"fields": "nickname", "formato": "csv"})
+    assert response.text.splitlines() == ["nickname"] + [f"user{i}" for i in range(50)]
+
+
+def test_export_updated_since_breaks_ties_by_id(client):
+    response = client.get("/export/usuarios", params={"updated_since": "2025-06-01T00:00:00Z"})
+    assert _ids(response) == list(range(2, 51, 2))
+    response = client.get("/export/usuarios", params={"updated_since": "2024-01-01T00:00:00Z", "fields": "email"})
+    assert len(response.text.splitlines()) == 50
+
+
+def test_export_does_not_hold_a_connection_between_batches(client):
+    batches = crud_export.export_batches("usuarios", ("id",))
+    seen = []
+    for rows in batches:
+        assert get_pool().stats()["in_use"] == 0
+        seen.extend(row[0] for row in rows)
+    assert seen == list(range(1, 51))
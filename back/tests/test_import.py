@@ -0,0 +1,62 @@
+# tests/test_import.py
+"""
+Comprueba que la carga masiva (`app.tools.import`) respeta el cupo de los torneos
+y el no solapamiento de partidos aunque desactive los triggers durante la carga.
+
+Ejecutar desde `back/` con `python -m pytest tests`.
+"""
+import importlib
+import json
+
+import pytest
+
+from app.db.database import create_connection
+
+importer = importlib.import_module("app.tools.import")
+
+
+@pytest.fixture()
+def conn(seed):
+    seed(users=4, teams=4, max_equipos=3)
+    conn = create_connection()
+    yield conn
+    conn.close()
+
+
+def _load(conn, tmp_path, table, records):
+    path = tmp_path / f"{table}.ndjson"
+    path.write_text("".join(json.dumps(record) + "\n" for record in records), encoding="utf-8")
+    return importer.import_table(conn, table, str(path), "ndjson", 2)
+
+
+def test_import_rejects_inscriptions_over_capacity(conn, tmp_path):
+    with pytest.raises(importer.ImportFailed, match="max_equipos"):
+        _load(conn, tmp_path, "inscripciones", [{"id_equipo": team, "id_torneo": 1} for team in range(1, 5)])
+    assert conn.execute("SELECT COUNT(*) FROM inscripciones").fetchone()[0] == 0
+    assert conn.execute("SELECT inscritos FROM torneos").fetchone()[0] == 0
+
+    assert _load(conn, tmp_path, "inscripciones", [{"id_equipo": team, "id_torneo": 1} for team in range(1, 4)])[0] == 3
+    assert conn.execute("SELECT inscritos FROM torneos").fetchone()[0] == 3
+    # El trigger de cupo vuelve a estar activo después de la carga
+    with pytest.raises(Exception, match="torneo_completo"):
+        conn.execute("INSERT INTO inscripciones (id_equipo, id_torneo) VALUES (4, 1)")
+    conn.rollback()
+
+
+def test_import_rejects_overlapping_matches(conn, tmp_path):
+    matches = [
+        {"id_torneo": 1, "equipo_local": 1, "equipo_visitante": 2, "fecha": "2026-02-01T10:00:00Z"},
+        {"id_torneo": 1, "equipo_local": 3, "equipo_visitante": 1, "fecha": "2026-02-01T10:30:00Z"},
+    ]
+    with pytest.raises(importer.ImportFailed, match="chocan"):
+        _load(conn, tmp_path, "partidos", matches)
+    assert conn.execute("SELECT COUNT(*) FROM partidos").fetchone()[0] == 0
+
+    matches[1]["fecha"] = "2026-02-02T10:00:00Z"
+    assert _load(conn, tmp_path, "partidos", matches)[0] == 2
+    # También choca con los partidos que ya estaban en la base de datos
+    with pytest.raises(importer.ImportFailed, match="chocan"):
+        _load(conn, tmp_path, "partidos", [
+            {"id_torneo": 1, "equipo_local": 2, "equipo_visitante": 4, "fecha": "2026-02-01T11:00:00Z"},
+        ])
+    assert conn.execute("SELECT COUNT(*) FROM partidos").fetchone()[0] == 2
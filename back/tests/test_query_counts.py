@@ -0,0 +1,230 @@
+# tests/test_query_counts.py
+"""
+Comprueba el presupuesto de sentencias SQL de cada endpoint de escritura.
+
+Cada endpoint tiene un número fijo de sentencias y un solo commit. Las mutaciones
+simples se resuelven con una sola sentencia (INSERT/UPDATE/DELETE ... RETURNING):
+la unicidad la validan las restricciones UNIQUE y la fila devuelta sale del propio
+RETURNING, sin pre-comprobaciones ni relecturas. Las demás anotan en `WRITES` para
+qué es cada sentencia adicional. Si un cambio añade una consulta a una de estas
+rutas, este test falla.
+
+Ejecutar desde `back/` con `python -m pytest tests`.
+"""
+import sqlite3
+
+import pytest
+from fastapi.testclient import TestClient
+
+import main
+from app.db import database
+from app.db.database import apply_pragma_profile
+
+# Sentencias de control de transacción, que no cuentan como consultas
+_TRANSACTION = ("BEGIN", "COMMIT", "ROLLBACK", "SAVEPOINT", "RELEASE")
+
+
+class CountingConnection(sqlite3.Connection):
+    """
+    Conexión que anota cada sentencia que se le envía y cada commit.
+
+    Se cuentan las llamadas desde Python y no lo que informa `set_trace_callback`,
+    que también incluye las sentencias internas de los triggers y del índice FTS.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.queries = []
+        self.commits = 0
+
+    def _record(self, sql):
+        if not sql.lstrip().upper().startswith(_TRANSACTION):
+            self.queries.append(" ".join(sql.split()))
+        elif sql.lstrip().upper().startswith("COMMIT"):
+            self.commits += 1
+
+    def execute(self, sql, *args):
+        self._record(sql)
+        return super().execute(sql, *args)
+
+    def executemany(self, sql, *args):
+        self._record(sql)
+        return super().executemany(sql, *args)
+
+    def cursor(self, *args, **kwargs):
+        return super().cursor(CountingCursor)
+
+    def commit(self):
+        self.commits += 1
+        return super().commit()
+
+    def reset(self):
+        self.queries.clear()
+        self.commits = 0
+
+
+class CountingCursor(sqlite3.Cursor):
+    def execute(self, sql, *args):
+        self.connection._record(sql)
+        return super().execute(sql, *args)
+
+
+@pytest.fixture()
+def client(db_path, monkeypatch):
+    """
+    Cliente en el que cada conexión que abre una petición es una `CountingConnection`.
+
+    Sin pool, tanto `get_db` como `connection()` abren una conexión por uso con
+    `create_connection`, que se sustituye una vez arrancada la aplicación (las
+    tareas de fondo se quedan con la original).
+    """
+    connections = []
+
+    def counting_connection():
+        conn = sqlite3.connect(database.DB_PATH, check_same_thread=False, factory=CountingConnection)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA foreign_keys = ON;")
+        apply_pragma_profile(conn)
+        conn.reset()
+        connections.append(conn)
+        return conn
+
+    with TestClient(main.app) as c:
+        monkeypatch.setattr(database, "DB_POOL_DISABLED", True)
+        monkeypatch.setattr(database, "create_connection", counting_connection)
+        c.connections = connections
+        yield c
+
+
+@pytest.fixture()
+def data(client, seed):
+    """
+    Añade a los datos de `seed` una inscripción más, un pago, un miembro, un
+    partido, una entrada en lista de espera y un segundo torneo con cuatro equipos
+    inscritos y sin partidos, y devuelve todos los IDs.
+    """
+    ids = seed(users=6, teams=4, max_equipos=8)
+    teams, tournament = ids["teams"], ids["tournament"]
+    conn = sqlite3.connect(database.DB_PATH)
+
+    def insert(sql, params):
+        return conn.execute(sql + " RETURNING id", params).fetchone()[0]
+
+    inscriptions = [insert("INSERT INTO inscripciones (id_equipo, id_torneo) VALUES (?, ?)", (team, tournament)) for team in teams[:2]]
+    ids.update({
+        "inscription": inscriptions[0],
+        "payment": insert("INSERT INTO pagos (id_equipo, id_torneo, monto_cent) VALUES (?, ?, 1000)", (teams[0], tournament)),
+        "member": insert("INSERT INTO miembros_equipo (id_equipo, id_usuario) VALUES (?, ?)", (teams[0], ids["users"][4])),
+        "match": insert(
+            "INSERT INTO partidos (id_torneo, equipo_local, equipo_visitante, fecha) VALUES (?, ?, ?, '2024-07-02T18:00:00Z')",
+            (tournament, teams[0], teams[1]),
+        ),
+        "waitlist": insert("INSERT INTO lista_espera (id_equipo, id_torneo) VALUES (?, ?)", (teams[3], tournament)),
+        "empty_tournament": insert(
+            "INSERT INTO torneos (nombre, fecha_inicio, fecha_fin, max_equipos, id_organizador) "
+            "VALUES ('Liga', '2024-09-01T18:00:00Z', '2024-09-30T18:00:00Z', 8, ?)",
+            (ids["users"][0],),
+        ),
+    })
+    for team in teams:
+        insert("INSERT INTO inscripciones (id_equipo, id_torneo) VALUES (?, ?)", (team, ids["empty_tournament"]))
+    conn.commit()
+    conn.close()
+    return ids
+
+
+def _tournament_body(organizer, nombre="Copa Invierno"):
+    return {
+        "nombre": nombre,
+        "fecha_inicio": "2024-12-01T18:00:00Z",
+        "fecha_fin": "2024-12-31T18:00:00Z",
+        "max_equipos": 16,
+        "id_organizador": organizer,
+    }
+
+
+def _user_body(nickname):
+    return {"nombre": nickname.title(), "nickname": nickname, "email": f"{nickname}@example.com", "password": "secreto123"}
+
+
+# Endpoint -> (método, URL, cuerpo, consultas esperadas)
+WRITES = {
+    "create_user": lambda s: ("POST", "/users/", _user_body("nueva"), 1),
+    # + lectura de los IDs asignados (`sqlite_sequence`) en todos los lotes
+    "create_users_bulk": lambda s: ("POST", "/users/bulk", {"items": [_user_body("nueva"), _user_body("otra")]}, 2),
+    "create_teams_bulk": lambda s: (
+        "POST", "/teams/bulk",
+        {"items": [{"nombre": "Equipo A", "id_capitan": s["users"][4]}, {"nombre": "Equipo B", "id_capitan": s["users"][5]}]},
+        2,
+    ),
+    "create_payments_bulk": lambda s: (
+        "POST", "/payments/bulk",
+        {"items": [{"id_equipo": team, "id_torneo": s["tournament"], "monto_cent": 500} for team in s["teams"][:2]]},
+        2,
+    ),
+    "create_inscriptions_bulk": lambda s: (
+        "POST", "/inscriptions/bulk",
+        {"items": [{"id_equipo": team, "id_torneo": s["tournament"]} for team in s["teams"][2:]]},
+        2,
+    ),
+    # Por partido: cuatro comprobaciones de solape y el INSERT; el que trae resultado
+    # añade la clasificación (upsert y limpieza) y el rating de los dos equipos
+    "create_matches_bulk": lambda s: (
+        "POST", "/matches/bulk",
+        {"items": [
+            {"id_torneo": s["tournament"], "equipo_local": s["teams"][0], "equipo_visitante": s["teams"][1], "fecha": "2024-07-09T18:00:00Z"},
+            {"id_torneo": s["tournament"], "equipo_local": s["teams"][1], "equipo_visitante": s["teams"][0], "fecha": "2024-07-19T18:00:00Z",
+             "resultado_local": 1, "resultado_visitante": 0},
+        ]},
+        16,
+    ),
+    "create_tournament": lambda s: ("POST", "/tournaments/", _tournament_body(s["users"][0]), 1),
+    "update_tournament": lambda s: ("PUT", f"/tournaments/{s['tournament']}", _tournament_body(s["users"][0], "Copa Renombrada"), 1),
+    "update_tournament_status": lambda s: ("PUT", f"/tournaments/{s['tournament']}/status", {"status": "en_curso"}, 1),
+    "create_team": lambda s: ("POST", "/teams/", {"nombre": "Equipo Nuevo", "id_capitan": s["users"][5]}, 1),
+    # + lectura del nombre anterior para el índice de autocompletado
+    "update_team": lambda s: ("PUT", f"/teams/{s['teams'][0]}", {"nombre": "Equipo Renombrado", "id_capitan": s["users"][0]}, 2),
+    # + lectura del nickname anterior para el índice de autocompletado
+    "update_user": lambda s: ("PUT", f"/users/{s['users'][1]}", {"nombre": "Usuario 1", "nickname": "renamed", "email": "user1@example.com"}, 2),
+    # + torneos en los que estaba inscrito, para invalidar su caché
+    "delete_team": lambda s: ("DELETE", f"/teams/{s['teams'][2]}", None, 2),
+    "delete_user": lambda s: ("DELETE", f"/users/{s['users'][5]}", None, 1),
+    "add_member": lambda s: ("POST", "/members/", {"id_equipo": s["teams"][1], "id_usuario": s["users"][3]}, 1),
+    "delete_member": lambda s: ("DELETE", f"/members/{s['member']}", None, 1),
+    "create_payment": lambda s: ("POST", "/payments/", {"id_equipo": s["teams"][0], "id_torneo": s["tournament"], "monto_cent": 500}, 1),
+    "delete_payment": lambda s: ("DELETE", f"/payments/{s['payment']}", None, 1),
+    "create_inscription": lambda s: ("POST", "/inscriptions/", {"id_equipo": s["teams"][2], "id_torneo": s["tournament"]}, 1),
+    "delete_inscription": lambda s: ("DELETE", f"/inscriptions/{s['inscription']}", None, 1),
+    "delete_waitlist_entry": lambda s: ("DELETE", f"/inscriptions/waitlist/{s['waitlist']}", None, 1),
+    # + cuatro comprobaciones de solape (cada equipo como local y como visitante)
+    "create_match": lambda s: (
+        "POST", "/matches/",
+        {"id_torneo": s["tournament"], "equipo_local": s["teams"][0], "equipo_visitante": s["teams"][1], "fecha": "2024-07-09T18:00:00Z"},
+        5,
+    ),
+    # + resultado anterior, clasificación (upsert y limpieza) y rating de los dos equipos
+    "update_match_result": lambda s: ("PUT", f"/matches/{s['match']}", {"resultado_local": 2, "resultado_visitante": 1}, 9),
+    # Torneo, inscripciones, INSERT de todos los partidos y formato del torneo
+    "generate_fixtures": lambda s: ("POST", f"/tournaments/{s['empty_tournament']}/fixtures", {"formato": "liga"}, 4),
+    # Torneo, semillas (UPDATE y lectura), formato, rondas anteriores, INSERT de la
+    # ronda y lectura de los partidos creados
+    "generate_next_swiss_round": lambda s: ("POST", f"/tournaments/{s['empty_tournament']}/rounds/next", None, 7),
+    # Torneo, partidos pendientes, ocupación de las franjas y, por partido, cuatro
+    # comprobaciones de solape, una de sede y el UPDATE
+    "schedule_matches": lambda s: (
+        "POST", f"/tournaments/{s['tournament']}/schedule",
+        {"franjas": ["2024-07-05T10:00:00Z", "2024-07-05T12:00:00Z"], "sedes": ["Pista 1"]},
+        9,
+    ),
+}
+
+
+@pytest.mark.parametrize("endpoint", sorted(WRITES))
+def test_write_endpoints_stay_within_statement_budget(client, data, endpoint):
+    method, url, body, expected = WRITES[endpoint](data)
+    client.connections.clear()
+    response = client.request(method, url, json=body)
+    assert response.status_code < 300, response.text
+    [conn] = client.connections
+    assert conn.commits == 1
+    assert len(conn.queries) == expected, conn.queries
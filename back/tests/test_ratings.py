@@ -0,0 +1,48 @@
+# tests/test_ratings.py
+"""
+Comprueba que el recálculo vectorizado de los ratings (`ratings.recompute`) da lo
+mismo que el recorrido partido a partido.
+
+Ejecutar desde `back/` con `python -m pytest tests`.
+"""
+import random
+
+import pytest
+
+from app.services import ratings
+
+pytest.importorskip("numpy")
+
+
+def schedule(matches: int, teams: int) -> list:
+    rng = random.Random(matches * teams)
+    result = []
+    for match_id in range(1, matches + 1):
+        local = rng.randrange(1, teams + 1)
+        visitante = rng.choice([t for t in range(1, teams + 1) if t != local])
+        result.append((match_id, local * 7, visitante * 7, rng.randrange(4), rng.randrange(4)))
+    # Los mismos dos equipos seguidos, y un equipo que solo juega al final
+    result += [(matches + 1, 7, 14, 2, 0), (matches + 2, 14, 7, 1, 1), (matches + 3, 7, 10_000, 0, 3)]
+    return result
+
+
+@pytest.mark.parametrize("matches, teams", [(1, 2), (50, 3), (2000, 40), (5000, 800)])
+def test_recompute_matches_the_sequential_loop(monkeypatch, matches, teams):
+    monkeypatch.setattr(ratings, "MIN_LEVEL_WIDTH", 0)
+    data = schedule(matches, teams)
+
+    final, played, history = ratings.recompute(data, k=24.0, initial=1200.0)
+    expected_final, expected_played, expected_history = ratings._recompute_python(data, 24.0, 1200.0)
+
+    assert played == expected_played
+    assert final == pytest.approx(expected_final, abs=1e-9)
+    assert len(history) == len(expected_history)
+    for row, expected_row in zip(history, expected_history):
+        assert row[:3] == expected_row[:3]
+        assert row[3:] == pytest.approx(expected_row[3:], abs=1e-9)
+
+
+def test_recompute_falls_back_to_the_loop_for_deep_schedules(monkeypatch):
+    data = schedule(200, 4)
+    monkeypatch.setattr(ratings, "_recompute_python", lambda *args: "python")
+    assert ratings.recompute(data) == "python"
@@ -0,0 +1,118 @@
+# tests/test_scheduler.py
+"""
+Comprueba la detección de choques de horario: `IntervalIndex` en memoria,
+`find_conflict` en la base de datos (que deben coincidir) y el 409 de
+`POST /matches/`.
+
+Ejecutar desde `back/` con `python -m pytest tests`.
+"""
+import sqlite3
+
+import pytest
+
+from app.crud.crud_match import find_conflict
+from app.db import database
+from app.db.database import connection
+from app.services.scheduler import IntervalIndex
+
+# Intervalos ocupados por el equipo: [100, 200) y [400, 500)
+BUSY = ((100, 200), (400, 500))
+
+# (inicio, fin, descanso, ¿choca?)
+CASES = [
+    # Sin descanso, los intervalos que sólo se tocan no chocan
+    (0, 100, 0, False),
+    (200, 300, 0, False),
+    (300, 400, 0, False),
+    (0, 101, 0, True),
+    (199, 300, 0, True),
+    (120, 180, 0, True),
+    (50, 250, 0, True),
+    (250, 350, 0, False),
+    # Con descanso: el predecesor debe acabar y el sucesor empezar con margen
+    (210, 300, 10, False),
+    (209, 300, 10, True),
+    (0, 90, 10, False),
+    (0, 91, 10, True),
+    (300, 390, 10, False),
+    (300, 391, 10, True),
+    (550, 600, 50, False),
+    (549, 600, 50, True),
+]
+
+
+@pytest.mark.parametrize("inicio, fin, descanso, expected", CASES)
+def test_interval_index_edges(inicio, fin, descanso, expected):
+    index = IntervalIndex()
+    for busy in reversed(BUSY):
+        index.add("equipo", *busy)
+    assert index.conflicts("equipo", inicio, fin, descanso) is expected
+    assert not index.conflicts("otro", inicio, fin, descanso)
+
+
+@pytest.fixture()
+def matches(seed):
+    """
+    Programa los intervalos de `BUSY` para el primer equipo (una vez como local y
+    otra como visitante) y un partido de los otros dos en la sede 'Pista 1'.
+    """
+    ids = seed(users=4, teams=4)
+    a, b, c, d = ids["teams"]
+    conn = sqlite3.connect(database.DB_PATH)
+    rows = [(a, b, None, *BUSY[0]), (c, a, None, *BUSY[1]), (c, d, "Pista 1", 1000, 1100)]
+    match_ids = [
+        conn.execute(
+            "INSERT INTO partidos (id_torneo, equipo_local, equipo_visitante, fecha, sede, inicio, fin) "
+            "VALUES (?, ?, ?, '2024-07-02T18:00:00Z', ?, ?, ?) RETURNING id",
+            (ids["tournament"], *row),
+        ).fetchone()[0]
+        for row in rows
+    ]
+    conn.commit()
+    conn.close()
+    return {**ids, "matches": match_ids}
+
+
+@pytest.mark.parametrize("inicio, fin, descanso, expected", CASES)
+def test_find_conflict_agrees_with_the_index(matches, inicio, fin, descanso, expected):
+    team = matches["teams"][0]
+    with connection() as db:
+        conflict = find_conflict(db, (team,), None, inicio, fin, descanso)
+    assert (conflict is not None) is expected
+    if expected:
+        assert conflict in matches["matches"][:2]
+
+
+def test_find_conflict_checks_the_venue(matches):
+    other = matches["teams"][1]
+    with connection() as db:
+        assert find_conflict(db, (other,), "Pista 1", 1050, 1150) == matches["matches"][2]
+        assert find_conflict(db, (other,), "Pista 2", 1050, 1150) is None
+        # La sede no exige descanso: basta con que no se solapen
+        assert find_conflict(db, (other,), "Pista 1", 1100, 1200, descanso=60) is None
+        assert find_conflict(db, (other,), "Pista 1", 900, 1000, descanso=60) is None
+
+
+def test_create_match_returns_409_on_a_clash(client, seed):
+    ids = seed(users=4, teams=4)
+    a, b, c, d = ids["teams"]
+
+    def create(local, visitante, fecha, sede="Pista 1"):
+        body = {"id_torneo": ids["tournament"], "equipo_local": local, "equipo_visitante": visitante, "fecha": fecha, "sede": sede}
+        return client.post("/matches/", json=body)
+
+    first = create(a, b, "2024-07-02T18:00:00Z")
+    assert first.status_code == 200, first.text
+
+    # Un equipo que ya juega (partidos de 90 minutos)
+    clash = create(a, c, "2024-07-02T19:00:00Z", sede="Pista 2")
+    assert clash.status_code == 409
+    assert str(first.json()["id"]) in clash.json()["detail"]
+    # La sede ocupada, con otros equipos
+    assert create(c, d, "2024-07-02T18:30:00Z").status_code == 409
+    # Sin descanso mínimo, empezar justo al acabar no choca
+    assert create(a, c, "2024-07-02T19:30:00Z").status_code == 200
+    # En otra sede siguen chocando los equipos ocupados
+    assert create(c, d, "2024-07-02T18:30:00Z", sede="Pista 2").status_code == 409
+    assert create(b, d, "2024-07-02T18:30:00Z", sede="Pista 2").status_code == 409
+    assert create(d, b, "2024-07-02T21:00:00Z", sede="Pista 2").status_code == 200
@@ -0,0 +1,37 @@
+# tests/test_search.py
+"""
+Comprueba que la búsqueda lee candidatos y detalles de la misma foto de la base de
+datos aunque otra conexión borre filas entre las dos lecturas.
+
+Ejecutar desde `back/` con `python -m pytest tests`.
+"""
+import sqlite3
+
+from app.crud import crud_search
+from app.db import database
+from app.db.database import create_connection
+
+
+def test_row_deleted_between_candidates_and_display(seed, monkeypatch):
+    ids = seed(users=3, teams=0)
+    original = crud_search._candidates
+
+    def candidates_then_delete(db, tipo, query, top):
+        rows = original(db, tipo, query, top)
+        other = sqlite3.connect(database.DB_PATH)
+        other.execute("DELETE FROM usuarios WHERE id = ?", (ids["users"][1],))
+        other.commit()
+        other.close()
+        return rows
+
+    monkeypatch.setattr(crud_search, "_candidates", candidates_then_delete)
+    db = create_connection()
+    try:
+        results = crud_search.search(db, "user", tipo="usuarios")
+        assert sorted(result.id for result in results) == ids["users"]
+        assert not db.in_transaction
+
+        # La búsqueda siguiente ya no ve la fila borrada
+        assert sorted(result.id for result in crud_search.search(db, "user", tipo="usuarios")) == [ids["users"][0], ids["users"][2]]
+    finally:
+        db.close()
@@ -0,0 +1,89 @@
+# tests/test_standings.py
+"""
+Comprueba que la clasificación mantenida incrementalmente al crear, corregir,
+quitar y borrar resultados coincide con la que reconstruye `rebuild_standings`
+desde los partidos.
+
+Ejecutar desde `back/` con `python -m pytest tests`.
+"""
+import sqlite3
+
+import pytest
+
+from app.crud import crud_match, crud_standings
+from app.db import database
+from app.db.database import connection
+from app.services.standings import Estadisticas
+
+
+@pytest.fixture()
+def data(client, seed):
+    ids = seed(users=3, teams=3)
+    conn = sqlite3.connect(database.DB_PATH)
+    conn.executemany(
+        "INSERT INTO inscripciones (id_equipo, id_torneo) VALUES (?, ?)",
+        [(team, ids["tournament"]) for team in ids["teams"]],
+    )
+    conn.commit()
+    conn.close()
+    return ids
+
+
+def standings():
+    """
+    Devuelve la clasificación guardada y la que deja `rebuild_standings`, que se
+    calcula en una transacción que se deshace.
+    """
+    conn = sqlite3.connect(database.DB_PATH)
+    conn.row_factory = sqlite3.Row
+    try:
+        stored = crud_standings.stored_standings(conn)
+        crud_standings.rebuild_standings(conn)
+        rebuilt = crud_standings.stored_standings(conn)
+        conn.rollback()
+    finally:
+        conn.close()
+    return stored, rebuilt
+
+
+def test_incremental_standings_match_a_rebuild(client, data):
+    tournament = data["tournament"]
+    a, b, c = data["teams"]
+
+    def create(local, visitante, day, *result):
+        body = {"id_torneo": tournament, "equipo_local": local, "equipo_visitante": visitante, "fecha": f"2024-07-{day:02d}T18:00:00Z"}
+        if result:
+            body.update(resultado_local=result[0], resultado_visitante=result[1])
+        response = client.post("/matches/", json=body)
+        assert response.status_code == 200, response.text
+        return response.json()["id"]
+
+    def set_result(match_id, local, visitante):
+        response = client.put(f"/matches/{match_id}", json={"resultado_local": local, "resultado_visitante": visitante})
+        assert response.status_code == 200, response.text
+
+    # Alta con resultado y alta sin resultado que luego se juega (empate)
+    first = create(a, b, 2, 2, 1)
+    second = create(b, c, 3)
+    set_result(second, 1, 1)
+    stored, rebuilt = standings()
+    assert stored == rebuilt
+    assert stored[(tournament, b)] == Estadisticas(2, 0, 1, 1, 2, 3, 1)
+
+    # Corrección del resultado: la victoria pasa al visitante
+    set_result(first, 0, 3)
+    stored, rebuilt = standings()
+    assert stored == rebuilt
+    assert stored[(tournament, a)] == Estadisticas(1, 0, 0, 1, 0, 3, 0)
+
+    # Se quita un resultado: el equipo que ya no ha jugado desaparece
+    set_result(second, None, None)
+    stored, rebuilt = standings()
+    assert stored == rebuilt
+    assert set(stored) == {(tournament, a), (tournament, b)}
+
+    # Borrar el partido que queda con resultado vacía la clasificación (no hay ruta
+    # DELETE /matches/{id}: se llama directamente al CRUD)
+    with connection() as db:
+        assert crud_match.delete_match(db, match_id=first)
+    assert standings() == ({}, {})
@@ -0,0 +1,42 @@
+# tests/test_users.py
+"""
+Comprueba que las rutas que hashean o verifican contraseñas no tienen una conexión
+del pool prestada mientras esperan al pool de bcrypt.
+
+Ejecutar desde `back/` con `python -m pytest tests`.
+"""
+import pytest
+
+from app.db.database import get_pool
+from app.security import security
+
+
+@pytest.fixture()
+def connections_in_use(monkeypatch):
+    """
+    Envuelve las funciones de hash de `security` y anota las conexiones del pool
+    prestadas en el momento de llamarlas.
+    """
+    seen = []
+    for name in ("get_password_hash_async", "verify_password_async", "hash_passwords_async"):
+        original = getattr(security, name)
+
+        async def wrapper(*args, _original=original):
+            seen.append(get_pool().stats()["in_use"])
+            return await _original(*args)
+
+        monkeypatch.setattr(security, name, wrapper)
+    return seen
+
+
+def test_password_routes_release_the_connection_before_hashing(client, connections_in_use):
+    user = {"nombre": "Ana", "nickname": "ana", "email": "ana@example.com", "password": "secreto123"}
+    assert client.post("/users/", json=user).status_code == 201
+    response = client.post("/users/bulk", json={"modo": "parcial", "items": [
+        {"nombre": "Bea", "nickname": "bea", "email": "bea@example.com", "password": "secreto123"},
+        user,
+    ]})
+    assert [item["ok"] for item in response.json()["resultados"]] == [True, False]
+    assert client.post("/users/token", data={"username": "ana@example.com", "password": "secreto123"}).status_code == 200
+    assert client.post("/users/token", data={"username": "ana@example.com", "password": "otra-clave"}).status_code == 401
+    assert connections_in_use == [0, 0, 0, 0]